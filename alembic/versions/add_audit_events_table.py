@@ -0,0 +1,72 @@
+"""add append-only audit_events table
+
+Revision ID: audit_events
+Revises: usage_daily_rollups
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'audit_events'
+down_revision: Union[str, None] = 'usage_daily_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Create audit_events for admin and billing actions.
+
+    The table is append-only: on PostgreSQL a trigger rejects UPDATE and
+    DELETE, so recorded events cannot be altered through the application's
+    database role.
+    """
+    op.create_table(
+        'audit_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('occurred_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('action', sa.String(length=100), nullable=False),
+        sa.Column('actor_type', sa.String(length=32), nullable=False),
+        sa.Column('actor_id', sa.String(length=255), nullable=True),
+        sa.Column('subject_type', sa.String(length=64), nullable=True),
+        sa.Column('subject_id', sa.String(length=255), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('request_id', sa.String(length=64), nullable=True),
+        sa.Column('details', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_audit_events_occurred_at', 'audit_events', ['occurred_at'])
+    op.create_index('ix_audit_events_action_id', 'audit_events', ['action', 'id'])
+    op.create_index('ix_audit_events_actor_id', 'audit_events', ['actor_id', 'id'])
+    op.create_index('ix_audit_events_subject_id', 'audit_events', ['subject_type', 'subject_id', 'id'])
+    op.create_index('ix_audit_events_user_id', 'audit_events', ['user_id', 'id'])
+
+    op.execute("""
+        CREATE FUNCTION audit_events_append_only() RETURNS trigger AS $$
+        BEGIN
+            RAISE EXCEPTION 'audit_events is append-only';
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER audit_events_append_only
+        BEFORE UPDATE OR DELETE ON audit_events
+        FOR EACH ROW EXECUTE FUNCTION audit_events_append_only()
+    """)
+
+
+def downgrade() -> None:
+    """Drop audit_events and its append-only trigger; recorded events are lost."""
+    op.execute("DROP TRIGGER IF EXISTS audit_events_append_only ON audit_events")
+    op.execute("DROP FUNCTION IF EXISTS audit_events_append_only()")
+    op.drop_index('ix_audit_events_user_id', table_name='audit_events')
+    op.drop_index('ix_audit_events_subject_id', table_name='audit_events')
+    op.drop_index('ix_audit_events_actor_id', table_name='audit_events')
+    op.drop_index('ix_audit_events_action_id', table_name='audit_events')
+    op.drop_index('ix_audit_events_occurred_at', table_name='audit_events')
+    op.drop_table('audit_events')
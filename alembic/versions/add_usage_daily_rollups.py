@@ -0,0 +1,46 @@
+"""add usage_daily_rollups table
+
+Revision ID: usage_daily_rollups
+Revises: webhook_event_queue
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'usage_daily_rollups'
+down_revision: Union[str, None] = 'webhook_event_queue'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Create usage_daily_rollups for long-range billing analytics.
+
+    The usage rollup job sums usage_records per user, day and endpoint for
+    closed days; analytics read those rows instead of every request. The table
+    starts empty and is back-filled by the first rollup run.
+    """
+    op.create_table(
+        'usage_daily_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('endpoint', sa.String(), nullable=False),
+        sa.Column('requests', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('tokens', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'day', 'endpoint', name='uq_usage_daily_rollups_user_day_endpoint')
+    )
+    op.create_index('ix_usage_daily_rollups_day', 'usage_daily_rollups', ['day'])
+
+
+def downgrade() -> None:
+    """Drop usage_daily_rollups; analytics fall back to raw usage records."""
+    op.drop_index('ix_usage_daily_rollups_day', table_name='usage_daily_rollups')
+    op.drop_table('usage_daily_rollups')
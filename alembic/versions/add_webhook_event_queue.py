@@ -0,0 +1,74 @@
+"""turn webhook_events into a processing queue
+
+Revision ID: webhook_event_queue
+Revises: webhook_idempotency
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'webhook_event_queue'
+down_revision: Union[str, None] = 'webhook_idempotency'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+webhook_event_status = sa.Enum(
+    'QUEUED', 'PROCESSING', 'PROCESSED', 'FAILED', 'DEAD_LETTER', name='webhookeventstatus'
+)
+
+
+def upgrade() -> None:
+    """
+    Add queue state to webhook_events.
+
+    Webhooks are now acknowledged once stored and applied by a background
+    worker, so each row tracks its processing state, attempts and retry time.
+    Rows written before this migration were processed inline and are marked
+    PROCESSED. processed_at is now set when processing finishes instead of on
+    insert.
+    """
+    webhook_event_status.create(op.get_bind(), checkfirst=True)
+
+    op.add_column('webhook_events', sa.Column('customer_id', sa.String(length=255), nullable=True))
+    op.add_column('webhook_events', sa.Column('event_created', sa.Integer(), nullable=True))
+    op.add_column(
+        'webhook_events',
+        sa.Column('status', webhook_event_status, server_default='PROCESSED', nullable=False)
+    )
+    op.alter_column('webhook_events', 'status', server_default=None)
+    op.add_column('webhook_events', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('webhook_events', sa.Column('last_error', sa.Text(), nullable=True))
+    op.add_column(
+        'webhook_events',
+        sa.Column('received_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False)
+    )
+    op.add_column('webhook_events', sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('webhook_events', sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True))
+    op.alter_column('webhook_events', 'processed_at', nullable=True, server_default=None)
+
+    # The worker looks up pending events and the pending events of a customer
+    op.create_index(
+        'ix_webhook_events_status_customer',
+        'webhook_events',
+        ['status', 'customer_id']
+    )
+
+
+def downgrade() -> None:
+    """Drop the queue state; unprocessed events are lost."""
+    op.drop_index('ix_webhook_events_status_customer', table_name='webhook_events')
+    op.execute("UPDATE webhook_events SET processed_at = received_at WHERE processed_at IS NULL")
+    op.alter_column('webhook_events', 'processed_at', nullable=False, server_default=sa.text('now()'))
+    op.drop_column('webhook_events', 'locked_at')
+    op.drop_column('webhook_events', 'next_attempt_at')
+    op.drop_column('webhook_events', 'received_at')
+    op.drop_column('webhook_events', 'last_error')
+    op.drop_column('webhook_events', 'attempts')
+    op.drop_column('webhook_events', 'status')
+    op.drop_column('webhook_events', 'event_created')
+    op.drop_column('webhook_events', 'customer_id')
+    webhook_event_status.drop(op.get_bind(), checkfirst=True)
@@ -3,7 +3,7 @@ from __future__ import annotations
 import warnings
 from pathlib import Path
 import tomllib
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Literal, Tuple
 from pydantic import Field, SecretStr, field_validator
 from pydantic_settings import BaseSettings, PydanticBaseSettingsSource
 
@@ -70,6 +70,9 @@ class TOMLSettingsSource(PydanticBaseSettingsSource):
         # Keep oauth providers as nested structure, but allow oauth.enabled to be flattened
         if key == "providers" or (key == "oauth" and "providers" in value):
             return True
+        # Keep per-tier rate limit policy tables as nested dictionaries
+        if key == "rate_limit_policies":
+            return True
         # Keep subscription_tiers and rate_limits as flattened structures
         if key in ["subscription_tiers", "rate_limits"]:
             return False
@@ -89,6 +92,7 @@ class TOMLSettingsSource(PydanticBaseSettingsSource):
             "qdrant.local.url": "local_qdrant_url",
             "context_window.default": "default_context_window",
             "context_window.max_context": "max_context_window",
+            "context_window.packing": "context_packing_enabled",
             "llm.request_timeout_seconds": "llm_request_timeout",
             "llm.generation_timeout_seconds": "llm_generation_timeout",
             "llm.chat_timeout_seconds": "llm_chat_timeout",
@@ -103,6 +107,25 @@ class TOMLSettingsSource(PydanticBaseSettingsSource):
             "subscription_tiers.basic.requests_per_month": "basic_tier_requests_per_month",
             "subscription_tiers.premium.requests_per_month": "premium_tier_requests_per_month",
             "subscription_tiers.academic.requests_per_month": "academic_tier_requests_per_month",
+            "rate_limits.enabled": "rate_limiting_enabled",
+            "rate_limits.window_seconds": "rate_limit_window_seconds",
+            "semantic_cache.enabled": "semantic_cache_enabled",
+            "semantic_cache.threshold": "semantic_cache_threshold",
+            "semantic_cache.ttl_seconds": "semantic_cache_ttl_seconds",
+            "semantic_cache.max_entries": "semantic_cache_max_entries",
+            "document_parsing.workers": "document_parse_workers",
+            "document_parsing.pages_per_task": "document_parse_pages_per_task",
+            "document_parsing.page_timeout_seconds": "document_parse_page_timeout_seconds",
+            "document_parsing.max_pages": "document_parse_max_pages",
+            "health.probe_interval_seconds": "health_probe_interval_seconds",
+            "health.llm_probe_interval_seconds": "health_llm_probe_interval_seconds",
+            "health.probe_budget": "health_probe_budget",
+            "health.max_probe_interval_seconds": "health_max_probe_interval_seconds",
+            "health.latency_history": "health_latency_history",
+            "audit.batch_size": "audit_batch_size",
+            "audit.flush_interval_seconds": "audit_flush_interval_seconds",
+            "audit.max_pending": "audit_max_pending",
+            "prompts.philosopher_bundle": "philosopher_bundle_path",
         }
 
         # Check for exact match in special mappings
@@ -214,6 +237,7 @@ class Settings(BaseSettings):
     fusion_methods: str = Field("hyde,rag_fusion")  # Will use APP_FUSION_METHODS
     fusion_rrf_k: int = Field(60)  # Will use APP_FUSION_RRF_K
     fusion_max_queries: int = Field(4)  # Will use APP_FUSION_MAX_QUERIES
+    chat_hybrid_search: bool = Field(True)  # Will use APP_CHAT_HYBRID_SEARCH (sparse + dense chat history search)
     enable_compilation: bool = Field(True)  # Will use APP_ENABLE_COMPILATION
     chat_history: bool = Field(True)  # Will use APP_CHAT_HISTORY
     
@@ -226,6 +250,11 @@ class Settings(BaseSettings):
     llm_model: str = Field("qwen3:8b")  # From models.llm in TOML
     embed_model: str = Field("avr/sfr-embedding-mistral")  # From models.embed_model in TOML
     splade_model: str = Field("naver/splade-cocondenser-ensembledistil")  # From models.splade_model in TOML
+    tokenizer_model: str = Field("Qwen/Qwen3-8B")  # HF tokenizer of the served LLM (loaded offline; "" = estimate)
+    splade_backend: Literal["torch", "onnx"] = Field("torch")  # From models.splade_backend in TOML
+    splade_onnx_dir: str = Field("models/splade-onnx")  # Persisted ONNX export (graph + tokenizer)
+    splade_onnx_quantize: bool = Field(True)  # Serve the dynamically int8-quantized graph
+    splade_onnx_threads: int = Field(0, ge=0)  # ONNX Runtime intra-op threads (0 = runtime default)
     
     # LLM timeout configuration
     llm_request_timeout: int = Field(300)  # 5 minutes default
@@ -236,6 +265,7 @@ class Settings(BaseSettings):
     # Context window configuration
     default_context_window: int = Field(8192)
     max_context_window: int = Field(32000)
+    context_packing_enabled: bool = Field(True)  # Pack retrieved nodes into the default window
     
     # OAuth configuration (placeholder for future)
     oauth_enabled: bool = Field(False)
@@ -250,6 +280,55 @@ class Settings(BaseSettings):
     )
     max_upload_size_mb: int = Field(50)  # Will use APP_MAX_UPLOAD_SIZE_MB
 
+    # Document parsing (PDF/DOCX extraction in a process pool)
+    document_parse_workers: int = Field(
+        2,
+        ge=0,
+        description="Worker processes for PDF/DOCX extraction. 0 parses in a thread of the server process."
+    )
+    document_parse_pages_per_task: int = Field(
+        16,
+        ge=1,
+        description="PDF pages converted per worker task; large PDFs are split across workers."
+    )
+    document_parse_page_timeout_seconds: float = Field(10.0, gt=0)
+    document_parse_max_pages: int = Field(1000, ge=1)
+
+    # Background dependency health probes (served from a cached snapshot by /health)
+    health_probe_interval_seconds: float = Field(15.0, gt=0)
+    health_llm_probe_interval_seconds: float = Field(
+        120.0,
+        gt=0,
+        description="Interval between embedding-model probes; each one costs a real embedding call."
+    )
+    health_probe_budget: float = Field(
+        0.01,
+        gt=0,
+        le=1,
+        description="Largest fraction of wall time a dependency may spend being probed; "
+                    "slow probes back off beyond their interval."
+    )
+    health_max_probe_interval_seconds: float = Field(
+        300.0,
+        gt=0,
+        description="Upper bound on the time between two probes of a dependency, however slow its probe."
+    )
+    health_latency_history: int = Field(60, ge=1)
+
+    # Audit log (events are buffered in memory and written in batches)
+    audit_batch_size: int = Field(200, ge=1)
+    audit_flush_interval_seconds: float = Field(
+        1.0,
+        gt=0,
+        description="Longest time an audit event waits in memory before it is written."
+    )
+    audit_max_pending: int = Field(
+        10000,
+        ge=1,
+        description="Buffered audit events beyond which new events are dropped (and counted) "
+                    "while the database is unavailable."
+    )
+
     # Logging configuration
     log_dir: str = Field(
         "logs",
@@ -274,6 +353,29 @@ class Settings(BaseSettings):
                     "Default: 1000 bytes (1KB). Range: 100-10000 bytes."
     )
 
+    # Semantic answer cache for /ask_philosophy
+    semantic_cache_enabled: bool = Field(
+        True,
+        description="Serve cached answers to near-identical philosophy questions. "
+                    "Requests with chat history or user documents always bypass it."
+    )
+    semantic_cache_threshold: float = Field(
+        0.95,
+        ge=0.0,
+        le=1.0,
+        description="Minimum cosine similarity between query embeddings for a cache hit."
+    )
+    semantic_cache_ttl_seconds: int = Field(3600, ge=1)
+    semantic_cache_max_entries: int = Field(5000, ge=1)
+
+    # Pre-built philosopher prompt assets
+    philosopher_bundle_path: str = Field(
+        "build/philosopher_bundle.bin",
+        description="Philosopher asset bundle built by scripts/build_philosopher_bundle.py. "
+                    "Used instead of rendering philosopher templates when present; "
+                    "a newly deployed bundle is picked up within a minute. Empty disables it."
+    )
+
     # Cache warming configuration
     cache_warming_enabled: bool = Field(
         True,
@@ -366,6 +468,62 @@ class Settings(BaseSettings):
         description="Grace period in days before restricting access after payment failure. "
                     "Set via APP_SUBSCRIPTION_GRACE_PERIOD_DAYS environment variable."
     )
+    stripe_timeout_seconds: float = Field(
+        10.0,
+        gt=0,
+        description="Time limit for one Stripe API request. "
+                    "Set via APP_STRIPE_TIMEOUT_SECONDS environment variable."
+    )
+    stripe_max_retries: int = Field(
+        2,
+        ge=0,
+        le=5,
+        description="Retries of a Stripe request after a network error, rate limit or Stripe 5xx. "
+                    "Mutating requests are retried with the same idempotency key. "
+                    "Set via APP_STRIPE_MAX_RETRIES environment variable."
+    )
+    stripe_circuit_failure_threshold: int = Field(
+        5,
+        ge=1,
+        description="Consecutive failed Stripe calls that open the circuit breaker. "
+                    "Set via APP_STRIPE_CIRCUIT_FAILURE_THRESHOLD environment variable."
+    )
+    stripe_circuit_reset_seconds: float = Field(
+        30.0,
+        gt=0,
+        description="Seconds the Stripe circuit breaker rejects calls before trying again. "
+                    "Set via APP_STRIPE_CIRCUIT_RESET_SECONDS environment variable."
+    )
+    webhook_max_attempts: int = Field(
+        5,
+        ge=1,
+        description="Processing attempts of a webhook event before it is moved to the dead-letter store. "
+                    "Set via APP_WEBHOOK_MAX_ATTEMPTS environment variable."
+    )
+    webhook_retry_base_seconds: float = Field(
+        30.0,
+        gt=0,
+        description="Delay before the first retry of a failed webhook event; doubles on each further retry. "
+                    "Set via APP_WEBHOOK_RETRY_BASE_SECONDS environment variable."
+    )
+    webhook_poll_interval_seconds: float = Field(
+        5.0,
+        gt=0,
+        description="How often the webhook worker looks for due retries and events queued by other workers. "
+                    "Set via APP_WEBHOOK_POLL_INTERVAL_SECONDS environment variable."
+    )
+    webhook_concurrency: int = Field(
+        4,
+        ge=1,
+        description="Customers whose webhook events are applied concurrently (one event at a time per customer). "
+                    "Set via APP_WEBHOOK_CONCURRENCY environment variable."
+    )
+    usage_rollup_interval_seconds: float = Field(
+        3600.0,
+        ge=0,
+        description="How often closed days of API usage are rolled up for billing analytics (0 disables). "
+                    "Set via APP_USAGE_ROLLUP_INTERVAL_SECONDS environment variable."
+    )
     subscription_fail_open: bool = Field(
         False,
         description="Enable fail-open mode for subscription checks. When False (default), "
@@ -398,6 +556,22 @@ class Settings(BaseSettings):
         description="API requests per month for academic tier subscribers"
     )
 
+    # Rate limiting (can be overridden in TOML [rate_limits])
+    rate_limiting_enabled: bool = Field(
+        True,
+        description="Enforce per-tier rate limits on API endpoints"
+    )
+    rate_limit_window_seconds: int = Field(
+        60,
+        gt=0,
+        description="Window in seconds for rate limit policies given as request counts"
+    )
+    rate_limit_policies: Dict[str, Dict[str, int]] = Field(
+        default_factory=dict,
+        description="Requests per window keyed by subscription tier and endpoint class "
+                    "(default, streaming, heavy, upload)"
+    )
+
     @field_validator('cors_origins', mode='before')
     @classmethod
     def parse_cors_origins(cls, v):
@@ -0,0 +1,110 @@
+"""
+Pure ASGI middleware for application-wide request handling.
+
+These middlewares operate directly on the ASGI ``scope``/``receive``/``send``
+callables instead of subclassing ``BaseHTTPMiddleware``. Response bodies are
+passed through untouched, which avoids the per-request memory-stream overhead
+of ``BaseHTTPMiddleware`` and keeps streaming (SSE) responses unbuffered.
+"""
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class SecurityHeadersMiddleware:
+    """
+    Apply security headers to all HTTP responses.
+
+    Headers are applied to all endpoints including health checks, errors,
+    and normal responses. Uses SecurityManager.get_security_headers() as
+    single source of truth for security header configuration.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Import SecurityManager within function scope
+        from app.core.security import SecurityManager
+
+        async def send_with_security_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for header_name, header_value in SecurityManager.get_security_headers().items():
+                    headers[header_name] = header_value
+            await send(message)
+
+        await self.app(scope, receive, send_with_security_headers)
+
+
+class StartupCheckMiddleware:
+    """
+    Reject traffic with 503 when critical services failed to start.
+
+    Health endpoints are always served so monitoring keeps working during
+    startup issues. Startup state is read from ``app.state.serving_enabled``
+    and ``app.state.startup_errors``.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Allow health endpoints always (for monitoring during startup issues)
+        if scope["type"] != "http" or scope["path"].startswith("/health"):
+            await self.app(scope, receive, send)
+            return
+
+        # Check if serving is enabled (critical services are up)
+        app_state = scope["app"].state
+        serving_enabled = getattr(app_state, 'serving_enabled', True)
+        startup_errors = getattr(app_state, 'startup_errors', [])
+
+        if not serving_enabled and startup_errors:
+            response = JSONResponse(
+                status_code=503,
+                content={
+                    "error": "Service Unavailable",
+                    "message": "Critical services are unavailable. Server cannot serve traffic.",
+                    "startup_errors": startup_errors,
+                    "health_check": "/health"
+                }
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Add ``RateLimit-*`` headers to responses of rate-limited endpoints.
+
+    The limiter records its decision on ``request.state.rate_limit`` (stored
+    in ``scope["state"]``); the headers are applied when the response starts,
+    so streaming responses are not buffered.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_rate_limit_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                result = scope.get("state", {}).get("rate_limit")
+                if result is not None:
+                    headers = MutableHeaders(scope=message)
+                    for header_name, header_value in result.headers.items():
+                        headers[header_name] = header_value
+            await send(message)
+
+        await self.app(scope, receive, send_with_rate_limit_headers)
@@ -17,6 +17,7 @@ from fastapi_users.db import SQLAlchemyUserDatabase
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.user_models import User
+from app.core.principal import user_cache
 from app.core.logger import log
 from app.config.settings import get_settings
 
@@ -62,11 +63,38 @@ class UserManager(IntegerIDMixin, BaseUserManager[User, int]):
         """Hook called after verification email request."""
         log.info(f"Verification requested for user {user.id} ({user.email}).")
 
+    async def on_after_update(self, user: User, update_dict: dict, request: Optional = None):
+        """Hook called after a user update; drops the cached copy."""
+        user_cache.invalidate(user.id)
+
+    async def on_after_verify(self, user: User, request: Optional = None):
+        """Hook called after email verification; drops the cached copy."""
+        user_cache.invalidate(user.id)
+
+    async def on_after_reset_password(self, user: User, request: Optional = None):
+        """Hook called after a password reset; drops the cached copy."""
+        user_cache.invalidate(user.id)
+
+    async def on_before_delete(self, user: User, request: Optional = None):
+        """Hook called before a user is deleted; drops the cached copy."""
+        user_cache.invalidate(user.id)
+
     async def get(self, user_id):  # type: ignore[override]
-        """Fetch a user by ID with additional debug logging for JWT validation."""
+        """
+        Fetch a user by ID with additional debug logging for JWT validation.
+
+        Served from the short-TTL user cache when possible so warm
+        authenticated requests skip the users table lookup.
+        """
+        cached_user = user_cache.get(user_id)
+        if cached_user is not None:
+            log.debug("UserManager.get served user_id=%s from cache", user_id)
+            return cached_user
+
         log.debug("UserManager.get invoked for user_id=%s", user_id)
         user = await super().get(user_id)
         if user:
+            user_cache.set(user)
             log.debug(
                 "UserManager.get resolved user_id=%s email=%s is_active=%s",
                 user_id,
@@ -5,6 +5,7 @@ from __future__ import annotations
 import base64
 import binascii
 import json
+import logging
 from typing import Any, Dict, Optional, Tuple
 
 from fastapi import Depends, Request
@@ -66,7 +67,8 @@ async def get_optional_user_with_logging(
     if not is_valid_header and auth_header:
         log.warning("Authorization header failed validation: %s", validation_error)
 
-    if auth_header and is_valid_header:
+    # Decoding the payload is only useful for debug output; skip it otherwise
+    if auth_header and is_valid_header and log.isEnabledFor(logging.DEBUG):
         token = auth_header.split(" ", 1)[1].strip()
         payload = decode_jwt_payload(token)
         if payload:
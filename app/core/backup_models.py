@@ -54,6 +54,7 @@ class CollectionBackupResult(BaseModel):
     target_points: Optional[int] = None
     processed_points: int = 0
     batches_processed: int = 0
+    points_per_second: Optional[float] = None
     error: Optional[str] = None
 
 
@@ -71,6 +72,8 @@ class BackupProgressResponse(BaseModel):
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     duration_seconds: Optional[float] = None
+    points_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
     errors: List[str] = Field(default_factory=list)
 
 
@@ -84,6 +87,7 @@ class BackupResponse(BaseModel):
     total_source_points: int
     total_target_points: int
     duration_seconds: Optional[float] = None
+    points_per_second: Optional[float] = None
     collections: List[CollectionBackupResult]
     errors: List[str] = Field(default_factory=list)
 
@@ -133,8 +137,35 @@ class RepairRequest(BaseModel):
     target_collection: str
     repair_mode: str = Field(
         default="missing_points",
-        description="Repair mode: 'missing_points' or 'full_sync'"
+        description="Repair mode: 'missing_points', 'incremental_sync' or 'full_sync'"
     )
+    dry_run: bool = Field(
+        default=False,
+        description="Only report differences between source and target, do not modify the target"
+    )
+    compare_content: bool = Field(
+        default=False,
+        description="incremental_sync only: compare payload/vector hashes to detect changed points"
+    )
+    resume: bool = Field(
+        default=True,
+        description="Resume an interrupted sync from its last checkpoint"
+    )
+
+
+class SyncDiffReport(BaseModel):
+    """Differences found (and applied) by an incremental sync."""
+    missing_points: int = 0
+    changed_points: int = 0
+    extra_points: int = 0
+    copied_points: int = 0
+    deleted_points: int = 0
+    scanned_source_points: int = 0
+    scanned_target_points: int = 0
+    resumed_from_checkpoint: bool = False
+    sample_missing_ids: List[Any] = Field(default_factory=list)
+    sample_changed_ids: List[Any] = Field(default_factory=list)
+    sample_extra_ids: List[Any] = Field(default_factory=list)
 
 
 class RepairResponse(BaseModel):
@@ -144,6 +175,8 @@ class RepairResponse(BaseModel):
     repair_mode: str
     success: bool
     repaired_points: int
+    dry_run: bool = False
+    diff: Optional[SyncDiffReport] = None
     errors: List[str] = Field(default_factory=list)
 
 
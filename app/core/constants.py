@@ -23,7 +23,19 @@ CONTEXT_BUFFER_TOKENS: Final[int] = 2000
 """Buffer tokens reserved for system prompts and response generation."""
 
 CHARS_PER_TOKEN_ESTIMATE: Final[int] = 4
-"""Rough approximation of characters per token for context estimation."""
+"""Rough approximation of characters per token, used when the tokenizer is unavailable."""
+
+TOKEN_COUNT_CACHE_MAX_ENTRIES: Final[int] = 50000
+"""Maximum number of memoized per-text token counts held by the token counter."""
+
+CONTEXT_DEDUP_SHINGLE_SIZE: Final[int] = 5
+"""Word n-gram size used to detect near-duplicate context chunks."""
+
+CONTEXT_DEDUP_OVERLAP_THRESHOLD: Final[float] = 0.8
+"""Shingle overlap (relative to the smaller chunk) at which a chunk counts as a near-duplicate."""
+
+CONTEXT_MIN_TRUNCATED_TOKENS: Final[int] = 64
+"""Smallest remaining budget worth filling with a sentence-truncated chunk."""
 
 
 # ============================================================================
@@ -39,6 +51,15 @@ CHAT_CONTEXT_WINDOW_CHARS: Final[int] = 4000
 MAX_CONVERSATION_HISTORY_MESSAGES: Final[int] = 50
 """Maximum number of messages to include in conversation history."""
 
+CHAT_MIGRATION_BATCH_SIZE: Final[int] = 500
+"""Rows read, written and checkpointed per batch during chat export/import."""
+
+CHAT_EXPORT_FORMAT_VERSION: Final[str] = "2.0"
+"""Format version written to streaming (NDJSON) chat exports."""
+
+CHAT_BATCH_CHECKPOINT_DIR: Final[str] = "checkpoints/chat_batch"
+"""Directory where chat vector backfills keep their resume checkpoints."""
+
 
 # ============================================================================
 # Caching Configuration
@@ -59,6 +80,55 @@ EMBEDDING_CACHE_TTL: Final[int] = 86400
 PHILOSOPHER_COLLECTIONS_CACHE_TTL: Final[int] = 3600
 """Cache TTL for philosopher collections (1 hour - collections rarely change)."""
 
+PRINCIPAL_CACHE_TTL_SECONDS: Final[int] = 30
+"""In-process TTL for resolved principals (user, tier, entitlements) across requests."""
+
+PRINCIPAL_CACHE_MAX_ENTRIES: Final[int] = 10000
+"""Maximum number of users held in the in-process principal cache."""
+
+PROMPT_RENDER_CACHE_MAX_ENTRIES: Final[int] = 512
+"""Maximum number of memoized static prompt renders held by PromptRenderer."""
+
+PROMPT_PREFIX_TRACKER_MAX_ENTRIES: Final[int] = 256
+"""Number of recent static prompt prefixes remembered for the prefix hit-rate metric."""
+
+SEMANTIC_CACHE_GENERATION_KEY: Final[str] = "ontologic:semantic_cache:generation"
+"""Redis hash of per-collection generation counters used to invalidate semantic answer caches."""
+
+
+# ============================================================================
+# Streaming Quantile Configuration
+# ============================================================================
+
+QUANTILE_RELATIVE_ACCURACY: Final[float] = 0.01
+"""Relative error bound of reported quantiles (1%)."""
+
+QUANTILE_MAX_BUCKETS: Final[int] = 512
+"""Bucket cap per quantile sketch; the lowest buckets are folded together beyond it."""
+
+QUANTILE_FINE_SLICE_SECONDS: Final[int] = 60
+"""Slice width of the fine-grained quantile ring."""
+
+QUANTILE_FINE_RETENTION_SECONDS: Final[int] = 3600
+"""Time covered by the fine-grained quantile ring (1 hour)."""
+
+QUANTILE_COARSE_SLICE_SECONDS: Final[int] = 3600
+"""Slice width of the coarse quantile ring."""
+
+QUANTILE_COARSE_RETENTION_SECONDS: Final[int] = 86400
+"""Time covered by the coarse quantile ring (24 hours)."""
+
+QUANTILE_SUMMARY_WINDOWS: Final[dict] = {"1m": 60, "10m": 600, "1h": 3600, "24h": 86400}
+"""Windows exported as Prometheus summaries and shared between workers."""
+
+QUANTILE_SUMMARY_QUANTILES: Final[tuple] = (0.5, 0.9, 0.95, 0.99)
+"""Quantiles reported for timers and histograms."""
+
+QUANTILE_SNAPSHOT_KEY_PREFIX: Final[str] = "ontologic:quantiles"
+"""Redis key prefix for per-worker quantile snapshots."""
+
+QUANTILE_SNAPSHOT_TTL_SECONDS: Final[int] = 180
+"""Expiry of a worker's published quantile snapshot (several publish intervals)."""
 
 # ============================================================================
 # Cache Key Constants
@@ -93,6 +163,20 @@ META_REFEED_LIMIT: Final[int] = 10
 """Number of results to retrieve during meta collection refeed."""
 
 
+# ============================================================================
+# Query Expansion Configuration
+# ============================================================================
+
+PRF_SPARSE_VECTOR_NAME: Final[str] = "sparse_original"
+"""Stored SPLADE vector reused for pseudo-relevance feedback term extraction."""
+
+PRF_FEEDBACK_DOCS: Final[int] = 3
+"""Number of top initial results used as pseudo-relevant feedback documents."""
+
+PRF_MAX_EXPANSION_TERMS: Final[int] = 10
+"""Maximum number of SPLADE terms appended to the query by PRF."""
+
+
 # ============================================================================
 # Timeout Configuration (Fallback Values)
 # ============================================================================
@@ -135,6 +219,18 @@ RATE_LIMIT_ASK_SIMPLE: Final[str] = "30/minute"
 RATE_LIMIT_QUERY_HYBRID: Final[str] = "20/minute"
 """Rate limit for hybrid search queries."""
 
+RATE_LIMIT_WINDOW_SECONDS: Final[int] = 60
+"""Default window for tier rate-limit policies configured as a request count."""
+
+RATE_LIMIT_KEY_PREFIX: Final[str] = "ontologic:ratelimit"
+"""Redis key prefix for rate-limit buckets."""
+
+RATE_LIMIT_REDIS_RETRY_SECONDS: Final[int] = 30
+"""Back-off before retrying Redis after a rate-limit backend failure."""
+
+RATE_LIMIT_FALLBACK_MAX_KEYS: Final[int] = 100000
+"""Maximum buckets tracked by the in-process fallback limiter."""
+
 RATE_LIMIT_GET_PHILOSOPHERS: Final[str] = "60/minute"
 """Rate limit for philosopher listing (cheap operation)."""
 
@@ -1,7 +1,7 @@
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import Optional, Dict, Any, List
 from sqlmodel import SQLModel, Field, JSON, Column, Relationship
-from sqlalchemy import DateTime, func, String, Index
+from sqlalchemy import DateTime, func, String, Index, UniqueConstraint
 from enum import Enum
 
 
@@ -351,6 +351,27 @@ class UsageRecord(SQLModel, table=True):
     )
 
 
+class UsageDailyRollup(SQLModel, table=True):
+    """
+    Usage records pre-aggregated per user, day and endpoint.
+
+    Filled for closed days by the usage rollup job so that analytics over long
+    ranges read one row per day and endpoint instead of every request.
+    """
+    __tablename__ = "usage_daily_rollups"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id")
+    day: date = Field(index=True, description="UTC day of the usage")
+    endpoint: str
+    requests: int = Field(default=0)
+    tokens: int = Field(default=0)
+
+    __table_args__ = (
+        UniqueConstraint('user_id', 'day', 'endpoint', name='uq_usage_daily_rollups_user_day_endpoint'),
+    )
+
+
 class PaymentRecord(SQLModel, table=True):
     """
     Payment transaction history.
@@ -569,12 +590,22 @@ class DisputeRecord(SQLModel, table=True):
         Index('ix_dispute_records_evidence_due', 'evidence_due_by'),
     )
 
+class WebhookEventStatus(str, Enum):
+    """Processing state of a received webhook event."""
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    PROCESSED = "processed"
+    FAILED = "failed"  # Will be retried
+    DEAD_LETTER = "dead_letter"  # Retries exhausted; replay manually
+
+
 class WebhookEvent(SQLModel, table=True):
     """
-    Model for tracking webhook events to ensure idempotency.
-    
-    Prevents duplicate webhook processing by storing event IDs with atomic
-    INSERT ... ON CONFLICT operations.
+    Received webhook events: the idempotency record and the processing queue.
+
+    The unique event_id makes redelivered events no-ops. Events are acknowledged
+    as soon as they are stored and applied later by the WebhookQueue, in order
+    per customer; events whose retries are exhausted stay here as dead letters.
     """
     __tablename__ = "webhook_events"
     
@@ -584,17 +615,41 @@ class WebhookEvent(SQLModel, table=True):
     
     # Event metadata
     event_type: str = Field(max_length=100, description="Type of webhook event")
-    processed_at: datetime = Field(
+    customer_id: Optional[str] = Field(
+        default=None, max_length=255, description="Stripe customer ID; events of one customer are applied in order"
+    )
+    event_created: Optional[int] = Field(default=None, description="Stripe event creation time (Unix seconds)")
+
+    # Queue state
+    status: WebhookEventStatus = Field(default=WebhookEventStatus.QUEUED, description="Processing state")
+    attempts: int = Field(default=0, description="Processing attempts so far")
+    last_error: Optional[str] = Field(default=None, description="Error of the last failed attempt")
+    received_at: datetime = Field(
         default_factory=lambda: datetime.now(timezone.utc),
         sa_column=Column(DateTime(timezone=True), server_default=func.now()),
+        description="When the event was received"
+    )
+    next_attempt_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+        description="Earliest time of the next retry"
+    )
+    locked_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+        description="When the current processing attempt started"
+    )
+    processed_at: Optional[datetime] = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
         description="When the event was processed"
     )
     
-    # Optional payload storage for debugging
+    # Full payload, needed to process and replay the event
     payload: Optional[Dict[str, Any]] = Field(
         default=None,
         sa_column=Column(JSON),
-        description="Raw event payload for debugging"
+        description="Raw event payload"
     )
     
     class Config:
@@ -603,4 +658,52 @@ class WebhookEvent(SQLModel, table=True):
     __table_args__ = (
         Index('ix_webhook_events_event_type', 'event_type'),
         Index('ix_webhook_events_processed_at', 'processed_at'),
+        Index('ix_webhook_events_status_customer', 'status', 'customer_id'),
+    )
+
+
+class AuditEvent(SQLModel, table=True):
+    """
+    Append-only audit log of administrative and billing actions.
+
+    One row per action: who did it (actor), what it was done to (subject),
+    which account it affects (user_id) and action-specific details. Rows are
+    written in batches by the AuditLog service and never updated or deleted.
+    """
+    __tablename__ = "audit_events"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    occurred_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        description="When the action happened"
+    )
+    action: str = Field(max_length=100, description="Dotted action name, e.g. 'subscription.override'")
+
+    # Who performed the action
+    actor_type: str = Field(default="system", max_length=32, description="admin, user, system or stripe")
+    actor_id: Optional[str] = Field(default=None, max_length=255, description="User ID of the actor, if any")
+
+    # What the action was performed on
+    subject_type: Optional[str] = Field(default=None, max_length=64, description="e.g. subscription, refund, backup")
+    subject_id: Optional[str] = Field(default=None, max_length=255, description="Identifier of the subject")
+    user_id: Optional[int] = Field(default=None, description="Account affected by the action")
+
+    request_id: Optional[str] = Field(default=None, max_length=64, description="Request that triggered the action")
+    details: Optional[Dict[str, Any]] = Field(
+        default=None,
+        sa_column=Column(JSON),
+        description="Action-specific details (old and new values, amounts, notes)"
+    )
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    # Listings are newest first (id descending), filtered by one of these
+    __table_args__ = (
+        Index('ix_audit_events_occurred_at', 'occurred_at'),
+        Index('ix_audit_events_action_id', 'action', 'id'),
+        Index('ix_audit_events_actor_id', 'actor_id', 'id'),
+        Index('ix_audit_events_subject_id', 'subject_type', 'subject_id', 'id'),
+        Index('ix_audit_events_user_id', 'user_id', 'id'),
     )
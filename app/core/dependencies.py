@@ -24,6 +24,27 @@ def get_cache_service(request: Request):
     )  # Can be None (graceful degradation)
 
 
+def get_semantic_cache(request: Request):
+    """Get SemanticAnswerCache instance from app.state."""
+    return getattr(
+        request.app.state, "semantic_cache", None
+    )  # Can be None (semantic cache disabled)
+
+
+def get_document_parser(request: Request):
+    """Get DocumentParser instance from app.state."""
+    return getattr(
+        request.app.state, "document_parser", None
+    )  # Can be None (uploads parse in a thread)
+
+
+def get_health_monitor(request: Request):
+    """Get HealthMonitor instance from app.state."""
+    return getattr(
+        request.app.state, "health_monitor", None
+    )  # Can be None (health endpoints probe live)
+
+
 def get_auth_service(request: Request):
     """Get AuthService instance from app.state."""
     return getattr(
@@ -131,6 +152,20 @@ def get_billing_service(request: Request):
     return getattr(request.app.state, "billing_service", None)
 
 
+def get_webhook_queue(request: Request):
+    """Get WebhookQueue instance from app.state."""
+    return getattr(
+        request.app.state, "webhook_queue", None
+    )  # Can be None (payments disabled; webhooks processed inline)
+
+
+def get_audit_log(request: Request):
+    """Get AuditLog instance from app.state."""
+    return getattr(
+        request.app.state, "audit_log", None
+    )  # Can be None (audit log failed to start)
+
+
 async def get_current_user_subscription(
     request: Request,
     subscription_manager = Depends(get_subscription_manager)
@@ -182,6 +217,9 @@ def require_documents_enabled() -> None:
 LLMManagerDep = Annotated[object, Depends(get_llm_manager)]
 QdrantManagerDep = Annotated[object, Depends(get_qdrant_manager)]
 CacheServiceDep = Annotated[object, Depends(get_cache_service)]
+SemanticCacheDep = Annotated[object, Depends(get_semantic_cache)]
+DocumentParserDep = Annotated[object, Depends(get_document_parser)]
+HealthMonitorDep = Annotated[object, Depends(get_health_monitor)]
 AuthServiceDep = Annotated[object, Depends(get_auth_service)]
 ChatHistoryServiceDep = Annotated[object, Depends(get_chat_history_service)]
 ChatQdrantServiceDep = Annotated[object, Depends(get_chat_qdrant_service)]
@@ -192,6 +230,8 @@ PromptRendererDep = Annotated[object, Depends(get_prompt_renderer)]
 PaymentServiceDep = Annotated[object, Depends(get_payment_service)]
 SubscriptionManagerDep = Annotated[object, Depends(get_subscription_manager)]
 BillingServiceDep = Annotated[object, Depends(get_billing_service)]
+WebhookQueueDep = Annotated[object, Depends(get_webhook_queue)]
+AuditLogDep = Annotated[object, Depends(get_audit_log)]
 
 
 def reset_dependency_cache() -> None:
@@ -289,3 +289,24 @@ def create_conflict_error(
         ],
         request_id=request_id,
     )
+
+
+def create_rate_limit_error(
+    limit: str,
+    retry_after: int,
+    request_id: Optional[str] = None,
+) -> ErrorResponse:
+    """Create a rate limit exceeded error response."""
+    message = f"Rate limit exceeded: {limit}. Retry after {retry_after} seconds."
+    return create_error_response(
+        error_code="rate_limit_exceeded",
+        message=message,
+        details=[
+            ErrorDetail(
+                type="rate_limit_exceeded",
+                message=message,
+                context={"limit": limit, "retry_after": retry_after},
+            )
+        ],
+        request_id=request_id,
+    )
@@ -101,6 +101,37 @@ class CacheOperationError(OntologicError):
         super().__init__(message, details)
 
 
+# Document parsing exceptions (used by the document parser)
+class DocumentParseError(OntologicError):
+    """Raised when an uploaded document cannot be parsed."""
+    pass
+
+
+class DocumentTooLargeError(DocumentParseError):
+    """Raised when a document has more pages than the parser accepts."""
+
+    def __init__(self, page_count: int, max_pages: int):
+        self.page_count = page_count
+        self.max_pages = max_pages
+        super().__init__(
+            f"Document has {page_count} pages (max {max_pages})",
+            {"page_count": page_count, "max_pages": max_pages},
+        )
+
+
+class DocumentParseTimeoutError(DocumentParseError):
+    """Raised when parsing a range of pages exceeds its time budget."""
+
+    def __init__(self, first_page: int, last_page: int, timeout_seconds: float):
+        self.first_page = first_page
+        self.last_page = last_page
+        self.timeout_seconds = timeout_seconds
+        super().__init__(
+            f"Parsing pages {first_page}-{last_page} timed out after {timeout_seconds:.0f}s",
+            {"first_page": first_page, "last_page": last_page, "timeout_seconds": timeout_seconds},
+        )
+
+
 # Service dependency exceptions (used during service initialization)
 class DependencyUnavailableError(OntologicError):
     """Raised when a required service dependency is not available."""
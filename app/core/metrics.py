@@ -53,6 +53,23 @@ llm_splade_duration_seconds = Histogram(
     buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0)
 )
 
+llm_prompt_prefix_total = Counter(
+    'llm_prompt_prefix_total',
+    'LLM requests whose static prompt prefix was or was not sent recently',
+    ['prompt_kind', 'result']  # prompt_kind: neutral, immersive, adaptive, ...; result: hit, miss
+)
+
+llm_prompt_prefix_hit_rate = Gauge(
+    'llm_prompt_prefix_hit_rate',
+    'Percentage of LLM requests reusing a recently sent static prompt prefix'
+)
+
+prompt_render_cache_total = Counter(
+    'prompt_render_cache_total',
+    'Memoized prompt render lookups',
+    ['result']  # result: hit, miss
+)
+
 
 # ========== Cache Metrics ==========
 
@@ -162,6 +179,66 @@ cache_warming_operations_total = Counter(
 )
 
 
+# ========== Dependency Health Metrics ==========
+
+HEALTH_STATUSES = ('healthy', 'degraded', 'unhealthy', 'disabled', 'error')
+
+dependency_health_status = Gauge(
+    'dependency_health_status',
+    'Current health status of a dependency (1 for the current status, 0 otherwise)',
+    ['dependency', 'status']  # dependency: database, qdrant, redis, llm, chat_history
+)
+
+dependency_health_transitions_total = Counter(
+    'dependency_health_transitions_total',
+    'Total number of dependency health status changes',
+    ['dependency', 'from_status', 'to_status']
+)
+
+dependency_health_probe_duration_seconds = Histogram(
+    'dependency_health_probe_duration_seconds',
+    'Duration of background dependency health probes in seconds',
+    ['dependency'],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0)
+)
+
+
+# ========== Webhook Metrics ==========
+
+webhook_events_total = Counter(
+    'webhook_events_total',
+    'Total number of webhook events by outcome',
+    ['event_type', 'outcome']  # outcome: queued, duplicate, processed, retry, dead_letter, replayed
+)
+
+webhook_processing_lag_seconds = Histogram(
+    'webhook_processing_lag_seconds',
+    'Time from receiving a webhook event to applying it, in seconds',
+    ['event_type'],
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+)
+
+webhook_queue_depth = Gauge(
+    'webhook_queue_depth',
+    'Webhook events waiting to be applied, by status',
+    ['status']  # status: queued, failed, dead_letter
+)
+
+
+# ========== Audit Log Metrics ==========
+
+audit_events_total = Counter(
+    'audit_events_total',
+    'Total number of audit events by outcome',
+    ['outcome']  # outcome: written, dropped, failed
+)
+
+audit_log_pending = Gauge(
+    'audit_log_pending',
+    'Audit events recorded but not yet written to the database'
+)
+
+
 # ========== System Info ==========
 
 ontologic_info = Info(
@@ -354,6 +431,66 @@ def update_cache_hit_rate(cache_type: str, hit_rate: float):
     cache_hit_rate.labels(cache_type=cache_type).set(hit_rate)
 
 
+def record_prompt_prefix(prompt_kind: str, hit: bool, hit_rate: float):
+    """
+    Record whether an LLM request reused a recently sent static prompt prefix.
+
+    Args:
+        prompt_kind: System prompt variant (neutral, immersive, adaptive, ...)
+        hit: True if the same prefix was sent recently
+        hit_rate: Running prefix hit rate as a percentage (0-100)
+    """
+    llm_prompt_prefix_total.labels(prompt_kind=prompt_kind, result='hit' if hit else 'miss').inc()
+    llm_prompt_prefix_hit_rate.set(hit_rate)
+
+
+def record_health_probe(dependency: str, status: str, previous_status: Optional[str], duration_seconds: float):
+    """
+    Record a background health probe and any change in dependency status.
+
+    Args:
+        dependency: Dependency name (database, qdrant, redis, llm, ...)
+        status: Status reported by this probe
+        previous_status: Status reported by the previous probe, None for the first
+        duration_seconds: Time the probe took
+    """
+    dependency_health_probe_duration_seconds.labels(dependency=dependency).observe(duration_seconds)
+    if status == previous_status:
+        return
+    for known_status in set(HEALTH_STATUSES) | {status}:
+        dependency_health_status.labels(dependency=dependency, status=known_status).set(
+            1 if known_status == status else 0
+        )
+    dependency_health_transitions_total.labels(
+        dependency=dependency, from_status=previous_status or 'unknown', to_status=status
+    ).inc()
+
+
+def record_webhook_event(event_type: str, outcome: str, lag_seconds: Optional[float] = None):
+    """
+    Record what happened to a webhook event.
+
+    Args:
+        event_type: Stripe event type
+        outcome: queued, duplicate, processed, retry, dead_letter or replayed
+        lag_seconds: For processed events, time since the event was received
+    """
+    webhook_events_total.labels(event_type=event_type, outcome=outcome).inc()
+    if lag_seconds is not None:
+        webhook_processing_lag_seconds.labels(event_type=event_type).observe(lag_seconds)
+
+
+def record_audit_events(outcome: str, count: int = 1):
+    """
+    Record audit events leaving the audit log buffer.
+
+    Args:
+        outcome: written, dropped (buffer full) or failed (write error, will be retried)
+        count: Number of events
+    """
+    audit_events_total.labels(outcome=outcome).inc(count)
+
+
 def track_cache_warming(warming_type: str = 'overall', items_count: int = 1, items_count_fn: Optional[Callable[[Any], int]] = None):
     """
     Decorator to track cache warming metrics.
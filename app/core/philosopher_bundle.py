@@ -0,0 +1,187 @@
+"""
+Versioned, memory-mapped bundle of philosopher prompt assets.
+
+The bundle is compiled from the prompt templates by
+``scripts/build_philosopher_bundle.py`` (see
+``app.core.philosopher_loader.build_philosopher_bundle``) and holds, in one
+file, everything workers otherwise render from templates at import time:
+philosopher metadata, rendered priming passages and pre-rendered static
+prompt fragments.
+
+Layout:
+
+    MAGIC (8 bytes) | header length (8 bytes, little-endian) | header (JSON) | texts (UTF-8)
+
+The header carries the format version, a content hash, the template version
+the bundle was built from, the philosopher metadata and the offset and
+length of every text. Opening a bundle parses only the header; texts are
+sliced out of the memory map when used, so workers share the file through
+the page cache.
+
+The content hash covers the metadata and every text (not the build time), so
+two builds of the same templates have the same hash and it can be used in
+cache keys.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+BUNDLE_MAGIC = b"ONTOPHB\x00"
+BUNDLE_FORMAT_VERSION = 1
+_LENGTH = struct.Struct("<Q")
+
+
+class BundleFormatError(ValueError):
+    """The file is not a philosopher bundle this version can read."""
+
+
+def _content_hash(philosophers: Dict[str, Any], texts: Dict[str, str]) -> str:
+    digest = hashlib.sha256()
+    digest.update(json.dumps(philosophers, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    for key in sorted(texts):
+        digest.update(key.encode("utf-8") + b"\x00")
+        digest.update(texts[key].encode("utf-8") + b"\x00")
+    return digest.hexdigest()
+
+
+def passage_key(philosopher: str, passage: str) -> str:
+    return f"passage/{philosopher}/{passage}"
+
+
+def fragment_key(template_path: str, philosopher: Optional[str] = None) -> str:
+    return f"fragment/{template_path}/{philosopher or ''}"
+
+
+def write_bundle(
+    path: Union[str, Path],
+    philosophers: Dict[str, Any],
+    texts: Dict[str, str],
+    template_version: str,
+) -> str:
+    """
+    Write a bundle atomically (temporary file, then rename).
+
+    Workers that have the previous bundle mapped keep reading it until they
+    swap, since the rename leaves the old file intact for them.
+
+    Args:
+        philosophers: Philosopher metadata, keyed by display name
+        texts: Rendered texts keyed by passage_key() / fragment_key()
+        template_version: PromptRenderer.version of the templates the texts were rendered from
+
+    Returns:
+        The content hash
+    """
+    path = Path(path)
+    content_hash = _content_hash(philosophers, texts)
+
+    blob = bytearray()
+    offsets: Dict[str, Tuple[int, int]] = {}
+    for key in sorted(texts):
+        encoded = texts[key].encode("utf-8")
+        offsets[key] = (len(blob), len(encoded))
+        blob += encoded
+
+    header = json.dumps({
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "content_hash": content_hash,
+        "template_version": template_version,
+        "built_at": datetime.now(timezone.utc).isoformat(),
+        "philosophers": philosophers,
+        "texts": offsets,
+    }, ensure_ascii=False).encode("utf-8")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(BUNDLE_MAGIC + _LENGTH.pack(len(header)) + header)
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return content_hash
+
+
+class PhilosopherBundle:
+    """
+    A bundle opened read-only through a memory map.
+
+    Use PhilosopherBundle.open(); texts are decoded from the map on access.
+    """
+
+    def __init__(self, path: Path, mapped: mmap.mmap, header: Dict[str, Any], data_offset: int,
+                 file_id: Tuple[int, int, int]):
+        self.path = path
+        self._map = mapped
+        self._data_offset = data_offset
+        self._texts: Dict[str, Tuple[int, int]] = {key: tuple(span) for key, span in header["texts"].items()}
+        self.format_version: int = header["format_version"]
+        self.content_hash: str = header["content_hash"]
+        self.template_version: str = header["template_version"]
+        self.built_at: str = header["built_at"]
+        self.philosophers: Dict[str, Any] = header["philosophers"]
+        # (inode, size, mtime) of the file when opened, to notice a newly deployed bundle
+        self.file_id = file_id
+
+    @classmethod
+    def open(cls, path: Union[str, Path]) -> "PhilosopherBundle":
+        """
+        Map a bundle and parse its header.
+
+        Raises:
+            OSError: If the file cannot be read
+            BundleFormatError: If it is not a bundle of this format version
+        """
+        path = Path(path)
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if stat.st_size < len(BUNDLE_MAGIC) + _LENGTH.size:
+                raise BundleFormatError(f"{path} is too small to be a philosopher bundle")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if mapped[:len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+                raise BundleFormatError(f"{path} is not a philosopher bundle")
+            header_start = len(BUNDLE_MAGIC) + _LENGTH.size
+            (header_length,) = _LENGTH.unpack(mapped[len(BUNDLE_MAGIC):header_start])
+            try:
+                header = json.loads(mapped[header_start:header_start + header_length].decode("utf-8"))
+            except ValueError as e:
+                raise BundleFormatError(f"{path} has a corrupt header: {e}") from e
+            if header.get("format_version") != BUNDLE_FORMAT_VERSION:
+                raise BundleFormatError(
+                    f"{path} has format version {header.get('format_version')}, expected {BUNDLE_FORMAT_VERSION}"
+                )
+            data_offset = header_start + header_length
+            if any(data_offset + start + length > len(mapped) for start, length in header["texts"].values()):
+                raise BundleFormatError(f"{path} is truncated")
+        except Exception:
+            mapped.close()
+            raise
+        return cls(path, mapped, header, data_offset, (stat.st_ino, stat.st_size, stat.st_mtime_ns))
+
+    def text(self, key: str) -> Optional[str]:
+        span = self._texts.get(key)
+        if span is None:
+            return None
+        start = self._data_offset + span[0]
+        return self._map[start:start + span[1]].decode("utf-8")
+
+    def passage(self, philosopher: str, passage: str) -> Optional[str]:
+        """A rendered priming passage, or None if the bundle has none by that key."""
+        return self.text(passage_key(philosopher, passage))
+
+    def fragment(self, template_path: str, philosopher: Optional[str] = None) -> Optional[str]:
+        """A pre-rendered prompt fragment, or None if the bundle does not have it."""
+        return self.text(fragment_key(template_path, philosopher))
+
+    def __len__(self) -> int:
+        return len(self._texts)
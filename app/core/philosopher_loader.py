@@ -4,11 +4,20 @@ Dynamic philosopher data loader using Jinja2 templates.
 This module replaces the hardcoded PHILOSOPHER_INFO dictionary with a 
 template-based system that loads philosopher data from structured 
 Jinja2 template files.
+
+When a pre-built asset bundle exists at ``settings.philosopher_bundle_path``
+(built with ``scripts/build_philosopher_bundle.py``), philosopher data,
+priming passages and static prompt fragments come from the bundle instead
+of rendering templates. refresh_philosopher_bundle() swaps in a newly
+deployed bundle.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from pathlib import Path
 import functools
+from app.core.philosopher_bundle import (
+    BundleFormatError, PhilosopherBundle, fragment_key, passage_key, write_bundle
+)
 from app.services.prompt_renderer import PromptRenderer
 from app.core.logger import log
 
@@ -129,6 +138,9 @@ class PhilosopherLoader:
     
     def get_priming_passage(self, philosopher: str, passage_key: str) -> Optional[str]:
         """Get a specific priming passage for a philosopher."""
+        if _bundle is not None:
+            return _bundle.passage(philosopher, passage_key)
+
         philosopher_data = self.load_philosopher(philosopher)
         if not philosopher_data:
             return None
@@ -146,21 +158,179 @@ class PhilosopherLoader:
             return None
 
 
+def immersive_system_context(name: str, info: Dict[str, Any]) -> Dict[str, Any]:
+    """Context of chat/immersive_system.j2 for a philosopher."""
+    return {
+        "name": name,
+        "axioms": info.get("axioms", []),
+        "personality": info.get("personality", []),
+        "rhetorical_tactics": info.get("rhetorical_tactics", []),
+        "response_protocol": info.get("response_protocol", []),
+        "cognitive_tone": info.get("cognitive_tone", []),
+    }
+
+
+def writer_system_context(name: str, info: Dict[str, Any]) -> Dict[str, Any]:
+    """Context of workflows/writer/immersive_system.j2 for a philosopher."""
+    return {
+        "philosopher_name": name,
+        "axioms": info.get("axioms", []),
+        "personality": info.get("personality", []),
+        "rhetorical_tactics": info.get("rhetorical_tactics", []),
+        "cognitive_tone": info.get("cognitive_tone", []),
+    }
+
+
+# Static prompt fragments pre-rendered into the bundle, per philosopher and shared
+PHILOSOPHER_FRAGMENTS: Dict[str, Callable[[str, Dict[str, Any]], Dict[str, Any]]] = {
+    "chat/immersive_system.j2": immersive_system_context,
+    "workflows/writer/immersive_system.j2": writer_system_context,
+}
+SHARED_FRAGMENTS = ("chat/neutral_system.j2",)
+
+
+def build_philosopher_bundle(output_path, loader: Optional[PhilosopherLoader] = None) -> str:
+    """
+    Compile philosopher data, priming passages and static prompt fragments into a bundle.
+
+    Always renders from the templates, never from an active bundle.
+
+    Returns:
+        The bundle's content hash
+    """
+    loader = loader or PhilosopherLoader()
+    renderer = loader.prompt_renderer
+    philosophers = {}
+    texts = {}
+    for name in loader.available_philosophers:
+        info = loader.load_philosopher(name)
+        if not info:
+            continue
+        philosophers[name] = info
+        for key, template_path in info.get("prompt_priming_passages", {}).items():
+            texts[passage_key(name, key)] = renderer.render(template_path)
+        for template_path, context in PHILOSOPHER_FRAGMENTS.items():
+            texts[fragment_key(template_path, name)] = renderer.render(template_path, context(name, info))
+    for template_path in SHARED_FRAGMENTS:
+        texts[fragment_key(template_path)] = renderer.render(template_path)
+    return write_bundle(output_path, philosophers, texts, renderer.version)
+
+
 # Create singleton instance
 _philosopher_loader = PhilosopherLoader()
 
+# Bundle in use, if any; replaced as a whole by refresh_philosopher_bundle()
+_bundle: Optional[PhilosopherBundle] = None
+
+
+def _bundle_path() -> Optional[Path]:
+    from app.config.settings import get_settings
+    path = get_settings().philosopher_bundle_path
+    return Path(path) if path else None
+
+
+def _open_bundle(path: Path) -> Optional[PhilosopherBundle]:
+    """Open a bundle, or None if it is missing, unreadable or built from other templates."""
+    try:
+        bundle = PhilosopherBundle.open(path)
+    except FileNotFoundError:
+        log.debug(f"No philosopher bundle at {path}; rendering from templates")
+        return None
+    except (OSError, BundleFormatError) as e:
+        log.warning(f"Ignoring philosopher bundle {path}: {e}")
+        return None
+    if bundle.template_version != _philosopher_loader.prompt_renderer.version:
+        log.warning(
+            f"Ignoring philosopher bundle {path}: built from other templates "
+            f"({bundle.template_version}, current {_philosopher_loader.prompt_renderer.version}); rebuild it"
+        )
+        return None
+    return bundle
+
+
+def get_active_bundle() -> Optional[PhilosopherBundle]:
+    """The philosopher bundle in use, or None when data comes from the templates."""
+    return _bundle
+
+
+def get_prompt_fragment(template_path: str, philosopher: Optional[str] = None) -> Optional[str]:
+    """
+    A static prompt pre-rendered into the active bundle.
+
+    Returns None without a bundle; callers then render the template
+    themselves, with the same context (see PHILOSOPHER_FRAGMENTS).
+    """
+    bundle = _bundle
+    return bundle.fragment(template_path, philosopher) if bundle is not None else None
+
+
 # Create a cached function to get philosopher info
 @functools.lru_cache(maxsize=10)
 def get_philosopher_info() -> Dict[str, Any]:
     """Get all philosopher information (cached)."""
+    if _bundle is not None:
+        return dict(_bundle.philosophers)
     return _philosopher_loader.get_all_philosophers()
 
+
+def _publish_philosopher_info() -> None:
+    """Refresh PHILOSOPHER_INFO in place, so modules that imported it see the new data."""
+    get_philosopher_info.cache_clear()
+    info = get_philosopher_info()
+    # Each philosopher's entry is replaced in one step: readers see old or new data, never a mix
+    for name in PHILOSOPHER_INFO.keys() - info.keys():
+        PHILOSOPHER_INFO.pop(name, None)
+    PHILOSOPHER_INFO.update(info)
+
+
+def refresh_philosopher_bundle() -> bool:
+    """
+    Swap in the bundle at philosopher_bundle_path if a new one was deployed.
+
+    Cheap when nothing changed (one stat call). An invalid new bundle is
+    ignored and the current one stays in use.
+
+    Returns:
+        True if the bundle in use changed
+    """
+    global _bundle
+    path = _bundle_path()
+    if path is None:
+        return False
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return False
+    current = _bundle
+    if current is not None and current.file_id == (stat.st_ino, stat.st_size, stat.st_mtime_ns):
+        return False
+
+    bundle = _open_bundle(path)
+    if bundle is None:
+        return False
+    _bundle = bundle
+    if current is not None and bundle.content_hash == current.content_hash:
+        return False  # Redeployed unchanged
+    _publish_philosopher_info()
+    log.info(
+        f"Loaded philosopher bundle {path} ({bundle.content_hash[:12]}, {len(bundle.philosophers)} philosophers)",
+        extra={"event_type": "philosopher_bundle_loaded", "content_hash": bundle.content_hash}
+    )
+    return True
+
+
 # Backward compatibility - maintain PHILOSOPHER_INFO interface
-PHILOSOPHER_INFO = get_philosopher_info()
+PHILOSOPHER_INFO: Dict[str, Any] = {}
+
+# From the bundle if one is deployed, else from the templates
+if not refresh_philosopher_bundle():
+    _publish_philosopher_info()
 
 def reload_philosopher_info():
-    """Reload philosopher information (clears cache)."""
-    global PHILOSOPHER_INFO
+    """Reload philosopher information (clears cache) from the bundle when configured, else the templates."""
+    global _bundle
     _philosopher_loader._cache.clear()
-    get_philosopher_info.cache_clear()
-    PHILOSOPHER_INFO = get_philosopher_info()
\ No newline at end of file
+    _philosopher_loader.prompt_renderer.clear_cache()
+    path = _bundle_path()
+    _bundle = _open_bundle(path) if path is not None else None
+    _publish_philosopher_info()
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""
+Resolved principal caching for authenticated requests.
+
+A principal bundles what access checks need to know about a caller: the user
+id, subscription tier and status, and the entitlements (features) granted by
+that tier. It is resolved at most once per request (memoised on
+``request.state``) and kept in a short-TTL in-process cache across requests,
+so warm authenticated requests make no database round-trips for auth or tier
+checks. Subscription changes (Stripe webhooks, admin overrides, refunds and
+disputes) invalidate the affected user explicitly; the TTL bounds staleness
+for changes made by other worker processes.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Generic, Hashable, Optional, Tuple, TypeVar
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.constants import PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_TTL_SECONDS
+from app.core.db_models import SubscriptionStatus, SubscriptionTier
+from app.core.logger import log
+from app.core.user_models import User
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class ResolvedPrincipal:
+    """Immutable access-control view of an authenticated user."""
+
+    user_id: int
+    tier: SubscriptionTier = SubscriptionTier.FREE
+    status: Optional[SubscriptionStatus] = None
+    entitlements: FrozenSet[str] = field(default_factory=frozenset)
+    stripe_subscription_id: Optional[str] = None
+
+    def has_entitlement(self, feature: str) -> bool:
+        """Check whether the principal's tier grants ``feature``."""
+        return feature in self.entitlements
+
+
+class PrincipalCache(Generic[T]):
+    """
+    Bounded in-process TTL cache keyed by user id.
+
+    Entries expire ``ttl_seconds`` after they are stored; the least recently
+    stored entry is evicted once ``max_entries`` is reached. All operations
+    are synchronous and O(1), so they are safe to call from the event loop.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS,
+        max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, T]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[T]:
+        """Return the cached value for ``key`` or None when missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: T) -> None:
+        """Store ``value`` for ``key`` for the cache TTL."""
+        if self.ttl_seconds <= 0:
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop ``key`` from the cache; returns True if an entry was removed."""
+        return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for monitoring."""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+class UserCache:
+    """
+    Cross-request cache of authenticated ``User`` rows.
+
+    Column values are stored rather than ORM instances so concurrent requests
+    never share a session-bound object: every hit returns a fresh detached
+    ``User`` that can be merged into a request's session like a loaded row.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = PRINCIPAL_CACHE_TTL_SECONDS,
+        max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES,
+    ):
+        self._snapshots: PrincipalCache[Dict[str, Any]] = PrincipalCache(ttl_seconds, max_entries)
+        self._columns = tuple(attr.key for attr in sa_inspect(User).mapper.column_attrs)
+
+    def get(self, user_id: Any) -> Optional[User]:
+        """Return a detached copy of the cached user, or None."""
+        snapshot = self._snapshots.get(user_id)
+        if snapshot is None:
+            return None
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, user: User) -> None:
+        """Cache the column values of a loaded user."""
+        if user is None or user.id is None:
+            return
+        self._snapshots.set(user.id, {column: getattr(user, column) for column in self._columns})
+
+    def invalidate(self, user_id: Any) -> bool:
+        """Drop the cached user."""
+        return self._snapshots.invalidate(user_id)
+
+    def clear(self) -> None:
+        """Drop all cached users."""
+        self._snapshots.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for monitoring."""
+        return self._snapshots.get_stats()
+
+
+# Process-wide user cache consulted by UserManager.get during JWT validation
+user_cache = UserCache()
+
+
+async def resolve_principal(request: Any, user_id: int, subscription_manager: Any) -> ResolvedPrincipal:
+    """
+    Resolve the principal for ``user_id`` once per request.
+
+    The result is memoised on ``request.state.principal`` so the subscription
+    middleware, endpoint access checks and usage tracking share a single
+    resolution. Across requests ``subscription_manager.get_principal`` serves
+    it from its short-TTL cache.
+
+    Args:
+        request: Current request (anything exposing ``state``), or None
+        user_id: Authenticated user id
+        subscription_manager: SubscriptionManager used on a cache miss
+
+    Returns:
+        ResolvedPrincipal for the user
+    """
+    state = getattr(request, "state", None)
+    principal = getattr(state, "principal", None) if state is not None else None
+    if isinstance(principal, ResolvedPrincipal) and principal.user_id == user_id:
+        return principal
+
+    principal = await subscription_manager.get_principal(user_id)
+    if state is not None:
+        state.principal = principal
+        state.subscription_tier = principal.tier
+    log.debug("Resolved principal for user %s (tier=%s)", user_id, principal.tier)
+    return principal
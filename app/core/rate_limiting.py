@@ -1,185 +1,440 @@
-"""Rate limiting configuration for the application."""
-import os
-from typing import Optional, Dict, Any
-from fastapi import Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+"""
+Rate limiting for the application.
 
+A single engine enforces every per-endpoint limit: a GCRA (generic cell rate
+algorithm) limiter that runs atomically in Redis as a Lua script, so limits
+are shared across workers. When Redis is unavailable the same algorithm runs
+in-process until Redis recovers.
+
+Policies are data-driven: requests per window are configured per subscription
+tier and endpoint class (``default``, ``streaming``, ``heavy``, ``upload``) in
+the ``[rate_limit_policies]`` and ``[rate_limits]`` TOML sections. Endpoints
+opt in with ``@limiter.limit(...)`` and responses carry the standard
+``RateLimit-Limit``/``RateLimit-Remaining``/``RateLimit-Reset``/
+``RateLimit-Policy`` headers (plus ``Retry-After`` when throttled).
+"""
+
+import functools
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from fastapi import HTTPException, Request
+
+from app.config.settings import get_settings
+from app.core.constants import (
+    RATE_LIMIT_FALLBACK_MAX_KEYS,
+    RATE_LIMIT_KEY_PREFIX,
+    RATE_LIMIT_REDIS_RETRY_SECONDS,
+    RATE_LIMIT_WINDOW_SECONDS,
+)
 from app.core.db_models import SubscriptionTier
+from app.core.error_responses import create_rate_limit_error
+from app.core.logger import log
+
+ENDPOINT_CLASSES = ("default", "streaming", "heavy", "upload")
+
+# Fallback requests per window when a tier/class is missing from configuration
+DEFAULT_TIER_RATE_LIMITS: Dict[SubscriptionTier, Dict[str, int]] = {
+    SubscriptionTier.FREE: {"default": 10, "streaming": 5, "heavy": 2, "upload": 3},
+    SubscriptionTier.BASIC: {"default": 60, "streaming": 20, "heavy": 10, "upload": 15},
+    SubscriptionTier.PREMIUM: {"default": 300, "streaming": 100, "heavy": 50, "upload": 75},
+    SubscriptionTier.ACADEMIC: {"default": 180, "streaming": 60, "heavy": 30, "upload": 45},
+}
+
+_WINDOW_UNITS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE_SPEC = re.compile(r"^\s*(\d+)\s*(?:/|per)\s*(\d+)?\s*(second|minute|hour|day)s?\s*$")
+
+# GCRA: the bucket stores the theoretical arrival time (TAT) in milliseconds.
+# A request is admitted when TAT + emission_interval - burst <= now.
+# Returns {allowed, remaining, reset_ms, retry_after_ms}.
+GCRA_LUA = """
+local now = tonumber(ARGV[1])
+local emission = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local burst = emission * limit
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+end
+local new_tat = tat + emission
+local allow_at = new_tat - burst
+if allow_at > now then
+    return {0, 0, tat - now, allow_at - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, math.floor((burst - (new_tat - now)) / emission), new_tat - now, 0}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Allow ``limit`` requests per ``window_seconds``."""
+
+    limit: int
+    window_seconds: int = RATE_LIMIT_WINDOW_SECONDS
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimitPolicy":
+        """
+        Parse a limit such as ``"10/minute"``, ``"100 per hour"`` or ``"5/30 seconds"``.
+
+        Raises:
+            ValueError: If the specification is malformed
+        """
+        match = _RATE_SPEC.match(spec.lower())
+        if not match:
+            raise ValueError(f"Invalid rate limit specification: {spec!r}")
+        limit, multiplier, unit = match.groups()
+        return cls(int(limit), int(multiplier or 1) * _WINDOW_UNITS[unit])
+
+    @property
+    def emission_interval_ms(self) -> int:
+        """Milliseconds between admitted requests at the sustained rate."""
+        return max(1, (self.window_seconds * 1000) // self.limit)
+
+    @property
+    def header_value(self) -> str:
+        """``RateLimit-Policy`` header value, e.g. ``10;w=60``."""
+        return f"{self.limit};w={self.window_seconds}"
+
+    def __str__(self) -> str:
+        for unit, seconds in _WINDOW_UNITS.items():
+            if self.window_seconds == seconds:
+                return f"{self.limit}/{unit}"
+        return f"{self.limit}/{self.window_seconds} seconds"
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of a single rate-limit check."""
+
+    allowed: bool
+    policy: RateLimitPolicy
+    remaining: int
+    reset_ms: int
+    retry_after_ms: int = 0
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Standard ``RateLimit-*`` response headers for this result."""
+        headers = {
+            "RateLimit-Limit": str(self.policy.limit),
+            "RateLimit-Remaining": str(max(0, self.remaining)),
+            "RateLimit-Reset": str(_ceil_seconds(self.reset_ms)),
+            "RateLimit-Policy": self.policy.header_value,
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, _ceil_seconds(self.retry_after_ms)))
+        return headers
+
+
+class RateLimitExceededError(HTTPException):
+    """HTTP 429 raised when a request exceeds its rate-limit policy."""
+
+    def __init__(self, result: RateLimitResult, request_id: Optional[str] = None):
+        error = create_rate_limit_error(
+            limit=str(result.policy),
+            retry_after=int(result.headers["Retry-After"]),
+            request_id=request_id,
+        )
+        super().__init__(status_code=429, detail=error.model_dump(), headers=result.headers)
+        self.result = result
+
+
+def _ceil_seconds(milliseconds: int) -> int:
+    return -(-int(milliseconds) // 1000)
+
+
+def _gcra(tat: Optional[int], now_ms: int, policy: RateLimitPolicy) -> Tuple[RateLimitResult, Optional[int]]:
+    """In-process GCRA step mirroring ``GCRA_LUA``; returns the result and new TAT."""
+    emission = policy.emission_interval_ms
+    burst = emission * policy.limit
+    tat = now_ms if tat is None or tat < now_ms else tat
+    new_tat = tat + emission
+    allow_at = new_tat - burst
+    if allow_at > now_ms:
+        return RateLimitResult(False, policy, 0, tat - now_ms, allow_at - now_ms), None
+    remaining = (burst - (new_tat - now_ms)) // emission
+    return RateLimitResult(True, policy, remaining, new_tat - now_ms), new_tat
+
+
+class InMemoryRateLimitBackend:
+    """
+    Per-process GCRA buckets used when Redis is unavailable.
+
+    Limits are enforced per worker rather than globally, which keeps
+    protection in place (at a looser effective limit) during a Redis outage.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_FALLBACK_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: Dict[str, int] = {}
+
+    def hit(self, key: str, policy: RateLimitPolicy, now_ms: int) -> RateLimitResult:
+        result, new_tat = _gcra(self._buckets.get(key), now_ms, policy)
+        if new_tat is not None:
+            self._buckets[key] = new_tat
+            if len(self._buckets) > self.max_keys:
+                self._prune(now_ms)
+        return result
+
+    def _prune(self, now_ms: int) -> None:
+        """Drop fully replenished buckets, then the oldest if still over capacity."""
+        self._buckets = {key: tat for key, tat in self._buckets.items() if tat > now_ms}
+        while len(self._buckets) > self.max_keys:
+            self._buckets.pop(next(iter(self._buckets)))
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class RedisRateLimitBackend:
+    """GCRA buckets stored in Redis and updated atomically by a Lua script."""
+
+    def __init__(self, redis_client: Any):
+        self.redis_client = redis_client
+        self._script = redis_client.register_script(GCRA_LUA)
+
+    async def hit(self, key: str, policy: RateLimitPolicy, now_ms: int) -> RateLimitResult:
+        allowed, remaining, reset_ms, retry_after_ms = await self._script(
+            keys=[key],
+            args=[now_ms, policy.emission_interval_ms, policy.limit],
+        )
+        return RateLimitResult(bool(allowed), policy, int(remaining), int(reset_ms), int(retry_after_ms))
+
+
+def load_tier_policies(settings: Any = None) -> Dict[SubscriptionTier, Dict[str, RateLimitPolicy]]:
+    """
+    Build tier/endpoint-class policies from configuration.
+
+    ``rate_limit_policies`` supplies counts per tier and class; the default
+    class falls back to ``<tier>_requests_per_minute`` and anything still
+    missing to ``DEFAULT_TIER_RATE_LIMITS``.
+    """
+    settings = settings or get_settings()
+    configured = getattr(settings, "rate_limit_policies", None) or {}
+    window = getattr(settings, "rate_limit_window_seconds", RATE_LIMIT_WINDOW_SECONDS)
+
+    policies: Dict[SubscriptionTier, Dict[str, RateLimitPolicy]] = {}
+    for tier, defaults in DEFAULT_TIER_RATE_LIMITS.items():
+        counts = dict(defaults)
+        per_minute = getattr(settings, f"{tier.value}_requests_per_minute", None)
+        if isinstance(per_minute, int):
+            counts["default"] = per_minute
+        counts.update(configured.get(tier.value, {}))
+        policies[tier] = {
+            endpoint_class: RateLimitPolicy(int(count), window)
+            for endpoint_class, count in counts.items()
+            if int(count) > 0
+        }
+    return policies
 
 
 def get_user_subscription_tier(request: Request) -> SubscriptionTier:
     """
     Get user's subscription tier for dynamic rate limiting.
-    
-    This function integrates with the subscription middleware to determine
-    the user's subscription tier for dynamic rate limit calculation.
+
+    Uses the tier resolved by the subscription middleware or the request's
+    resolved principal, defaulting to the free tier.
     """
-    # Try to get subscription tier from request state (set by middleware)
     tier = getattr(request.state, "subscription_tier", None)
     if tier:
         return tier
-    
-    # Try to get from subscription manager if available
-    subscription_manager = getattr(request.app.state, "subscription_manager", None)
-    if subscription_manager:
-        # This would require async context, so we'll use a default for now
-        # In practice, the middleware should set this in request.state
-        pass
-    
-    # Default to free tier
+
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal.tier
+
     return SubscriptionTier.FREE
 
 
+def get_rate_limit_identity(request: Request) -> str:
+    """Identify the caller: authenticated user id when known, otherwise client IP."""
+    principal = getattr(request.state, "principal", None)
+    user_id = getattr(request.state, "user_id", None) or getattr(principal, "user_id", None)
+    if user_id and not str(user_id).startswith("anon_"):
+        return f"user:{user_id}"
+    client_host = request.client.host if request.client else "127.0.0.1"
+    return f"ip:{client_host}"
+
+
 def get_dynamic_rate_limit_key(request: Request) -> str:
     """
-    Generate rate limit key based on user subscription tier.
-    
-    This allows different rate limits for different subscription tiers
-    while maintaining backward compatibility with existing rate limiting.
+    Generate rate limit key based on caller and subscription tier.
+
+    Kept for callers that bucket by tier; the limiter itself buckets by
+    caller and endpoint class so a tier change keeps the caller's history.
     """
-    # Get base key (IP address)
-    base_key = get_remote_address(request)
-    
-    # Get subscription tier
+    client_host = request.client.host if request.client else "127.0.0.1"
     tier = get_user_subscription_tier(request)
-    
-    # Append tier to key for tier-specific rate limiting
-    return f"{base_key}:{tier.value}"
+    return f"{client_host}:{tier.value}"
+
+
+class TierRateLimiter:
+    """
+    Subscription-aware rate limiter with a Redis backend and in-process fallback.
+
+    Use ``@limiter.limit(rule)`` on endpoints that take a ``request: Request``
+    parameter. ``rule`` is an endpoint class (``"heavy"``), one of the
+    ``get_*_limit`` helpers, or a fixed limit such as ``"10/minute"`` that
+    applies regardless of tier.
+    """
+
+    def __init__(
+        self,
+        policies: Optional[Dict[SubscriptionTier, Dict[str, RateLimitPolicy]]] = None,
+        redis_client: Any = None,
+        enabled: bool = True,
+        key_prefix: str = RATE_LIMIT_KEY_PREFIX,
+    ):
+        self.policies = policies if policies is not None else load_tier_policies()
+        self.enabled = enabled
+        self.key_prefix = key_prefix
+        self.fallback = InMemoryRateLimitBackend()
+        self._redis: Optional[RedisRateLimitBackend] = None
+        self._redis_retry_at = 0.0
+        self.set_redis_client(redis_client)
+
+    @property
+    def backend_name(self) -> str:
+        """Backend that will serve the next check."""
+        if self._redis is not None and time.monotonic() >= self._redis_retry_at:
+            return "redis"
+        return "memory"
+
+    def set_redis_client(self, redis_client: Any) -> None:
+        """Use ``redis_client`` (redis.asyncio) for shared limits, or None for in-process only."""
+        self._redis = RedisRateLimitBackend(redis_client) if redis_client is not None else None
+        self._redis_retry_at = 0.0
+
+    def get_policy(self, tier: SubscriptionTier, endpoint_class: str = "default") -> RateLimitPolicy:
+        """Policy for a tier and endpoint class (falls back to the tier's default class)."""
+        tier_policies = self.policies.get(tier) or self.policies[SubscriptionTier.FREE]
+        return tier_policies.get(endpoint_class) or tier_policies["default"]
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        """Count one request against ``key`` and return the decision."""
+        now_ms = int(time.time() * 1000)
+        bucket = f"{self.key_prefix}:{key}"
+        if self._redis is not None and time.monotonic() >= self._redis_retry_at:
+            try:
+                return await self._redis.hit(bucket, policy, now_ms)
+            except Exception as e:
+                self._redis_retry_at = time.monotonic() + RATE_LIMIT_REDIS_RETRY_SECONDS
+                log.warning(
+                    f"Redis rate limiting unavailable ({e}); using in-process limits "
+                    f"for {RATE_LIMIT_REDIS_RETRY_SECONDS}s"
+                )
+        return self.fallback.hit(bucket, policy, now_ms)
+
+    async def check(self, request: Request, rule: Union[str, RateLimitPolicy], bucket: str) -> RateLimitResult:
+        """
+        Check a request against its policy and record the result on ``request.state``.
+
+        Raises:
+            RateLimitExceededError: If the request is over its limit
+        """
+        if isinstance(rule, RateLimitPolicy):
+            policy = rule
+        else:
+            policy = self.get_policy(get_user_subscription_tier(request), rule)
+
+        identity = get_rate_limit_identity(request)
+        result = await self.hit(f"{bucket}:{identity}", policy)
+        request.state.rate_limit = result
+
+        if not result.allowed:
+            log.warning(f"Rate limit exceeded for {identity} on {request.url.path} ({policy})")
+            raise RateLimitExceededError(result, getattr(request.state, "request_id", None))
+        return result
+
+    def limit(self, rule: Union[str, Callable[[], str]]) -> Callable:
+        """Decorator enforcing ``rule`` on an async endpoint."""
+        if callable(rule):
+            rule = rule()
+        if "/" in rule or " per " in rule:
+            policy: Union[str, RateLimitPolicy] = RateLimitPolicy.parse(rule)
+            bucket_name = None
+        elif rule in ENDPOINT_CLASSES:
+            policy = rule
+            bucket_name = rule
+        else:
+            raise ValueError(f"Unknown rate limit rule: {rule!r}")
+
+        def decorator(func: Callable) -> Callable:
+            # Fixed limits get a bucket per endpoint; class limits share one per class
+            bucket = bucket_name or f"{func.__module__}.{func.__name__}"
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request = kwargs.get("request")
+                if request is None:
+                    request = next((arg for arg in args if isinstance(arg, Request)), None)
+                if self.enabled and request is not None:
+                    await self.check(request, policy, bucket)
+                return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
 
 
 def get_tier_rate_limit(tier: SubscriptionTier, endpoint_type: str = "default") -> str:
     """
     Get rate limit string for a subscription tier and endpoint type.
-    
+
     Args:
         tier: User's subscription tier
-        endpoint_type: Type of endpoint (default, streaming, heavy, etc.)
-    
+        endpoint_type: Type of endpoint (default, streaming, heavy, upload)
+
     Returns:
-        Rate limit string in SlowAPI format (e.g., "60/minute")
+        Rate limit string (e.g., "60/minute")
     """
-    # Rate limits per tier per minute
-    tier_limits = {
-        SubscriptionTier.FREE: {
-            "default": "10/minute",
-            "streaming": "5/minute", 
-            "heavy": "2/minute",
-            "upload": "3/minute"
-        },
-        SubscriptionTier.BASIC: {
-            "default": "60/minute",
-            "streaming": "20/minute",
-            "heavy": "10/minute", 
-            "upload": "15/minute"
-        },
-        SubscriptionTier.PREMIUM: {
-            "default": "300/minute",
-            "streaming": "100/minute",
-            "heavy": "50/minute",
-            "upload": "75/minute"
-        },
-        SubscriptionTier.ACADEMIC: {
-            "default": "180/minute",
-            "streaming": "60/minute", 
-            "heavy": "30/minute",
-            "upload": "45/minute"
-        }
-    }
-    
-    return tier_limits.get(tier, tier_limits[SubscriptionTier.FREE]).get(
-        endpoint_type, tier_limits[tier]["default"]
-    )
+    return str(limiter.get_policy(tier, endpoint_type))
 
 
-def create_limiter():
-    """
-    Create a limiter instance with Redis storage for production or in-memory for development.
-    
-    Uses Redis for shared rate limiting across multiple workers in production,
-    falls back to in-memory storage for local development.
-    
-    Enhanced with subscription-aware rate limiting.
+def create_limiter() -> TierRateLimiter:
     """
-    # Get Redis URL from environment or config
-    redis_url = os.environ.get("REDIS_URL", "redis://localhost:6379")
-    app_env = os.environ.get("APP_ENV", "dev").lower()
-    
-    # Use Redis storage for production environments
-    if app_env in ("prod", "production"):
-        try:
-            from slowapi.middleware import SlowAPIMiddleware
-            from slowapi._limiter import Limiter as SlowAPILimiter
-            import redis.asyncio as redis
-            
-            # Create Redis connection for rate limiting
-            redis_client = redis.from_url(
-                redis_url,
-                encoding="utf-8",
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_timeout=5,
-                retry_on_timeout=True
-            )
-            
-            # Create limiter with Redis storage and dynamic key function
-            limiter = Limiter(
-                key_func=get_dynamic_rate_limit_key,
-                storage_uri=redis_url
-            )
-            
-            print(f"Rate limiting configured with Redis backend and subscription tiers: {redis_url}")
-            return limiter
-            
-        except ImportError as e:
-            print(f"Warning: Redis dependencies not available ({e}), falling back to in-memory rate limiting")
-        except Exception as e:
-            print(f"Warning: Failed to connect to Redis ({e}), falling back to in-memory rate limiting")
-    
-    # Fallback to in-memory storage for development or if Redis fails
-    limiter = Limiter(key_func=get_dynamic_rate_limit_key)
-    print(f"Rate limiting configured with in-memory backend and subscription tiers (env: {app_env})")
-    return limiter
+    Create the shared limiter from settings.
 
-
-def create_subscription_aware_limit(endpoint_type: str = "default"):
-    """
-    Create a rate limit decorator that adapts to user subscription tier.
-    
-    Args:
-        endpoint_type: Type of endpoint for tier-specific limits
-    
-    Returns:
-        Function that returns appropriate rate limit for user's tier
+    The limiter starts with in-process buckets; the application lifespan
+    attaches the Redis client once the cache service is up so limits are
+    shared across workers.
     """
-    def get_limit_for_request(request: Request) -> str:
-        tier = get_user_subscription_tier(request)
-        return get_tier_rate_limit(tier, endpoint_type)
-    
-    return get_limit_for_request
+    settings = get_settings()
+    limiter = TierRateLimiter(
+        policies=load_tier_policies(settings),
+        enabled=getattr(settings, "rate_limiting_enabled", True),
+    )
+    log.info(
+        f"Rate limiting configured (enabled={limiter.enabled}, "
+        f"window={getattr(settings, 'rate_limit_window_seconds', RATE_LIMIT_WINDOW_SECONDS)}s)"
+    )
+    return limiter
 
 
 # Create a shared limiter instance that can be imported by routers
 limiter = create_limiter()
 
 
-# Convenience functions for common endpoint types
-# These return the limit function that slowapi can call with the request
-def get_default_limit():
-    """Get default rate limit function for user's subscription tier."""
-    return create_subscription_aware_limit("default")
+# Endpoint classes for @limiter.limit(...)
+def get_default_limit() -> str:
+    """Endpoint class for standard requests."""
+    return "default"
 
 
-def get_streaming_limit():
-    """Get streaming rate limit function for user's subscription tier."""
-    return create_subscription_aware_limit("streaming")
+def get_streaming_limit() -> str:
+    """Endpoint class for streaming responses."""
+    return "streaming"
 
 
-def get_heavy_limit():
-    """Get heavy operation rate limit function for user's subscription tier."""
-    return create_subscription_aware_limit("heavy")
+def get_heavy_limit() -> str:
+    """Endpoint class for expensive operations."""
+    return "heavy"
 
 
-def get_upload_limit():
-    """Get upload rate limit function for user's subscription tier."""
-    return create_subscription_aware_limit("upload")
\ No newline at end of file
+def get_upload_limit() -> str:
+    """Endpoint class for uploads."""
+    return "upload"
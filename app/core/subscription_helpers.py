@@ -5,7 +5,6 @@ Provides reusable functions for subscription-based access control and usage trac
 across API endpoints, reducing code duplication and ensuring consistent behavior.
 """
 
-import math
 from typing import Optional
 from fastapi import Request, HTTPException
 from app.core.user_models import User
@@ -13,7 +12,7 @@ from app.core.dependencies import SubscriptionManagerDep
 from app.config.settings import get_settings
 from app.core.error_responses import create_authorization_error
 from app.core.logger import log
-from app.core.constants import CHARS_PER_TOKEN_ESTIMATE
+from app.services.token_counter import count_tokens
 
 
 async def check_subscription_access(
@@ -141,21 +140,18 @@ async def track_subscription_usage(
     """
     Track API usage for subscription billing from response text.
 
-    Estimates token count using ceiling division with minimum 1 token for non-empty
-    responses. Degrades gracefully on failure.
+    Counts tokens with the served model's tokenizer (falling back to a character
+    estimate with minimum 1 token for non-empty responses). Degrades gracefully
+    on failure.
 
     Args:
         user: Authenticated user (None for anonymous requests)
         subscription_manager: Subscription manager service
         endpoint: API endpoint path (e.g., "/ask", "/ask_philosophy")
-        response_text: Response content for token estimation
+        response_text: Response content to count tokens for
     """
-    # Estimate tokens from text
-    estimated_tokens = (
-        max(1, math.ceil(len(response_text) / CHARS_PER_TOKEN_ESTIMATE))
-        if response_text else 0
-    )
-    await _track_usage_internal(user, subscription_manager, endpoint, estimated_tokens)
+    tokens_used = count_tokens(response_text)
+    await _track_usage_internal(user, subscription_manager, endpoint, tokens_used)
 
 
 async def track_subscription_tokens(
@@ -10,9 +10,10 @@ from datetime import datetime
 from typing import Callable, Optional, Dict, Any
 from fastapi import Request, Response, HTTPException, status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logger import log
+from app.core.principal import resolve_principal
 from app.core.db_models import SubscriptionTier, SubscriptionStatus
 from app.core.user_models import User
 from app.services.subscription_manager import SubscriptionManager, UsageLimitExceededException
@@ -20,7 +21,7 @@ from app.services.billing_service import BillingService
 from app.services.auth_service import AuthService
 
 
-class SubscriptionMiddleware(BaseHTTPMiddleware):
+class SubscriptionMiddleware:
     """
     Middleware for subscription-based access control and usage tracking.
 
@@ -36,7 +37,7 @@ class SubscriptionMiddleware(BaseHTTPMiddleware):
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         subscription_manager: Optional[SubscriptionManager] = None,
         billing_service: Optional[BillingService] = None,
         auth_service: Optional[AuthService] = None,
@@ -46,13 +47,13 @@ class SubscriptionMiddleware(BaseHTTPMiddleware):
         Initialize subscription middleware.
 
         Args:
-            app: FastAPI application instance
+            app: Next ASGI application in the middleware stack
             subscription_manager: SubscriptionManager service instance
             billing_service: BillingService for usage tracking
             auth_service: AuthService for user context
             enabled: Whether subscription checking is enabled
         """
-        super().__init__(app)
+        self.app = app
         self.subscription_manager = subscription_manager
         self.billing_service = billing_service
         self.auth_service = auth_service
@@ -84,9 +85,47 @@ class SubscriptionMiddleware(BaseHTTPMiddleware):
         else:
             log.info("SubscriptionMiddleware initialized and enabled")
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Process an HTTP request through subscription middleware.
+
+        Implemented as pure ASGI so response bodies (including SSE streams)
+        pass straight through to the client instead of being re-streamed
+        through an intermediate memory channel.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope, receive)
+        check = await self._check_access(request)
+        if check is None:
+            await self.app(scope, receive, send)
+            return
+
+        if isinstance(check, Response):
+            await check(scope, receive, send)
+            return
+
+        response_status = None
+        request_duration_ms = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_status, request_duration_ms
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+                request_duration_ms = int((time.time() - check["start_time"]) * 1000)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        # Track usage once the response has been sent, so it never delays it
+        if response_status is not None:
+            await self._record_usage(request, check, response_status, request_duration_ms)
+
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """
-        Process request through subscription middleware.
+        Request/response form of the middleware for callers that invoke it directly.
 
         Args:
             request: Incoming HTTP request
@@ -95,24 +134,46 @@ class SubscriptionMiddleware(BaseHTTPMiddleware):
         Returns:
             HTTP response
         """
+        check = await self._check_access(request)
+        if check is None:
+            return await call_next(request)
+
+        if isinstance(check, Response):
+            return check
+
+        response = await call_next(request)
+        await self._record_usage(
+            request, check, response.status_code, int((time.time() - check["start_time"]) * 1000)
+        )
+        return response
+
+    async def _check_access(self, request: Request) -> Optional[Any]:
+        """
+        Run subscription checks for a request before it reaches the endpoint.
+
+        Returns:
+            None when the request is not subject to subscription processing,
+            a Response when access is denied, or a context dict describing
+            the admitted request for usage tracking.
+        """
         # Get services dynamically from app.state
         subscription_manager = getattr(request.app.state, 'subscription_manager', None)
         billing_service = getattr(request.app.state, 'billing_service', None)
         auth_service = getattr(request.app.state, 'auth_service', None)
-        
+
         # Skip processing if middleware is disabled or no subscription manager
         if not self.enabled or not subscription_manager:
-            return await call_next(request)
+            return None
 
         # Skip excluded endpoints
         if self._is_excluded_endpoint(request.url.path):
-            return await call_next(request)
+            return None
 
         # Get endpoint configuration
         endpoint_config = self._get_endpoint_config(request.url.path)
         if not endpoint_config:
             # Endpoint not protected, continue normally
-            return await call_next(request)
+            return None
 
         start_time = time.time()
         user_id = None
@@ -128,8 +189,9 @@ class SubscriptionMiddleware(BaseHTTPMiddleware):
                 user_id = self._get_anonymous_user_id(request)
                 subscription_tier = SubscriptionTier.FREE
             else:
-                # Get user's subscription tier
-                subscription_tier = await subscription_manager.get_user_tier(user_id)
+                # Resolve user's subscription tier once for this request
+                principal = await resolve_principal(request, user_id, subscription_manager)
+                subscription_tier = principal.tier
 
             # Store subscription tier in request state for rate limiting
             request.state.subscription_tier = subscription_tier
@@ -141,10 +203,11 @@ class SubscriptionMiddleware(BaseHTTPMiddleware):
                 log.warning(f"User {user_id} with tier {subscription_tier} denied access to {request.url.path} (requires {required_tier})")
                 return self._create_subscription_required_response(required_tier)
 
-            # Check and enforce rate limits
+            # Enforce the monthly quota; per-minute throttling is done by the
+            # shared rate limiter on each endpoint
             try:
                 rate_limit_ok = await subscription_manager.enforce_rate_limits(
-                    user_id, request.url.path
+                    user_id, request.url.path, enforce_per_minute=False
                 )
                 if not rate_limit_ok:
                     log.warning(f"Rate limit exceeded for user {user_id} on {request.url.path}")
@@ -153,27 +216,38 @@ class SubscriptionMiddleware(BaseHTTPMiddleware):
                 log.warning(f"Usage limit exceeded for user {user_id}: {e}")
                 return self._create_usage_limit_response(str(e))
 
-            # Process the request
-            response = await call_next(request)
-
-            # Track usage if enabled for this endpoint
-            if endpoint_config.get("track_usage", False) and billing_service:
-                await self._track_request_usage(
-                    user_id=user_id,
-                    endpoint=request.url.path,
-                    method=request.method,
-                    subscription_tier=subscription_tier,
-                    request_duration_ms=int((time.time() - start_time) * 1000),
-                    response_status=response.status_code,
-                    billing_service=billing_service
-                )
-
-            return response
-
         except Exception as e:
             log.error(f"Error in subscription middleware: {e}", exc_info=True)
             # Don't block requests on middleware errors, just log and continue
-            return await call_next(request)
+            return None
+
+        return {
+            "user_id": user_id,
+            "subscription_tier": subscription_tier,
+            "endpoint_config": endpoint_config,
+            "billing_service": billing_service,
+            "start_time": start_time,
+        }
+
+    async def _record_usage(
+        self,
+        request: Request,
+        context: Dict[str, Any],
+        response_status: int,
+        request_duration_ms: int
+    ) -> None:
+        """Track usage for an admitted request if its endpoint is billable."""
+        billing_service = context["billing_service"]
+        if context["endpoint_config"].get("track_usage", False) and billing_service:
+            await self._track_request_usage(
+                user_id=context["user_id"],
+                endpoint=request.url.path,
+                method=request.method,
+                subscription_tier=context["subscription_tier"],
+                request_duration_ms=request_duration_ms,
+                response_status=response_status,
+                billing_service=billing_service
+            )
 
     def _is_excluded_endpoint(self, path: str) -> bool:
         """Check if endpoint should be excluded from subscription processing."""
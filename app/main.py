@@ -2,19 +2,30 @@ from fastapi import FastAPI, Request, Response
 from fastapi.responses import JSONResponse
 import uvicorn
 import argparse
+import functools
 import os
 from pathlib import Path
 from contextlib import asynccontextmanager
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
+from app.core.asgi_middleware import (
+    RateLimitHeadersMiddleware,
+    SecurityHeadersMiddleware,
+    StartupCheckMiddleware,
+)
 from app.core.constants import UVICORN_KEEPALIVE_TIMEOUT_SECONDS, UVICORN_GRACEFUL_SHUTDOWN_SECONDS
 
 
+def _answer_prompt_version(app: FastAPI) -> str:
+    """Prompt version in semantic answer cache keys: the templates and the philosopher bundle in use."""
+    from app.core.philosopher_loader import get_active_bundle
+    version = app.state.prompt_renderer.version if app.state.prompt_renderer else ""
+    bundle = get_active_bundle()
+    return f"{version}:{bundle.content_hash[:16]}" if bundle else version
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -24,6 +35,7 @@ async def lifespan(app: FastAPI):
     for request-time access via dependency injection.
     """
     # Import dependencies inside lifespan to avoid circular imports
+    import asyncio
     from app.core.logger import log
     from app.core.database import init_db
     from app.services.qdrant_manager import QdrantManager
@@ -35,6 +47,11 @@ async def lifespan(app: FastAPI):
     from app.services.chat_history_service import ChatHistoryService
     from app.services.chat_qdrant_service import ChatQdrantService
     from app.services.prompt_renderer import PromptRenderer
+    from app.services.semantic_cache import SemanticAnswerCache
+    from app.services.document_parser import DocumentParser
+    from app.services.health_monitor import HealthMonitor
+    from app.services.audit_log import AuditLog
+    from app.services.token_counter import get_token_counter
     from app.services.cache_warming import CacheWarmingService
     from app.workflow_services.paper_workflow import PaperWorkflow
     from app.workflow_services.review_workflow import ReviewWorkflow
@@ -270,15 +287,20 @@ async def lifespan(app: FastAPI):
         "qdrant_manager": False,
         "cache_service": False,  # Non-critical, but tracked
         "prompt_renderer": False,  # Non-critical, but tracked
+        "semantic_cache": False,  # Non-critical, but tracked
+        "document_parser": False,  # Non-critical, but tracked
         "expansion_service": False,  # Non-critical, but tracked
         "chat_history_service": False,  # Non-critical, but tracked
         "chat_qdrant_service": False,  # Non-critical, but tracked
         "paper_workflow": False,  # Non-critical, but tracked
         "review_workflow": False,  # Non-critical, but tracked
+        "health_monitor": False,  # Non-critical, but tracked
         "payment_service": False,  # Non-critical, but tracked
         "subscription_manager": False,  # Non-critical, but tracked
         "billing_service": False,  # Non-critical, but tracked
         "refund_dispute_service": False,  # Non-critical, but tracked
+        "webhook_queue": False,  # Non-critical, but tracked
+        "audit_log": False,  # Non-critical, but tracked
     }
 
     # Initialize database (CRITICAL - failure aborts startup)
@@ -303,6 +325,18 @@ async def lifespan(app: FastAPI):
         )
         app.state.startup_errors.append({"service": "database", "error": str(e), "type": type(e).__name__})
 
+    # Start the audit log writer (NON-CRITICAL - actions are not audited without it)
+    try:
+        app.state.audit_log = await AuditLog.start(settings)
+        app.state.services_ready["audit_log"] = True
+    except Exception as e:
+        log.warning(
+            f"AuditLog initialization failed: {e} - admin and billing actions will not be audited",
+            exc_info=True,
+            extra={"error_type": type(e).__name__, "service": "audit_log"}
+        )
+        app.state.audit_log = None
+
     # ========== SERVICE INITIALIZATION (DEPENDENCY ORDER) ==========
     # CRITICAL: Services must be initialized in this exact order to satisfy dependencies.
     #
@@ -337,6 +371,11 @@ async def lifespan(app: FastAPI):
         app.state.prompt_renderer = None
         # Non-critical service, continue without it
 
+    # Load the tokenizer used for token accounting (NON-CRITICAL - counts fall back to estimates)
+    token_counter = get_token_counter()
+    await asyncio.to_thread(token_counter.load)
+    app.state.token_counter = token_counter
+
     # Initialize Redis cache service (NON-CRITICAL - graceful degradation)
     # IMPORTANT: Must complete before LLMManager/QdrantManager initialization
     # to ensure they receive the correct cache_service instance (or None)
@@ -345,6 +384,10 @@ async def lifespan(app: FastAPI):
         app.state.cache_service = cache_service
         app.state.services_ready["cache_service"] = True
         log.info("RedisCacheService initialized and stored in app state")
+
+        # Share rate-limit buckets across workers through Redis
+        from app.core.rate_limiting import limiter
+        limiter.set_redis_client(cache_service.redis_client)
     except (ConnectionError, TimeoutError) as e:
         log.warning(
             f"Redis connection failed: {e} - running without cache",
@@ -360,6 +403,33 @@ async def lifespan(app: FastAPI):
         )
         app.state.cache_service = None
 
+    # Initialize semantic answer cache (NON-CRITICAL - depends on cache_service and prompt_renderer)
+    app.state.semantic_cache = None
+    if settings.semantic_cache_enabled:
+        try:
+            app.state.semantic_cache = await SemanticAnswerCache.start(
+                settings, cache_service=app.state.cache_service, prompt_version=_answer_prompt_version(app)
+            )
+            app.state.services_ready["semantic_cache"] = True
+        except Exception as e:
+            log.warning(
+                f"SemanticAnswerCache initialization failed: {e} - answers will not be cached",
+                exc_info=True,
+                extra={"error_type": type(e).__name__, "service": "semantic_cache"}
+            )
+
+    # Initialize document parser (NON-CRITICAL - uploads parse in a thread without it)
+    try:
+        app.state.document_parser = await DocumentParser.start(settings)
+        app.state.services_ready["document_parser"] = True
+    except Exception as e:
+        log.warning(
+            f"DocumentParser initialization failed: {e} - uploads will be parsed in a thread",
+            exc_info=True,
+            extra={"error_type": type(e).__name__, "service": "document_parser"}
+        )
+        app.state.document_parser = None
+
     # Initialize AuthService (depends on cache_service)
     try:
         auth_service = await AuthService.start(cache_service=app.state.cache_service)
@@ -403,6 +473,8 @@ async def lifespan(app: FastAPI):
             billing_service = await BillingService.start(
                 cache_service=app.state.cache_service
             )
+            if settings.usage_rollup_interval_seconds > 0:
+                billing_service.run_usage_rollups(settings.usage_rollup_interval_seconds)
             app.state.billing_service = billing_service
             app.state.services_ready["billing_service"] = True
             log.info("BillingService initialized and stored in app state")
@@ -417,6 +489,20 @@ async def lifespan(app: FastAPI):
             app.state.refund_dispute_service = refund_dispute_service
             app.state.services_ready["refund_dispute_service"] = True
             log.info("RefundDisputeService initialized and stored in app state")
+
+            # Start the webhook queue worker (applies Stripe events via payment_service)
+            from app.services.webhook_queue import WebhookQueue
+            from app.router.payments import process_webhook_event
+            app.state.webhook_queue = await WebhookQueue.start(
+                handler=functools.partial(
+                    process_webhook_event,
+                    payment_service=payment_service,
+                    subscription_manager=subscription_manager
+                ),
+                settings=settings
+            )
+            app.state.services_ready["webhook_queue"] = True
+            log.info("WebhookQueue initialized and stored in app state")
             
             log.info("Payment services initialized successfully")
         except Exception as e:
@@ -429,6 +515,7 @@ async def lifespan(app: FastAPI):
             app.state.subscription_manager = None
             app.state.billing_service = None
             app.state.refund_dispute_service = None
+            app.state.webhook_queue = None
             # Non-critical services, continue without them
     else:
         log.info("Payments disabled - skipping payment service initialization")
@@ -436,6 +523,7 @@ async def lifespan(app: FastAPI):
         app.state.subscription_manager = None
         app.state.billing_service = None
         app.state.refund_dispute_service = None
+        app.state.webhook_queue = None
 
     # Initialize LLM Manager (CRITICAL - depends on PromptRenderer and uses cache_service)
     try:
@@ -748,6 +836,19 @@ async def lifespan(app: FastAPI):
     else:
         log.info("Cache warming skipped: required services not available")
 
+    # Start background health probes (NON-CRITICAL - /health probes live without them)
+    try:
+        from app.router.health import build_health_probes
+        app.state.health_monitor = await HealthMonitor.start(build_health_probes(app, settings), settings)
+        app.state.services_ready["health_monitor"] = True
+    except Exception as e:
+        log.warning(
+            f"HealthMonitor initialization failed: {e} - health endpoints will probe live",
+            exc_info=True,
+            extra={"error_type": type(e).__name__, "service": "health_monitor"}
+        )
+        app.state.health_monitor = None
+
     # ATOMIC CHECK: Only enable serving when ALL critical services are ready
     critical_services = ["database", "llm_manager", "qdrant_manager"]
     all_critical_ready = all(
@@ -793,7 +894,7 @@ async def lifespan(app: FastAPI):
 
     # Start background task for periodic metrics updates
     async def update_metrics_periodically():
-        """Background task to update cache and Qdrant metrics every 60 seconds."""
+        """Background task to update cache and Qdrant metrics and share chat quantiles every 60 seconds."""
         import asyncio
         while True:
             try:
@@ -806,6 +907,22 @@ async def lifespan(app: FastAPI):
                     except Exception as e:
                         log.debug(f"Cache metrics update failed: {e}")
 
+                # Share chat monitoring quantiles with the other workers
+                if app.state.cache_service:
+                    try:
+                        from app.services.chat_monitoring import chat_monitoring
+                        await chat_monitoring.sync_quantiles(app.state.cache_service.redis_client)
+                    except Exception as e:
+                        log.debug(f"Quantile snapshot sync failed: {e}")
+
+                # Swap in a newly deployed philosopher bundle
+                try:
+                    from app.core.philosopher_loader import refresh_philosopher_bundle
+                    if refresh_philosopher_bundle() and app.state.semantic_cache:
+                        app.state.semantic_cache.prompt_version = _answer_prompt_version(app)
+                except Exception as e:
+                    log.debug(f"Philosopher bundle refresh failed: {e}")
+
                 # Update Qdrant collection metrics
                 if app.state.qdrant_manager:
                     try:
@@ -889,6 +1006,8 @@ async def lifespan(app: FastAPI):
 
     # Close services in reverse dependency order
     services = [
+        ('health_monitor', 'HealthMonitor'),
+        ('webhook_queue', 'WebhookQueue'),
         ('review_workflow', 'ReviewWorkflow'),
         ('paper_workflow', 'PaperWorkflow'),
         ('chat_qdrant_service', 'ChatQdrantService'),
@@ -898,6 +1017,9 @@ async def lifespan(app: FastAPI):
         ('billing_service', 'BillingService'),
         ('subscription_manager', 'SubscriptionManager'),
         ('payment_service', 'PaymentService'),
+        ('document_parser', 'DocumentParser'),
+        ('semantic_cache', 'SemanticAnswerCache'),
+        ('audit_log', 'AuditLog'),
         ('cache_service', 'RedisCacheService'),
         ('qdrant_manager', 'QdrantManager'),
         ('llm_manager', 'LLMManager'),
@@ -953,20 +1075,9 @@ def configure_app():
         enabled=getattr(settings, 'payments_enabled', False)
     )
     
-    # Add SlowAPI middleware
-    app.add_middleware(SlowAPIMiddleware)
-
-    # Custom rate limit exceeded handler with logging
-    @app.exception_handler(RateLimitExceeded)
-    async def rate_limit_handler(request, exc):
-        from slowapi.util import get_remote_address
-        from app.core.logger import log
-        client_ip = get_remote_address(request)
-        endpoint = request.url.path
-        log.warning(f"Rate limit exceeded for IP {client_ip} on endpoint {endpoint}")
-        return _rate_limit_exceeded_handler(request, exc)
-
-    app.add_exception_handler(RateLimitExceeded, rate_limit_handler)
+    # Add RateLimit-* headers recorded by the shared limiter (limits are
+    # enforced per endpoint by @limiter.limit; 429s are raised as HTTPException)
+    app.add_middleware(RateLimitHeadersMiddleware)
 
     # Load trusted hosts from configuration
     trusted_hosts = get_trusted_hosts()
@@ -1051,57 +1162,10 @@ def configure_app():
     TracingConfig.instrument_fastapi(app)
 
     # Apply security headers to all responses (including health checks and errors)
-    @app.middleware("http")
-    async def security_headers_middleware(request: Request, call_next):
-        """
-        Apply security headers to all responses.
-
-        Headers are applied to all endpoints including health checks, errors,
-        and normal responses. Uses SecurityManager.get_security_headers() as
-        single source of truth for security header configuration.
-        """
-        # Import SecurityManager within function scope
-        from app.core.security import SecurityManager
-
-        # Process the request
-        response = await call_next(request)
-
-        # Get security headers from SecurityManager
-        security_headers = SecurityManager.get_security_headers()
-
-        # Apply each header to the response
-        for header_name, header_value in security_headers.items():
-            response.headers[header_name] = header_value
-
-        return response
-
-    # Add middleware to check startup state before serving traffic
-    @app.middleware("http")
-    async def startup_check_middleware(request: Request, call_next):
-        """
-        Middleware to check if critical services are available.
-        Returns 503 for non-health endpoints if startup failed.
-        """
-        # Allow health endpoints always (for monitoring during startup issues)
-        if request.url.path.startswith("/health"):
-            return await call_next(request)
-        
-        # Check if serving is enabled (critical services are up)
-        serving_enabled = getattr(app.state, 'serving_enabled', True)
-        startup_errors = getattr(app.state, 'startup_errors', [])
-        
-        if not serving_enabled and startup_errors:
-            return JSONResponse(
-                status_code=503,
-                content={
-                    "error": "Service Unavailable",
-                    "message": "Critical services are unavailable. Server cannot serve traffic.",
-                    "startup_errors": startup_errors,
-                    "health_check": "/health"
-                }
-            )
-        
-        return await call_next(request)
+    app.add_middleware(SecurityHeadersMiddleware)
+
+    # Check startup state before serving traffic (returns 503 if startup failed)
+    app.add_middleware(StartupCheckMiddleware)
     
     # Include routers
     app.include_router(router)
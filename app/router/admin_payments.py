@@ -6,6 +6,7 @@ Provides admin-only endpoints for:
 - Dispute handling and evidence submission
 - Subscription overrides and adjustments
 - Payment audit trails and reporting
+- Webhook dead-letter inspection and replay
 """
 
 from typing import Dict, Any, List, Optional
@@ -24,7 +25,9 @@ from app.core.error_responses import (
     create_internal_error,
     create_forbidden_error
 )
-from app.core.db_models import RefundReason, RefundStatus, DisputeStatus, SubscriptionTier, SubscriptionStatus
+from app.core.db_models import (
+    RefundReason, RefundStatus, DisputeStatus, SubscriptionTier, SubscriptionStatus, WebhookEventStatus
+)
 
 
 # Router setup
@@ -95,15 +98,24 @@ class SubscriptionOverrideResponse(BaseModel):
     admin_notes: str = Field(..., description="Administrative notes")
 
 
-class PaymentAuditRecord(BaseModel):
-    """Response model for payment audit records."""
-    id: int = Field(..., description="Record ID")
-    user_id: int = Field(..., description="User ID")
-    action_type: str = Field(..., description="Type of action (refund, dispute, override)")
-    action_details: Dict[str, Any] = Field(..., description="Action details")
-    admin_user_id: Optional[int] = Field(None, description="Admin user who performed action")
-    timestamp: datetime = Field(..., description="Action timestamp")
-    notes: Optional[str] = Field(None, description="Administrative notes")
+class AuditEventResponse(BaseModel):
+    """Response model for an audit log event."""
+    id: int = Field(..., description="Event ID")
+    occurred_at: datetime = Field(..., description="When the action happened")
+    action: str = Field(..., description="Dotted action name, e.g. 'refund.initiated'")
+    actor_type: str = Field(..., description="admin, user, system or stripe")
+    actor_id: Optional[str] = Field(None, description="User who performed the action")
+    subject_type: Optional[str] = Field(None, description="Kind of object acted on")
+    subject_id: Optional[str] = Field(None, description="Object acted on")
+    user_id: Optional[int] = Field(None, description="Account affected by the action")
+    request_id: Optional[str] = Field(None, description="Request that triggered the action")
+    details: Optional[Dict[str, Any]] = Field(None, description="Action details")
+
+
+class AuditTrailResponse(BaseModel):
+    """Response model for a page of the audit trail, newest first."""
+    events: List[AuditEventResponse] = Field(..., description="Events on this page")
+    next_cursor: Optional[int] = Field(None, description="Cursor of the next page; None on the last page")
 
 
 class PaymentSummaryResponse(BaseModel):
@@ -118,6 +130,19 @@ class PaymentSummaryResponse(BaseModel):
     period_end: datetime = Field(..., description="Summary period end")
 
 
+class WebhookEventResponse(BaseModel):
+    """Response model for a stored webhook event."""
+    event_id: str = Field(..., description="Stripe event ID")
+    event_type: str = Field(..., description="Stripe event type")
+    customer_id: Optional[str] = Field(None, description="Stripe customer the event belongs to")
+    status: WebhookEventStatus = Field(..., description="Processing state")
+    attempts: int = Field(..., description="Processing attempts so far")
+    last_error: Optional[str] = Field(None, description="Error of the last failed attempt")
+    received_at: datetime = Field(..., description="When the event was received")
+    next_attempt_at: Optional[datetime] = Field(None, description="Earliest time of the next retry")
+    processed_at: Optional[datetime] = Field(None, description="When the event was processed")
+
+
 # Dependency functions
 async def get_refund_dispute_service(request: Request):
     """Get refund dispute service from app state."""
@@ -152,6 +177,28 @@ async def get_subscription_manager(request: Request):
     return subscription_manager
 
 
+async def get_webhook_queue(request: Request):
+    """Get webhook queue from app state."""
+    webhook_queue = getattr(request.app.state, 'webhook_queue', None)
+    if webhook_queue is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Webhook queue unavailable. Payments may be disabled."
+        )
+    return webhook_queue
+
+
+async def get_audit_log(request: Request):
+    """Get audit log from app state."""
+    audit_log = getattr(request.app.state, 'audit_log', None)
+    if audit_log is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Audit log unavailable - check startup logs."
+        )
+    return audit_log
+
+
 async def verify_admin_user(current_user: User = Depends(current_active_user)) -> User:
     """Verify that the current user has admin privileges."""
     # TODO: Implement proper admin role checking
@@ -617,50 +664,147 @@ async def get_payment_summary(
         raise HTTPException(status_code=500, detail=error.model_dump())
 
 
-@router.get("/audit/trail")
+@router.get("/audit/trail", response_model=AuditTrailResponse)
 async def get_audit_trail(
     request: Request,
+    actor_id: Optional[str] = None,
     user_id: Optional[int] = None,
+    subject_type: Optional[str] = None,
+    subject_id: Optional[str] = None,
     action_type: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    cursor: Optional[int] = None,
     limit: int = 100,
-    offset: int = 0,
-    admin_user: User = Depends(verify_admin_user)
-) -> List[PaymentAuditRecord]:
+    admin_user: User = Depends(verify_admin_user),
+    audit_log = Depends(get_audit_log)
+) -> AuditTrailResponse:
     """
-    Get audit trail of payment-related administrative actions.
-    
-    Admin-only endpoint for viewing comprehensive audit logs.
+    Get the audit trail of administrative and billing actions, newest first.
+
+    Admin-only endpoint. Filters combine; action_type is an action
+    ('subscription.override') or a subject prefix ('subscription'). Pass
+    next_cursor back as cursor to get the next page.
     """
     try:
-        audit_records = await _get_audit_trail(
+        events, next_cursor = await audit_log.query(
+            actor_id=actor_id,
             user_id=user_id,
-            action_type=action_type,
-            limit=limit,
-            offset=offset
+            subject_type=subject_type,
+            subject_id=subject_id,
+            action=action_type,
+            since=since,
+            until=until,
+            cursor=cursor,
+            limit=max(1, min(limit, 500))
         )
-        
+
+        return AuditTrailResponse(
+            events=[
+                AuditEventResponse(
+                    id=event.id,
+                    occurred_at=event.occurred_at,
+                    action=event.action,
+                    actor_type=event.actor_type,
+                    actor_id=event.actor_id,
+                    subject_type=event.subject_type,
+                    subject_id=event.subject_id,
+                    user_id=event.user_id,
+                    request_id=event.request_id,
+                    details=event.details
+                )
+                for event in events
+            ],
+            next_cursor=next_cursor
+        )
+
+    except Exception as e:
+        log.error(f"Failed to get audit trail: {e}")
+        error = create_internal_error(
+            message="Failed to retrieve audit trail",
+            request_id=getattr(request.state, 'request_id', None)
+        )
+        raise HTTPException(status_code=500, detail=error.model_dump())
+
+
+# Webhook queue endpoints
+@router.get("/webhooks")
+async def list_webhook_events(
+    request: Request,
+    status: Optional[WebhookEventStatus] = WebhookEventStatus.DEAD_LETTER,
+    limit: int = 50,
+    admin_user: User = Depends(verify_admin_user),
+    webhook_queue = Depends(get_webhook_queue)
+) -> List[WebhookEventResponse]:
+    """
+    List received webhook events, by default the dead-lettered ones.
+
+    Admin-only endpoint for inspecting webhook processing failures.
+    """
+    try:
+        events = await webhook_queue.list_events(status=status, limit=min(limit, 500))
         return [
-            PaymentAuditRecord(
-                id=record.id,
-                user_id=record.user_id,
-                action_type=record.action_type,
-                action_details=record.action_details,
-                admin_user_id=record.admin_user_id,
-                timestamp=record.timestamp,
-                notes=record.notes
+            WebhookEventResponse(
+                event_id=event.event_id,
+                event_type=event.event_type,
+                customer_id=event.customer_id,
+                status=event.status,
+                attempts=event.attempts,
+                last_error=event.last_error,
+                received_at=event.received_at,
+                next_attempt_at=event.next_attempt_at,
+                processed_at=event.processed_at
             )
-            for record in audit_records
+            for event in events
         ]
-        
+
     except Exception as e:
-        log.error(f"Failed to get audit trail: {e}")
+        log.error(f"Failed to list webhook events: {e}")
         error = create_internal_error(
-            message="Failed to retrieve audit trail",
+            message="Failed to retrieve webhook events",
             request_id=getattr(request.state, 'request_id', None)
         )
         raise HTTPException(status_code=500, detail=error.model_dump())
 
 
+@router.post("/webhooks/{event_id}/replay")
+@limiter.limit("30/minute")
+async def replay_webhook_event(
+    request: Request,
+    event_id: str,
+    admin_user: User = Depends(verify_admin_user),
+    webhook_queue = Depends(get_webhook_queue)
+) -> Dict[str, Any]:
+    """
+    Queue a stored webhook event to be applied again.
+
+    Admin-only endpoint for replaying dead-lettered events once their cause is fixed.
+    """
+    request_id = getattr(request.state, 'request_id', None)
+
+    try:
+        if not await webhook_queue.replay(event_id):
+            error = create_not_found_error(
+                resource="webhook event",
+                identifier=event_id,
+                request_id=request_id
+            )
+            raise HTTPException(status_code=404, detail=error.model_dump())
+
+        log.info(f"Admin {admin_user.id} replayed webhook event {event_id}")
+        return {"event_id": event_id, "status": WebhookEventStatus.QUEUED.value}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        log.error(f"Failed to replay webhook event {event_id}: {e}")
+        error = create_internal_error(
+            message="Failed to replay webhook event",
+            request_id=request_id
+        )
+        raise HTTPException(status_code=500, detail=error.model_dump())
+
+
 # Helper functions
 def _parse_path_identifier(raw_id: str, request: Request, field_name: str, resource_label: str) -> int:
     """Parse path parameters that reference database identifiers."""
@@ -712,123 +856,8 @@ async def _get_dispute_record(dispute_id: int):
 
 async def _get_payment_summary(start_date: datetime, end_date: datetime) -> Dict[str, Any]:
     """Get payment summary statistics for date range."""
-    from app.core.database import get_session
-    from app.core.db_models import PaymentRecord, RefundRecord, DisputeRecord, Subscription
-    from sqlmodel import select, func
-    
-    async with get_session() as session:
-        # Total payments in period
-        payment_stats = session.exec(
-            select(
-                func.count(PaymentRecord.id).label("count"),
-                func.sum(PaymentRecord.amount_cents).label("total_amount")
-            ).where(
-                PaymentRecord.created_at >= start_date,
-                PaymentRecord.created_at <= end_date,
-                PaymentRecord.status == "succeeded"
-            )
-        ).first()
-        
-        # Total refunds in period
-        refund_stats = session.exec(
-            select(
-                func.count(RefundRecord.id).label("count"),
-                func.sum(RefundRecord.amount_cents).label("total_amount")
-            ).where(
-                RefundRecord.created_at >= start_date,
-                RefundRecord.created_at <= end_date,
-                RefundRecord.status == "succeeded"
-            )
-        ).first()
-        
-        # Active disputes
-        active_disputes = session.exec(
-            select(func.count(DisputeRecord.id)).where(
-                DisputeRecord.status.in_(["needs_response", "under_review", "warning_needs_response"])
-            )
-        ).first()
-        
-        # Suspended accounts
-        suspended_accounts = session.exec(
-            select(func.count(DisputeRecord.id)).where(
-                DisputeRecord.account_suspended == True
-            )
-        ).first()
-        
-        return {
-            "total_payments": payment_stats.count or 0,
-            "total_amount_cents": payment_stats.total_amount or 0,
-            "total_refunds": refund_stats.count or 0,
-            "total_refund_amount_cents": refund_stats.total_amount or 0,
-            "active_disputes": active_disputes or 0,
-            "suspended_accounts": suspended_accounts or 0
-        }
-
+    from app.core.database import AsyncSessionLocal
+    from app.services.usage_analytics import payment_summary
 
-async def _get_audit_trail(
-    user_id: Optional[int] = None,
-    action_type: Optional[str] = None,
-    limit: int = 100,
-    offset: int = 0
-) -> List[Any]:
-    """Get audit trail records."""
-    # For now, we'll return refund and dispute records as audit trail
-    # In a full implementation, you'd have a dedicated audit log table
-    from app.core.database import get_session
-    from app.core.db_models import RefundRecord, DisputeRecord
-    from sqlmodel import select
-    
-    audit_records = []
-    
-    async with get_session() as session:
-        # Get refund records as audit entries
-        refund_query = select(RefundRecord).order_by(RefundRecord.created_at.desc())
-        if user_id:
-            refund_query = refund_query.where(RefundRecord.user_id == user_id)
-        
-        refunds = session.exec(refund_query.limit(limit//2).offset(offset//2)).all()
-        
-        for refund in refunds:
-            audit_records.append({
-                "id": refund.id,
-                "user_id": refund.user_id,
-                "action_type": "refund",
-                "action_details": {
-                    "stripe_refund_id": refund.stripe_refund_id,
-                    "amount_cents": refund.amount_cents,
-                    "reason": refund.reason.value,
-                    "status": refund.status.value
-                },
-                "admin_user_id": refund.initiated_by_user_id,
-                "timestamp": refund.created_at,
-                "notes": refund.admin_notes
-            })
-        
-        # Get dispute records as audit entries
-        dispute_query = select(DisputeRecord).order_by(DisputeRecord.created_at.desc())
-        if user_id:
-            dispute_query = dispute_query.where(DisputeRecord.user_id == user_id)
-        
-        disputes = session.exec(dispute_query.limit(limit//2).offset(offset//2)).all()
-        
-        for dispute in disputes:
-            audit_records.append({
-                "id": dispute.id + 10000,  # Offset to avoid ID conflicts
-                "user_id": dispute.user_id,
-                "action_type": "dispute",
-                "action_details": {
-                    "stripe_dispute_id": dispute.stripe_dispute_id,
-                    "amount_cents": dispute.amount_cents,
-                    "reason": dispute.reason.value,
-                    "status": dispute.status.value,
-                    "account_suspended": dispute.account_suspended
-                },
-                "admin_user_id": dispute.assigned_to_user_id,
-                "timestamp": dispute.created_at,
-                "notes": dispute.admin_notes
-            })
-    
-    # Sort by timestamp descending
-    audit_records.sort(key=lambda x: x["timestamp"], reverse=True)
-    
-    return audit_records[:limit]
+    async with AsyncSessionLocal() as session:
+        return await payment_summary(session, start_date, end_date)
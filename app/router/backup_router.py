@@ -12,10 +12,12 @@ from fastapi.responses import JSONResponse
 
 from app.core.backup_models import (
     BackupRequest, BackupResponse, BackupProgressResponse,
-    ValidationRequest, ValidationResponse, RepairRequest, RepairResponse,
+    ValidationRequest, ValidationResponse, RepairRequest, RepairResponse, SyncDiffReport,
     CollectionInfoResponse, CollectionListResponse
 )
 from app.services.qdrant_backup_service import QdrantBackupService
+from app.services.audit_log import record_audit_event
+from app.core.dependencies import get_semantic_cache
 from app.core.logger import log
 from app.core.error_responses import (
     create_validation_error,
@@ -245,13 +247,20 @@ async def get_local_collection_info(
         raise HTTPException(status_code=500, detail=error.model_dump())
 
 
-async def run_backup_task(backup_service: QdrantBackupService, request: BackupRequest) -> str:
+async def run_backup_task(
+    backup_service: QdrantBackupService,
+    request: BackupRequest,
+    backup_id: Optional[str] = None,
+    semantic_cache=None
+) -> str:
     """
     Background task to run backup operation.
     
     Args:
         backup_service: Backup service instance
         request: Backup request parameters
+        backup_id: Progress tracker created when the backup was scheduled
+        semantic_cache: Semantic answer cache to invalidate once collections are restored
         
     Returns:
         Backup ID
@@ -263,27 +272,45 @@ async def run_backup_task(backup_service: QdrantBackupService, request: BackupRe
                 include_patterns=request.include_patterns,
                 exclude_patterns=request.exclude_patterns,
                 target_prefix=request.target_prefix,
-                overwrite=request.overwrite
+                overwrite=request.overwrite,
+                backup_id=backup_id
             )
         elif request.collections:
             # Specific collections backup
             result = await backup_service.backup_collections(
                 collections=request.collections,
                 target_prefix=request.target_prefix,
-                overwrite=request.overwrite
+                overwrite=request.overwrite,
+                backup_id=backup_id
             )
         else:
             # All philosophy collections backup
             result = await backup_service.backup_philosophy_collections(
                 target_prefix=request.target_prefix,
-                overwrite=request.overwrite
+                overwrite=request.overwrite,
+                backup_id=backup_id
             )
         
         log.info(f"Backup task completed: {result.get('backup_id')}")
+        record_audit_event(
+            "backup.completed" if result.get("status") == "completed" else "backup.failed",
+            subject_type="backup",
+            subject_id=result.get("backup_id") or backup_id,
+            details={
+                key: result[key]
+                for key in ("status", "successful_backups", "failed_backups", "total_target_points",
+                            "duration_seconds", "error")
+                if key in result
+            }
+        )
+        if semantic_cache is not None:
+            # Re-ingested collections may answer differently
+            await semantic_cache.invalidate()
         return result.get("backup_id")
         
     except Exception as e:
         log.error(f"Backup task failed: {e}")
+        record_audit_event("backup.failed", subject_type="backup", subject_id=backup_id, details={"error": str(e)})
         raise
 
 
@@ -335,9 +362,25 @@ async def start_backup(
         backup_id = progress.backup_id
 
         # Start backup in background
-        background_tasks.add_task(run_backup_task, backup_service, backup_request)
+        background_tasks.add_task(
+            run_backup_task, backup_service, backup_request, backup_id, get_semantic_cache(request)
+        )
 
         log.info(f"Started backup operation {backup_id}")
+        record_audit_event(
+            "backup.started",
+            actor_type="admin",
+            subject_type="backup",
+            subject_id=backup_id,
+            request_id=getattr(request.state, 'request_id', None),
+            details={
+                "collections": collections_to_backup,
+                "include_patterns": backup_request.include_patterns,
+                "exclude_patterns": backup_request.exclude_patterns,
+                "target_prefix": backup_request.target_prefix,
+                "overwrite": backup_request.overwrite
+            }
+        )
 
         return {
             "backup_id": backup_id,
@@ -396,6 +439,8 @@ async def get_backup_status(
             start_time=progress.start_time,
             end_time=progress.end_time,
             duration_seconds=progress.duration_seconds,
+            points_per_second=progress.points_per_second,
+            eta_seconds=progress.eta_seconds,
             errors=progress.errors
         )
 
@@ -462,6 +507,10 @@ async def repair_collection(
     """
     Repair a target collection by syncing with source.
 
+    'missing_points' and 'incremental_sync' only copy (and, for incremental_sync,
+    delete) the points that differ. Use dry_run to get the diff report without
+    modifying the target.
+
     Args:
         repair_request: Repair parameters
 
@@ -472,15 +521,39 @@ async def repair_collection(
         result = await backup_service.repair_collection(
             source_collection=repair_request.source_collection,
             target_collection=repair_request.target_collection,
-            repair_mode=repair_request.repair_mode
+            repair_mode=repair_request.repair_mode,
+            dry_run=repair_request.dry_run,
+            compare_content=repair_request.compare_content,
+            resume=repair_request.resume
         )
 
+        semantic_cache = get_semantic_cache(request)
+        if semantic_cache is not None and not result["dry_run"] and result["repaired_points"]:
+            await semantic_cache.invalidate(result["target_collection"])
+
+        if not result["dry_run"]:
+            record_audit_event(
+                "backup.collection_restored",
+                actor_type="admin",
+                subject_type="collection",
+                subject_id=result["target_collection"],
+                request_id=getattr(request.state, 'request_id', None),
+                details={
+                    "source_collection": result["source_collection"],
+                    "repair_mode": result["repair_mode"],
+                    "repaired_points": result["repaired_points"],
+                    "success": result["success"]
+                }
+            )
+
         return RepairResponse(
             source_collection=result["source_collection"],
             target_collection=result["target_collection"],
             repair_mode=result["repair_mode"],
             success=result["success"],
             repaired_points=result["repaired_points"],
+            dry_run=result["dry_run"],
+            diff=SyncDiffReport(**result["diff"]) if result.get("diff") else None,
             errors=result["errors"]
         )
 
@@ -526,6 +599,17 @@ async def delete_local_collection(
         )
 
         log.info(f"Deleted local collection: {collection_name}")
+        record_audit_event(
+            "backup.collection_deleted",
+            actor_type="admin",
+            subject_type="collection",
+            subject_id=collection_name,
+            request_id=getattr(request.state, 'request_id', None)
+        )
+
+        semantic_cache = get_semantic_cache(request)
+        if semantic_cache is not None:
+            await semantic_cache.invalidate(collection_name)
 
         return {
             "collection_name": collection_name,
@@ -16,7 +16,13 @@ from pydantic import BaseModel, Field
 
 from qdrant_client.http.exceptions import UnexpectedResponse, ResponseHandlingException, ApiException
 
-from app.core.dependencies import QdrantManagerDep, require_documents_enabled, SubscriptionManagerDep
+from app.core.dependencies import (
+    QdrantManagerDep,
+    DocumentParserDep,
+    require_documents_enabled,
+    SubscriptionManagerDep,
+)
+from app.core.exceptions import DocumentTooLargeError
 from app.core.rate_limiting import limiter, get_default_limit, get_upload_limit
 from app.core.logger import log
 from app.services.qdrant_upload import QdrantUploadService
@@ -215,6 +221,7 @@ async def upload_document(
     user: User = Depends(current_active_user),
     qdrant_manager: QdrantManagerDep = None,
     subscription_manager: SubscriptionManagerDep = None,
+    document_parser: DocumentParserDep = None,
     _: None = Depends(require_documents_enabled),
 ) -> DocumentUploadResponse:
     """
@@ -231,6 +238,7 @@ async def upload_document(
         user: Authenticated user (automatically injected from JWT token)
         qdrant_manager: Injected Qdrant manager dependency
         subscription_manager: Subscription manager for access control
+        document_parser: Process-pool parser for PDF/DOCX content
 
     Returns:
         Upload result with file_id and metadata
@@ -286,7 +294,12 @@ async def upload_document(
         validate_file_content_type(file_bytes, file_ext, request_id=getattr(request.state, 'request_id', None))
 
         # Create upload service instance
-        upload_service = QdrantUploadService(qdrant_client=qdrant_manager.qclient)
+        # Reuse the app's LLMManager rather than loading the models again per upload
+        upload_service = QdrantUploadService(
+            qdrant_client=qdrant_manager.qclient,
+            llm_manager=getattr(request.app.state, "llm_manager", None),
+            document_parser=document_parser,
+        )
 
         # Upload file with username metadata
         result = await upload_service.upload_file(
@@ -337,26 +350,29 @@ async def upload_document(
         )
 
         # Track subscription usage for document upload
-        # Use actual text content from upload result instead of raw file bytes
-        char_count = result.get('char_count')
-        if char_count is None:
-            # Fallback: use sum of character counts from all chunks
-            chunks = result.get('chunks', [])
-            if chunks and hasattr(chunks[0], 'text'):
-                char_count = sum(len(chunk.text) for chunk in chunks)
-                log.info(
-                    f"char_count missing from upload result for user={username}, "
-                    f"file={file.filename}; calculated {char_count} chars from {len(chunks)} chunks"
-                )
-            else:
-                # Final fallback: use file size as proxy
-                file_size_bytes = len(file_bytes)
-                char_count = max(file_size_bytes, 100)
-                log.warning(
-                    f"upload_service missing char_count and chunks for user={username}, "
-                    f"file={file.filename}; using file_size={file_size_bytes} as estimate"
-                )
-        estimated_tokens = max(1, math.ceil(char_count / CHARS_PER_TOKEN_ESTIMATE))
+        # Prefer tokenizer counts of the uploaded chunks; otherwise estimate from
+        # the extracted text length instead of raw file bytes
+        estimated_tokens = result.get('token_count')
+        if estimated_tokens is None:
+            char_count = result.get('char_count')
+            if char_count is None:
+                # Fallback: use sum of character counts from all chunks
+                chunks = result.get('chunks', [])
+                if chunks and hasattr(chunks[0], 'text'):
+                    char_count = sum(len(chunk.text) for chunk in chunks)
+                    log.info(
+                        f"char_count missing from upload result for user={username}, "
+                        f"file={file.filename}; calculated {char_count} chars from {len(chunks)} chunks"
+                    )
+                else:
+                    # Final fallback: use file size as proxy
+                    file_size_bytes = len(file_bytes)
+                    char_count = max(file_size_bytes, 100)
+                    log.warning(
+                        f"upload_service missing char_count and chunks for user={username}, "
+                        f"file={file.filename}; using file_size={file_size_bytes} as estimate"
+                    )
+            estimated_tokens = max(1, math.ceil(char_count / CHARS_PER_TOKEN_ESTIMATE))
         await track_subscription_tokens(
             user, subscription_manager,
             "/documents/upload",
@@ -373,6 +389,21 @@ async def upload_document(
             metadata={},
         )
 
+    except DocumentTooLargeError as e:
+        safe_record_metric(
+            "document_upload_errors",
+            metric_type="counter",
+            labels={"error_type": "413_too_many_pages", "file_type": file_ext}
+        )
+        error = create_validation_error(
+            field="file",
+            message=e.message,
+            request_id=getattr(request.state, 'request_id', None)
+        )
+        raise HTTPException(
+            status_code=413,
+            detail=error.model_dump()
+        )
     except HTTPException as http_exc:
         # Record HTTP error metrics if not already recorded - use safe_record_metric in error paths
         if http_exc.status_code == 400:
@@ -5,24 +5,34 @@ Provides three endpoints:
 - /health - Detailed status of all services
 - /health/ready - Readiness probe (all services available)
 - /health/live - Liveness probe (app is running)
+
+When the HealthMonitor is running, /health and /health/ready serve its
+background-refreshed snapshot, with each service's age and probe latencies,
+instead of probing every dependency (including a real embedding call) on
+every request. Without it they probe live.
 """
 
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from fastapi import APIRouter, Request, Response, status
 from sqlalchemy import text
 
 from app.core.dependencies import (
     get_cache_service,
+    get_health_monitor,
     get_llm_manager,
     get_qdrant_manager,
 )
 from app.core.chat_dependencies import get_feature_flags, get_chat_config
 from app.core.logger import log
+from app.services.health_monitor import HealthProbe
 
 router = APIRouter(prefix="/health", tags=["health"])
 
+# Services that must be healthy for the API to serve traffic
+CRITICAL_SERVICES = ("database", "qdrant", "llm")
+
 
 async def check_database_health() -> Dict[str, Any]:
     """
@@ -289,6 +299,52 @@ async def check_llm_health(request: Request) -> Dict[str, Any]:
         }
 
 
+def build_health_probes(app, settings=None) -> List[HealthProbe]:
+    """
+    Background probes for the services reported by /health.
+
+    The embedding model probe generates a real vector, so it runs on its own,
+    longer interval.
+    """
+    if settings is None:
+        from app.config.settings import get_settings
+        settings = get_settings()
+
+    # The checks only read app.state through the request
+    request = Request({"type": "http", "app": app})
+    interval = settings.health_probe_interval_seconds
+    return [
+        HealthProbe("database", lambda: check_database_health(), interval, critical=True),
+        HealthProbe("qdrant", lambda: check_qdrant_health(request), interval, critical=True),
+        HealthProbe("redis", lambda: check_redis_health(request), interval),
+        HealthProbe("llm", lambda: check_llm_health(request), settings.health_llm_probe_interval_seconds, critical=True),
+        HealthProbe("chat_history", lambda: check_chat_history_health(request), interval),
+    ]
+
+
+async def probe_services_live(request: Request) -> Dict[str, Dict[str, Any]]:
+    """Probe every service now, in parallel."""
+    checks = {
+        "database": check_database_health(),
+        "qdrant": check_qdrant_health(request),
+        "redis": check_redis_health(request),
+        "llm": check_llm_health(request),
+        "chat_history": check_chat_history_health(request),
+    }
+    results = await asyncio.gather(*checks.values(), return_exceptions=True)
+
+    # Handle exceptions from gather
+    return {
+        name: {"status": "error", "message": str(result)} if isinstance(result, Exception) else result
+        for name, result in zip(checks, results)
+    }
+
+
+def is_service_up(service_health: Dict[str, Any]) -> bool:
+    """Healthy and, for a cached result, not stale."""
+    return service_health.get("status") == "healthy" and not service_health.get("stale", False)
+
+
 @router.get("", summary="Comprehensive health check")
 async def health_check(request: Request, response: Response) -> Dict[str, Any]:
     """
@@ -300,38 +356,26 @@ async def health_check(request: Request, response: Response) -> Dict[str, Any]:
     - Qdrant vector database
     - Redis cache
     - LLM service
+
+    ``source`` is "snapshot" when served from the background monitor (each
+    service then carries ``age_seconds``, ``stale`` and probe ``latency_ms``)
+    and "live" when the services were probed for this request.
     
     Returns 200 if all critical services are healthy, 503 if any are unhealthy.
     """
-    # Check all services in parallel for faster response
-    db_health, qdrant_health, redis_health, llm_health, chat_health = await asyncio.gather(
-        check_database_health(),
-        check_qdrant_health(request),
-        check_redis_health(request),
-        check_llm_health(request),
-        check_chat_history_health(request),
-        return_exceptions=True
-    )
-    
-    # Handle exceptions from gather
-    if isinstance(db_health, Exception):
-        db_health = {"status": "error", "message": str(db_health)}
-    if isinstance(qdrant_health, Exception):
-        qdrant_health = {"status": "error", "message": str(qdrant_health)}
-    if isinstance(redis_health, Exception):
-        redis_health = {"status": "error", "message": str(redis_health)}
-    if isinstance(llm_health, Exception):
-        llm_health = {"status": "error", "message": str(llm_health)}
-    if isinstance(chat_health, Exception):
-        chat_health = {"status": "error", "message": str(chat_health)}
+    monitor = get_health_monitor(request)
+    if monitor is not None and monitor.running:
+        services = monitor.snapshot()
+        source = "snapshot"
+    else:
+        services = await probe_services_live(request)
+        source = "live"
     
     # Determine overall status
     # Critical services: database, qdrant, llm
     # Non-critical: redis (can run without cache)
-    critical_services_healthy = (
-        db_health.get("status") == "healthy" and
-        qdrant_health.get("status") == "healthy" and
-        llm_health.get("status") == "healthy"
+    critical_services_healthy = all(
+        is_service_up(services.get(name, {})) for name in CRITICAL_SERVICES
     )
     
     overall_status = "healthy" if critical_services_healthy else "unhealthy"
@@ -345,13 +389,8 @@ async def health_check(request: Request, response: Response) -> Dict[str, Any]:
     return {
         "status": overall_status,
         "version": "1.0.0",
-        "services": {
-            "database": db_health,
-            "qdrant": qdrant_health,
-            "redis": redis_health,
-            "llm": llm_health,
-            "chat_history": chat_health
-        }
+        "source": source,
+        "services": services
     }
 
 
@@ -361,33 +400,32 @@ async def readiness_check(request: Request, response: Response) -> Dict[str, str
     Kubernetes readiness probe.
     
     Checks if the application is ready to serve traffic by verifying
-    that all critical services (database, Qdrant, LLM) are available.
+    that all critical services (database, Qdrant, LLM) are available,
+    using the background monitor's snapshot when it is running.
     
     Returns 200 if ready, 503 if not ready.
     """
     try:
-        # Check critical services only (faster than full health check)
-        db_health, qdrant_health, llm_health = await asyncio.gather(
-            check_database_health(),
-            check_qdrant_health(request),
-            check_llm_health(request),
-            return_exceptions=True
-        )
-        
-        # Handle exceptions
-        if isinstance(db_health, Exception):
-            db_health = {"status": "error"}
-        if isinstance(qdrant_health, Exception):
-            qdrant_health = {"status": "error"}
-        if isinstance(llm_health, Exception):
-            llm_health = {"status": "error"}
+        monitor = get_health_monitor(request)
+        if monitor is not None and monitor.running:
+            snapshot = monitor.snapshot()
+            critical_health = [snapshot.get(name, {}) for name in CRITICAL_SERVICES]
+        else:
+            # Check critical services only (faster than full health check)
+            critical_health = await asyncio.gather(
+                check_database_health(),
+                check_qdrant_health(request),
+                check_llm_health(request),
+                return_exceptions=True
+            )
+            # Handle exceptions
+            critical_health = [
+                {"status": "error"} if isinstance(health, Exception) else health
+                for health in critical_health
+            ]
         
         # Check if all critical services are healthy
-        is_ready = (
-            db_health.get("status") == "healthy" and
-            qdrant_health.get("status") == "healthy" and
-            llm_health.get("status") == "healthy"
-        )
+        is_ready = all(is_service_up(health) for health in critical_health)
         
         if is_ready:
             response.status_code = status.HTTP_200_OK
@@ -9,6 +9,7 @@ from app.core.dependencies import (
     LLMManagerDep,
     QdrantManagerDep,
     CacheServiceDep,
+    SemanticCacheDep,
     ChatHistoryServiceDep,
     ChatQdrantServiceDep,
     SubscriptionManagerDep,
@@ -38,6 +39,8 @@ from app.core.models import (
     ConversationMessage,
 )
 from app.services.monitoring_helpers import safe_record_metric
+from app.services.token_counter import get_token_counter
+from app.services.context_packer import ContextPacker, select_context_window
 from app.core.exceptions import (
     LLMError,
     LLMTimeoutError,
@@ -61,6 +64,7 @@ from app.core.constants import (
     CHAT_CONTEXT_WINDOW_CHARS,
     CONTEXT_BUFFER_TOKENS,
     CHARS_PER_TOKEN_ESTIMATE,
+    MIN_CONTEXT_WINDOW,
     AVERAGE_MESSAGE_LENGTH_CHARS,
     MAX_CONVERSATION_HISTORY_MESSAGES,
     DEFAULT_PDF_CONTEXT_LIMIT,
@@ -482,16 +486,87 @@ async def retrieve_user_document_context(
     return context_messages
 
 
+def semantic_cache_scope(
+    semantic_cache: Any,
+    body: HybridQueryRequest,
+    immersive: bool,
+    prompt_type: Optional[str],
+    refeed: bool,
+    temperature: float,
+) -> str:
+    """Semantic cache scope: the collection plus every request option that changes the answer."""
+    return semantic_cache.scope_key(
+        body.collection,
+        immersive=immersive,
+        prompt_type=prompt_type,
+        refeed=refeed,
+        temperature=temperature,
+        filter=body.filter,
+        vector_types=sorted(body.vector_types or []),
+        payload=sorted(body.payload or []),
+    )
+
+
+def pack_context_nodes(
+    nodes: List[Any],
+    conversation_history: List[Any] = None,
+    query_str: str = "",
+) -> List[Any]:
+    """
+    Pack retrieved nodes into the token budget left in the default context window.
+
+    The budget is the default window minus the response buffer, the query and
+    the conversation history, so the prompt fits the default window and the
+    model keeps its loaded ``num_ctx``. Returns nodes unchanged when packing is
+    disabled.
+
+    Args:
+        nodes: Retrieved (fused) nodes with payload and score
+        conversation_history: Previous conversation messages
+        query_str: Current query text
+
+    Returns:
+        Packed nodes in score order
+    """
+    settings = get_settings()
+    if not settings.context_packing_enabled or not nodes:
+        return nodes
+
+    texts = [query_str] + [msg.text for msg in conversation_history or [] if hasattr(msg, "text")]
+    fixed_tokens = sum(get_token_counter().count_batch(texts))
+    budget = max(
+        settings.default_context_window - CONTEXT_BUFFER_TOKENS - fixed_tokens,
+        MIN_CONTEXT_WINDOW,
+    )
+
+    packed = ContextPacker().pack(nodes, budget)
+    log.info(
+        f"Packed {len(packed.nodes)}/{len(nodes)} nodes into {packed.token_count}/{budget} tokens "
+        f"({packed.duplicates_dropped} near-duplicates, {packed.over_budget_dropped} over budget, "
+        f"{len(packed.truncated_ids)} truncated)"
+    )
+    return packed.nodes
+
+
 def calculate_required_context_window(
-    nodes: List[Any], conversation_history: List[Any] = None, query_length: int = 0
+    nodes: List[Any],
+    conversation_history: List[Any] = None,
+    query_length: int = 0,
+    query_str: Optional[str] = None,
 ) -> tuple[int, str]:
     """
     Calculate required context window based on actual content size.
 
+    Token counts come from the served model's tokenizer (see TokenCounter), so
+    the window tracks what the model will actually see. Windows larger than
+    the default are picked from a fixed set of sizes (see
+    ``context_window_tiers``) so the model is not reloaded for every new size.
+
     Args:
         nodes: Retrieved nodes with text content
         conversation_history: Previous conversation messages
-        query_length: Length of current query in characters
+        query_length: Length of current query in characters (used if query_str is not given)
+        query_str: Current query text
 
     Returns:
         Tuple of (context_window_size, reasoning)
@@ -501,10 +576,9 @@ def calculate_required_context_window(
     default_context = settings.default_context_window
     max_context = settings.max_context_window
 
-    # Calculate total content length
-    total_content_length = query_length
+    texts = [query_str] if query_str is not None else []
 
-    # Add node content length
+    # Add node content
     for node in nodes:
         if hasattr(node, "payload") and isinstance(node.payload, dict):
             text = (
@@ -512,16 +586,17 @@ def calculate_required_context_window(
                 or node.payload.get("summary", "")
                 or node.payload.get("conjecture", "")
             )
-            total_content_length += len(text)
+            texts.append(text)
 
-    # Add conversation history length
+    # Add conversation history
     if conversation_history:
         for msg in conversation_history:
             if hasattr(msg, "text"):
-                total_content_length += len(msg.text)
+                texts.append(msg.text)
 
-    # Estimate tokens using configured character-to-token ratio
-    estimated_tokens = total_content_length // CHARS_PER_TOKEN_ESTIMATE
+    estimated_tokens = sum(get_token_counter().count_batch(texts))
+    if query_str is None:
+        estimated_tokens += query_length // CHARS_PER_TOKEN_ESTIMATE
 
     # Add buffer for system prompts and response
     estimated_tokens += CONTEXT_BUFFER_TOKENS
@@ -531,10 +606,7 @@ def calculate_required_context_window(
         context_window = default_context
         reasoning = f"Using default context ({estimated_tokens} estimated tokens < {default_context})"
     elif estimated_tokens <= max_context:
-        # Round up to nearest 1024 for efficiency
-        context_window = ((estimated_tokens + 1023) // 1024) * 1024
-        # Clamp to max_context to prevent exceeding configured limit
-        context_window = min(context_window, max_context)
+        context_window = select_context_window(estimated_tokens, default_context, max_context)
         reasoning = f"Scaled context to {context_window} for {estimated_tokens} estimated tokens"
     else:
         context_window = max_context
@@ -814,6 +886,7 @@ async def ask_a_philosophy_question(
     chat_history_service: ChatHistoryServiceDep,
     chat_qdrant_service: ChatQdrantServiceDep,
     subscription_manager: SubscriptionManagerDep,
+    semantic_cache: SemanticCacheDep,
     refeed: bool = Query(
         True,
         description="If true, the text content of meta_nodes is used to refine and retrieve more specific nodes from sub-collection.",
@@ -909,6 +982,24 @@ async def ask_a_philosophy_question(
                 detail="Failed to extract username from authentication token"
             )
 
+    # Semantic answer cache: only for self-contained questions (no chat history or user documents)
+    cache_embedding = None
+    cache_scope = None
+    if semantic_cache is not None:
+        if body.conversation_history or include_pdf_context or (session_id and is_chat_history_enabled()):
+            semantic_cache.record_bypass()
+        else:
+            try:
+                cache_embedding = await llm_manager.generate_dense_vector(body.query_str)
+                cache_scope = semantic_cache_scope(semantic_cache, body, immersive, prompt_type, refeed, temperature)
+                cached = await semantic_cache.lookup(cache_embedding, body.collection, cache_scope)
+            except Exception as e:
+                log.warning(f"Semantic cache lookup failed, answering without it: {e}")
+                cache_embedding, cached = None, None
+            if cached is not None:
+                await track_subscription_usage(user, subscription_manager, "/ask_philosophy", cached.text)
+                return AskPhilosophyResponse(text=cached.text, raw=cached.raw)
+
     try:
         # Store user query if chat history is enabled
         await store_chat_message_safely(
@@ -1040,11 +1131,12 @@ async def ask_a_philosophy_question(
             context_window_limit=CHAT_CONTEXT_WINDOW_CHARS,  # Reserve space for conversation context
         )
 
-        # Calculate required context window based on actual content
+        # Fit retrieved context into the default window, then size the window
+        nodes = pack_context_nodes(nodes, conversation_history, body.query_str)
         context_window, reasoning = calculate_required_context_window(
             nodes=nodes,
             conversation_history=conversation_history,
-            query_length=len(body.query_str),
+            query_str=body.query_str,
         )
 
         # Log context window decision with metrics
@@ -1089,6 +1181,12 @@ async def ask_a_philosophy_question(
             text=processed_response_text, raw=response.raw
         )
 
+        if cache_embedding is not None:
+            await semantic_cache.store(
+                cache_embedding, body.collection, cache_scope,
+                query=body.query_str, text=processed_response_text, raw=response.raw,
+            )
+
         return processed_response
 
     except HTTPException:
@@ -1312,11 +1410,12 @@ async def ask_a_philosophy_question_stream(
                 context_window_limit=CHAT_CONTEXT_WINDOW_CHARS,
             )
 
-            # Calculate required context window
+            # Fit retrieved context into the default window, then size the window
+            nodes = pack_context_nodes(nodes, conversation_history, body.query_str)
             context_window, reasoning = calculate_required_context_window(
                 nodes=nodes,
                 conversation_history=conversation_history,
-                query_length=len(body.query_str),
+                query_str=body.query_str,
             )
 
             log.info(
@@ -1525,11 +1624,12 @@ async def gather_points_from_collections(
             await track_subscription_usage(current_user, subscription_manager, "/query_hybrid", response_content)
             return nodes
 
-        # Calculate required context window for vetting
+        # Fit retrieved context into the default window, then size the window for vetting
+        nodes = pack_context_nodes(nodes, query_str=body.query_str)
         context_window, reasoning = calculate_required_context_window(
             nodes=nodes,
             conversation_history=None,  # No conversation history in vet mode
-            query_length=len(body.query_str),
+            query_str=body.query_str,
         )
 
         # Log context window decision with metrics
@@ -20,6 +20,7 @@ from app.core.user_models import User, UserRead
 from app.core.rate_limiting import limiter, get_default_limit
 from app.core.logger import log
 from app.config.settings import get_settings
+from app.services.audit_log import record_audit_event
 from app.core.error_responses import (
     create_validation_error,
     create_not_found_error,
@@ -104,6 +105,8 @@ class WebhookResponse(BaseModel):
     """Response model for webhook processing."""
     received: bool = Field(True, description="Whether webhook was received successfully")
     processed: bool = Field(..., description="Whether webhook was processed successfully")
+    queued: bool = Field(False, description="Whether the event was queued for background processing")
+    duplicate: bool = Field(False, description="Whether the event had been received before")
     event_type: str = Field(..., description="Stripe event type")
 
 
@@ -146,7 +149,7 @@ async def _verify_webhook_signature(
             request_id=request_id
         )
         raise HTTPException(status_code=400, detail=error.model_dump())
-    except stripe.error.SignatureVerificationError as e:
+    except stripe.SignatureVerificationError as e:
         log.warning(f"Invalid Stripe webhook signature: {e}")
         error = create_validation_error(
             field="signature",
@@ -348,6 +351,19 @@ async def cancel_subscription(
         
         if success:
             log.info(f"Subscription cancelled for user {current_user.id}")
+            record_audit_event(
+                "subscription.cancelled",
+                actor_type="user",
+                actor_id=current_user.id,
+                subject_type="subscription",
+                subject_id=subscription.id,
+                user_id=current_user.id,
+                request_id=getattr(request.state, 'request_id', None),
+                details={
+                    "stripe_subscription_id": subscription.stripe_subscription_id,
+                    "access_until": subscription.current_period_end,
+                }
+            )
             return {
                 "message": "Subscription cancelled successfully",
                 "cancelled": True,
@@ -651,8 +667,10 @@ async def handle_stripe_webhook(
     """
     Handle Stripe webhook events.
 
-    Processes subscription lifecycle events and payment notifications.
-    Validates webhook signature for security and enforces idempotency.
+    Validates the webhook signature, then stores the event in the webhook
+    queue and acknowledges it; the queue worker applies subscription lifecycle
+    events and payment notifications in order per customer. Redelivered
+    events are acknowledged without being queued again.
     """
     try:
         # Get raw request body for signature validation
@@ -698,8 +716,19 @@ async def handle_stripe_webhook(
             )
             raise HTTPException(status_code=400, detail=error.model_dump())
 
-        # ATOMIC IDEMPOTENCY CHECK: This INSERT...ON CONFLICT operation ensures
-        # that only ONE process can successfully claim this event for processing
+        # Normally the event is stored and acknowledged here, and applied in the background
+        webhook_queue = getattr(request.app.state, 'webhook_queue', None)
+        if webhook_queue is not None:
+            queued = await webhook_queue.enqueue(event)
+            return WebhookResponse(
+                received=True,
+                processed=False,
+                queued=queued,
+                duplicate=not queued,
+                event_type=event_type
+            )
+
+        # No queue worker: apply inline, guarded by the same event-ID idempotency record
         is_first_processing = await payment_service.check_webhook_processed(
             event_id=event_id,
             event_type=event_type,
@@ -712,44 +741,16 @@ async def handle_stripe_webhook(
             return WebhookResponse(
                 received=True,
                 processed=True,  # Already processed successfully
+                duplicate=True,
                 event_type=event_type
             )
 
-        # This is the first time processing this event - proceed with business logic
-        log.info(f"Processing Stripe webhook event: {event_id} ({event_type}) for the first time")
-
-        # Process different event types
-        processed = False
-
-        if event_type == 'checkout.session.completed':
-            processed = await _handle_checkout_completed(event, payment_service)
-
-        elif event_type == 'customer.subscription.created':
-            processed = await _handle_subscription_created(event, payment_service)
-
-        elif event_type == 'customer.subscription.updated':
-            processed = await _handle_subscription_updated(event, payment_service)
-
-        elif event_type == 'customer.subscription.deleted':
-            processed = await _handle_subscription_deleted(event, payment_service)
-
-        elif event_type == 'invoice.payment_succeeded':
-            processed = await _handle_payment_succeeded(event, payment_service)
-
-        elif event_type == 'invoice.payment_failed':
-            processed = await _handle_payment_failed(event, payment_service)
-
-        else:
-            log.info(f"Unhandled Stripe webhook event type: {event_type}")
-            processed = True  # Mark as processed to avoid retries
-
-        if processed:
-            log.info(f"Successfully processed Stripe webhook event: {event_type}")
-            # Event already marked as processed by check_webhook_processed() - no need for additional marking
-        else:
-            log.error(f"Failed to process Stripe webhook event: {event_type}")
-            # TODO: Consider implementing rollback mechanism to remove webhook_events entry
-            # if processing fails, allowing retry on next webhook delivery
+        log.info(f"Processing Stripe webhook event: {event_id} ({event_type}) inline")
+        processed = await process_webhook_event(
+            event,
+            payment_service,
+            getattr(request.app.state, 'subscription_manager', None)
+        )
 
         return WebhookResponse(
             received=True,
@@ -768,6 +769,82 @@ async def handle_stripe_webhook(
         raise HTTPException(status_code=500, detail=error.model_dump())
 
 
+async def process_webhook_event(event: Dict[str, Any], payment_service, subscription_manager=None) -> bool:
+    """
+    Apply a verified Stripe webhook event.
+
+    Called by the WebhookQueue worker (or inline when no worker runs).
+
+    Returns:
+        True if the event was applied (or needs no handling), False to retry it
+    """
+    event_type = event.get('type', 'unknown')
+
+    if event_type == 'checkout.session.completed':
+        processed = await _handle_checkout_completed(event, payment_service)
+
+    elif event_type == 'customer.subscription.created':
+        processed = await _handle_subscription_created(event, payment_service)
+
+    elif event_type == 'customer.subscription.updated':
+        processed = await _handle_subscription_updated(event, payment_service)
+
+    elif event_type == 'customer.subscription.deleted':
+        processed = await _handle_subscription_deleted(event, payment_service)
+
+    elif event_type == 'invoice.payment_succeeded':
+        processed = await _handle_payment_succeeded(event, payment_service)
+
+    elif event_type == 'invoice.payment_failed':
+        processed = await _handle_payment_failed(event, payment_service)
+
+    else:
+        log.info(f"Unhandled Stripe webhook event type: {event_type}")
+        processed = True  # Mark as processed to avoid retries
+
+    if event_type in _SUBSCRIPTION_CHANGING_EVENTS:
+        # Drop cached tier/entitlements so the next request sees the change
+        await _invalidate_cached_subscription(event, subscription_manager)
+
+    if processed:
+        log.info(f"Successfully processed Stripe webhook event: {event_type}")
+    else:
+        log.error(f"Failed to process Stripe webhook event: {event_type}")
+    return processed
+
+
+# Webhook events that can change a user's tier or subscription status
+_SUBSCRIPTION_CHANGING_EVENTS = frozenset({
+    'checkout.session.completed',
+    'customer.subscription.created',
+    'customer.subscription.updated',
+    'customer.subscription.deleted',
+    'invoice.payment_succeeded',
+    'invoice.payment_failed',
+})
+
+
+async def _invalidate_cached_subscription(event: Dict[str, Any], subscription_manager) -> None:
+    """Invalidate cached subscription data for the user a webhook event refers to."""
+    if not subscription_manager:
+        return
+
+    obj = event.get('data', {}).get('object', {})
+    if event.get('type', '').startswith('customer.subscription.'):
+        stripe_subscription_id = obj.get('id')
+    else:
+        stripe_subscription_id = obj.get('subscription')
+
+    try:
+        user_ids = await subscription_manager.invalidate_stripe_subscription(
+            stripe_subscription_id=stripe_subscription_id,
+            stripe_customer_id=obj.get('customer')
+        )
+        log.debug(f"Invalidated cached subscriptions for users {user_ids} after {event.get('type')}")
+    except Exception as e:
+        log.warning(f"Failed to invalidate cached subscription for webhook {event.get('id')}: {e}")
+
+
 # Webhook event handlers
 async def _handle_checkout_completed(event: Dict[str, Any], payment_service) -> bool:
     """Handle successful checkout session completion."""
@@ -0,0 +1,285 @@
+"""
+Append-only audit log for administrative and billing actions.
+
+Actions are recorded with ``record_audit_event`` (or ``AuditLog.record``),
+which only appends the event to an in-memory buffer and returns: auditing
+never waits on the database in the request that performs the action. A
+background writer inserts buffered events in batches, when a batch fills up
+or every ``flush_interval_seconds``. Failed batches stay buffered and are
+retried; when the buffer is full, new events are dropped and counted in the
+``audit_events_total{outcome="dropped"}`` metric.
+
+Events are never updated or deleted (the ORM refuses it here, and the
+migration adds a trigger doing the same on PostgreSQL). Listings are newest
+first and paginated with a cursor (the ID of the last event of the previous
+page), so deep pages cost the same as the first one.
+
+Action names are dotted, ``<subject>.<verb>``:
+
+    record_audit_event(
+        "subscription.override",
+        actor_type="admin", actor_id=admin.id,
+        subject_type="subscription", subject_id=user_id, user_id=user_id,
+        details={"old_tier": "free", "new_tier": "premium"},
+    )
+"""
+
+import asyncio
+import contextlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, insert, or_, select
+
+from app.core.database import AsyncSessionLocal
+from app.core.db_models import AuditEvent
+from app.core.logger import log
+from app.core.metrics import audit_log_pending, record_audit_events
+
+# The running AuditLog, set by run() and cleared by aclose()
+_active: Optional["AuditLog"] = None
+
+
+@event.listens_for(AuditEvent, "before_update")
+@event.listens_for(AuditEvent, "before_delete")
+def _reject_changes(mapper, connection, target):
+    raise PermissionError("audit_events is append-only")
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def record_audit_event(
+    action: str,
+    *,
+    actor_type: str = "system",
+    actor_id: Any = None,
+    subject_type: Optional[str] = None,
+    subject_id: Any = None,
+    user_id: Optional[int] = None,
+    details: Optional[Dict[str, Any]] = None,
+    request_id: Optional[str] = None,
+) -> None:
+    """Record an action on the running audit log; never blocks or raises."""
+    audit_log = _active
+    if audit_log is None:
+        log.debug(f"Audit log not running; not recording {action}")
+        return
+    audit_log.record(
+        action,
+        actor_type=actor_type,
+        actor_id=actor_id,
+        subject_type=subject_type,
+        subject_id=subject_id,
+        user_id=user_id,
+        details=details,
+        request_id=request_id,
+    )
+
+
+class AuditLog:
+    """
+    Buffers audit events and writes them in batches, managed by the application lifespan.
+
+    Access via app.core.dependencies.get_audit_log(); services record through
+    record_audit_event().
+
+    Args:
+        batch_size: Events written per INSERT; a full batch wakes the writer
+        flush_interval_seconds: Longest time an event waits in the buffer
+        max_pending: Buffered events beyond which new events are dropped
+        session_factory: Async session factory for the audit_events table
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 200,
+        flush_interval_seconds: float = 1.0,
+        max_pending: int = 10000,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self._session_factory = session_factory
+        self._pending: List[Dict[str, Any]] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def start(cls, settings=None) -> "AuditLog":
+        """Async factory method for lifespan-managed initialization; starts the writer."""
+        if settings is None:
+            from app.config.settings import get_settings
+            settings = get_settings()
+        instance = cls(
+            batch_size=settings.audit_batch_size,
+            flush_interval_seconds=settings.audit_flush_interval_seconds,
+            max_pending=settings.audit_max_pending,
+        )
+        instance.run()
+        log.info(f"AuditLog started (batches of {instance.batch_size}, flushed every {instance.flush_interval_seconds}s)")
+        return instance
+
+    def run(self) -> None:
+        """Start the background writer and route record_audit_event() here."""
+        global _active
+        _active = self
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._writer_loop(), name="audit-log")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def aclose(self):
+        """Async cleanup for lifespan management; writes buffered events first."""
+        global _active
+        if _active is self:
+            _active = None
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await self.flush()
+        if self._pending:
+            # Last resort: keep the events in the application log
+            log.error(
+                f"Audit log closed with {len(self._pending)} unwritten events",
+                extra={"event_type": "audit_events_unwritten", "events": self._pending}
+            )
+            self._pending = []
+        log.info("AuditLog cleaned up")
+
+    def record(
+        self,
+        action: str,
+        *,
+        actor_type: str = "system",
+        actor_id: Any = None,
+        subject_type: Optional[str] = None,
+        subject_id: Any = None,
+        user_id: Optional[int] = None,
+        details: Optional[Dict[str, Any]] = None,
+        request_id: Optional[str] = None,
+    ) -> None:
+        """Buffer an event for the writer; returns immediately."""
+        if len(self._pending) >= self.max_pending:
+            record_audit_events("dropped")
+            log.warning(f"Audit log buffer full; dropped {action}", extra={"event_type": "audit_event_dropped"})
+            return
+        self._pending.append({
+            "occurred_at": datetime.now(timezone.utc),
+            "action": action,
+            "actor_type": actor_type,
+            "actor_id": None if actor_id is None else str(actor_id),
+            "subject_type": subject_type,
+            "subject_id": None if subject_id is None else str(subject_id),
+            "user_id": user_id,
+            "request_id": request_id,
+            "details": details,
+        })
+        audit_log_pending.set(len(self._pending))
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """
+        Write buffered events in batches.
+
+        Stops at the first failed batch, which stays buffered for the next flush.
+
+        Returns:
+            Number of events written
+        """
+        written = 0
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[:self.batch_size]
+                try:
+                    async with self._session_factory() as session:
+                        await session.execute(insert(AuditEvent), [self._storable(row) for row in batch])
+                        await session.commit()
+                except Exception as e:
+                    record_audit_events("failed", len(batch))
+                    log.error(f"Failed to write {len(batch)} audit events: {e}", exc_info=True)
+                    break
+                del self._pending[:len(batch)]
+                written += len(batch)
+                record_audit_events("written", len(batch))
+        audit_log_pending.set(len(self._pending))
+        return written
+
+    @staticmethod
+    def _storable(row: Dict[str, Any]) -> Dict[str, Any]:
+        # Plain JSON details; serialized here rather than in record() to keep that cheap
+        if row["details"] is not None:
+            return {**row, "details": json.loads(json.dumps(row["details"], default=str))}
+        return row
+
+    async def _writer_loop(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_seconds)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                log.error(f"Audit log flush failed: {e}", exc_info=True)
+
+    async def query(
+        self,
+        *,
+        actor_id: Any = None,
+        user_id: Optional[int] = None,
+        subject_type: Optional[str] = None,
+        subject_id: Any = None,
+        action: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[int] = None,
+        limit: int = 100,
+    ) -> Tuple[List[AuditEvent], Optional[int]]:
+        """
+        List events newest first.
+
+        Args:
+            action: An action ('refund.initiated') or a subject prefix ('refund')
+            since, until: Time range of occurred_at, inclusive start, exclusive end
+            cursor: next_cursor of the previous page
+
+        Returns:
+            The page of events and the cursor of the next page (None on the last page)
+        """
+        stmt = select(AuditEvent).order_by(AuditEvent.id.desc()).limit(limit + 1)
+        if actor_id is not None:
+            stmt = stmt.where(AuditEvent.actor_id == str(actor_id))
+        if user_id is not None:
+            stmt = stmt.where(AuditEvent.user_id == user_id)
+        if subject_type is not None:
+            stmt = stmt.where(AuditEvent.subject_type == subject_type)
+        if subject_id is not None:
+            stmt = stmt.where(AuditEvent.subject_id == str(subject_id))
+        if action is not None:
+            stmt = stmt.where(or_(AuditEvent.action == action, AuditEvent.action.startswith(f"{action}.")))
+        if since is not None:
+            stmt = stmt.where(AuditEvent.occurred_at >= _as_utc(since))
+        if until is not None:
+            stmt = stmt.where(AuditEvent.occurred_at < _as_utc(until))
+        if cursor is not None:
+            stmt = stmt.where(AuditEvent.id < cursor)
+
+        async with self._session_factory() as session:
+            events = list((await session.execute(stmt)).scalars().all())
+        if len(events) > limit:
+            return events[:limit], events[limit - 1].id
+        return events, None
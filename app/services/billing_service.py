@@ -6,6 +6,8 @@ Handles API usage tracking, billing history management, and usage analytics
 with integration to existing database session management and logging.
 """
 
+import asyncio
+import contextlib
 from datetime import datetime, timedelta, timezone
 from dateutil.relativedelta import relativedelta
 from typing import Optional, Dict, Any, List, TYPE_CHECKING
@@ -19,6 +21,7 @@ from app.config.settings import get_settings
 from app.core.logger import log
 from app.core.db_models import UsageRecord, PaymentRecord, SubscriptionTier
 from app.core.database import AsyncSessionLocal
+from app.services.usage_analytics import UsageAggregate, roll_up_usage, usage_for_period, usage_for_range
 
 if TYPE_CHECKING:
     from app.services.cache_service import RedisCacheService
@@ -146,6 +149,7 @@ class BillingService:
         
         # Degraded mode flag indicates initialization failures
         self.degraded_mode = False
+        self._rollup_task: Optional[asyncio.Task] = None
         
         if cache_service is None:
             log.warning("BillingService initialized without cache_service - billing data will not be cached")
@@ -196,6 +200,46 @@ class BillingService:
         log.info("BillingService initialized for lifespan management")
         return instance
 
+    def run_usage_rollups(self, interval_seconds: float) -> None:
+        """Roll up closed days of usage in the background every ``interval_seconds``."""
+        if self._rollup_task is not None and not self._rollup_task.done():
+            return
+        self._rollup_task = asyncio.create_task(self._rollup_loop(interval_seconds), name="usage-rollup")
+
+    async def _rollup_loop(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.roll_up_closed_days()
+            except Exception as e:
+                log.error(f"Usage rollup failed: {e}", exc_info=True)
+            await asyncio.sleep(interval_seconds)
+
+    async def roll_up_closed_days(self) -> int:
+        """
+        Roll up usage of every closed (UTC) day into the daily rollup table.
+
+        Returns:
+            Number of days rolled up
+        """
+        today = datetime.now(timezone.utc).date()
+        async with AsyncSessionLocal() as session:
+            days = await roll_up_usage(session, through=today)
+        if days:
+            log.info(
+                f"Rolled up {days} day(s) of usage",
+                extra={"event_type": "usage_rolled_up", "days": days, "through": today.isoformat()}
+            )
+        return days
+
+    async def aclose(self):
+        """Async cleanup for lifespan management; stops the rollup loop."""
+        task, self._rollup_task = self._rollup_task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        log.info("BillingService cleaned up")
+
     def _load_overage_rates(self) -> Dict[SubscriptionTier, Decimal]:
         """Load overage rates for different subscription tiers."""
         return {
@@ -473,63 +517,37 @@ class BillingService:
                         subscription_tier=cached_stats.get("subscription_tier", SubscriptionTier.FREE)
                     )
 
-            # Query from database
+            # Aggregate in the database
             async with AsyncSessionLocal() as session:
-                stmt = select(UsageRecord).where(
-                    UsageRecord.user_id == user_id,
-                    UsageRecord.billing_period == period_key
-                )
-                result = await session.execute(stmt)
-                records = list(result.scalars().all())
+                usage = await usage_for_period(session, user_id, period_key)
 
-                # Parse period to get dates
-                year, month = map(int, period_key.split('-'))
-                billing_period = self._get_billing_period(year, month)
+            # Parse period to get dates
+            year, month = map(int, period_key.split('-'))
+            billing_period = self._get_billing_period(year, month)
+            subscription_tier = usage.subscription_tier or SubscriptionTier.FREE
 
-                if not records:
-                    return UsageStats(
-                        user_id=user_id,
-                        period=period_key,
-                        total_requests=0,
-                        total_tokens=0,
-                        endpoints_used={},
-                        subscription_tier=SubscriptionTier.FREE,
-                        period_start=billing_period.start_date,
-                        period_end=billing_period.end_date
-                    )
-
-                # Aggregate statistics
-                total_requests = len(records)
-                total_tokens = sum(r.tokens_used for r in records)
-                endpoints = {}
-                subscription_tier = records[0].subscription_tier if records else SubscriptionTier.FREE
-
-                for record in records:
-                    endpoint = record.endpoint
-                    endpoints[endpoint] = endpoints.get(endpoint, 0) + 1
-
-                stats = UsageStats(
-                    user_id=user_id,
-                    period=period_key,
-                    total_requests=total_requests,
-                    total_tokens=total_tokens,
-                    endpoints_used=endpoints,
-                    subscription_tier=subscription_tier,
-                    period_start=billing_period.start_date,
-                    period_end=billing_period.end_date
-                )
+            stats = UsageStats(
+                user_id=user_id,
+                period=period_key,
+                total_requests=usage.requests,
+                total_tokens=usage.tokens,
+                endpoints_used=usage.endpoints,
+                subscription_tier=subscription_tier,
+                period_start=billing_period.start_date,
+                period_end=billing_period.end_date
+            )
 
-                # Cache the results
-                if self.cache_service:
-                    cache_data = {
-                        "total_requests": total_requests,
-                        "total_tokens": total_tokens,
-                        "endpoints": endpoints,
-                        "subscription_tier": subscription_tier
-                    }
-                    await self.cache_service.set(cache_key, cache_data, 3600, cache_type='billing')
+            # Cache the results
+            if self.cache_service and usage.requests:
+                cache_data = {
+                    "total_requests": usage.requests,
+                    "total_tokens": usage.tokens,
+                    "endpoints": usage.endpoints,
+                    "subscription_tier": subscription_tier
+                }
+                await self.cache_service.set(cache_key, cache_data, 3600, cache_type='billing')
 
-                return stats
+            return stats
 
         except Exception as e:
             log.error(f"Error getting usage stats for user {user_id}, period {period}: {e}")
@@ -746,6 +764,24 @@ class BillingService:
             total_charge_cents=total_charge_cents
         )
 
+    async def _usage_by_month(self, user_id: int, periods: List[str]) -> UsageAggregate:
+        """
+        Usage over whole billing periods (YYYY-MM), bucketed per month.
+
+        Runs one aggregate query over the span of the periods; rolled-up days
+        are read from the daily rollups. Returns empty usage on error.
+        """
+        if not periods:
+            return UsageAggregate()
+        start = datetime.strptime(min(periods), "%Y-%m").replace(tzinfo=timezone.utc)
+        end = datetime.strptime(max(periods), "%Y-%m").replace(tzinfo=timezone.utc) + relativedelta(months=1)
+        try:
+            async with AsyncSessionLocal() as session:
+                return await usage_for_range(session, user_id, start, end, granularity="month")
+        except Exception as e:
+            log.error(f"Error aggregating usage for user {user_id}, periods {min(periods)}..{max(periods)}: {e}")
+            return UsageAggregate()
+
     async def get_usage_analytics(
         self, 
         user_id: int, 
@@ -795,28 +831,19 @@ class BillingService:
             current_date = datetime.now(timezone.utc)
             periods = [current_date.strftime("%Y-%m")]
 
-        # Collect usage stats for all periods
-        total_requests = 0
-        total_tokens = 0
-        endpoint_breakdown = {}
-        monthly_usage = []
-
-        for period in periods:
-            stats = await self.get_usage_stats(user_id, period)
-            total_requests += stats.total_requests
-            total_tokens += stats.total_tokens
-            
-            # Aggregate endpoint usage
-            for endpoint, count in stats.endpoints_used.items():
-                if endpoint not in endpoint_breakdown:
-                    endpoint_breakdown[endpoint] = 0
-                endpoint_breakdown[endpoint] += count
-            
-            monthly_usage.append({
+        # One aggregate query over all periods instead of one query per period
+        usage = await self._usage_by_month(user_id, periods)
+        total_requests = usage.requests
+        total_tokens = usage.tokens
+        endpoint_breakdown = usage.endpoints
+        monthly_usage = [
+            {
                 "period": period,
-                "requests": stats.total_requests,
-                "tokens": stats.total_tokens
-            })
+                "requests": usage.buckets.get(period, {}).get("requests", 0),
+                "tokens": usage.buckets.get(period, {}).get("tokens", 0)
+            }
+            for period in periods
+        ]
 
         analytics = {
             "user_id": user_id,
@@ -904,19 +931,18 @@ class BillingService:
             Dictionary containing trend analysis
         """
         current_date = datetime.now(timezone.utc)
-        trends_data = []
+        # Calculate the period dates using relativedelta for correct month arithmetic
+        periods = [(current_date - relativedelta(months=i)).strftime("%Y-%m") for i in range(months)]
+        usage = await self._usage_by_month(user_id, periods)
 
-        for i in range(months):
-            # Calculate the period date using relativedelta for correct month arithmetic
-            period_date = current_date - relativedelta(months=i)
-            period_key = period_date.strftime("%Y-%m")
-            stats = await self.get_usage_stats(user_id, period_key)
-            
+        trends_data = []
+        for period_key in periods:
+            bucket = usage.buckets.get(period_key, {})
             trends_data.append({
                 "period": period_key,
-                "requests": stats.total_requests,
-                "tokens": stats.total_tokens,
-                "endpoints": len(stats.endpoints_used)
+                "requests": bucket.get("requests", 0),
+                "tokens": bucket.get("tokens", 0),
+                "endpoints": len(usage.bucket_endpoints.get(period_key, ()))
             })
         
         # Calculate trends
@@ -290,6 +290,13 @@ class RedisCacheService:
             self._redis_available = False
             self._redis_client = None
 
+    @property
+    def redis_client(self):
+        """Underlying async Redis client, or None when Redis is unavailable."""
+        if not self._redis_available:
+            return None
+        return self._redis_client
+
     def _make_cache_key(self, prefix: str, *args, **kwargs) -> str:
         """
         Generate deterministic cache key from arguments.
@@ -746,6 +753,46 @@ class RedisCacheService:
             log.warning(f"Cache set error for {key}: {e}")
             return False
 
+    async def delete(self, key: str, cache_type: str = 'unknown') -> bool:
+        """
+        Delete a key from cache (used for invalidation).
+
+        Args:
+            key: Cache key
+            cache_type: Explicit cache type for metrics
+
+        Returns:
+            True if a key was removed, False otherwise
+        """
+        if not self._redis_available or not self._redis_client:
+            return False
+
+        _, per_attempt_timeout = calculate_per_attempt_timeout(5, max_retries=2)
+
+        try:
+            removed = await asyncio.wait_for(
+                self._redis_client.delete(key),
+                timeout=per_attempt_timeout
+            )
+            cache_operations_total.labels(
+                operation='delete',
+                cache_type=cache_type,
+                status='success'
+            ).inc()
+            return bool(removed)
+
+        except Exception as e:
+            with self._stats_lock:
+                self._errors += 1
+                self._stats['errors'] += 1
+            cache_operations_total.labels(
+                operation='delete',
+                cache_type=cache_type,
+                status='error'
+            ).inc()
+            log.warning(f"Cache delete error for {key}: {e}")
+            return False
+
     def cached(self, prefix: str, ttl: int):
         """
         Decorator factory for caching async function results.
@@ -5,6 +5,9 @@ This service provides comprehensive monitoring, logging, and health checks
 for the chat history system with privacy compliance tracking.
 """
 
+import json
+import os
+import socket
 import time
 import asyncio
 from datetime import datetime, timezone
@@ -15,11 +18,22 @@ from enum import Enum
 from collections import defaultdict, deque
 
 from app.core.logger import log
+from app.core.constants import (
+    QUANTILE_COARSE_RETENTION_SECONDS,
+    QUANTILE_SNAPSHOT_KEY_PREFIX,
+    QUANTILE_SNAPSHOT_TTL_SECONDS,
+    QUANTILE_SUMMARY_QUANTILES,
+    QUANTILE_SUMMARY_WINDOWS,
+)
 from app.core.chat_exceptions import ChatError, ChatErrorCategory, ChatErrorSeverity
 from app.core.database import AsyncSessionLocal
 from app.core.db_models import ChatConversation, ChatMessage
 from sqlmodel import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
+from prometheus_client import REGISTRY
+from prometheus_client.core import Metric
+
+from app.services.quantile_sketch import QuantileSketch, RollingQuantiles, merge_snapshots, summarize
 
 
 class HealthStatus(Enum):
@@ -38,6 +52,10 @@ class MetricType(Enum):
     TIMER = "timer"
 
 
+# Timers and histograms are summarized by streaming-quantile sketches instead of raw samples
+DISTRIBUTION_METRIC_TYPES = (MetricType.TIMER, MetricType.HISTOGRAM)
+
+
 @dataclass
 class PerformanceMetric:
     """Performance metric data structure."""
@@ -83,7 +101,8 @@ class ChatMonitoringService:
     Comprehensive monitoring service for chat history operations.
     
     Features:
-    - Performance metrics collection and aggregation
+    - Performance metrics collection and aggregation (timers and histograms
+      as mergeable streaming-quantile sketches over rolling windows)
     - Error tracking and analysis
     - Health checks for all chat components
     - Privacy compliance monitoring
@@ -93,6 +112,9 @@ class ChatMonitoringService:
     
     def __init__(self):
         self.metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
+        self.quantiles: Dict[str, RollingQuantiles] = defaultdict(RollingQuantiles)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._cluster_quantiles: Optional[Dict[str, Dict[str, QuantileSketch]]] = None
         self.error_counts: Dict[str, int] = defaultdict(int)
         self.performance_timers: Dict[str, float] = {}
         self.health_checks: Dict[str, HealthCheckResult] = {}
@@ -131,7 +153,10 @@ class ChatMonitoringService:
             labels=labels or {}
         )
 
-        self.metrics[name].append(metric)
+        if metric_type in DISTRIBUTION_METRIC_TYPES:
+            self.quantiles[name].add(value)
+        else:
+            self.metrics[name].append(metric)
 
         # Log significant metrics
         if metric_type == MetricType.COUNTER:
@@ -565,6 +590,13 @@ class ChatMonitoringService:
             "metrics": {}
         }
         
+        # Timers and histograms: quantiles from the rolling sketches (at most 24 hours)
+        window_seconds = min(hours * 3600, QUANTILE_COARSE_RETENTION_SECONDS)
+        for metric_name, rolling in self.quantiles.items():
+            sketch = rolling.window(window_seconds)
+            if sketch.count:
+                summary["metrics"][metric_name] = summarize(sketch, QUANTILE_SUMMARY_QUANTILES)
+
         for metric_name, metric_queue in self.metrics.items():
             recent_metrics = [m for m in metric_queue if m.timestamp >= cutoff_time]
             
@@ -573,16 +605,7 @@ class ChatMonitoringService:
             
             values = [m.value for m in recent_metrics]
             
-            if recent_metrics[0].metric_type == MetricType.TIMER:
-                # For timers, calculate statistics
-                summary["metrics"][metric_name] = {
-                    "count": len(values),
-                    "avg": sum(values) / len(values),
-                    "min": min(values),
-                    "max": max(values),
-                    "p95": sorted(values)[int(len(values) * 0.95)] if len(values) > 0 else 0
-                }
-            elif recent_metrics[0].metric_type == MetricType.COUNTER:
+            if recent_metrics[0].metric_type == MetricType.COUNTER:
                 # For counters, sum the values
                 summary["metrics"][metric_name] = {
                     "total": sum(values),
@@ -597,6 +620,50 @@ class ChatMonitoringService:
         
         return summary
     
+    def local_quantiles(self) -> Dict[str, Dict[str, QuantileSketch]]:
+        """This worker's sketches per metric and summary window."""
+        local: Dict[str, Dict[str, QuantileSketch]] = {}
+        for metric_name, rolling in list(self.quantiles.items()):
+            windows = {window: rolling.window(seconds) for window, seconds in QUANTILE_SUMMARY_WINDOWS.items()}
+            if any(sketch.count for sketch in windows.values()):
+                local[metric_name] = windows
+        return local
+
+    def quantile_snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """JSON-serializable form of ``local_quantiles`` for sharing between workers."""
+        return {
+            metric_name: {window: sketch.to_dict() for window, sketch in windows.items()}
+            for metric_name, windows in self.local_quantiles().items()
+        }
+
+    async def sync_quantiles(self, redis_client: Any) -> None:
+        """
+        Publish this worker's quantile snapshot to Redis and merge all workers' snapshots.
+
+        Each worker writes its snapshot under its own expiring key; the merged
+        result is what the Prometheus collector exports, so every worker
+        reports cluster-wide quantiles. Without Redis only local sketches are
+        exported.
+        """
+        key = f"{QUANTILE_SNAPSHOT_KEY_PREFIX}:{self.worker_id}"
+        try:
+            await redis_client.set(key, json.dumps(self.quantile_snapshot()), ex=QUANTILE_SNAPSHOT_TTL_SECONDS)
+            snapshots = []
+            async for worker_key in redis_client.scan_iter(match=f"{QUANTILE_SNAPSHOT_KEY_PREFIX}:*"):
+                raw = await redis_client.get(worker_key)
+                if raw:
+                    snapshots.append(json.loads(raw))
+            self._cluster_quantiles = merge_snapshots(snapshots)
+        except Exception:
+            self._cluster_quantiles = None
+            raise
+
+    def exported_quantiles(self) -> Dict[str, Dict[str, QuantileSketch]]:
+        """Sketches to export: the last cluster-wide merge if available, else this worker's."""
+        if self._cluster_quantiles is not None:
+            return self._cluster_quantiles
+        return self.local_quantiles()
+
     def cleanup_old_data(self) -> None:
         """Clean up old monitoring data to prevent memory leaks."""
         now = datetime.now(timezone.utc)
@@ -621,7 +688,7 @@ class ChatMonitoringService:
             "service": "chat_monitoring",
             "status": "active",
             "timestamp": datetime.now(timezone.utc).isoformat(),
-            "metrics_tracked": len(self.metrics),
+            "metrics_tracked": len(self.metrics) + len(self.quantiles),
             "error_types_tracked": len(self.error_counts),
             "privacy_violations": len(self.privacy_violations),
             "active_timers": len(self.performance_timers),
@@ -629,8 +696,34 @@ class ChatMonitoringService:
         }
 
 
+class ChatQuantileCollector:
+    """Prometheus collector exporting chat timers and histograms as summaries with quantiles."""
+
+    metric_name = "chat_monitoring_summary"
+
+    def __init__(self, service: ChatMonitoringService):
+        self.service = service
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        family = Metric(self.metric_name, "Chat monitoring timers and histograms over rolling windows", "summary")
+        for metric_name, windows in self.service.exported_quantiles().items():
+            for window, sketch in windows.items():
+                labels = {"metric": metric_name, "window": window}
+                for q in QUANTILE_SUMMARY_QUANTILES:
+                    value = sketch.quantile(q)
+                    family.add_sample(self.metric_name, {**labels, "quantile": str(q)},
+                                      value if value is not None else float("nan"))
+                family.add_sample(f"{self.metric_name}_count", labels, sketch.count)
+                family.add_sample(f"{self.metric_name}_sum", labels, sketch.sum)
+        yield family
+
+
 # Global monitoring service instance
 chat_monitoring = ChatMonitoringService()
+REGISTRY.register(ChatQuantileCollector(chat_monitoring))
 
 
 def monitor_chat_operation(operation_name: str):
@@ -31,6 +31,10 @@ if TYPE_CHECKING:
     from app.services.expansion_service import ExpansionService
 
 
+DENSE_VECTOR_SIZE = 4096  # Size for Salesforce/sfr-embedding-mistral model
+SPARSE_VECTOR_NAME = "sparse"
+
+
 class ChatQdrantService:
     """
     Service for managing chat history vector operations with environment-aware collection management.
@@ -39,9 +43,16 @@ class ChatQdrantService:
     - Environment-specific collection names (Chat_History_Dev, Chat_History_Test, Chat_History)
     - Automatic collection initialization and validation
     - Message vector generation and upload with chunking support
-    - Semantic search with strict session filtering
+    - Hybrid (sparse + dense) search with strict session filtering
     - Privacy isolation between users
 
+    Chat collections store a dense embedding (the unnamed default vector) and a
+    SPLADE sparse vector (``sparse``) per chunk. Searches prefetch candidates
+    with both and fuse them with RRF inside Qdrant, so exact names and terms
+    from past conversations are found even when the dense embedding blurs
+    them. Collections created before sparse vectors were added keep working
+    dense-only until migrated with migrate_to_hybrid().
+
     LIFECYCLE: This service is lifespan-managed. It is initialized during
     application startup and stored in app.state. Access via dependency
     injection using get_chat_qdrant_service() from app.core.dependencies.
@@ -71,6 +82,8 @@ class ChatQdrantService:
         self.timeout_seconds = 30
         self.retry_attempts = 3
         self.max_chunk_size = 1000  # Maximum characters per chunk for long messages
+        self.hybrid_prefetch_multiplier = 4  # Chunk candidates per requested message, for each vector
+        self._collection_is_hybrid: Optional[bool] = None
 
         # Load fusion configuration
         try:
@@ -79,6 +92,7 @@ class ChatQdrantService:
             self.fusion_methods = [m.strip() for m in settings.fusion_methods.split(",")] if settings.fusion_methods else ["hyde", "rag_fusion"]
             self.fusion_rrf_k = settings.fusion_rrf_k
             self.fusion_max_queries = settings.fusion_max_queries
+            self.hybrid_search = settings.chat_hybrid_search
 
             if self.use_fusion and not self.expansion_service:
                 log.warning("Fusion search enabled but ExpansionService not provided - fusion will be disabled")
@@ -90,6 +104,7 @@ class ChatQdrantService:
             self.fusion_methods = ["hyde", "rag_fusion"]
             self.fusion_rrf_k = 60
             self.fusion_max_queries = 4
+            self.hybrid_search = True
 
     @classmethod
     async def start(
@@ -268,7 +283,7 @@ class ChatQdrantService:
         Ensure the chat history collection exists with proper configuration.
         
         Creates the collection if it doesn't exist with appropriate vector configuration
-        for dense embeddings and metadata structure for chat messages.
+        for dense and sparse embeddings and metadata structure for chat messages.
         """
         try:
             # Check if collection already exists
@@ -283,19 +298,11 @@ class ChatQdrantService:
                 log.info(f"Chat collection {self.collection_name} already exists")
                 return
 
-            # Create collection with dense vector configuration
+            # Create collection with dense and sparse vector configuration
             log.info(f"Creating chat collection: {self.collection_name}")
             
-            await self.execute_with_retries(
-                lambda: self.qclient.create_collection(
-                    collection_name=self.collection_name,
-                    vectors_config=models.VectorParams(
-                        size=4096,  # Size for Salesforce/sfr-embedding-mistral model
-                        distance=models.Distance.COSINE
-                    )
-                ),
-                operation_name=f"Create chat collection {self.collection_name}"
-            )
+            await self._create_hybrid_collection(self.collection_name)
+            self._collection_is_hybrid = True
             
             log.info(f"Successfully created chat collection: {self.collection_name}")
             
@@ -321,12 +328,19 @@ class ChatQdrantService:
             
             # Validate vector configuration
             vectors_config = collection_info.config.params.vectors
-            if vectors_config.size != 4096:
-                raise LLMError(f"Invalid vector size: expected 4096, got {vectors_config.size}")
+            if vectors_config.size != DENSE_VECTOR_SIZE:
+                raise LLMError(f"Invalid vector size: expected {DENSE_VECTOR_SIZE}, got {vectors_config.size}")
             
             if vectors_config.distance != models.Distance.COSINE:
                 raise LLMError(f"Invalid distance metric: expected COSINE, got {vectors_config.distance}")
             
+            self._collection_is_hybrid = self._has_sparse_vectors(collection_info)
+            if not self._collection_is_hybrid:
+                log.warning(
+                    f"Chat collection {self.collection_name} has no sparse vectors; searches are dense-only "
+                    "until it is migrated (chat_maintenance_cli.py migrate-hybrid)"
+                )
+            
             log.info(f"Chat collection {self.collection_name} configuration validated successfully")
             return True
             
@@ -399,8 +413,10 @@ class ChatQdrantService:
             log.debug(f"Generating vector for message content (length: {len(content)})")
             vector = await self.llm_manager.generate_dense_vector(content)
             
-            if not vector or len(vector) != 4096:
-                raise LLMError(f"Invalid vector generated: expected 4096 dimensions, got {len(vector) if vector else 0}")
+            if not vector or len(vector) != DENSE_VECTOR_SIZE:
+                raise LLMError(
+                    f"Invalid vector generated: expected {DENSE_VECTOR_SIZE} dimensions, got {len(vector) if vector else 0}"
+                )
             
             return vector
             
@@ -408,6 +424,83 @@ class ChatQdrantService:
             log.error(f"Failed to generate message vector: {e}")
             raise LLMError(f"Message vector generation failed: {str(e)}")
 
+    async def generate_message_vectors(self, contents: List[str]) -> List[List[float]]:
+        """
+        Generate dense vectors for several texts with one embedding request.
+
+        Raises:
+            LLMError: If vector generation fails for the batch
+        """
+        try:
+            vectors = await self.llm_manager.generate_dense_vectors(contents)
+        except Exception as e:
+            log.error(f"Failed to generate {len(contents)} message vectors: {e}")
+            raise LLMError(f"Message vector generation failed: {str(e)}")
+        if len(vectors) != len(contents) or any(len(vector) != DENSE_VECTOR_SIZE for vector in vectors):
+            raise LLMError(
+                f"Invalid vectors generated: expected {len(contents)} vectors of {DENSE_VECTOR_SIZE} dimensions"
+            )
+        return vectors
+
+    async def generate_message_sparse_vector(self, content: str) -> Optional[models.SparseVector]:
+        """
+        Generate the SPLADE sparse vector for message content.
+
+        Returns:
+            Sparse vector, or None when SPLADE is unavailable (the caller then
+            stores or searches with the dense vector only)
+        """
+        try:
+            sparse = await self.llm_manager.generate_splade_vector(content)
+            return models.SparseVector(indices=sparse["indices"], values=sparse["values"])
+        except Exception as e:
+            log.warning(f"Sparse vector generation failed, continuing dense-only: {e}")
+            return None
+
+    async def _hybrid_enabled(self) -> bool:
+        """Whether hybrid search is configured and the chat collection has sparse vectors."""
+        return self.hybrid_search and await self._collection_has_sparse_vectors()
+
+    async def _collection_has_sparse_vectors(self) -> bool:
+        if self._collection_is_hybrid is None:
+            try:
+                collection_info = await self.execute_with_retries(
+                    lambda: self.qclient.get_collection(self.collection_name),
+                    operation_name=f"Get collection info for {self.collection_name}"
+                )
+            except Exception as e:
+                # Not created yet: it will be created with sparse vectors
+                log.debug(f"Could not read chat collection configuration: {e}")
+                return True
+            self._collection_is_hybrid = self._has_sparse_vectors(collection_info)
+        return self._collection_is_hybrid
+
+    @staticmethod
+    def _has_sparse_vectors(collection_info) -> bool:
+        return SPARSE_VECTOR_NAME in (collection_info.config.params.sparse_vectors or {})
+
+    async def _create_hybrid_collection(self, collection_name: str) -> None:
+        await self.execute_with_retries(
+            lambda: self.qclient.create_collection(
+                collection_name=collection_name,
+                vectors_config=models.VectorParams(
+                    size=DENSE_VECTOR_SIZE,
+                    distance=models.Distance.COSINE
+                ),
+                sparse_vectors_config={SPARSE_VECTOR_NAME: models.SparseVectorParams()}
+            ),
+            operation_name=f"Create chat collection {collection_name}"
+        )
+
+    async def _generate_vectors(self, text: str, hybrid: bool) -> Tuple[List[float], Optional[models.SparseVector]]:
+        """Dense and (when hybrid) sparse vectors for ``text``, generated concurrently."""
+        if not hybrid:
+            return await self.generate_message_vector(text), None
+        return await asyncio.gather(
+            self.generate_message_vector(text),
+            self.generate_message_sparse_vector(text)
+        )
+
     @monitor_chat_operation("upload_message_to_qdrant")
     @vector_store_fallback_decorator()
     async def upload_message_to_qdrant(self, message: ChatMessage) -> List[str]:
@@ -474,38 +567,21 @@ class ChatQdrantService:
             log.info(f"Uploading message {message.message_id} in {len(chunks)} chunks to {self.collection_name}")
             
             # Process each chunk
+            hybrid = await self._hybrid_enabled()
             points_to_upload = []
             for chunk_text, chunk_index, total_chunks in chunks:
                 try:
-                    # Generate vector for this chunk
-                    vector = await self.generate_message_vector(chunk_text)
+                    # Generate vectors for this chunk
+                    dense_vector, sparse_vector = await self._generate_vectors(chunk_text, hybrid)
                     
                     # Create unique point ID for this chunk
                     point_id = str(uuid.uuid4())
                     point_ids.append(point_id)
                     
-                    # Prepare payload with all necessary metadata
-                    payload = {
-                        "message_id": message.message_id,
-                        "session_id": message.session_id,
-                        "conversation_id": message.conversation_id,
-                        "username": message.username,
-                        "role": message.role.value,
-                        "content": chunk_text,
-                        "philosopher_collection": message.philosopher_collection,
-                        "created_at": message.created_at.isoformat(),
-                        "chunk_index": chunk_index,
-                        "total_chunks": total_chunks,
-                        "original_content_length": len(message.content)
-                    }
-                    
                     # Create point for batch upload
-                    point = models.PointStruct(
-                        id=point_id,
-                        vector=vector,
-                        payload=payload
-                    )
-                    points_to_upload.append(point)
+                    points_to_upload.append(self._chunk_point(
+                        point_id, message, chunk_text, chunk_index, total_chunks, dense_vector, sparse_vector
+                    ))
                     
                 except Exception as e:
                     log.error(f"Failed to process chunk {chunk_index} for message {message.message_id}: {e}")
@@ -564,56 +640,117 @@ class ChatQdrantService:
                 }
             )
 
+    @staticmethod
+    def _chunk_point(point_id: str, message: ChatMessage, chunk_text: str, chunk_index: int, total_chunks: int,
+                     dense_vector: List[float], sparse_vector: Optional[models.SparseVector]) -> models.PointStruct:
+        """The Qdrant point of one message chunk, with all metadata searches filter and rebuild on."""
+        return models.PointStruct(
+            id=point_id,
+            vector={"": dense_vector, SPARSE_VECTOR_NAME: sparse_vector} if sparse_vector else dense_vector,
+            payload={
+                "message_id": message.message_id,
+                "session_id": message.session_id,
+                "conversation_id": message.conversation_id,
+                "username": message.username,
+                "role": message.role.value,
+                "content": chunk_text,
+                "philosopher_collection": message.philosopher_collection,
+                "created_at": message.created_at.isoformat(),
+                "chunk_index": chunk_index,
+                "total_chunks": total_chunks,
+                "original_content_length": len(message.content)
+            }
+        )
+
     async def batch_upload_messages(self, messages: List[ChatMessage]) -> Dict[str, List[str]]:
         """
-        Upload multiple messages to Qdrant in batches for efficiency.
-        
+        Upload multiple messages to Qdrant with bulk embedding.
+
+        The chunks of all messages are embedded with one request to the
+        embedding model and written with one upsert. If that fails, the
+        messages are uploaded one at a time, so one bad message does not
+        fail the rest of the batch.
+
         Args:
             messages: List of ChatMessage instances to upload
-            
+
         Returns:
-            Dictionary mapping message_id to list of point IDs
-            
+            Dictionary mapping message_id to list of point IDs (empty for
+            messages that could not be uploaded)
+
         Raises:
-            LLMError: If batch upload fails
+            LLMError: If the chat collection cannot be prepared
         """
         if not messages:
             return {}
-        
+
         try:
-            # Ensure collection exists
             await self.ensure_chat_collection_exists()
-            
-            result_mapping = {}
-            batch_size = 10  # Process in smaller batches to avoid timeouts
-            
-            for i in range(0, len(messages), batch_size):
-                batch = messages[i:i + batch_size]
-                log.info(f"Processing batch {i//batch_size + 1}/{(len(messages) + batch_size - 1)//batch_size}")
-                
-                # Process each message in the batch
-                for message in batch:
-                    try:
-                        point_ids = await self.upload_message_to_qdrant(message)
-                        result_mapping[message.message_id] = point_ids
-                    except Exception as e:
-                        log.error(f"Failed to upload message {message.message_id}: {e}")
-                        # Continue with other messages, don't fail the entire batch
-                        result_mapping[message.message_id] = []
-                
-                # Small delay between batches to avoid overwhelming the service
-                if i + batch_size < len(messages):
-                    await asyncio.sleep(0.1)
-            
-            successful_uploads = sum(1 for point_ids in result_mapping.values() if point_ids)
-            log.info(f"Batch upload completed: {successful_uploads}/{len(messages)} messages uploaded successfully")
-            
-            return result_mapping
-            
         except Exception as e:
             log.error(f"Batch upload failed: {e}")
             raise LLMError(f"Batch message upload failed: {str(e)}")
 
+        result_mapping: Dict[str, List[str]] = {}
+        uploadable = []
+        for message in messages:
+            if not (message.message_id and message.session_id and message.content and message.content.strip()):
+                log.warning(f"Skipping message {message.message_id}: missing ID, session or content")
+                result_mapping[message.message_id] = []
+                continue
+            chunks = self._chunk_message_content(message.content)
+            if len(chunks) > 50:  # Same limit as upload_message_to_qdrant
+                log.warning(f"Skipping message {message.message_id}: too large ({len(chunks)} chunks, max 50)")
+                result_mapping[message.message_id] = []
+                continue
+            uploadable.append((message, chunks))
+
+        if uploadable:
+            try:
+                result_mapping.update(await self._upload_chunks_bulk(uploadable))
+            except Exception as e:
+                log.warning(f"Bulk upload of {len(uploadable)} messages failed, uploading one at a time: {e}")
+                for message, _ in uploadable:
+                    try:
+                        result_mapping[message.message_id] = await self.upload_message_to_qdrant(message)
+                    except Exception as upload_error:
+                        log.error(f"Failed to upload message {message.message_id}: {upload_error}")
+                        result_mapping[message.message_id] = []
+
+        successful_uploads = sum(1 for point_ids in result_mapping.values() if point_ids)
+        log.info(f"Batch upload completed: {successful_uploads}/{len(messages)} messages uploaded successfully")
+        return result_mapping
+
+    async def _upload_chunks_bulk(
+        self, uploadable: List[Tuple[ChatMessage, List[Tuple[str, int, int]]]]
+    ) -> Dict[str, List[str]]:
+        texts = [chunk_text for _, chunks in uploadable for chunk_text, _, _ in chunks]
+        if await self._hybrid_enabled():
+            dense_vectors, sparse_vectors = await asyncio.gather(
+                self.generate_message_vectors(texts),
+                asyncio.gather(*(self.generate_message_sparse_vector(text) for text in texts))
+            )
+        else:
+            dense_vectors, sparse_vectors = await self.generate_message_vectors(texts), [None] * len(texts)
+
+        points = []
+        mapping: Dict[str, List[str]] = {}
+        vectors = iter(zip(dense_vectors, sparse_vectors))
+        for message, chunks in uploadable:
+            point_ids = mapping.setdefault(message.message_id, [])
+            for chunk_text, chunk_index, total_chunks in chunks:
+                dense_vector, sparse_vector = next(vectors)
+                point_id = str(uuid.uuid4())
+                point_ids.append(point_id)
+                points.append(self._chunk_point(
+                    point_id, message, chunk_text, chunk_index, total_chunks, dense_vector, sparse_vector
+                ))
+
+        await self.execute_with_retries(
+            lambda: self.qclient.upsert(collection_name=self.collection_name, points=points),
+            operation_name=f"Upload {len(uploadable)} messages to Qdrant"
+        )
+        return mapping
+
     @monitor_chat_operation("search_messages")
     @vector_store_fallback_decorator(fallback_operation=lambda *args, **kwargs: [])
     async def search_messages(self, session_id: str, query: str, limit: int = 10,
@@ -713,85 +850,44 @@ class ChatQdrantService:
                                 username: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Search using fusion with query expansion via ExpansionService.
-        
-        Uses the existing expand_query() API to generate enhanced queries and fuse results,
-        while maintaining session filtering and privacy controls.
+
+        The expanded queries are each run as a grouped (hybrid) search against
+        the chat collection with the full session/username/philosopher filter,
+        and the per-query message rankings are fused with RRF.
         """
+        search_filter = self._build_search_filter(session_id, philosopher_filter, username)
+
         try:
-            # Use ExpansionService to expand query and get fused results
-            expansion_result = await self.expansion_service.expand_query(
-                query=query,
-                collection=self.collection_name,
-                methods=self.fusion_methods,
-                rrf_k=self.fusion_rrf_k,
-                max_results=limit * 2,  # Get more results for better fusion
-                enable_prf=False,
-                # Pass session filtering to ensure privacy
-                session_id=session_id,
-                philosopher_filter=philosopher_filter
+            expanded_queries = await self.expansion_service.generate_queries(query, self.fusion_methods)
+            queries = [query] + [q for queries in expanded_queries.values() for q in queries if q and q.strip()]
+            queries = list(dict.fromkeys(queries))[:max(1, self.fusion_max_queries)]
+
+            hybrid = await self._hybrid_enabled()
+            query_vectors = await asyncio.gather(*(self._generate_vectors(q, hybrid) for q in queries))
+            group_lists = await asyncio.gather(*(
+                self._query_message_groups(dense_vector, search_filter, limit, session_id, sparse_vector)
+                for dense_vector, sparse_vector in query_vectors
+            ))
+            fused_groups = self.expansion_service.qdrant_manager.rrf_fuse(
+                [groups for groups in group_lists if groups], k=self.fusion_rrf_k
+            )[:limit]
+
+            formatted_results = await self._format_message_groups(
+                fused_groups, session_id, violation_type="cross_session_result_fusion"
             )
-            
-            # Extract the fused results from expansion
-            fused_results = expansion_result.retrieval_results[:limit]
-            
-            # Convert Qdrant points to chat message format with privacy validation
-            formatted_results = []
-            for result in fused_results:
-                # Ensure result has proper structure (from Qdrant)
-                if not hasattr(result, 'payload') or not hasattr(result, 'score'):
-                    log.warning(f"Skipping invalid result structure in fusion search: {type(result)}")
-                    continue
-                
-                # Double-check privacy: ensure result belongs to the session  
-                result_session_id = result.payload.get("session_id")
-                if result_session_id != session_id:
-                    log.error(f"Privacy violation: fusion result from different session {result_session_id} for query session {session_id}")
-                    raise ChatPrivacyError(
-                        message="Fusion search result privacy violation detected",
-                        violation_type="cross_session_result_fusion",
-                        session_id=session_id,
-                        details={
-                            "result_session_id": result_session_id,
-                            "point_id": getattr(result, 'id', 'unknown')
-                        }
-                    )
-                
-                # Apply philosopher filter if specified
-                if philosopher_filter:
-                    result_philosopher = result.payload.get("philosopher_collection")
-                    if result_philosopher != philosopher_filter:
-                        continue  # Skip results that don't match philosopher filter
-
-                # Apply username filter if specified
-                if username:
-                    result_username = result.payload.get("username")
-                    if result_username != username:
-                        continue  # Skip results that don't match username filter
-
-                message_data = {
-                    "message_id": result.payload.get("message_id"),
-                    "conversation_id": result.payload.get("conversation_id"),
-                    "session_id": result.payload.get("session_id"),
-                    "username": result.payload.get("username"),
-                    "role": result.payload.get("role"),
-                    "content": result.payload.get("content"),
-                    "philosopher_collection": result.payload.get("philosopher_collection"),
-                    "created_at": result.payload.get("created_at"),
-                    "chunk_index": result.payload.get("chunk_index", 0),
-                    "total_chunks": result.payload.get("total_chunks", 1),
-                    "relevance_score": result.score,
-                    "point_id": getattr(result, 'id', None),
-                    "fusion_metadata": {
-                        "methods_used": expansion_result.expanded_queries.keys(),
-                        "total_queries_generated": len([q for queries in expansion_result.expanded_queries.values() for q in queries]),
-                        "rrf_k": self.fusion_rrf_k
-                    }
-                }
-                formatted_results.append(message_data)
-            
+            fusion_metadata = {
+                "methods_used": list(expanded_queries.keys()),
+                "total_queries_generated": sum(len(q) for q in expanded_queries.values()),
+                "rrf_k": self.fusion_rrf_k
+            }
+            for message_data in formatted_results:
+                message_data["fusion_metadata"] = fusion_metadata
+
             log.info(f"Fusion search found {len(formatted_results)} relevant messages for session {session_id}")
             return formatted_results
-            
+
+        except ChatPrivacyError:
+            raise
         except Exception as e:
             log.error(f"Fusion search failed for session {session_id}: {e} - falling back to standard search")
             # Graceful fallback to standard search on fusion failure
@@ -807,13 +903,16 @@ class ChatQdrantService:
                              philosopher_filter: Optional[str] = None,
                              username: Optional[str] = None) -> List[Dict[str, Any]]:
         """
-        Standard vector search implementation (original search_messages logic).
+        Standard search: one grouped query for the best chunk of each message,
+        fusing sparse and dense candidates when the collection is hybrid.
 
-        This preserves the existing search behavior as a fallback and for when fusion is disabled.
+        This is the fallback for fusion search and the default when fusion is disabled.
         """
-        # Generate query vector
+        search_filter = self._build_search_filter(session_id, philosopher_filter, username)
+
+        # Generate query vectors
         try:
-            query_vector = await self.generate_message_vector(query)
+            query_vector, sparse_vector = await self._generate_vectors(query, await self._hybrid_enabled())
         except Exception as e:
             log.error(f"Failed to generate query vector for search: {e}")
             raise ChatVectorStoreError(
@@ -824,7 +923,42 @@ class ChatQdrantService:
                 details={"query_length": len(query)}
             )
 
-        # Build filter conditions - session_id is mandatory for privacy
+        log.info(f"Searching chat messages for session {session_id} with query: {query[:100]}...")
+
+        # Execute search with session filtering
+        try:
+            groups = await self._query_message_groups(query_vector, search_filter, limit, session_id, sparse_vector)
+        except Exception as e:
+            log.error(f"Qdrant search failed for session {session_id}: {e}")
+            raise ChatVectorStoreError(
+                message=f"Vector search operation failed: {str(e)}",
+                operation="qdrant_search",
+                collection_name=self.collection_name,
+                session_id=session_id,
+                details={
+                    "query_length": len(query),
+                    "limit": limit,
+                    "philosopher_filter": philosopher_filter,
+                    "username": username
+                }
+            )
+
+        formatted_results = await self._format_message_groups(groups, session_id)
+
+        log.info(f"Found {len(formatted_results)} relevant messages for session {session_id}")
+        return formatted_results
+
+    def _build_search_filter(self, session_id: str, philosopher_filter: Optional[str] = None,
+                             username: Optional[str] = None) -> models.Filter:
+        """
+        Build the Qdrant filter for a chat search.
+
+        Every filter is applied inside Qdrant, so selective filters still yield
+        up to ``limit`` results. session_id is mandatory for privacy.
+
+        Raises:
+            ChatValidationError: If username or philosopher_filter is too long
+        """
         filter_conditions = [
             models.FieldCondition(
                 key="session_id",
@@ -863,75 +997,176 @@ class ChatQdrantService:
                     match=models.MatchValue(value=philosopher_filter)
                 )
             )
-        
-        search_filter = models.Filter(must=filter_conditions)
-        
-        log.info(f"Searching chat messages for session {session_id} with query: {query[:100]}...")
-        
-        # Execute search with session filtering
-        try:
-            search_results = await self.execute_with_retries(
-                lambda: self.qclient.search(
+
+        return models.Filter(must=filter_conditions)
+
+    async def _query_message_groups(self, query_vector: List[float], search_filter: models.Filter,
+                                    limit: int, session_id: str,
+                                    sparse_vector: Optional[models.SparseVector] = None) -> List[models.PointGroup]:
+        """
+        Run a filtered search grouped by message_id.
+
+        Returns up to ``limit`` groups, each holding the best-matching chunk of
+        one message, so a long message occupies a single result slot. With a
+        sparse vector the search is hybrid (see _query_hybrid_groups).
+        """
+        if sparse_vector is not None:
+            return await self._query_hybrid_groups(query_vector, sparse_vector, search_filter, limit, session_id)
+
+        result = await self.execute_with_retries(
+            lambda: self.qclient.query_points_groups(
+                collection_name=self.collection_name,
+                query=query_vector,
+                query_filter=search_filter,
+                group_by="message_id",
+                limit=limit,
+                group_size=1,
+                with_payload=True,
+                with_vectors=False  # Don't return vectors to save bandwidth
+            ),
+            operation_name=f"Search chat messages for session {session_id}"
+        )
+        return result.groups
+
+    async def _query_hybrid_groups(self, query_vector: List[float], sparse_vector: models.SparseVector,
+                                   search_filter: models.Filter, limit: int,
+                                   session_id: str) -> List[models.PointGroup]:
+        """
+        Hybrid search: dense and sparse chunk candidates fused with RRF in Qdrant.
+
+        Each vector prefetches ``limit * hybrid_prefetch_multiplier`` filtered
+        chunks; the fused chunk ranking is then reduced to the best chunk of
+        each message. While a few long messages fill the candidates with fewer
+        than ``limit`` distinct messages, the search is repeated with twice the
+        candidates until the limit is met or the matching chunks run out.
+        Scores are RRF scores.
+        """
+        candidates = limit * self.hybrid_prefetch_multiplier
+        while True:
+            result = await self.execute_with_retries(
+                lambda: self.qclient.query_points(
                     collection_name=self.collection_name,
-                    query_vector=query_vector,
+                    prefetch=[
+                        models.Prefetch(query=query_vector, filter=search_filter, limit=candidates),
+                        models.Prefetch(query=sparse_vector, using=SPARSE_VECTOR_NAME, filter=search_filter, limit=candidates),
+                    ],
+                    query=models.FusionQuery(fusion=models.Fusion.RRF),
                     query_filter=search_filter,
-                    limit=limit,
+                    limit=candidates,
                     with_payload=True,
-                    with_vectors=False  # Don't return vectors to save bandwidth
+                    with_vectors=False
                 ),
-                operation_name=f"Search chat messages for session {session_id}"
-            )
-        except Exception as e:
-            log.error(f"Qdrant search failed for session {session_id}: {e}")
-            raise ChatVectorStoreError(
-                message=f"Vector search operation failed: {str(e)}",
-                operation="qdrant_search",
-                collection_name=self.collection_name,
-                session_id=session_id,
-                details={
-                    "query_length": len(query),
-                    "limit": limit,
-                    "philosopher_filter": philosopher_filter,
-                    "username": username
-                }
+                operation_name=f"Hybrid search chat messages for session {session_id}"
             )
 
-        # Convert results to message format with privacy validation
-        formatted_results = []
-        for result in search_results:
+            groups: Dict[str, models.PointGroup] = {}
+            for point in result.points:
+                message_id = (point.payload or {}).get("message_id")
+                if message_id not in groups:
+                    groups[message_id] = models.PointGroup(id=message_id, hits=[point])
+                    if len(groups) == limit:
+                        break
+            # Fewer fused points than requested means neither prefetch was cut off
+            if len(groups) == limit or len(result.points) < candidates:
+                return list(groups.values())
+            candidates *= 2
+
+    async def _format_message_groups(self, groups: List[models.PointGroup], session_id: str,
+                                     violation_type: str = "cross_session_result") -> List[Dict[str, Any]]:
+        """
+        Convert message groups to result dicts with privacy validation.
+
+        Messages stored in several chunks get their full content, reassembled
+        from all chunks fetched in a single scroll.
+        """
+        best_hits = []
+        for group in groups:
+            if not group.hits:
+                continue
+            hit = group.hits[0]
+
             # Double-check privacy: ensure result belongs to the session
-            result_session_id = result.payload.get("session_id")
+            result_session_id = hit.payload.get("session_id")
             if result_session_id != session_id:
                 log.error(f"Privacy violation: search result from different session {result_session_id} for query session {session_id}")
                 raise ChatPrivacyError(
                     message="Search result privacy violation detected",
-                    violation_type="cross_session_result",
+                    violation_type=violation_type,
                     session_id=session_id,
                     details={
                         "result_session_id": result_session_id,
-                        "point_id": result.id
+                        "point_id": hit.id
                     }
                 )
+            best_hits.append(hit)
 
-            message_data = {
-                "message_id": result.payload.get("message_id"),
-                "conversation_id": result.payload.get("conversation_id"),
-                "session_id": result.payload.get("session_id"),
-                "username": result.payload.get("username"),
-                "role": result.payload.get("role"),
-                "content": result.payload.get("content"),
-                "philosopher_collection": result.payload.get("philosopher_collection"),
-                "created_at": result.payload.get("created_at"),
-                "chunk_index": result.payload.get("chunk_index", 0),
-                "total_chunks": result.payload.get("total_chunks", 1),
-                "relevance_score": result.score,
-                "point_id": result.id
-            }
-            formatted_results.append(message_data)
+        chunked = {
+            hit.payload.get("message_id"): hit.payload.get("total_chunks", 1)
+            for hit in best_hits if hit.payload.get("total_chunks", 1) > 1
+        }
+        full_content = await self._fetch_message_content(chunked, session_id) if chunked else {}
 
-        log.info(f"Found {len(formatted_results)} relevant messages for session {session_id}")
+        formatted_results = []
+        for hit in best_hits:
+            message_id = hit.payload.get("message_id")
+            formatted_results.append({
+                "message_id": message_id,
+                "conversation_id": hit.payload.get("conversation_id"),
+                "session_id": hit.payload.get("session_id"),
+                "username": hit.payload.get("username"),
+                "role": hit.payload.get("role"),
+                "content": full_content.get(message_id, hit.payload.get("content")),
+                "philosopher_collection": hit.payload.get("philosopher_collection"),
+                "created_at": hit.payload.get("created_at"),
+                "chunk_index": hit.payload.get("chunk_index", 0),  # Best-matching chunk
+                "total_chunks": hit.payload.get("total_chunks", 1),
+                "relevance_score": hit.score,
+                "point_id": hit.id
+            })
         return formatted_results
 
+    async def _fetch_message_content(self, chunk_counts: Dict[str, int], session_id: str) -> Dict[str, str]:
+        """
+        Reassemble the full content of chunked messages.
+
+        Args:
+            chunk_counts: message_id -> total_chunks for the messages to fetch
+            session_id: Session ID for privacy filtering
+
+        Returns:
+            Dictionary mapping message_id to its reassembled content
+        """
+        scroll_filter = models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="session_id",
+                    match=models.MatchValue(value=session_id)
+                ),
+                models.FieldCondition(
+                    key="message_id",
+                    match=models.MatchAny(any=list(chunk_counts))
+                )
+            ]
+        )
+        points, _ = await self.execute_with_retries(
+            lambda: self.qclient.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                limit=sum(chunk_counts.values()),
+                with_payload=True,
+                with_vectors=False
+            ),
+            operation_name=f"Get chunks for {len(chunk_counts)} messages"
+        )
+
+        chunks_by_message: Dict[str, List[Dict[str, Any]]] = {}
+        for point in points:
+            chunks_by_message.setdefault(point.payload.get("message_id"), []).append(point.payload)
+        return {
+            message_id: self._reconstruct_message_from_chunks(chunks)["content"]
+            for message_id, chunks in chunks_by_message.items()
+        }
+
     async def search_conversation_context(self, session_id: str, query: str, 
                                         conversation_id: Optional[str] = None,
                                         limit: int = 5) -> List[Dict[str, Any]]:
@@ -965,43 +1200,29 @@ class ChatQdrantService:
                     )
                 )
             
-            # Generate query vector
-            query_vector = await self.generate_message_vector(query)
+            # Generate query vectors
+            query_vector, sparse_vector = await self._generate_vectors(query, await self._hybrid_enabled())
             search_filter = models.Filter(must=filter_conditions)
             
-            # Search for relevant context
-            search_results = await self.execute_with_retries(
-                lambda: self.qclient.search(
-                    collection_name=self.collection_name,
-                    query_vector=query_vector,
-                    query_filter=search_filter,
-                    limit=limit * 2,  # Get more results to filter and deduplicate
-                    with_payload=True,
-                    with_vectors=False
-                ),
-                operation_name=f"Search conversation context for session {session_id}"
-            )
+            # Best chunk of each relevant message, most relevant first
+            groups = await self._query_message_groups(query_vector, search_filter, limit, session_id, sparse_vector)
             
-            # Group by message_id and take the best chunk for each message
-            message_groups = {}
-            for result in search_results:
-                message_id = result.payload.get("message_id")
-                if message_id not in message_groups or result.score > message_groups[message_id]["score"]:
-                    message_groups[message_id] = {
-                        "message_id": message_id,
-                        "conversation_id": result.payload.get("conversation_id"),
-                        "role": result.payload.get("role"),
-                        "content": result.payload.get("content"),
-                        "philosopher_collection": result.payload.get("philosopher_collection"),
-                        "created_at": result.payload.get("created_at"),
-                        "score": result.score
-                    }
-            
-            # Sort by relevance and return top results
-            context_messages = list(message_groups.values())
-            context_messages.sort(key=lambda x: x["score"], reverse=True)
+            context_messages = []
+            for group in groups:
+                if not group.hits:
+                    continue
+                result = group.hits[0]
+                context_messages.append({
+                    "message_id": result.payload.get("message_id"),
+                    "conversation_id": result.payload.get("conversation_id"),
+                    "role": result.payload.get("role"),
+                    "content": result.payload.get("content"),
+                    "philosopher_collection": result.payload.get("philosopher_collection"),
+                    "created_at": result.payload.get("created_at"),
+                    "score": result.score
+                })
             
-            return context_messages[:limit]
+            return context_messages
             
         except Exception as e:
             log.error(f"Conversation context search failed: {e}")
@@ -1087,6 +1308,278 @@ class ChatQdrantService:
             log.error(f"Failed to get message chunks: {e}")
             raise LLMError(f"Failed to retrieve message chunks: {str(e)}")
 
+    async def get_points_for_messages(
+        self,
+        message_ids: List[str],
+        with_vectors: bool = True,
+        page_size: int = 256
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieve the stored chunk points for a batch of messages.
+
+        Uses a single paginated scroll with a ``message_id`` MatchAny filter
+        instead of one lookup per message.
+
+        Args:
+            message_ids: Message IDs to fetch points for
+            with_vectors: Whether to include vector data
+            page_size: Number of points fetched per scroll request
+
+        Returns:
+            Dictionary mapping message_id to a list of serialisable point dicts
+            (``id``, ``vector``, ``payload``)
+        """
+        if not message_ids:
+            return {}
+
+        points_by_message: Dict[str, List[Dict[str, Any]]] = {}
+        scroll_filter = models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="message_id",
+                    match=models.MatchAny(any=list(message_ids))
+                )
+            ]
+        )
+
+        try:
+            offset = None
+            while True:
+                points, offset = await self.execute_with_retries(
+                    lambda: self.qclient.scroll(
+                        collection_name=self.collection_name,
+                        scroll_filter=scroll_filter,
+                        limit=page_size,
+                        offset=offset,
+                        with_payload=True,
+                        with_vectors=with_vectors
+                    ),
+                    operation_name=f"Get points for {len(message_ids)} messages"
+                )
+
+                for point in points:
+                    message_id = (point.payload or {}).get("message_id")
+                    points_by_message.setdefault(message_id, []).append({
+                        "id": point.id,
+                        "vector": self._serialize_vector(point.vector) if with_vectors else None,
+                        "payload": point.payload
+                    })
+
+                if offset is None:
+                    break
+
+            return points_by_message
+
+        except Exception as e:
+            log.error(f"Failed to get points for messages: {e}")
+            raise LLMError(f"Failed to retrieve message points: {str(e)}")
+
+    async def upsert_point_data(self, points: List[Dict[str, Any]]) -> int:
+        """
+        Upsert previously exported point dicts (``id``, ``vector``, ``payload``).
+
+        Args:
+            points: Point dicts as returned by get_points_for_messages
+
+        Returns:
+            Number of points written
+        """
+        points = [point for point in points if point.get("vector") is not None]
+        if not points:
+            return 0
+
+        try:
+            await self.ensure_chat_collection_exists()
+            hybrid = await self._collection_has_sparse_vectors()
+            point_structs = [
+                models.PointStruct(
+                    id=point["id"],
+                    # Points exported from a hybrid collection keep only their dense vector in a dense-only one
+                    vector=point["vector"] if hybrid or not isinstance(point["vector"], dict) else point["vector"].get(""),
+                    payload=point.get("payload") or {}
+                )
+                for point in points
+            ]
+            await self.execute_with_retries(
+                lambda: self.qclient.upsert(
+                    collection_name=self.collection_name,
+                    points=point_structs
+                ),
+                operation_name=f"Upsert {len(point_structs)} imported points"
+            )
+            return len(point_structs)
+
+        except Exception as e:
+            log.error(f"Failed to upsert imported points: {e}")
+            raise LLMError(f"Failed to import message points: {str(e)}")
+
+    @staticmethod
+    def _serialize_vector(vector: Any) -> Any:
+        """Convert a Qdrant vector (plain, named or sparse) into JSON-compatible data."""
+        if isinstance(vector, dict):
+            return {name: ChatQdrantService._serialize_vector(value) for name, value in vector.items()}
+        if isinstance(vector, models.SparseVector):
+            return {"indices": list(vector.indices), "values": list(vector.values)}
+        return vector
+
+    async def migrate_to_hybrid(self, batch_size: int = 64) -> Dict[str, int]:
+        """
+        Give every point of the chat collection a sparse vector.
+
+        Qdrant cannot add a vector to an existing collection, so a dense-only
+        collection is rebuilt: its points are copied with their new sparse
+        vectors into a staging collection, the collection is recreated with
+        sparse vectors and the points are copied back. Points of a hybrid
+        collection that lack a sparse vector (stored while SPLADE was
+        unavailable) are then backfilled in place.
+
+        Every step is idempotent, so an interrupted migration resumes where it
+        stopped when run again. Messages stored in the collection between the
+        copy and the rebuild are not carried over; run it while chat writes
+        are paused.
+
+        Args:
+            batch_size: Points read, encoded and written per request
+
+        Returns:
+            Counts of points ``copied`` to staging, ``restored`` from staging
+            and ``backfilled`` in place
+        """
+        staging = f"{self.collection_name}_hybrid_migration"
+        counts = {"copied": 0, "restored": 0, "backfilled": 0}
+
+        collections = await self.execute_with_retries(
+            lambda: self.qclient.get_collections(),
+            operation_name="List collections for hybrid migration"
+        )
+        existing = {col.name for col in collections.collections}
+
+        if self.collection_name in existing:
+            collection_info = await self.execute_with_retries(
+                lambda: self.qclient.get_collection(self.collection_name),
+                operation_name=f"Get collection info for {self.collection_name}"
+            )
+            if not self._has_sparse_vectors(collection_info):
+                if staging not in existing:
+                    await self._create_hybrid_collection(staging)
+                    existing.add(staging)
+                counts["copied"] = await self._copy_points(self.collection_name, staging, batch_size, encode=True)
+                log.info(f"Copied {counts['copied']} points to {staging}; recreating {self.collection_name}")
+                await self.execute_with_retries(
+                    lambda: self.qclient.delete_collection(self.collection_name),
+                    operation_name=f"Delete dense-only collection {self.collection_name}"
+                )
+                existing.discard(self.collection_name)
+
+        if staging in existing:
+            if self.collection_name not in existing:
+                await self._create_hybrid_collection(self.collection_name)
+            counts["restored"] = await self._copy_points(staging, self.collection_name, batch_size, encode=False)
+            await self.execute_with_retries(
+                lambda: self.qclient.delete_collection(staging),
+                operation_name=f"Delete staging collection {staging}"
+            )
+        elif self.collection_name not in existing:
+            await self.ensure_chat_collection_exists()
+
+        self._collection_is_hybrid = True
+        counts["backfilled"] = await self._backfill_sparse_vectors(batch_size)
+        log.info(
+            f"Chat collection {self.collection_name} migrated to hybrid vectors: {counts}",
+            extra={"event_type": "chat_hybrid_migration", **counts}
+        )
+        return counts
+
+    async def _copy_points(self, source: str, target: str, batch_size: int, encode: bool) -> int:
+        """
+        Copy points from ``source`` to ``target``, skipping points ``target`` already has.
+
+        With ``encode``, dense-only source points get a sparse vector computed
+        from their chunk content.
+        """
+        copied = 0
+        offset = None
+        while True:
+            points, offset = await self.execute_with_retries(
+                lambda: self.qclient.scroll(
+                    collection_name=source,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=True
+                ),
+                operation_name=f"Read points of {source}"
+            )
+            present = await self.execute_with_retries(
+                lambda: self.qclient.retrieve(
+                    collection_name=target,
+                    ids=[point.id for point in points],
+                    with_payload=False,
+                    with_vectors=False
+                ),
+                operation_name=f"Find points already in {target}"
+            )
+            present_ids = {point.id for point in present}
+            missing = [point for point in points if point.id not in present_ids]
+
+            if missing:
+                vectors = [point.vector for point in missing]
+                if encode:
+                    sparse_vectors = await asyncio.gather(*(
+                        self.generate_message_sparse_vector((point.payload or {}).get("content") or "")
+                        for point in missing
+                    ))
+                    vectors = [
+                        {"": vector, SPARSE_VECTOR_NAME: sparse} if sparse else vector
+                        for vector, sparse in zip(vectors, sparse_vectors)
+                    ]
+                point_structs = [
+                    models.PointStruct(id=point.id, vector=vector, payload=point.payload or {})
+                    for point, vector in zip(missing, vectors)
+                ]
+                await self.execute_with_retries(
+                    lambda: self.qclient.upsert(collection_name=target, points=point_structs),
+                    operation_name=f"Copy {len(point_structs)} points to {target}"
+                )
+                copied += len(point_structs)
+
+            if offset is None:
+                return copied
+
+    async def _backfill_sparse_vectors(self, batch_size: int) -> int:
+        """Add sparse vectors to points of the hybrid chat collection stored without one."""
+        backfilled = 0
+        offset = None
+        while True:
+            points, offset = await self.execute_with_retries(
+                lambda: self.qclient.scroll(
+                    collection_name=self.collection_name,
+                    limit=batch_size,
+                    offset=offset,
+                    with_payload=["content"],
+                    with_vectors=[SPARSE_VECTOR_NAME]
+                ),
+                operation_name=f"Find points without sparse vectors in {self.collection_name}"
+            )
+            missing = [point for point in points if not (point.vector or {}).get(SPARSE_VECTOR_NAME)]
+            sparse_vectors = await asyncio.gather(*(
+                self.generate_message_sparse_vector((point.payload or {}).get("content") or "")
+                for point in missing
+            ))
+            updates = [
+                models.PointVectors(id=point.id, vector={SPARSE_VECTOR_NAME: sparse})
+                for point, sparse in zip(missing, sparse_vectors) if sparse
+            ]
+            if updates:
+                await self.execute_with_retries(
+                    lambda: self.qclient.update_vectors(collection_name=self.collection_name, points=updates),
+                    operation_name=f"Backfill {len(updates)} sparse vectors"
+                )
+                backfilled += len(updates)
+
+            if offset is None:
+                return backfilled
+
     async def delete_user_messages(self, session_id: str) -> bool:
         """
         Delete all messages for a specific session from Qdrant.
@@ -1132,6 +1625,71 @@ class ChatQdrantService:
             log.error(f"Failed to delete user messages: {e}")
             raise LLMError(f"Message deletion failed: {str(e)}")
 
+    async def delete_points_for_sessions(self, session_ids: List[str]) -> int:
+        """
+        Delete every chunk point belonging to a batch of sessions.
+
+        Args:
+            session_ids: Session IDs whose points should be removed
+
+        Returns:
+            Number of points deleted
+        """
+        return await self._delete_points_matching("session_id", session_ids)
+
+    async def delete_points_for_messages(self, message_ids: List[str]) -> int:
+        """
+        Delete every chunk point belonging to a batch of messages.
+
+        Args:
+            message_ids: Message IDs whose points should be removed
+
+        Returns:
+            Number of points deleted
+        """
+        return await self._delete_points_matching("message_id", message_ids)
+
+    async def _delete_points_matching(self, payload_key: str, values: List[str]) -> int:
+        """Count, then delete, all points whose payload field matches any of ``values``."""
+        if not values:
+            return 0
+
+        delete_filter = models.Filter(
+            must=[
+                models.FieldCondition(
+                    key=payload_key,
+                    match=models.MatchAny(any=list(values))
+                )
+            ]
+        )
+
+        try:
+            count_result = await self.execute_with_retries(
+                lambda: self.qclient.count(
+                    collection_name=self.collection_name,
+                    count_filter=delete_filter,
+                    exact=True
+                ),
+                operation_name=f"Count points for {len(values)} {payload_key} values"
+            )
+            if not count_result.count:
+                return 0
+
+            await self.execute_with_retries(
+                lambda: self.qclient.delete(
+                    collection_name=self.collection_name,
+                    points_selector=models.FilterSelector(filter=delete_filter)
+                ),
+                operation_name=f"Delete points for {len(values)} {payload_key} values"
+            )
+
+            log.info(f"Deleted {count_result.count} points for {len(values)} {payload_key} values")
+            return count_result.count
+
+        except Exception as e:
+            log.error(f"Failed to delete points by {payload_key}: {e}")
+            raise LLMError(f"Point deletion failed: {str(e)}")
+
     async def get_collection_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the chat collection.
@@ -1154,7 +1712,8 @@ class ChatQdrantService:
                 "optimizer_status": collection_info.optimizer_status,
                 "config": {
                     "vector_size": collection_info.config.params.vectors.size,
-                    "distance": collection_info.config.params.vectors.distance
+                    "distance": collection_info.config.params.vectors.distance,
+                    "sparse_vectors": sorted(collection_info.config.params.sparse_vectors or {})
                 }
             }
             
@@ -0,0 +1,188 @@
+"""
+Token-budgeted context packing for RAG prompts.
+
+Instead of growing the model context to fit whatever retrieval returned, the
+retrieved nodes are packed into a fixed token budget: highest-scoring nodes
+first, near-duplicate chunks (e.g. the same passage returned through several
+vectors or overlapping chunks) dropped, and the node that overflows the budget
+cut at a sentence boundary. Context windows are then chosen from a small set
+of fixed sizes, so Ollama does not reload the model for a new ``num_ctx`` on
+every request.
+"""
+
+import copy
+import re
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence, Set, Tuple
+
+from app.core.constants import (
+    CONTEXT_DEDUP_OVERLAP_THRESHOLD,
+    CONTEXT_DEDUP_SHINGLE_SIZE,
+    CONTEXT_MIN_TRUNCATED_TOKENS,
+)
+from app.core.logger import log
+from app.services.token_counter import TokenCounter, get_token_counter
+
+NODE_TEXT_FIELDS = ("text", "summary", "conjecture")
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;:])\s+")
+_WORD = re.compile(r"\w+")
+
+
+def node_text(node: Any) -> Tuple[Optional[str], str]:
+    """Return ``(payload_field, text)`` for the first populated text field of a node."""
+    payload = getattr(node, "payload", None)
+    if not isinstance(payload, dict):
+        return None, ""
+    for name in NODE_TEXT_FIELDS:
+        if payload.get(name):
+            return name, str(payload[name])
+    return None, ""
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text after sentence-ending punctuation, keeping the punctuation."""
+    return [sentence for sentence in _SENTENCE_BOUNDARY.split(text.strip()) if sentence]
+
+
+def context_window_tiers(default_context: int, max_context: int) -> List[int]:
+    """Fixed context window sizes: the default, doubled until ``max_context`` (inclusive)."""
+    tiers = [default_context]
+    while tiers[-1] < max_context:
+        tiers.append(min(tiers[-1] * 2, max_context))
+    return tiers
+
+
+def select_context_window(estimated_tokens: int, default_context: int, max_context: int) -> int:
+    """Smallest fixed context window that holds ``estimated_tokens`` (``max_context`` if none does)."""
+    for tier in context_window_tiers(default_context, max_context):
+        if estimated_tokens <= tier:
+            return tier
+    return max_context
+
+
+@dataclass
+class PackedContext:
+    """Result of packing retrieved nodes into a token budget."""
+
+    nodes: List[Any]
+    token_count: int
+    budget_tokens: int
+    duplicates_dropped: int = 0
+    over_budget_dropped: int = 0
+    truncated_ids: List[Any] = field(default_factory=list)
+
+
+class ContextPacker:
+    """Packs retrieved nodes into a fixed token budget by score."""
+
+    def __init__(
+        self,
+        token_counter: Optional[TokenCounter] = None,
+        shingle_size: int = CONTEXT_DEDUP_SHINGLE_SIZE,
+        overlap_threshold: float = CONTEXT_DEDUP_OVERLAP_THRESHOLD,
+        min_truncated_tokens: int = CONTEXT_MIN_TRUNCATED_TOKENS,
+    ):
+        self._counter = token_counter
+        self.shingle_size = shingle_size
+        self.overlap_threshold = overlap_threshold
+        self.min_truncated_tokens = min_truncated_tokens
+
+    @property
+    def counter(self) -> TokenCounter:
+        return self._counter or get_token_counter()
+
+    def _shingles(self, text: str) -> Set[Tuple[str, ...]]:
+        words = _WORD.findall(text.lower())
+        if len(words) <= self.shingle_size:
+            return {tuple(words)} if words else set()
+        return {tuple(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)}
+
+    def _is_near_duplicate(self, shingles: Set[Tuple[str, ...]], kept: List[Set[Tuple[str, ...]]]) -> bool:
+        for other in kept:
+            smaller = min(len(shingles), len(other))
+            if smaller and len(shingles & other) / smaller >= self.overlap_threshold:
+                return True
+        return False
+
+    def _truncate(self, text: str, budget_tokens: int) -> Tuple[str, int]:
+        """Longest sentence prefix of ``text`` within ``budget_tokens`` (``""`` if none fits)."""
+        sentences = split_sentences(text)
+        kept, used = [], 0
+        for sentence, n_tokens in zip(sentences, self.counter.count_batch(sentences)):
+            if used + n_tokens > budget_tokens:
+                break
+            kept.append(sentence)
+            used += n_tokens
+        return " ".join(kept), used
+
+    @staticmethod
+    def _with_text(node: Any, field_name: str, text: str) -> Any:
+        packed = copy.copy(node)
+        packed.payload = {**node.payload, field_name: text, "truncated": True}
+        return packed
+
+    def pack(self, nodes: Sequence[Any], budget_tokens: int) -> PackedContext:
+        """
+        Fill ``budget_tokens`` with the highest-scoring unique nodes.
+
+        Nodes are taken in descending score order (retrieval order for ties).
+        Exact duplicates (same id) and near-duplicates of an already packed node
+        are skipped. A node that does not fit is cut at the last sentence
+        boundary within the remaining budget, as long as at least
+        ``min_truncated_tokens`` remain; smaller later nodes may still fill the
+        rest. Truncated nodes are shallow copies, the originals are untouched.
+
+        Args:
+            nodes: Retrieved (fused) nodes with ``payload`` and optional ``score``
+            budget_tokens: Token budget for all node content
+
+        Returns:
+            PackedContext with the packed nodes in score order
+        """
+        ranked = sorted(nodes, key=lambda node: getattr(node, "score", None) or 0.0, reverse=True)
+
+        candidates, seen_ids = [], set()
+        for node in ranked:
+            node_id = getattr(node, "id", None)
+            if node_id is not None and node_id in seen_ids:
+                continue
+            seen_ids.add(node_id)
+            field_name, text = node_text(node)
+            if field_name is None:
+                log.warning(f"Node {node_id} has no text, summary, or conjecture in payload. Skipping.")
+                continue
+            candidates.append((node, field_name, text))
+
+        result = PackedContext(nodes=[], token_count=0, budget_tokens=budget_tokens)
+        kept_shingles: List[Set[Tuple[str, ...]]] = []
+        token_counts = self.counter.count_batch([text for _, _, text in candidates])
+
+        for (node, field_name, text), n_tokens in zip(candidates, token_counts):
+            shingles = self._shingles(text)
+            if self._is_near_duplicate(shingles, kept_shingles):
+                result.duplicates_dropped += 1
+                continue
+
+            remaining = budget_tokens - result.token_count
+            if n_tokens > remaining:
+                if remaining < self.min_truncated_tokens:
+                    result.over_budget_dropped += 1
+                    continue
+                text, n_tokens = self._truncate(text, remaining)
+                if not text:
+                    result.over_budget_dropped += 1
+                    continue
+                node = self._with_text(node, field_name, text)
+                result.truncated_ids.append(getattr(node, "id", None))
+
+            kept_shingles.append(shingles)
+            result.nodes.append(node)
+            result.token_count += n_tokens
+
+        log.debug(
+            f"Packed {len(result.nodes)}/{len(nodes)} nodes into {result.token_count}/{budget_tokens} tokens "
+            f"({result.duplicates_dropped} near-duplicates, {result.over_budget_dropped} over budget, "
+            f"{len(result.truncated_ids)} truncated)"
+        )
+        return result
@@ -0,0 +1,260 @@
+"""
+Document parsing off the event loop.
+
+PDF and DOCX extraction is CPU-bound (pymupdf4llm layout analysis can take
+seconds for a long book), so it runs in a bounded process pool rather than
+on the event loop serving other requests. Large PDFs are split into ranges
+of consecutive pages that are converted in parallel and joined back in page
+order; header levels are computed once for the whole document so every range
+formats headings the same way.
+
+At most ``max_workers`` tasks are handed to the pool at once, so a task's
+clock only starts when a worker is free to run it: ranges queued behind other
+ranges (of the same or another upload) do not use up their budget waiting.
+
+Each range has a time budget of ``page_timeout_seconds`` per page. A range
+that exceeds it fails its upload, and the pool is retired: new tasks go to a
+fresh pool, and the old one is terminated (stopping the stuck worker) once
+the other uploads' tasks running in it have finished.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from app.core.exceptions import DocumentParseError, DocumentParseTimeoutError, DocumentTooLargeError
+from app.core.logger import log
+from app.utils.file_parser import FileParser, inspect_pdf, parse_pdf_pages
+from app.utils.temp_file import secure_temp_file
+
+
+def _worker_ready() -> bool:
+    """No-op task that makes the pool start a worker."""
+    return True
+
+
+class DocumentParser:
+    """
+    Extracts text from uploaded documents in a bounded process pool.
+
+    Args:
+        max_workers: Worker processes; 0 parses in a thread instead
+        pages_per_task: PDF pages converted per pool task
+        page_timeout_seconds: Time budget per page
+        max_pages: Largest PDF accepted, in pages
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        pages_per_task: int = 16,
+        page_timeout_seconds: float = 10.0,
+        max_pages: int = 1000,
+    ):
+        self.max_workers = max_workers
+        self.pages_per_task = max(1, pages_per_task)
+        self.page_timeout_seconds = page_timeout_seconds
+        self.max_pages = max_pages
+        self.file_parser = FileParser()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = asyncio.Lock()
+        # One slot per worker, held until the worker has finished the task
+        self._slots = asyncio.Semaphore(max(1, max_workers))
+        self._pending: Dict[ProcessPoolExecutor, Set[Future]] = {}
+        # Retired pools and their stuck tasks; terminated once nothing else runs in them
+        self._retired: Dict[ProcessPoolExecutor, Set[Future]] = {}
+
+    @classmethod
+    async def start(cls, settings=None) -> "DocumentParser":
+        """Async factory method for lifespan-managed initialization."""
+        if settings is None:
+            from app.config.settings import get_settings
+            settings = get_settings()
+        instance = cls(
+            max_workers=settings.document_parse_workers,
+            pages_per_task=settings.document_parse_pages_per_task,
+            page_timeout_seconds=settings.document_parse_page_timeout_seconds,
+            max_pages=settings.document_parse_max_pages,
+        )
+        log.info(
+            f"DocumentParser initialized (workers={instance.max_workers}, "
+            f"pages_per_task={instance.pages_per_task}, max_pages={instance.max_pages})"
+        )
+        return instance
+
+    async def aclose(self):
+        """Async cleanup for lifespan management."""
+        executor, self._executor = self._executor, None
+        for retired in list(self._retired):
+            self._retired.pop(retired)
+            self._terminate(retired)
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+        log.info("DocumentParser cleaned up")
+
+    async def _get_executor(self) -> ProcessPoolExecutor:
+        """The process pool, started with all workers running on first use."""
+        async with self._executor_lock:
+            if self._executor is None:
+                # Spawned rather than forked: the server process runs threads (OpenTelemetry,
+                # thread-pool offloads) whose locks a forked child could inherit held
+                executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                # Start the workers before any task is timed: interpreter start-up and
+                # imports take a second or more and are not part of a page's budget
+                loop = asyncio.get_running_loop()
+                await asyncio.gather(
+                    *(loop.run_in_executor(executor, _worker_ready) for _ in range(self.max_workers))
+                )
+                self._executor = executor
+            return self._executor
+
+    @staticmethod
+    def _terminate(executor: ProcessPoolExecutor) -> None:
+        """Terminate ``executor``'s workers; its unfinished tasks fail with BrokenProcessPool."""
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def _retire_executor(self, executor: ProcessPoolExecutor, stuck: Optional[Future] = None) -> None:
+        """
+        Stop sending tasks to ``executor`` and terminate it once only ``stuck`` tasks run in it.
+
+        Without ``stuck`` (a broken pool) it is terminated right away.
+        """
+        if self._executor is executor:
+            self._executor = None
+        if stuck is None:
+            self._retired.pop(executor, None)
+            self._terminate(executor)
+            return
+        self._retired.setdefault(executor, set()).add(stuck)
+        self._terminate_if_idle(executor)
+
+    def _terminate_if_idle(self, executor: ProcessPoolExecutor) -> None:
+        stuck = self._retired.get(executor)
+        if stuck is not None and self._pending.get(executor, set()) <= stuck:
+            del self._retired[executor]
+            log.warning("[DocumentParser] Terminating retired worker pool with a stuck task")
+            self._terminate(executor)
+
+    def _task_done(self, executor: ProcessPoolExecutor, future: Future) -> None:
+        self._slots.release()
+        pending = self._pending.get(executor)
+        if pending is not None:
+            pending.discard(future)
+            if not pending:
+                del self._pending[executor]
+        self._terminate_if_idle(executor)
+
+    async def _run(self, timeout: float, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run ``fn(*args)`` in the pool (or a thread) within ``timeout`` seconds.
+
+        The clock starts once a worker slot is free: waiting for one does not count.
+        """
+        if self.max_workers <= 0:
+            return await asyncio.wait_for(asyncio.to_thread(fn, *args), timeout)
+        await self._slots.acquire()
+        try:
+            executor = await self._get_executor()
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._pending.setdefault(executor, set()).add(future)
+        loop = asyncio.get_running_loop()
+
+        def release(done: Future) -> None:
+            # Runs in the pool's management thread: the slot frees when the worker does
+            try:
+                loop.call_soon_threadsafe(self._task_done, executor, done)
+            except RuntimeError:
+                pass  # Event loop already closed
+
+        future.add_done_callback(release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self._retire_executor(executor, stuck=future)
+            raise
+        except BrokenProcessPool as e:
+            self._retire_executor(executor)
+            raise DocumentParseError("Document parser worker stopped unexpectedly") from e
+
+    async def parse(self, file_extension: str, file_bytes: bytes) -> str:
+        """
+        Extract the text of a document.
+
+        Args:
+            file_extension: File type ("txt", "md", "pdf" or "docx")
+            file_bytes: Raw file content
+
+        Returns:
+            The extracted text (Markdown for PDFs)
+
+        Raises:
+            DocumentTooLargeError: If a PDF has more than ``max_pages`` pages
+            DocumentParseTimeoutError: If a page range exceeds its time budget
+            UnicodeDecodeError: If a text file is not valid UTF-8
+            ValueError: If the file type is unsupported or the file is invalid
+        """
+        extension = file_extension.lower()
+        if extension in ("txt", "md"):
+            return self.file_parser.parse_file(extension, file_bytes.decode("utf-8"))
+        if extension == "pdf":
+            return await self._parse_pdf(file_bytes)
+        if extension == "docx":
+            timeout = self.page_timeout_seconds * self.pages_per_task
+            try:
+                return await self._run(timeout, self.file_parser.parse_docx, file_bytes)
+            except asyncio.TimeoutError:
+                raise DocumentParseTimeoutError(1, 1, timeout)
+        raise ValueError(f"Unsupported file extension: {file_extension}")
+
+    async def _parse_pdf(self, file_bytes: bytes) -> str:
+        if not file_bytes:
+            raise ValueError("file_content cannot be empty")
+        with secure_temp_file(suffix=".pdf") as tmp_path:
+            await asyncio.to_thread(Path(tmp_path).write_bytes, file_bytes)
+            try:
+                page_count, hdr_info = await self._run(self.page_timeout_seconds, inspect_pdf, tmp_path)
+            except asyncio.TimeoutError:
+                raise DocumentParseTimeoutError(1, 1, self.page_timeout_seconds)
+            except DocumentParseError:
+                raise
+            except Exception as e:
+                raise ValueError(f"Failed to parse PDF content: {e}") from e
+            if page_count > self.max_pages:
+                raise DocumentTooLargeError(page_count, self.max_pages)
+
+            ranges = [
+                range(start, min(start + self.pages_per_task, page_count))
+                for start in range(0, page_count, self.pages_per_task)
+            ]
+            tasks = [asyncio.ensure_future(self._parse_pdf_range(tmp_path, pages, hdr_info)) for pages in ranges]
+            try:
+                parts: List[str] = await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        return "".join(parts)
+
+    async def _parse_pdf_range(self, path: str, pages: range, hdr_info: Any) -> str:
+        timeout = self.page_timeout_seconds * len(pages)
+        try:
+            return await self._run(timeout, parse_pdf_pages, path, pages, hdr_info)
+        except asyncio.TimeoutError:
+            log.warning(f"[DocumentParser] Pages {pages.start + 1}-{pages.stop} exceeded {timeout:.0f}s")
+            raise DocumentParseTimeoutError(pages.start + 1, pages.stop, timeout)
+        except DocumentParseError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Failed to parse PDF content: {e}") from e
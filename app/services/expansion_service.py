@@ -1,9 +1,13 @@
 from typing import Any, Dict, List, Optional, TYPE_CHECKING
 import asyncio
+import re
 import time
 from dataclasses import dataclass
 
+import numpy as np
+
 from app.core.logger import log
+from app.core.constants import PRF_SPARSE_VECTOR_NAME, PRF_FEEDBACK_DOCS, PRF_MAX_EXPANSION_TERMS
 from app.core.exceptions import (
     ExpansionMethodError, LLMError,
     LLMUnavailableError, LLMResponseError
@@ -116,6 +120,40 @@ class ExpansionService:
                 query, collection, methods, rrf_k, max_results, enable_prf, **query_kwargs
             )
 
+    async def generate_queries(
+        self,
+        query: str,
+        methods: Optional[List[str]] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Generate expanded queries without retrieving anything.
+
+        For callers that search their own collection with their own filters
+        (e.g. chat history). Methods run concurrently; failed methods are omitted.
+
+        Args:
+            query: Original query string
+            methods: Expansion methods to use (default: hyde, rag_fusion, self_ask)
+
+        Returns:
+            Dictionary mapping method name to its generated queries
+        """
+        if methods is None:
+            methods = ['hyde', 'rag_fusion', 'self_ask']
+
+        results = await asyncio.gather(
+            *(self._generate_queries_for_method(query, method) for method in methods),
+            return_exceptions=True
+        )
+
+        expanded_queries = {}
+        for method, result in zip(methods, results):
+            if isinstance(result, Exception):
+                log.warning(f"Expansion method {method} failed to generate queries: {result}")
+                continue
+            expanded_queries[method] = result
+        return expanded_queries
+
     async def _expand_query_modern(
         self,
         query: str,
@@ -619,13 +657,19 @@ class ExpansionService:
         return all_results
 
     async def _initial_retrieval(self, query: str, collection: str, **kwargs) -> List[Any]:
-        """Perform initial retrieval for PRF (Pseudo Relevance Feedback)."""
+        """
+        Perform initial retrieval for PRF (Pseudo Relevance Feedback).
+
+        The stored SPLADE vector is requested alongside each point so PRF can
+        reuse it instead of re-encoding the result text.
+        """
         try:
             results = await self.qdrant_manager.query_hybrid(
                 query_text=query,
                 collection=collection,
                 limit=5,  # Small initial set for PRF
-                **{k: v for k, v in kwargs.items() if k != 'limit'}
+                with_vectors=[PRF_SPARSE_VECTOR_NAME],
+                **{k: v for k, v in kwargs.items() if k not in ('limit', 'with_vectors')}
             )
 
             # Flatten and return top results
@@ -633,45 +677,99 @@ class ExpansionService:
             for vector_type, points in results.items():
                 all_results.extend(points)
 
-            # Sort by score and return top results
+            # Sort by score and keep the best hit per point (a point can match several vector types)
             all_results.sort(key=lambda x: x.score, reverse=True)
-            return all_results[:3]  # Top 3 for PRF
+            top_results = []
+            seen_ids = set()
+            for point in all_results:
+                if point.id in seen_ids:
+                    continue
+                seen_ids.add(point.id)
+                top_results.append(point)
+                if len(top_results) >= PRF_FEEDBACK_DOCS:
+                    break
+            return top_results
 
         except Exception as e:
             log.warning(f"Initial PRF retrieval failed: {e}")
             return []
 
-    async def _generate_prf_query(self, original_query: str, initial_results: List[Any]) -> str:
-        """Generate PRF-enhanced query using initial retrieval results."""
-        try:
-            # Extract key terms from top results using SPLADE if available
-            key_terms = []
+    @staticmethod
+    def _stored_sparse_vector(point: Any, vector_name: str = PRF_SPARSE_VECTOR_NAME):
+        """Return (indices, values) of a point's stored sparse vector, or None if absent."""
+        vectors = getattr(point, 'vector', None)
+        if not isinstance(vectors, dict):
+            return None
 
-            for result in initial_results:
-                if hasattr(result, 'payload') and 'text' in result.payload:
-                    text = result.payload['text'][:500]  # First 500 chars
+        sparse = vectors.get(vector_name)
+        if sparse is None:
+            return None
+
+        if isinstance(sparse, dict):
+            indices, values = sparse.get('indices'), sparse.get('values')
+        else:
+            indices, values = getattr(sparse, 'indices', None), getattr(sparse, 'values', None)
+
+        if not indices or not values or len(indices) != len(values):
+            return None
+        return indices, values
+
+    def _top_prf_terms(
+        self,
+        sparse_vectors: List[tuple],
+        original_query: str,
+        max_terms: int = PRF_MAX_EXPANSION_TERMS
+    ) -> List[str]:
+        """
+        Merge sparse vectors across feedback documents and return the heaviest terms.
+
+        Weights for the same token id are summed in a single vectorized pass and
+        ids are mapped to tokens through the precomputed vocabulary table.
+        """
+        if not sparse_vectors:
+            return []
 
-                    # Use SPLADE to extract important terms
-                    splade_vector = await self.llm_manager.generate_splade_vector(text)
+        indices = np.concatenate([np.asarray(idx, dtype=np.int64) for idx, _ in sparse_vectors])
+        values = np.concatenate([np.asarray(val, dtype=np.float32) for _, val in sparse_vectors])
 
-                    # Get top terms from SPLADE vector
-                    if 'indices' in splade_vector and 'values' in splade_vector:
-                        indices = splade_vector['indices']
-                        values = splade_vector['values']
+        token_ids, inverse = np.unique(indices, return_inverse=True)
+        weights = np.bincount(inverse, weights=values)
+        ranked_ids = token_ids[np.argsort(-weights, kind='stable')]
 
-                        # Get top 5 terms by weight
-                        top_indices = sorted(zip(indices, values), key=lambda x: x[1], reverse=True)[:5]
+        vocab = self.llm_manager.splade_vocab
+        ranked_ids = ranked_ids[ranked_ids < len(vocab)]
+        query_terms = set(re.findall(r'\w+', original_query.lower()))
 
-                        for idx, weight in top_indices:
-                            term = self.llm_manager.splade_tokenizer.decode([idx])
-                            if len(term.strip()) > 2:  # Filter out short tokens
-                                key_terms.append(term.strip())
+        key_terms = []
+        for term in vocab[ranked_ids]:
+            term = str(term).strip()
+            # Skip special tokens, word-piece continuations and short tokens
+            if len(term) <= 2 or term.startswith('##') or (term.startswith('[') and term.endswith(']')):
+                continue
+            if term.lower() in query_terms or term in key_terms:
+                continue
+            key_terms.append(term)
+            if len(key_terms) >= max_terms:
+                break
+
+        return key_terms
+
+    async def _generate_prf_query(self, original_query: str, initial_results: List[Any]) -> str:
+        """Generate PRF-enhanced query from the stored SPLADE vectors of initial results."""
+        try:
+            sparse_vectors = []
+            for result in initial_results:
+                sparse = self._stored_sparse_vector(result)
+                if sparse is not None:
+                    sparse_vectors.append(sparse)
+                else:
+                    log.debug(f"PRF result {getattr(result, 'id', '?')} has no stored {PRF_SPARSE_VECTOR_NAME} vector")
 
-            # Combine original query with key terms
-            unique_terms = list(set(key_terms))[:10]  # Top 10 unique terms
-            enhanced_query = f"{original_query} {' '.join(unique_terms)}"
+            key_terms = self._top_prf_terms(sparse_vectors, original_query)
+            if not key_terms:
+                return original_query
 
-            return enhanced_query
+            return f"{original_query} {' '.join(key_terms)}"
 
         except Exception as e:
             log.warning(f"PRF query generation failed: {e}")
@@ -0,0 +1,230 @@
+"""
+Background dependency health monitoring.
+
+Each dependency probe (database, Qdrant, Redis, the embedding model, ...)
+runs on its own schedule in a background task, and the health endpoints
+serve the latest snapshot instead of probing on every request. Load
+balancers and Kubernetes can then poll /health as often as they like without
+taking embedding capacity from real traffic.
+
+Probe cost is budgeted: a dependency is probed no more often than its
+interval, and a healthy dependency no more often than keeps probing under
+``probe_budget`` of wall time (a probe that takes 2s with a 1% budget runs at
+most every 200s), up to ``max_interval_seconds``. A failing dependency is
+re-probed at its base interval so recovery shows up promptly; a timed-out
+probe's duration says nothing about what a healthy probe costs.
+
+Status changes update the ``dependency_health_status`` gauge and are logged
+as structured ``dependency_health_change`` events.
+"""
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.logger import log
+from app.core.metrics import record_health_probe
+
+
+@dataclass
+class HealthProbe:
+    """
+    A dependency check run by the monitor.
+
+    Args:
+        name: Dependency name as reported by /health
+        check: Coroutine function returning a dict with at least a "status" key
+        interval_seconds: Minimum time between two probes
+        critical: Whether readiness requires this dependency to be healthy
+        timeout_seconds: Upper bound on a single probe
+    """
+
+    name: str
+    check: Callable[[], Awaitable[Dict[str, Any]]]
+    interval_seconds: float
+    critical: bool = False
+    timeout_seconds: float = 30.0
+
+
+@dataclass
+class _ProbeState:
+    """Latest result and latency history of one probe."""
+
+    latencies_ms: Deque[float]
+    result: Optional[Dict[str, Any]] = None
+    checked_at: Optional[float] = None
+    next_interval_seconds: float = 0.0
+    consecutive_failures: int = 0
+
+
+class HealthMonitor:
+    """
+    Refreshes dependency health in the background, managed by the application lifespan.
+
+    Access via app.core.dependencies.get_health_monitor(); None when not started.
+
+    Args:
+        probes: Dependencies to monitor
+        probe_budget: Largest fraction of wall time a probe may spend running
+        max_interval_seconds: Upper bound on the time between two probes, whatever the budget
+        latency_history: Probe latencies kept per dependency
+        stale_after_intervals: A result older than this many probe intervals is stale
+    """
+
+    def __init__(
+        self,
+        probes: Sequence[HealthProbe],
+        probe_budget: float = 0.01,
+        max_interval_seconds: float = 300.0,
+        latency_history: int = 60,
+        stale_after_intervals: float = 3.0,
+    ):
+        self.probes: Dict[str, HealthProbe] = {probe.name: probe for probe in probes}
+        self.probe_budget = probe_budget
+        self.max_interval_seconds = max_interval_seconds
+        self.stale_after_intervals = stale_after_intervals
+        self._states: Dict[str, _ProbeState] = {
+            name: _ProbeState(latencies_ms=deque(maxlen=latency_history), next_interval_seconds=probe.interval_seconds)
+            for name, probe in self.probes.items()
+        }
+        self._tasks: List[asyncio.Task] = []
+
+    @classmethod
+    async def start(cls, probes: Sequence[HealthProbe], settings=None) -> "HealthMonitor":
+        """Async factory method for lifespan-managed initialization; starts the probe tasks."""
+        if settings is None:
+            from app.config.settings import get_settings
+            settings = get_settings()
+        instance = cls(
+            probes,
+            probe_budget=settings.health_probe_budget,
+            max_interval_seconds=settings.health_max_probe_interval_seconds,
+            latency_history=settings.health_latency_history,
+        )
+        instance.run()
+        log.info(
+            f"HealthMonitor started for {', '.join(instance.probes)} "
+            f"(probe budget {instance.probe_budget:.1%} of wall time)"
+        )
+        return instance
+
+    def run(self) -> None:
+        """Start one background task per probe."""
+        if self.running:
+            return
+        self._tasks = [
+            asyncio.create_task(self._probe_loop(probe), name=f"health-probe-{probe.name}")
+            for probe in self.probes.values()
+        ]
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def aclose(self):
+        """Async cleanup for lifespan management."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        log.info("HealthMonitor cleaned up")
+
+    async def _probe_loop(self, probe: HealthProbe) -> None:
+        while True:
+            await self.refresh(probe.name)
+            await asyncio.sleep(self._states[probe.name].next_interval_seconds)
+
+    async def refresh(self, name: Optional[str] = None) -> None:
+        """Probe ``name`` now, or every dependency concurrently when omitted."""
+        if name is None:
+            await asyncio.gather(*(self.refresh(probe_name) for probe_name in self.probes))
+            return
+
+        probe = self.probes[name]
+        started = time.perf_counter()
+        try:
+            # Not wait_for: on 3.11 it swallows a cancel that lands as the check completes, hanging aclose()
+            async with asyncio.timeout(probe.timeout_seconds):
+                result = await probe.check()
+        except asyncio.TimeoutError:
+            result = {"status": "unhealthy", "message": f"Health probe timed out after {probe.timeout_seconds:.0f}s"}
+        except Exception as e:
+            result = {"status": "error", "message": str(e)}
+        duration = time.perf_counter() - started
+        self._record(probe, result, duration)
+
+    def _record(self, probe: HealthProbe, result: Dict[str, Any], duration: float) -> None:
+        state = self._states[probe.name]
+        previous = state.result.get("status") if state.result else None
+        current = result.get("status", "error")
+
+        state.result = result
+        state.checked_at = time.time()
+        state.latencies_ms.append(duration * 1000)
+        ok = current in ("healthy", "disabled")
+        state.consecutive_failures = 0 if ok else state.consecutive_failures + 1
+        # Keep probing within budget: an expensive healthy probe backs off beyond its interval.
+        # Failed and timed-out probes retry at the base interval to notice recovery.
+        interval = max(probe.interval_seconds, duration / self.probe_budget) if ok else probe.interval_seconds
+        state.next_interval_seconds = min(interval, max(probe.interval_seconds, self.max_interval_seconds))
+
+        record_health_probe(probe.name, current, previous, duration)
+        if current != previous:
+            log_level = log.info if current in ("healthy", "disabled") else log.warning
+            log_level(
+                f"Dependency {probe.name} is {current} (was {previous or 'unknown'})",
+                extra={
+                    "event_type": "dependency_health_change",
+                    "dependency": probe.name,
+                    "status": current,
+                    "previous_status": previous,
+                    "critical": probe.critical,
+                    "probe_duration_ms": round(duration * 1000, 2),
+                    "detail": result.get("message"),
+                },
+            )
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Latest result of every probe, with its age and latency history.
+
+        Dependencies not probed yet report status "pending".
+        """
+        now = time.time()
+        services = {}
+        for name, state in self._states.items():
+            if state.result is None:
+                services[name] = {"status": "pending", "message": "Not probed yet", "stale": True}
+                continue
+
+            age = now - state.checked_at
+            latencies = np.fromiter(state.latencies_ms, dtype=float)
+            services[name] = {
+                **state.result,
+                "checked_at": datetime.fromtimestamp(state.checked_at, tz=timezone.utc).isoformat(),
+                "age_seconds": round(age, 3),
+                "stale": age > self.stale_after_intervals * state.next_interval_seconds,
+                "next_check_in_seconds": round(max(0.0, state.next_interval_seconds - age), 3),
+                "consecutive_failures": state.consecutive_failures,
+                "latency_ms": {
+                    "last": round(float(latencies[-1]), 2),
+                    "p50": round(float(np.percentile(latencies, 50)), 2),
+                    "p95": round(float(np.percentile(latencies, 95)), 2),
+                    "max": round(float(latencies.max()), 2),
+                    "samples": len(latencies),
+                },
+            }
+        return services
+
+    @property
+    def critical(self) -> List[str]:
+        """Names of the dependencies readiness depends on."""
+        return [name for name, probe in self.probes.items() if probe.critical]
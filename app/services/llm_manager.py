@@ -3,15 +3,17 @@ from llama_index.llms.ollama import Ollama
 from llama_index.embeddings.ollama import OllamaEmbedding
 from llama_index.core.base.llms.types import CompletionResponse
 import numpy as np
-from transformers import AutoModelForMaskedLM, AutoTokenizer
 from typing import Dict, List, Any, TYPE_CHECKING
 import torch
 import ollama
 from app.core.philosopher_info import PHILOSOPHER_INFO
+from app.core.philosopher_loader import get_prompt_fragment, immersive_system_context
 
 from app.config.settings import get_settings
 from app.core.logger import log
-from app.services.prompt_renderer import PromptRenderer
+from app.services.prompt_renderer import PromptRenderer, prompt_prefix_tracker
+from app.services.splade_runtime import load_splade_encoder
+from app.services.token_counter import get_token_counter
 from app.core.exceptions import LLMError, LLMTimeoutError, LLMResponseError, LLMUnavailableError
 from app.core.cache_helpers import with_cache
 from app.core.http_error_guard import with_retry
@@ -39,6 +41,7 @@ from app.core.constants import (
     EMBEDDING_CACHE_TTL,
 )
 import asyncio
+import inspect
 
 # Model configuration loaded from Pydantic Settings via TOML files
 # These will be accessed within the class initialization
@@ -52,6 +55,8 @@ class LLMManager:
         self._embed_model = None
         self._splade_tokenizer = None
         self._splade_model = None
+        self._splade_vocab = None
+        self._splade_encoder = None
         self._prompts = prompt_renderer  # Use injected instance or None
         self._cache_service = cache_service  # Injected cache service for embeddings and vectors
 
@@ -115,6 +120,8 @@ class LLMManager:
         self._embed_model = None
         self._splade_model = None
         self._splade_tokenizer = None
+        self._splade_vocab = None
+        self._splade_encoder = None
         self._prompts = None
 
         try:
@@ -136,7 +143,6 @@ class LLMManager:
             # Load model names from settings (loaded from TOML files + env vars)
             llm_model = settings.llm_model
             embed_model = settings.embed_model
-            splade_model = settings.splade_model
             
             # Initialize LLM with performance optimizations
             self._llm = Ollama(
@@ -151,24 +157,11 @@ class LLMManager:
 
             self.set_llm_context_window(settings.default_context_window)
 
-            # Initialize SPLADE model and tokenizer with compilation
+            # Initialize SPLADE encoder (torch, or a persisted ONNX Runtime export)
             try:
-                from app.services.model_compiler import ModelCompiler
-                
-                self._splade_tokenizer = AutoTokenizer.from_pretrained(splade_model, use_fast=True)
-                splade_model_raw = AutoModelForMaskedLM.from_pretrained(splade_model)
-                
-                # Apply optimizations during startup
-                self._splade_model = ModelCompiler.optimize_model(splade_model_raw, "SPLADE")
-                
-                # Set to evaluation mode after compilation
-                self._splade_model.eval()
-                
-                # Move to device
-                device = "cuda" if torch.cuda.is_available() else "cpu"
-                self._splade_model = self._splade_model.to(device)
-                
-                log.info(f"SPLADE model initialized with optimizations on device: {device}")
+                self._splade_encoder = load_splade_encoder(settings)
+                self._splade_model = self._splade_encoder.model
+                self._splade_tokenizer = self._splade_encoder.tokenizer
             except Exception as e:
                 log.error(f"Failed to initialize SPLADE model: {e}")
                 raise LLMError(f"SPLADE model initialization failed: {e}") from e
@@ -237,6 +230,22 @@ class LLMManager:
             raise RuntimeError("Splade model not initialized")
         return self._splade_tokenizer
 
+    @property
+    def splade_vocab(self) -> np.ndarray:
+        """
+        Id→token lookup table for the SPLADE vocabulary.
+
+        Built once from the tokenizer so sparse vector indices can be mapped to
+        terms with a single array lookup instead of one decode call per token.
+        """
+        if self._splade_vocab is None:
+            tokenizer = self.splade_tokenizer
+            self._splade_vocab = np.array(
+                tokenizer.convert_ids_to_tokens(list(range(len(tokenizer)))),
+                dtype=object
+            )
+        return self._splade_vocab
+
     def set_temperature(self, temperature: float) -> None:
         """Set model temperature safely."""
         self.llm.temperature = temperature
@@ -304,9 +313,7 @@ class LLMManager:
 
             # Track token usage if available
             try:
-                # Estimate tokens (rough approximation: 1 token ≈ 4 characters)
-                prompt_tokens = len(question) // 4
-                completion_tokens = len(str(response)) // 4
+                prompt_tokens, completion_tokens = get_token_counter().count_batch([question, str(response)])
 
                 llm_query_tokens_total.labels(
                     model=settings.llm_model,
@@ -378,8 +385,10 @@ class LLMManager:
         })
 
         try:
-            # Request async stream without awaiting so we get the generator itself
+            # llama-index returns the generator from a coroutine; await it when needed
             stream = self.llm.astream_complete(question)
+            if inspect.isawaitable(stream):
+                stream = await stream
 
             # Stream the response with timeout monitoring
             start_time = asyncio.get_event_loop().time()
@@ -406,6 +415,10 @@ class LLMManager:
     def _build_context_from_nodes(self, context: List) -> str:
         """
         Extract and deduplicate node content from context.
+
+        Callers pack ``context`` into the token budget first (see
+        app.router.ontologic.pack_context_nodes), since the context window is
+        sized from the packed nodes.
         
         Args:
             context: List of nodes with payload containing text/summary/conjecture
@@ -482,6 +495,7 @@ class LLMManager:
                         "personality": PHILOSOPHER_INFO.get(immersive_mode, {}).get("personality", []) if immersive_mode else [],
                         "expertise_level": "beginner",
                     },
+                    cache=True,
                 )
                 speaker_name = immersive_mode if immersive_mode else "Sophia"
                 return system_prompt, speaker_name
@@ -494,6 +508,7 @@ class LLMManager:
                         "role_description": "writing formal, well-structured analyses with evidence grounded in provided context",
                         "philosopher_name": immersive_mode,
                     },
+                    cache=True,
                 )
                 speaker_name = immersive_mode if immersive_mode else "Sophia"
                 return system_prompt, speaker_name
@@ -505,6 +520,7 @@ class LLMManager:
                         "criteria": None,
                         "tone": "professional",
                     },
+                    cache=True,
                 )
                 speaker_name = "Reviewer"
                 return system_prompt, speaker_name
@@ -515,25 +531,35 @@ class LLMManager:
                 raise ValueError(
                     f"Immersive mode '{immersive_mode}' is not recognized. Available modes: {list(PHILOSOPHER_INFO.keys())}"
                 )
-            character_info = PHILOSOPHER_INFO[immersive_mode]
-            system_prompt = self._prompts.render(
-                "chat/immersive_system.j2",
-                {
-                    "name": immersive_mode,
-                    "axioms": character_info.get("axioms", []),
-                    "personality": character_info.get("personality", []),
-                    "rhetorical_tactics": character_info.get("rhetorical_tactics", []),
-                    "response_protocol": character_info.get("response_protocol", []),
-                    "cognitive_tone": character_info.get("cognitive_tone", []),
-                },
-            )
+            system_prompt = get_prompt_fragment("chat/immersive_system.j2", immersive_mode)
+            if system_prompt is None:
+                system_prompt = self._prompts.render(
+                    "chat/immersive_system.j2",
+                    immersive_system_context(immersive_mode, PHILOSOPHER_INFO[immersive_mode]),
+                    cache=True,
+                )
             speaker_name = immersive_mode
         else:
-            system_prompt = self._prompts.render("chat/neutral_system.j2")
+            system_prompt = get_prompt_fragment("chat/neutral_system.j2")
+            if system_prompt is None:
+                system_prompt = self._prompts.render("chat/neutral_system.j2")
             speaker_name = "Sophia"
         
         return system_prompt, speaker_name
 
+    @staticmethod
+    def _observe_prompt_prefix(
+        system_prompt: str, immersive_mode: str | None, prompt_type: str | None
+    ) -> None:
+        """Record the static prompt prefix for the prefix hit-rate metric."""
+        if not isinstance(system_prompt, str):
+            return
+        if isinstance(prompt_type, str):
+            prompt_kind = prompt_type
+        else:
+            prompt_kind = "immersive" if immersive_mode else "neutral"
+        prompt_prefix_tracker.observe(system_prompt, prompt_kind)
+
     def _render_user_prompt(
         self,
         prompt_type: str | None,
@@ -631,8 +657,10 @@ class LLMManager:
             prompt_type, speaker_name, node_content, query_str
         )
         
-        # Step 5: Assemble final message list
+        # Step 5: Assemble final message list, static system prompt first so the
+        # model server can reuse its cached prefix across requests
         messages = [ChatMessage(role="system", content=system_prompt), *messages, ChatMessage(role="user", content=user_content)]
+        self._observe_prompt_prefix(system_prompt, immersive_mode, prompt_type)
         
         # Step 6: Execute LLM call with timeout and error handling
         try:
@@ -728,8 +756,10 @@ class LLMManager:
             prompt_type, speaker_name, node_content, query_str
         )
         
-        # Step 5: Assemble final message list
+        # Step 5: Assemble final message list, static system prompt first so the
+        # model server can reuse its cached prefix across requests
         messages = [ChatMessage(role="system", content=system_prompt), *messages, ChatMessage(role="user", content=user_content)]
+        self._observe_prompt_prefix(system_prompt, immersive_mode, prompt_type)
 
         # Step 6: Execute streaming LLM call with timeout and error handling
         chat_timeout = timeout or self._timeouts["chat"]
@@ -750,8 +780,10 @@ class LLMManager:
             })
 
         try:
-            # Request async stream without awaiting so we get the generator itself
+            # llama-index returns the generator from a coroutine; await it when needed
             stream = self.llm.astream_chat(messages)
+            if inspect.isawaitable(stream):
+                stream = await stream
 
             # Stream the response with timeout monitoring
             start_time = asyncio.get_event_loop().time()
@@ -793,6 +825,7 @@ class LLMManager:
                 seen_node_ids.add(node.id)
 
         system_prompt = self._prompts.render("vet/system.j2")
+        self._observe_prompt_prefix(system_prompt, None, "vet")
         user_content = self._prompts.render(
             "vet/user.j2", {"node_texts": node_texts, "query_str": query_str}
         )
@@ -946,39 +979,11 @@ class LLMManager:
             """Inner function to compute SPLADE vector."""
             log.debug(f"Generating SPLADE vector for text (length: {len(text)})")
 
-            # Use optimized inference without thread pool overhead (compiled models are fast)
-            if hasattr(self, '_splade_model_compiled') or self._splade_model is not None:
-                # Direct inference for compiled models - no need for thread pool
-                inputs = self.splade_tokenizer(
-                    text, return_tensors="pt", truncation=True, padding=True, max_length=512
-                )
-
-                # Move to same device as model
-                device = next(self._splade_model.parameters()).device
-                inputs = {k: v.to(device) for k, v in inputs.items()}
-
-                # Use inference mode for optimal performance
-                with torch.inference_mode():
-                    outputs = self._splade_model(**inputs)
-                    logits = outputs.logits
-
-                sparse_vector = torch.log(1 + torch.relu(logits)).squeeze()
-                sparse_vector = torch.max(sparse_vector, dim=0)[0]
-                return self.dense_to_sparse_qdrant_format(sparse_vector.cpu().numpy())
-            else:
-                # Fallback to thread pool for non-compiled models
-                def _generate_splade_sync():
-                    inputs = self.splade_tokenizer(
-                        text, return_tensors="pt", truncation=True, padding=True, max_length=512
-                    )
-                    with torch.no_grad():
-                        outputs = self.splade_model(**inputs)
-                        logits = outputs.logits
-                    sparse_vector = torch.log(1 + torch.relu(logits)).squeeze()
-                    sparse_vector = torch.max(sparse_vector, dim=0)[0]
-                    return self.dense_to_sparse_qdrant_format(sparse_vector.numpy())
-
-                return await asyncio.to_thread(_generate_splade_sync)
+            if self._splade_encoder is None:
+                raise LLMError("Splade model not initialized")
+            # Inference runs off the event loop; torch and ONNX Runtime release the GIL
+            sparse_vector = await asyncio.to_thread(self._splade_encoder.encode, text)
+            return self.dense_to_sparse_qdrant_format(sparse_vector)
 
         try:
             # Use per-attempt timeout to ensure total execution time doesn't exceed configured timeout
@@ -1046,6 +1051,99 @@ class LLMManager:
         )
         return await self.get_embedding(text, timeout=timeout, max_attempts=max_attempts)
 
+    @trace_async_operation("llm.embedding_batch", {"operation": "dense_embedding"})
+    async def get_embeddings(self, texts: List[str], timeout: int | None = None,
+                             max_attempts: int = 1) -> List[List[float]]:
+        """
+        Get embeddings for several texts with a single request to the embedding model.
+
+        Meant for bulk jobs such as backfills: one Ollama embed call carries
+        all texts, and the embedding cache is bypassed since backfilled texts
+        are rarely embedded twice.
+
+        Args:
+            texts: Texts to embed, none of them empty
+            timeout: Total timeout in seconds (see get_embedding)
+            max_attempts: Total number of attempts (used to calculate per-attempt timeout)
+
+        Returns:
+            One embedding per text, in order
+        """
+        if not texts:
+            return []
+        if any(not text or not text.strip() for text in texts):
+            raise LLMError("Texts cannot be empty for embedding generation")
+
+        start_time = time.time()
+        status = 'success'
+        settings = get_settings()
+        total_timeout = timeout or self._timeouts.get("request", 300)
+        if max_attempts > 1:
+            _, per_attempt_timeout = calculate_per_attempt_timeout(
+                total_timeout, max_retries=max_attempts - 1
+            )
+        else:
+            per_attempt_timeout = total_timeout
+
+        def _embed_batch() -> List[List[float]]:
+            model = self.embed_model
+            client = getattr(model, "_client", None)
+            if client is None:
+                return [model.get_general_text_embedding(text) for text in texts]
+            response = client.embed(
+                model=model.model_name, input=texts, options=model.ollama_additional_kwargs
+            )
+            return [list(embedding) for embedding in response.embeddings]
+
+        try:
+            log.debug(f"Generating embeddings for {len(texts)} texts")
+            set_span_attributes({
+                "llm.model": settings.embed_model,
+                "llm.batch_size": len(texts),
+                "llm.operation": "embedding"
+            })
+            embeddings = await asyncio.wait_for(asyncio.to_thread(_embed_batch), timeout=per_attempt_timeout)
+            if len(embeddings) != len(texts):
+                raise LLMError(f"Embedding model returned {len(embeddings)} embeddings for {len(texts)} texts")
+            return embeddings
+        except asyncio.TimeoutError as exc:
+            status = 'timeout'
+            log.error(f"Batch embedding of {len(texts)} texts timed out after {per_attempt_timeout}s")
+            raise LLMTimeoutError(
+                f"Batch embedding generation timed out after {per_attempt_timeout} seconds per attempt"
+            ) from exc
+        except LLMError:
+            status = 'error'
+            raise
+        except Exception as e:
+            status = 'error'
+            log.error(f"Batch embedding generation failed: {e}")
+            raise LLMError(f"Failed to generate embeddings: {str(e)}") from e
+        finally:
+            llm_embedding_duration_seconds.labels(
+                model=settings.embed_model,
+                status=status
+            ).observe(time.time() - start_time)
+
+    @with_retry(max_retries=3, retryable_exceptions=(ConnectionError, LLMTimeoutError))
+    @trace_async_operation("llm.dense_vectors", {"operation": "dense_embedding"})
+    async def generate_dense_vectors(self, texts: List[str], timeout: int | None = None) -> List[List[float]]:
+        """
+        Generate dense vectors for several texts in one embedding request, with timeout and retry protection.
+
+        Args:
+            texts: Texts to generate embeddings for
+            timeout: Total timeout in seconds across all retry attempts (see generate_dense_vector)
+        """
+        if self.embed_model is None:
+            raise ValueError(
+                "Embedding model not provided. Cannot generate dense vectors."
+            )
+        max_attempts, _ = calculate_per_attempt_timeout(
+            timeout or self._timeouts.get("request", 300), max_retries=3
+        )
+        return await self.get_embeddings(texts, timeout=timeout, max_attempts=max_attempts)
+
     def set_llm_context_window(
         self, context_window: int | None = None
     ):
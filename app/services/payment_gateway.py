@@ -0,0 +1,159 @@
+"""
+Stripe calls off the event loop.
+
+The stripe SDK is synchronous, so calling it from an async handler blocks the
+worker's event loop for the whole round trip to Stripe. StripeGateway runs
+each call in a worker thread with a timeout, retries transient failures
+(network errors, rate limits, Stripe 5xx) with exponential backoff, and opens
+a circuit breaker after repeated failures so requests fail fast instead of
+queueing behind an unreachable Stripe.
+
+Mutating calls carry an idempotency key that is generated once per logical
+call and reused by its retries, so a retried create whose first response was
+lost cannot create a second customer, subscription or refund.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Any, Callable, Optional, Tuple, Type, TypeVar
+
+try:
+    import stripe
+    from stripe import StripeError
+except ImportError:
+    stripe = None
+    StripeError = Exception
+
+from app.core.logger import log
+
+T = TypeVar("T")
+
+
+class StripeUnavailableError(StripeError):
+    """Stripe could not be reached in time, or the circuit breaker is open."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _transient_errors() -> Tuple[Type[BaseException], ...]:
+    errors: Tuple[Type[BaseException], ...] = (asyncio.TimeoutError, TimeoutError, ConnectionError)
+    if stripe is not None:
+        errors += (stripe.APIConnectionError, stripe.RateLimitError, stripe.APIError)
+    return errors
+
+
+TRANSIENT_ERRORS = _transient_errors()
+
+
+class StripeGateway:
+    """
+    Runs Stripe SDK calls in worker threads with timeouts, retries and a circuit breaker.
+
+    Args:
+        timeout_seconds: Time limit for one attempt
+        max_retries: Retries after a transient failure
+        backoff_seconds: Delay before the first retry; doubles on each further retry
+        failure_threshold: Consecutive failed calls that open the circuit
+        reset_seconds: How long the circuit stays open before a trial call
+        max_concurrency: Stripe calls in flight at once (bounds the threads used)
+    """
+
+    def __init__(
+        self,
+        timeout_seconds: float = 10.0,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.5,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        max_concurrency: int = 8,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+
+    @classmethod
+    def from_settings(cls, settings=None) -> "StripeGateway":
+        if settings is None:
+            from app.config.settings import get_settings
+            settings = get_settings()
+        return cls(
+            timeout_seconds=settings.stripe_timeout_seconds,
+            max_retries=settings.stripe_max_retries,
+            failure_threshold=settings.stripe_circuit_failure_threshold,
+            reset_seconds=settings.stripe_circuit_reset_seconds,
+        )
+
+    @property
+    def circuit_open(self) -> bool:
+        """True while calls are being rejected without reaching Stripe."""
+        return self._opened_at is not None and time.monotonic() - self._opened_at < self.reset_seconds
+
+    async def call(self, operation: Callable[..., T], *args: Any, mutating: bool = False, **params: Any) -> T:
+        """
+        Call ``operation(*args, **params)`` in a worker thread.
+
+        Args:
+            operation: Stripe SDK method, e.g. ``stripe.Customer.create``
+            mutating: The call changes state in Stripe; an idempotency key is
+                added (unless ``idempotency_key`` is given) and reused on retries
+            *args, **params: Passed to ``operation``
+
+        Raises:
+            StripeUnavailableError: If the circuit is open, or every attempt
+                failed with a transient error
+            StripeError: Non-transient errors (card declined, invalid request,
+                ...) are raised unchanged and never retried
+        """
+        name = getattr(operation, "__qualname__", repr(operation))
+        if self.circuit_open:
+            retry_after = self.reset_seconds - (time.monotonic() - self._opened_at)
+            raise StripeUnavailableError(
+                f"Stripe unavailable (circuit open after {self._consecutive_failures} failures); "
+                f"retry in {retry_after:.0f}s",
+                retry_after=retry_after,
+            )
+        if mutating:
+            params.setdefault("idempotency_key", f"ontologic-{uuid.uuid4()}")
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    result = await asyncio.wait_for(
+                        asyncio.to_thread(operation, *args, **params), self.timeout_seconds
+                    )
+            except TRANSIENT_ERRORS as e:
+                reason = f"timed out after {self.timeout_seconds:.0f}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+                if attempt < self.max_retries:
+                    delay = self.backoff_seconds * 2 ** attempt
+                    log.warning(f"Stripe {name} failed ({reason}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                self._record_failure(name)
+                raise StripeUnavailableError(f"Stripe {name} failed after {attempt + 1} attempts: {reason}") from e
+            self._record_success()
+            return result
+
+    def _record_success(self) -> None:
+        if self._opened_at is not None:
+            log.info("Stripe circuit closed")
+        self._consecutive_failures = 0
+        self._opened_at = None
+
+    def _record_failure(self, name: str) -> None:
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.failure_threshold:
+            # (Re)open: a failed trial call after the reset period starts a new one
+            if not self.circuit_open:
+                log.error(
+                    f"Stripe circuit opened after {self._consecutive_failures} failed calls "
+                    f"(last: {name}); rejecting calls for {self.reset_seconds:.0f}s"
+                )
+            self._opened_at = time.monotonic()
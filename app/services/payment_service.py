@@ -12,16 +12,20 @@ from typing import Optional, Dict, Any, List, Union, TYPE_CHECKING
 
 try:
     import stripe
-    from stripe import StripeError, CardError
+    from stripe import StripeError, CardError, InvalidRequestError
 except ImportError:
     stripe = None
     StripeError = Exception
     CardError = Exception
+    InvalidRequestError = Exception
 
 from app.config.settings import get_settings
 from app.core.logger import log
-from app.core.db_models import Subscription, PaymentRecord, SubscriptionTier, SubscriptionStatus, WebhookEvent
+from app.core.db_models import (
+    Subscription, PaymentRecord, SubscriptionTier, SubscriptionStatus, WebhookEvent, WebhookEventStatus
+)
 from app.core.user_models import User
+from app.services.payment_gateway import StripeGateway
 
 if TYPE_CHECKING:
     from app.services.cache_service import RedisCacheService
@@ -63,16 +67,27 @@ class PaymentService:
         'card_not_supported': (PaymentException, "Card type not supported"),
     }
 
-    def __init__(self, cache_service: Optional['RedisCacheService'] = None):
+    def __init__(
+        self,
+        cache_service: Optional['RedisCacheService'] = None,
+        gateway: Optional[StripeGateway] = None,
+        stripe_api: Optional[Any] = None,
+    ):
         """
         Initialize PaymentService with optional cache service.
 
         Args:
             cache_service: Optional RedisCacheService for caching payment data.
                           If None, operations will not be cached.
+            gateway: StripeGateway running the Stripe calls; defaults to one
+                    with default timeouts and retries
+            stripe_api: Stand-in for the stripe module (e.g. FakeStripe) to run
+                       offline; enables payments without a Stripe API key
         """
         self.cache_service = cache_service
         self.settings = get_settings()
+        self.gateway = gateway or StripeGateway()
+        self._stripe_api = stripe_api
         self._payments_enabled = False
         self._stripe_configured = False
         
@@ -83,17 +98,26 @@ class PaymentService:
             log.warning("PaymentService initialized without cache_service - payment data will not be cached")
 
     @classmethod
-    async def start(cls, cache_service: Optional['RedisCacheService'] = None):
+    async def start(
+        cls,
+        cache_service: Optional['RedisCacheService'] = None,
+        stripe_api: Optional[Any] = None,
+    ):
         """
         Async factory method for lifespan-managed initialization.
 
         Args:
             cache_service: Optional RedisCacheService instance
+            stripe_api: Optional stand-in for the stripe module (e.g. FakeStripe)
 
         Returns:
             Initialized PaymentService instance
         """
-        instance = cls(cache_service=cache_service)
+        instance = cls(
+            cache_service=cache_service,
+            gateway=StripeGateway.from_settings(get_settings()),
+            stripe_api=stripe_api,
+        )
         
         if instance._payments_enabled:
             log.info("PaymentService initialized with Stripe integration enabled")
@@ -102,8 +126,19 @@ class PaymentService:
             
         return instance
 
+    @property
+    def api(self):
+        """The Stripe API the calls go to: the stripe module, or the injected stand-in."""
+        return self._stripe_api or stripe
+
     def _initialize_stripe(self):
         """Initialize Stripe configuration and API key."""
+        if self._stripe_api is not None:
+            self._payments_enabled = True
+            self._stripe_configured = True
+            log.info(f"Stripe API replaced by {type(self._stripe_api).__name__} - no requests will reach Stripe")
+            return
+
         try:
             # Check if Stripe is available
             if stripe is None:
@@ -247,13 +282,15 @@ class PaymentService:
 
         try:
             # Create Stripe customer
-            customer = stripe.Customer.create(
+            customer = await self.gateway.call(
+                self.api.Customer.create,
                 email=user.email,
                 name=user.username or f"User {user.id}",
                 metadata={
                     "user_id": str(user.id),
                     "username": user.username or "",
-                }
+                },
+                mutating=True,
             )
 
             # Cache customer data
@@ -297,12 +334,14 @@ class PaymentService:
 
         try:
             # Create subscription
-            subscription = stripe.Subscription.create(
+            subscription = await self.gateway.call(
+                self.api.Subscription.create,
                 customer=customer_id,
                 items=[{"price": price_id}],
                 payment_behavior="default_incomplete",
                 payment_settings={"save_default_payment_method": "on_subscription"},
                 expand=["latest_invoice.payment_intent"],
+                mutating=True,
             )
 
             subscription_data = {
@@ -362,9 +401,11 @@ class PaymentService:
 
         try:
             # Cancel subscription at period end
-            subscription = stripe.Subscription.modify(
+            subscription = await self.gateway.call(
+                self.api.Subscription.modify,
                 subscription_id,
-                cancel_at_period_end=True
+                cancel_at_period_end=True,
+                mutating=True,
             )
 
             log.info(f"Cancelled subscription {subscription_id}")
@@ -423,7 +464,7 @@ class PaymentService:
             if trial_period_days is not None:
                 session_params["subscription_data"] = {"trial_period_days": trial_period_days}
 
-            session = stripe.checkout.Session.create(**session_params)
+            session = await self.gateway.call(self.api.checkout.Session.create, **session_params, mutating=True)
 
             session_data = {
                 "id": session.id,
@@ -480,7 +521,7 @@ class PaymentService:
                 "processed_at": datetime.now(timezone.utc).isoformat(),
             }
 
-            refund = stripe.Refund.create(**refund_params)
+            refund = await self.gateway.call(self.api.Refund.create, **refund_params, mutating=True)
 
             refund_data = {
                 "id": refund.id,
@@ -521,7 +562,7 @@ class PaymentService:
             raise PaymentException("Payments are not enabled or configured")
 
         try:
-            refund = stripe.Refund.retrieve(refund_id)
+            refund = await self.gateway.call(self.api.Refund.retrieve, refund_id)
 
             status_data = {
                 "id": refund.id,
@@ -560,7 +601,7 @@ class PaymentService:
             raise PaymentException("Payments are not enabled or configured")
 
         try:
-            refunds = stripe.Refund.list(payment_intent=payment_intent_id)
+            refunds = await self.gateway.call(self.api.Refund.list, payment_intent=payment_intent_id)
 
             refunds_data = []
             for refund in refunds.data:
@@ -602,7 +643,7 @@ class PaymentService:
 
         try:
             # Cancel refund in Stripe
-            refund = stripe.Refund.cancel(refund_id)
+            refund = await self.gateway.call(self.api.Refund.cancel, refund_id, mutating=True)
 
             refund_data = {
                 "id": refund.id,
@@ -642,7 +683,7 @@ class PaymentService:
 
         try:
             # Retrieve subscription from Stripe
-            subscription = stripe.Subscription.retrieve(stripe_subscription_id)
+            subscription = await self.gateway.call(self.api.Subscription.retrieve, stripe_subscription_id)
 
             subscription_data = {
                 "id": subscription.id,
@@ -656,14 +697,14 @@ class PaymentService:
                         "price_id": item.price.id,
                         "quantity": item.quantity,
                     }
-                    for item in subscription.items.data
+                    for item in subscription["items"].data
                 ],
             }
 
             log.debug(f"Synced subscription {stripe_subscription_id} from Stripe")
             return subscription_data
 
-        except stripe.error.InvalidRequestError:
+        except InvalidRequestError:
             log.warning(f"Subscription {stripe_subscription_id} not found in Stripe")
             return None
         except StripeError as e:
@@ -688,7 +729,8 @@ class PaymentService:
 
         try:
             # List payment methods
-            payment_methods = stripe.PaymentMethod.list(
+            payment_methods = await self.gateway.call(
+                self.api.PaymentMethod.list,
                 customer=customer_id,
                 type="card"
             )
@@ -883,7 +925,7 @@ class PaymentService:
             raise PaymentException("Payments are not enabled or configured")
 
         try:
-            dispute = stripe.Dispute.retrieve(dispute_id)
+            dispute = await self.gateway.call(self.api.Dispute.retrieve, dispute_id)
 
             dispute_data = {
                 "id": dispute.id,
@@ -934,13 +976,15 @@ class PaymentService:
 
         try:
             # Submit evidence to Stripe
-            dispute = stripe.Dispute.modify(
+            dispute = await self.gateway.call(
+                self.api.Dispute.modify,
                 dispute_id,
                 evidence=evidence,
                 metadata={
                     "evidence_submitted_by": str(admin_user_id) if admin_user_id else "",
                     "evidence_submitted_at": datetime.now(timezone.utc).isoformat(),
-                }
+                },
+                mutating=True,
             )
 
             dispute_data = {
@@ -983,7 +1027,7 @@ class PaymentService:
 
         try:
             # Close dispute in Stripe
-            dispute = stripe.Dispute.close(dispute_id)
+            dispute = await self.gateway.call(self.api.Dispute.close, dispute_id, mutating=True)
 
             dispute_data = {
                 "id": dispute.id,
@@ -1022,7 +1066,7 @@ class PaymentService:
 
         try:
             # Get charges for customer first, then disputes for those charges
-            charges = stripe.Charge.list(customer=customer_id, limit=100)
+            charges = await self.gateway.call(self.api.Charge.list, customer=customer_id, limit=100)
             
             disputes_data = []
             for charge in charges.data:
@@ -1049,10 +1093,11 @@ class PaymentService:
 
     async def check_webhook_processed(self, event_id: str, event_type: str, payload: Optional[Dict[str, Any]] = None) -> bool:
         """
-        Atomically check if a webhook event has been processed using INSERT ... ON CONFLICT.
+        Atomically check if a webhook event has been processed by inserting its ID.
 
-        This method uses a database-level atomic operation to ensure that duplicate
-        webhook events are never processed twice, even under concurrent requests.
+        The unique constraint on event_id ensures that duplicate webhook events
+        are never processed twice, even under concurrent requests. Used when
+        webhooks are processed inline; the WebhookQueue records events itself.
 
         Args:
             event_id: Stripe event ID (must be unique)
@@ -1066,42 +1111,29 @@ class PaymentService:
         Raises:
             PaymentException: If database operation fails
         """
-        from app.core.database import get_async_session
-        from sqlalchemy import text
-        import json
+        from app.core.database import AsyncSessionLocal
+        from sqlalchemy.exc import IntegrityError
 
         try:
-            async for session in get_async_session():
-                # Use PostgreSQL INSERT ... ON CONFLICT DO NOTHING for atomic idempotency
-                # This ensures that only ONE process can successfully insert a given event_id
-                query = text("""
-                    INSERT INTO webhook_events (event_id, event_type, payload, processed_at)
-                    VALUES (:event_id, :event_type, :payload, NOW())
-                    ON CONFLICT (event_id) DO NOTHING
-                    RETURNING id
-                """)
-
-                result = await session.execute(
-                    query,
-                    {
-                        "event_id": event_id,
-                        "event_type": event_type,
-                        "payload": json.dumps(payload) if payload else None
-                    }
-                )
-                await session.commit()
-
-                # If a row was returned, the insert succeeded (first time processing)
-                # If no row was returned, there was a conflict (already processed)
-                row = result.fetchone()
-                was_inserted = row is not None
-
-                if was_inserted:
-                    log.info(f"Webhook event {event_id} ({event_type}) marked for processing (first time)")
-                else:
+            # The unique event_id makes the insert the atomic check: only ONE
+            # request can store a given event
+            async with AsyncSessionLocal() as session:
+                session.add(WebhookEvent(
+                    event_id=event_id,
+                    event_type=event_type,
+                    payload=payload,
+                    status=WebhookEventStatus.PROCESSED,
+                    processed_at=datetime.now(timezone.utc),
+                ))
+                try:
+                    await session.commit()
+                except IntegrityError:
+                    await session.rollback()
                     log.warning(f"Webhook event {event_id} ({event_type}) already processed - skipping duplicate")
+                    return False
 
-                return was_inserted
+            log.info(f"Webhook event {event_id} ({event_type}) marked for processing (first time)")
+            return True
 
         except Exception as e:
             log.error(f"Failed to check webhook idempotency for event {event_id}: {e}")
@@ -1115,7 +1147,7 @@ class PaymentService:
         when using check_webhook_processed(), which atomically checks and marks in one operation.
 
         For new code, use check_webhook_processed() instead, which provides atomic
-        idempotency checking with INSERT ... ON CONFLICT.
+        idempotency checking on the unique event ID.
 
         Args:
             event_id: Stripe event ID
@@ -1,13 +1,28 @@
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from functools import lru_cache
+from typing import Any, Dict, Tuple
+from jinja2 import Environment, FileSystemLoader, Template, select_autoescape
 import json
 import hashlib
 
+from app.core.constants import PROMPT_RENDER_CACHE_MAX_ENTRIES, PROMPT_PREFIX_TRACKER_MAX_ENTRIES
+
 
 class PromptRenderer:
-    def __init__(self, templates_dir: Path | None = None) -> None:
+    """
+    Renders Jinja2 prompt templates with a compiled-template and static-render cache.
+
+    Templates are compiled once and kept in memory. Renders without a context,
+    or with ``cache=True``, are memoized by template and context hash so static
+    sections (system instructions, philosopher priming) are built once and stay
+    byte-identical between requests.
+    """
+
+    def __init__(
+        self,
+        templates_dir: Path | None = None,
+        max_cached_renders: int = PROMPT_RENDER_CACHE_MAX_ENTRIES,
+    ) -> None:
         base_dir = Path(__file__).resolve().parent.parent  # app/
         self.templates_dir = templates_dir or (base_dir / "prompts")
         self.env = Environment(
@@ -15,7 +30,15 @@ class PromptRenderer:
             autoescape=select_autoescape(enabled_extensions=(".j2",)),
             trim_blocks=True,
             lstrip_blocks=True,
+            # Templates ship with the code; skip the per-render mtime check
+            auto_reload=False,
         )
+        self._templates: Dict[str, Template] = {}
+        self._renders: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._max_cached_renders = max_cached_renders
+        self._version: str | None = None
+        self._hits = 0
+        self._misses = 0
 
     @classmethod
     async def start(cls, templates_dir: Path | None = None) -> 'PromptRenderer':
@@ -36,8 +59,8 @@ class PromptRenderer:
     async def aclose(self):
         """Async cleanup for lifespan management."""
         from app.core.logger import log
-        # PromptRenderer is stateless and has no resources to clean up
-        # This method exists for consistency with other lifespan-managed services
+        # Only in-memory caches to release; no external resources
+        self.clear_cache()
         log.info("PromptRenderer cleaned up")
 
     @staticmethod
@@ -51,16 +74,132 @@ class PromptRenderer:
             payload = str(context)
         return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-    @lru_cache(maxsize=256)
-    def _render_cached(self, template_path: str, context_hash: str) -> str:
-        tmpl = self.env.get_template(template_path)
-        # Context will be provided at call-time via render (not used here)
-        # We rely on separate cache key including context hash
+    def get_template(self, template_path: str) -> Template:
+        """Return the compiled template, compiling it on first use."""
+        tmpl = self._templates.get(template_path)
+        if tmpl is None:
+            tmpl = self.env.get_template(template_path)
+            self._templates[template_path] = tmpl
         return tmpl
 
-    def render(self, template_path: str, context: Dict[str, Any] | None = None) -> str:
+    def render(
+        self,
+        template_path: str,
+        context: Dict[str, Any] | None = None,
+        *,
+        cache: bool = False,
+    ) -> str:
+        """
+        Render a template.
+
+        Args:
+            template_path: Template path relative to the prompts directory
+            context: Template variables
+            cache: Memoize the output. Use only for static sections whose
+                context is small and repeats across requests; renders without
+                a context are always memoized.
+
+        Returns:
+            Rendered prompt text
+        """
         ctx = context or {}
-        ctx_hash = self._hash_context(ctx)
-        # Fetch compiled template via cache key
-        tmpl = self.env.get_template(template_path)
-        return tmpl.render(**ctx)
+        if ctx and not cache:
+            return self.get_template(template_path).render(**ctx)
+
+        from app.core.metrics import prompt_render_cache_total
+
+        key = (template_path, self._hash_context(ctx) if ctx else "")
+        rendered = self._renders.get(key)
+        if rendered is not None:
+            self._renders.move_to_end(key)
+            self._hits += 1
+            prompt_render_cache_total.labels(result="hit").inc()
+            return rendered
+
+        self._misses += 1
+        prompt_render_cache_total.labels(result="miss").inc()
+        rendered = self.get_template(template_path).render(**ctx)
+        self._renders[key] = rendered
+        while len(self._renders) > self._max_cached_renders:
+            self._renders.popitem(last=False)
+        return rendered
+
+    @property
+    def version(self) -> str:
+        """Fingerprint of all template sources; changes whenever a prompt is edited."""
+        if self._version is None:
+            digest = hashlib.sha256()
+            for path in sorted(self.templates_dir.rglob("*")):
+                if path.is_file():
+                    digest.update(str(path.relative_to(self.templates_dir)).encode("utf-8"))
+                    digest.update(path.read_bytes())
+            self._version = digest.hexdigest()[:16]
+        return self._version
+
+    def clear_cache(self) -> None:
+        """Drop compiled templates and memoized renders (e.g. after editing templates)."""
+        self._version = None
+        self._templates.clear()
+        self._renders.clear()
+        if self.env.cache is not None:
+            self.env.cache.clear()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Compiled-template and render-cache statistics."""
+        lookups = self._hits + self._misses
+        return {
+            "compiled_templates": len(self._templates),
+            "cached_renders": len(self._renders),
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups * 100, 2) if lookups else 0.0,
+        }
+
+
+class PromptPrefixTracker:
+    """
+    Tracks how often LLM requests start with a recently sent static prefix.
+
+    Ollama reuses its KV cache for the longest prompt prefix shared with an
+    earlier request, so chat prompts put the static part (system prompt) first.
+    This tracker fingerprints that part; its hit rate is an upper bound on the
+    prefix-cache reuse the model server can achieve.
+    """
+
+    def __init__(self, max_entries: int = PROMPT_PREFIX_TRACKER_MAX_ENTRIES) -> None:
+        self._recent: "OrderedDict[str, None]" = OrderedDict()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Prefix hit rate as a percentage (0-100)."""
+        total = self.hits + self.misses
+        return self.hits / total * 100 if total else 0.0
+
+    def observe(self, prefix: str, prompt_kind: str = "default") -> bool:
+        """Record a request's static prefix; returns True if it was sent recently."""
+        from app.core.metrics import record_prompt_prefix
+
+        digest = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        hit = digest in self._recent
+        if hit:
+            self._recent.move_to_end(digest)
+            self.hits += 1
+        else:
+            self._recent[digest] = None
+            if len(self._recent) > self._max_entries:
+                self._recent.popitem(last=False)
+            self.misses += 1
+        record_prompt_prefix(prompt_kind, hit, self.hit_rate)
+        return hit
+
+    def reset(self) -> None:
+        """Forget recent prefixes and counters."""
+        self._recent.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+prompt_prefix_tracker = PromptPrefixTracker()
@@ -7,7 +7,12 @@ without affecting production systems.
 """
 
 import asyncio
+import hashlib
+import json
 import os
+import re
+import tempfile
+import time
 import uuid
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
@@ -19,6 +24,7 @@ from qdrant_client.http.exceptions import ResponseHandlingException
 
 from app.core.logger import log
 from app.core.exceptions import LLMTimeoutError, LLMUnavailableError
+from app.utils.file_operations import atomic_write_json
 
 
 class BackupStatus(Enum):
@@ -66,6 +72,78 @@ class BackupProgress:
         end_time = self.end_time or datetime.now(timezone.utc)
         return (end_time - self.start_time).total_seconds()
 
+    @property
+    def points_per_second(self) -> Optional[float]:
+        """Average copy throughput since the operation started."""
+        duration = self.duration_seconds
+        if not duration or self.processed_points == 0:
+            return None
+        return self.processed_points / duration
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds remaining at the current throughput."""
+        if self.status != BackupStatus.IN_PROGRESS:
+            return None
+        rate = self.points_per_second
+        if not rate:
+            return None
+        return max(self.total_points - self.processed_points, 0) / rate
+
+
+class PointRateLimiter:
+    """
+    Token bucket shared by all concurrent backup tasks to cap the global point rate.
+
+    Callers acquire one token per point before reading a batch. Large batches are
+    allowed to run the bucket into debt; later callers wait for it to refill, so the
+    long-run rate never exceeds the budget.
+    """
+
+    def __init__(self, points_per_second: Optional[float] = None):
+        self.rate = float(points_per_second or 0)
+        self._tokens = self.rate  # Allow one second of burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, points: int) -> None:
+        """Wait until `points` may be processed within the rate budget."""
+        if self.rate <= 0 or points <= 0:
+            return
+
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= points
+            wait_seconds = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait_seconds > 0:
+            await asyncio.sleep(wait_seconds)
+
+
+class AdaptiveBatchSizer:
+    """
+    Adjusts scroll/upsert batch size from observed round-trip latency.
+
+    Additive-increase / multiplicative-decrease: batches grow while operations
+    finish well under the target latency and are halved when one exceeds it.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, target_seconds: float):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.size = min(max(initial, self.minimum), self.maximum)
+        self.target_seconds = target_seconds
+
+    def observe(self, latency_seconds: float) -> int:
+        """Record one operation latency and return the batch size to use next."""
+        if latency_seconds > self.target_seconds:
+            self.size = max(self.minimum, self.size // 2)
+        elif latency_seconds < self.target_seconds / 2:
+            self.size = min(self.maximum, self.size + max(1, self.size // 4))
+        return self.size
+
 
 @dataclass
 class CollectionInfo:
@@ -112,6 +190,22 @@ class QdrantBackupService:
         self.timeout_seconds = production_config.get("timeout", 30)
         self.retry_attempts = max(1, int(production_config.get("retry_attempts", 3)))
         self.batch_size = production_config.get("backup_batch_size", 1000)
+
+        # Pipeline configuration
+        self.min_batch_size = production_config.get("backup_min_batch_size", max(1, self.batch_size // 10))
+        self.max_batch_size = production_config.get("backup_max_batch_size", self.batch_size * 4)
+        self.target_batch_seconds = production_config.get("backup_target_batch_seconds", 2.0)
+        self.read_ahead_batches = max(1, production_config.get("backup_read_ahead_batches", 4))
+        self.upsert_workers = max(1, production_config.get("backup_upsert_workers", 4))
+        self.parallel_collections = max(1, production_config.get("backup_parallel_collections", 2))
+        self.max_points_per_second = production_config.get("backup_max_points_per_second")
+
+        # Incremental sync configuration
+        self.sync_page_size = production_config.get("sync_page_size", 1000)
+        self.checkpoint_dir = production_config.get(
+            "backup_checkpoint_dir",
+            os.path.join(tempfile.gettempdir(), "qdrant_backup_checkpoints")
+        )
         
         log.info("QdrantBackupService initialized with production and local clients")
     
@@ -361,21 +455,28 @@ class QdrantBackupService:
         collection_name: str, 
         target_name: Optional[str] = None,
         overwrite: bool = False,
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        rate_limiter: Optional[PointRateLimiter] = None
     ) -> Dict[str, Any]:
         """
         Backup a single collection from production to local.
+
+        Points are copied through a pipeline: one task scrolls production ahead into a
+        bounded queue while several workers upsert batches into local, so reads and
+        writes overlap instead of alternating.
         
         Args:
             collection_name: Name of the source collection
             target_name: Name for the target collection (defaults to source name)
             overwrite: Whether to overwrite existing target collection
             progress_callback: Optional callback for progress updates
+            rate_limiter: Optional shared point-rate budget (defaults to the service-wide limit)
             
         Returns:
             Dictionary with backup results and statistics
         """
         target_name = target_name or collection_name
+        stats = {"processed_points": 0, "batches_processed": 0}
         
         log.info(f"Starting backup of collection '{collection_name}' to '{target_name}'")
 
@@ -391,59 +492,21 @@ class QdrantBackupService:
             log.info(f"Creating target collection '{target_name}'")
             await self._create_collection_from_config(target_name, source_info.config)
             
-            # Backup points in batches
+            # Backup points through the read-ahead pipeline
             total_points = source_info.points_count
-            processed_points = 0
+            start_time = time.monotonic()
             
             if total_points > 0:
-                # Scroll through all points
-                next_offset = None
-                batch_count = 0
-
-                while True:
-                    # Get next batch of points (returns tuple: records, next_page_offset)
-                    records, next_offset = await self.execute_with_retries(
-                        lambda: self.production_client.scroll(
-                            collection_name=collection_name,
-                            limit=self.batch_size,
-                            offset=next_offset,
-                            with_payload=True,
-                            with_vectors=True
-                        ),
-                        operation_name=f"Scroll collection {collection_name} batch {batch_count + 1}"
-                    )
-
-                    if not records:
-                        break
-
-                    batch_count += 1
-                    batch_size = len(records)
-
-                    log.info(f"Processing batch {batch_count}: {batch_size} points")
-
-                    # Convert records to PointStruct objects using helper
-                    points = self._records_to_points(records)
-
-                    # Upload batch to target collection
-                    await self.execute_with_retries(
-                        lambda: self.local_client.upsert(
-                            collection_name=target_name,
-                            points=points
-                        ),
-                        operation_name=f"Upsert batch {batch_count} to {target_name}"
-                    )
-
-                    processed_points += batch_size
-
-                    # Call progress callback if provided
-                    if progress_callback:
-                        progress_callback(processed_points, total_points)
-
-                    log.info(f"Processed {processed_points}/{total_points} points ({(processed_points/total_points)*100:.1f}%)")
+                await self._copy_points_pipelined(
+                    collection_name,
+                    target_name,
+                    total_points,
+                    stats,
+                    progress_callback,
+                    rate_limiter or PointRateLimiter(self.max_points_per_second)
+                )
 
-                    # Check if we've processed all points
-                    if not next_offset:
-                        break
+            elapsed = time.monotonic() - start_time
             
             # Verify backup
             target_info = await self.get_collection_info(target_name, self.local_client)
@@ -454,8 +517,9 @@ class QdrantBackupService:
                 "source_points": source_info.points_count,
                 "target_points": target_info.points_count,
                 "success": True,
-                "processed_points": processed_points,
-                "batches_processed": batch_count if total_points > 0 else 0
+                "processed_points": stats["processed_points"],
+                "batches_processed": stats["batches_processed"],
+                "points_per_second": stats["processed_points"] / elapsed if elapsed > 0 else None
             }
             
             log.info(f"Backup completed successfully: {source_info.points_count} -> {target_info.points_count} points")
@@ -468,8 +532,111 @@ class QdrantBackupService:
                 "target_collection": target_name,
                 "success": False,
                 "error": str(e),
-                "processed_points": processed_points if 'processed_points' in locals() else 0
+                "processed_points": stats["processed_points"]
             }
+
+    async def _copy_points_pipelined(
+        self,
+        collection_name: str,
+        target_name: str,
+        total_points: int,
+        stats: Dict[str, int],
+        progress_callback: Optional[callable],
+        rate_limiter: PointRateLimiter
+    ) -> None:
+        """
+        Copy all points with a scroll producer and a pool of upsert workers.
+
+        The queue holds at most `read_ahead_batches` batches, bounding memory while
+        keeping the upsert workers fed. Batch size adapts to observed latency. The
+        first failure cancels the remaining tasks and is re-raised.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.read_ahead_batches)
+        sizer = AdaptiveBatchSizer(
+            initial=self.batch_size,
+            minimum=self.min_batch_size,
+            maximum=self.max_batch_size,
+            target_seconds=self.target_batch_seconds
+        )
+
+        async def producer():
+            next_offset = None
+            batch_number = 0
+            while True:
+                limit = sizer.size
+                await rate_limiter.acquire(limit)
+
+                offset = next_offset
+                scroll_start = time.monotonic()
+                records, next_offset = await self.execute_with_retries(
+                    lambda: self.production_client.scroll(
+                        collection_name=collection_name,
+                        limit=limit,
+                        offset=offset,
+                        with_payload=True,
+                        with_vectors=True
+                    ),
+                    operation_name=f"Scroll collection {collection_name} batch {batch_number + 1}"
+                )
+                sizer.observe(time.monotonic() - scroll_start)
+
+                if not records:
+                    break
+
+                batch_number += 1
+                await queue.put((batch_number, self._records_to_points(records)))
+
+                if not next_offset:
+                    break
+
+            for _ in range(self.upsert_workers):
+                await queue.put(None)
+
+        async def upsert_worker():
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+
+                batch_number, points = item
+                upsert_start = time.monotonic()
+                await self.execute_with_retries(
+                    lambda: self.local_client.upsert(
+                        collection_name=target_name,
+                        points=points
+                    ),
+                    operation_name=f"Upsert batch {batch_number} to {target_name}"
+                )
+                sizer.observe(time.monotonic() - upsert_start)
+
+                stats["batches_processed"] += 1
+                stats["processed_points"] += len(points)
+                processed_points = stats["processed_points"]
+
+                # Call progress callback if provided
+                if progress_callback:
+                    progress_callback(processed_points, total_points)
+
+                log.debug(
+                    f"Upserted batch {batch_number} ({len(points)} points, next batch size {sizer.size}): "
+                    f"{processed_points}/{total_points} points ({(processed_points/total_points)*100:.1f}%)"
+                )
+
+        tasks = [asyncio.create_task(producer())]
+        tasks.extend(asyncio.create_task(upsert_worker()) for _ in range(self.upsert_workers))
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        log.info(
+            f"Copied {stats['processed_points']}/{total_points} points from '{collection_name}' "
+            f"in {stats['batches_processed']} batches"
+        )
     
     async def _create_collection_from_config(self, collection_name: str, source_config: Dict[str, Any]):
         """
@@ -593,22 +760,30 @@ class QdrantBackupService:
         collections: Optional[List[str]] = None,
         collection_filter: Optional[str] = None,
         target_prefix: Optional[str] = None,
-        overwrite: bool = False
+        overwrite: bool = False,
+        backup_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Backup multiple collections with selective filtering.
+
+        Up to `parallel_collections` collections are copied concurrently, all drawing
+        from one global point-rate budget.
         
         Args:
             collections: Specific collections to backup (if None, backup all)
             collection_filter: Filter pattern for collection names (supports wildcards)
             target_prefix: Prefix to add to target collection names
             overwrite: Whether to overwrite existing target collections
+            backup_id: Existing progress tracker to report into (e.g. created by the API
+                before scheduling the background task); a new one is created if omitted
             
         Returns:
             Dictionary with backup results and statistics
         """
-        # Create backup progress tracker
-        backup_progress = self.create_backup_progress(collections or [])
+        # Reuse the caller's progress tracker when given, otherwise create one
+        backup_progress = self.get_backup_progress(backup_id) if backup_id else None
+        if backup_progress is None:
+            backup_progress = self.create_backup_progress(collections or [])
         backup_id = backup_progress.backup_id
         
         try:
@@ -625,7 +800,10 @@ class QdrantBackupService:
             # Update progress with actual collection count
             backup_progress.total_collections = len(collections_to_backup)
             
-            log.info(f"Starting backup of {len(collections_to_backup)} collections")
+            log.info(
+                f"Starting backup of {len(collections_to_backup)} collections "
+                f"({self.parallel_collections} in parallel)"
+            )
             
             # Calculate total points for progress tracking
             total_points = 0
@@ -642,46 +820,48 @@ class QdrantBackupService:
             
             backup_progress.total_points = total_points
             
-            # Backup each collection
-            backup_results = []
-            processed_points = 0
-            
-            for i, collection_name in enumerate(collections_to_backup):
-                backup_progress.current_collection = collection_name
-                backup_progress.completed_collections = i
-                
-                target_name = f"{target_prefix}{collection_name}" if target_prefix else collection_name
-                
-                log.info(f"Backing up collection {i+1}/{len(collections_to_backup)}: {collection_name} -> {target_name}")
-                
-                # Progress callback for individual collection backup
-                def progress_callback(current_points, total_collection_points):
-                    nonlocal processed_points
-                    # Update processed points (subtract previous count for this collection, add current)
-                    prev_processed = processed_points - sum(
-                        collection_point_counts.get(prev_col, 0) 
-                        for prev_col in collections_to_backup[:i]
+            # Backup collections concurrently under a shared rate budget
+            semaphore = asyncio.Semaphore(self.parallel_collections)
+            rate_limiter = PointRateLimiter(self.max_points_per_second)
+            processed_by_collection: Dict[str, int] = {}
+
+            async def backup_one(collection_name: str) -> Dict[str, Any]:
+                async with semaphore:
+                    backup_progress.current_collection = collection_name
+                    target_name = f"{target_prefix}{collection_name}" if target_prefix else collection_name
+
+                    log.info(f"Backing up collection: {collection_name} -> {target_name}")
+
+                    # Progress callback for individual collection backup
+                    def progress_callback(current_points, total_collection_points):
+                        processed_by_collection[collection_name] = current_points
+                        backup_progress.processed_points = sum(processed_by_collection.values())
+
+                    result = await self.backup_collection(
+                        collection_name=collection_name,
+                        target_name=target_name,
+                        overwrite=overwrite,
+                        progress_callback=progress_callback,
+                        rate_limiter=rate_limiter
                     )
-                    backup_progress.processed_points = prev_processed + current_points
-                
-                # Backup the collection
-                result = await self.backup_collection(
-                    collection_name=collection_name,
-                    target_name=target_name,
-                    overwrite=overwrite,
-                    progress_callback=progress_callback
-                )
-                
-                backup_results.append(result)
-                
-                # Update processed points
-                processed_points += collection_point_counts.get(collection_name, 0)
-                backup_progress.processed_points = processed_points
-                
-                if not result["success"]:
-                    backup_progress.errors.append(f"Failed to backup {collection_name}: {result.get('error', 'Unknown error')}")
-                
-                log.info(f"Completed {i+1}/{len(collections_to_backup)} collections")
+
+                    processed_by_collection[collection_name] = result.get("processed_points", 0)
+                    backup_progress.processed_points = sum(processed_by_collection.values())
+                    backup_progress.completed_collections += 1
+
+                    if not result["success"]:
+                        backup_progress.errors.append(f"Failed to backup {collection_name}: {result.get('error', 'Unknown error')}")
+
+                    log.info(
+                        f"Completed {backup_progress.completed_collections}/{len(collections_to_backup)} collections "
+                        f"({backup_progress.points_per_second or 0:.0f} points/s)"
+                    )
+                    return result
+
+            backup_results = await asyncio.gather(
+                *(backup_one(collection_name) for collection_name in collections_to_backup)
+            )
+            backup_results = list(backup_results)
             
             # Mark backup as completed
             backup_progress.completed_collections = len(collections_to_backup)
@@ -705,6 +885,7 @@ class QdrantBackupService:
                 "total_source_points": total_source_points,
                 "total_target_points": total_target_points,
                 "duration_seconds": backup_progress.duration_seconds,
+                "points_per_second": backup_progress.points_per_second,
                 "collections": backup_results,
                 "errors": backup_progress.errors
             }
@@ -751,7 +932,8 @@ class QdrantBackupService:
     async def backup_philosophy_collections(
         self,
         target_prefix: Optional[str] = None,
-        overwrite: bool = False
+        overwrite: bool = False,
+        backup_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Backup all philosophy-related collections (excludes Chat_History* collections).
@@ -759,6 +941,7 @@ class QdrantBackupService:
         Args:
             target_prefix: Prefix to add to target collection names
             overwrite: Whether to overwrite existing target collections
+            backup_id: Existing progress tracker to report into
             
         Returns:
             Dictionary with backup results and statistics
@@ -779,7 +962,8 @@ class QdrantBackupService:
         return await self.backup_collections(
             collections=philosophy_collections,
             target_prefix=target_prefix,
-            overwrite=overwrite
+            overwrite=overwrite,
+            backup_id=backup_id
         )
     
     async def backup_selective_collections(
@@ -787,7 +971,8 @@ class QdrantBackupService:
         include_patterns: List[str],
         exclude_patterns: Optional[List[str]] = None,
         target_prefix: Optional[str] = None,
-        overwrite: bool = False
+        overwrite: bool = False,
+        backup_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Backup collections using include/exclude patterns.
@@ -797,6 +982,7 @@ class QdrantBackupService:
             exclude_patterns: Patterns for collections to exclude
             target_prefix: Prefix to add to target collection names
             overwrite: Whether to overwrite existing target collections
+            backup_id: Existing progress tracker to report into
             
         Returns:
             Dictionary with backup results and statistics
@@ -826,7 +1012,8 @@ class QdrantBackupService:
         return await self.backup_collections(
             collections=selected_collections,
             target_prefix=target_prefix,
-            overwrite=overwrite
+            overwrite=overwrite,
+            backup_id=backup_id
         )   
  
     async def validate_backup_integrity(
@@ -1090,7 +1277,10 @@ class QdrantBackupService:
         self,
         source_collection: str,
         target_collection: str,
-        repair_mode: str = "missing_points"
+        repair_mode: str = "missing_points",
+        dry_run: bool = False,
+        compare_content: bool = False,
+        resume: bool = True
     ) -> Dict[str, Any]:
         """
         Repair a target collection by syncing missing or corrupted data.
@@ -1098,7 +1288,13 @@ class QdrantBackupService:
         Args:
             source_collection: Source collection name
             target_collection: Target collection name
-            repair_mode: Type of repair ("missing_points", "full_sync")
+            repair_mode: Type of repair:
+                - "missing_points": copy points missing from the target
+                - "incremental_sync": copy missing/changed points and delete extra ones
+                - "full_sync": recopy the whole collection
+            dry_run: Only report the differences, do not modify the target
+            compare_content: Compare payload/vector hashes to detect changed points
+            resume: Continue from a saved checkpoint of an interrupted sync
             
         Returns:
             Dictionary with repair results
@@ -1109,8 +1305,10 @@ class QdrantBackupService:
             "source_collection": source_collection,
             "target_collection": target_collection,
             "repair_mode": repair_mode,
+            "dry_run": dry_run,
             "success": False,
             "repaired_points": 0,
+            "diff": None,
             "errors": []
         }
         
@@ -1124,12 +1322,24 @@ class QdrantBackupService:
                 repair_result["errors"].append(f"Target collection '{target_collection}' does not exist")
                 return repair_result
             
-            if repair_mode == "missing_points":
-                # Find and sync missing points
-                repaired_count = await self._repair_missing_points(source_collection, target_collection)
-                repair_result["repaired_points"] = repaired_count
+            if repair_mode in ("missing_points", "incremental_sync"):
+                sync_result = await self.sync_collection(
+                    source_collection,
+                    target_collection,
+                    compare_content=compare_content and repair_mode == "incremental_sync",
+                    delete_extra=repair_mode == "incremental_sync",
+                    dry_run=dry_run,
+                    resume=resume
+                )
+                repair_result["diff"] = sync_result
+                repair_result["repaired_points"] = sync_result["copied_points"] + sync_result["deleted_points"]
+                repair_result["errors"].extend(sync_result["errors"])
                 
             elif repair_mode == "full_sync":
+                if dry_run:
+                    repair_result["errors"].append("dry_run is not supported for full_sync; use incremental_sync")
+                    return repair_result
+
                 # Full resync (essentially a backup with overwrite)
                 backup_result = await self.backup_collection(
                     collection_name=source_collection,
@@ -1158,42 +1368,289 @@ class QdrantBackupService:
             repair_result["errors"].append(f"Repair operation failed: {str(e)}")
             log.error(f"Collection repair error: {e}")
             return repair_result
-    
-    async def _repair_missing_points(self, source_collection: str, target_collection: str) -> int:
-        """
-        Repair collection by performing a full backup (incremental repair not yet implemented).
 
-        NOTE: This currently performs a full backup with overwrite instead of incremental
-        point-by-point synchronization. True incremental repair (syncing only missing points)
-        requires comparing point IDs between source and target collections, which is
-        planned for a future release.
+    async def sync_collection(
+        self,
+        source_collection: str,
+        target_collection: str,
+        compare_content: bool = False,
+        delete_extra: bool = True,
+        dry_run: bool = False,
+        resume: bool = True,
+        report_sample_size: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Incrementally sync a target collection with its source.
 
-        For incremental repair, consider:
-        1. Using snapshot-based backup (much faster for full collection sync)
-        2. Implementing custom point ID comparison logic if needed
-        3. Using Qdrant's collection aliases for zero-downtime updates
+        Source ids are streamed in id-only pages and looked up in the target in one
+        batched retrieve per page; only points that are missing (or, with
+        compare_content, whose payload/vector hash differs) are copied. With
+        delete_extra, a second pass streams target ids and deletes those no longer
+        in the source. Progress is checkpointed after every applied page so an
+        interrupted sync resumes where it stopped.
 
         Args:
-            source_collection: Source collection name
-            target_collection: Target collection name
+            source_collection: Source collection name (production)
+            target_collection: Target collection name (local)
+            compare_content: Also detect changed points via content hashes
+            delete_extra: Delete target points that no longer exist in the source
+            dry_run: Only compute the diff report, do not modify the target
+            resume: Continue from a saved checkpoint if one exists
+            report_sample_size: Maximum number of ids listed per category in the report
 
         Returns:
-            Number of points processed in full backup operation
+            Diff report with counts, sample ids and applied changes
         """
-        log.info(
-            f"Performing full backup repair for '{target_collection}' "
-            "(incremental point-by-point repair not yet implemented)"
-        )
+        checkpoint_path = self._checkpoint_path(source_collection, target_collection)
+        options = {"compare_content": compare_content, "delete_extra": delete_extra}
 
-        # Fall back to full backup - this ensures consistency but is not optimal
-        # for large collections where only a few points differ
-        backup_result = await self.backup_collection(
-            collection_name=source_collection,
-            target_name=target_collection,
-            overwrite=True
-        )
+        report = {
+            "source_collection": source_collection,
+            "target_collection": target_collection,
+            "dry_run": dry_run,
+            "compare_content": compare_content,
+            "missing_points": 0,
+            "changed_points": 0,
+            "extra_points": 0,
+            "copied_points": 0,
+            "deleted_points": 0,
+            "scanned_source_points": 0,
+            "scanned_target_points": 0,
+            "resumed_from_checkpoint": False,
+            "sample_missing_ids": [],
+            "sample_changed_ids": [],
+            "sample_extra_ids": [],
+            "errors": []
+        }
+
+        checkpoint = None
+        if resume and not dry_run:
+            checkpoint = self._load_checkpoint(checkpoint_path, options)
+            if checkpoint:
+                for key in ("missing_points", "changed_points", "extra_points", "copied_points",
+                            "deleted_points", "scanned_source_points", "scanned_target_points"):
+                    report[key] = checkpoint.get(key, 0)
+                report["resumed_from_checkpoint"] = True
+                log.info(
+                    f"Resuming sync {source_collection} -> {target_collection} "
+                    f"from {checkpoint['phase']} phase at offset {checkpoint['offset']}"
+                )
+
+        def save_checkpoint(phase: str, offset: Any) -> None:
+            if dry_run:
+                return
+            atomic_write_json({
+                "source_collection": source_collection,
+                "target_collection": target_collection,
+                **options,
+                "phase": phase,
+                "offset": offset,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+                **{key: report[key] for key in (
+                    "missing_points", "changed_points", "extra_points", "copied_points",
+                    "deleted_points", "scanned_source_points", "scanned_target_points"
+                )}
+            }, checkpoint_path)
+
+        def add_samples(key: str, ids: List[Any]) -> None:
+            room = report_sample_size - len(report[key])
+            if room > 0:
+                report[key].extend(ids[:room])
+
+        try:
+            phase = checkpoint["phase"] if checkpoint else "copy"
+
+            # Phase 1: copy points missing from (or changed in) the target
+            if phase == "copy":
+                offset = checkpoint["offset"] if checkpoint else None
+                while True:
+                    page_offset = offset
+                    records, offset = await self.execute_with_retries(
+                        lambda: self.production_client.scroll(
+                            collection_name=source_collection,
+                            limit=self.sync_page_size,
+                            offset=page_offset,
+                            with_payload=compare_content,
+                            with_vectors=compare_content
+                        ),
+                        operation_name=f"Scroll ids from {source_collection}"
+                    )
+                    if not records:
+                        break
+
+                    page_ids = [record.id for record in records]
+                    target_records = await self.execute_with_retries(
+                        lambda: self.local_client.retrieve(
+                            collection_name=target_collection,
+                            ids=page_ids,
+                            with_payload=compare_content,
+                            with_vectors=compare_content
+                        ),
+                        operation_name=f"Look up {len(page_ids)} ids in {target_collection}"
+                    )
+                    target_by_id = {record.id: record for record in target_records}
+
+                    missing_ids = [point_id for point_id in page_ids if point_id not in target_by_id]
+                    changed_ids = []
+                    if compare_content:
+                        changed_ids = [
+                            record.id for record in records
+                            if record.id in target_by_id
+                            and self._point_content_hash(record) != self._point_content_hash(target_by_id[record.id])
+                        ]
+
+                    report["scanned_source_points"] += len(page_ids)
+                    report["missing_points"] += len(missing_ids)
+                    report["changed_points"] += len(changed_ids)
+                    add_samples("sample_missing_ids", missing_ids)
+                    add_samples("sample_changed_ids", changed_ids)
+
+                    to_copy = missing_ids + changed_ids
+                    if to_copy and not dry_run:
+                        if compare_content:
+                            copy_ids = set(to_copy)
+                            source_records = [record for record in records if record.id in copy_ids]
+                        else:
+                            source_records = await self.execute_with_retries(
+                                lambda: self.production_client.retrieve(
+                                    collection_name=source_collection,
+                                    ids=to_copy,
+                                    with_payload=True,
+                                    with_vectors=True
+                                ),
+                                operation_name=f"Fetch {len(to_copy)} points from {source_collection}"
+                            )
+
+                        points = self._records_to_points(source_records)
+                        await self.execute_with_retries(
+                            lambda: self.local_client.upsert(
+                                collection_name=target_collection,
+                                points=points
+                            ),
+                            operation_name=f"Upsert {len(points)} repaired points to {target_collection}"
+                        )
+                        report["copied_points"] += len(points)
+
+                    if not offset:
+                        break
+                    save_checkpoint("copy", offset)
+
+                phase = "delete"
+                checkpoint = None
+                save_checkpoint("delete", None)
+
+            # Phase 2: delete target points that no longer exist in the source
+            if phase == "delete" and delete_extra:
+                offset = checkpoint["offset"] if checkpoint else None
+                while True:
+                    page_offset = offset
+                    records, offset = await self.execute_with_retries(
+                        lambda: self.local_client.scroll(
+                            collection_name=target_collection,
+                            limit=self.sync_page_size,
+                            offset=page_offset,
+                            with_payload=False,
+                            with_vectors=False
+                        ),
+                        operation_name=f"Scroll ids from {target_collection}"
+                    )
+                    if not records:
+                        break
+
+                    page_ids = [record.id for record in records]
+                    source_records = await self.execute_with_retries(
+                        lambda: self.production_client.retrieve(
+                            collection_name=source_collection,
+                            ids=page_ids,
+                            with_payload=False,
+                            with_vectors=False
+                        ),
+                        operation_name=f"Look up {len(page_ids)} ids in {source_collection}"
+                    )
+                    source_ids = {record.id for record in source_records}
+                    extra_ids = [point_id for point_id in page_ids if point_id not in source_ids]
+
+                    report["scanned_target_points"] += len(page_ids)
+                    report["extra_points"] += len(extra_ids)
+                    add_samples("sample_extra_ids", extra_ids)
+
+                    if extra_ids and not dry_run:
+                        await self.execute_with_retries(
+                            lambda: self.local_client.delete(
+                                collection_name=target_collection,
+                                points_selector=models.PointIdsList(points=extra_ids)
+                            ),
+                            operation_name=f"Delete {len(extra_ids)} extra points from {target_collection}"
+                        )
+                        report["deleted_points"] += len(extra_ids)
+
+                    if not offset:
+                        break
+                    save_checkpoint("delete", offset)
+
+            # Completed - a fresh run should start from scratch
+            if not dry_run and os.path.exists(checkpoint_path):
+                os.unlink(checkpoint_path)
+
+            log.info(
+                f"Sync {source_collection} -> {target_collection}{' (dry run)' if dry_run else ''}: "
+                f"{report['missing_points']} missing, {report['changed_points']} changed, "
+                f"{report['extra_points']} extra; copied {report['copied_points']}, "
+                f"deleted {report['deleted_points']}"
+            )
 
-        return backup_result.get("processed_points", 0)
+        except Exception as e:
+            log.error(f"Incremental sync failed for {source_collection} -> {target_collection}: {e}")
+            report["errors"].append(f"Incremental sync failed: {str(e)}")
+
+        return report
+
+    def _checkpoint_path(self, source_collection: str, target_collection: str) -> str:
+        """Checkpoint file for a source/target sync pair."""
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{source_collection}__{target_collection}")
+        return os.path.join(self.checkpoint_dir, f"sync_{safe_name}.json")
+
+    def _load_checkpoint(self, checkpoint_path: str, options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Load a sync checkpoint if it exists and was written with the same options."""
+        if not os.path.exists(checkpoint_path):
+            return None
+
+        try:
+            with open(checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable sync checkpoint {checkpoint_path}: {e}")
+            return None
+
+        if any(checkpoint.get(key) != value for key, value in options.items()):
+            log.info(f"Ignoring sync checkpoint {checkpoint_path} written with different options")
+            return None
+
+        return checkpoint
+
+    @staticmethod
+    def _point_content_hash(record: Any) -> str:
+        """
+        Stable hash of a point's payload and vectors.
+
+        Sparse vectors are normalised to index order and floats rounded so that
+        equivalent points hash identically across Qdrant instances.
+        """
+        def normalize(value: Any) -> Any:
+            if isinstance(value, models.SparseVector):
+                pairs = sorted(zip(value.indices, value.values))
+                return {"indices": [i for i, _ in pairs], "values": [round(v, 6) for _, v in pairs]}
+            if isinstance(value, dict):
+                return {key: normalize(val) for key, val in value.items()}
+            if isinstance(value, (list, tuple)):
+                return [normalize(item) for item in value]
+            if isinstance(value, float):
+                return round(value, 6)
+            return value
+
+        content = {"payload": normalize(record.payload or {}), "vector": normalize(record.vector)}
+        encoded = json.dumps(content, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
 
     async def backup_collection_snapshot(
         self,
@@ -220,6 +220,7 @@ class QdrantManager:
         vector_types: List[str] = None,
         filter: Dict[str, Any] = None,
         payload: List[str] = None,
+        with_vectors: bool | List[str] = None,
     ) -> Dict[str, List[models.ScoredPoint]]:
         """
         Query multiple vector types and return combined results with caching, timeout and retry protection.
@@ -232,6 +233,8 @@ class QdrantManager:
             collection: The collection to search
             limit: Number of results per vector type
             vector_types: List of vector types to query (default: all six)
+            with_vectors: Stored vectors to return with each point (True for all,
+                or a list of vector names such as ["sparse_original"])
 
         Returns:
             Dictionary with vector type as key and results as value
@@ -313,7 +316,8 @@ class QdrantManager:
                     using=vector_type,
                     limit=limit,
                     filter=query_filter,
-                    with_payload=payload if payload else True
+                    with_payload=payload if payload else True,
+                    with_vector=with_vectors if with_vectors else False
                 ))
 
             # Execute batch query with built-in retry and timeout handling
@@ -352,7 +356,8 @@ class QdrantManager:
             limit,           # Affects results
             vector_types,    # Affects results
             filter,          # Affects results
-            payload          # Affects results
+            payload,         # Affects results
+            with_vectors     # Affects results
         )
 
     def generate_qdrant_must_filter(self, conditions: Dict[str, Any]) -> models.Filter:
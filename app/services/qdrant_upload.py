@@ -11,6 +11,7 @@ This module provides a service class and helper functions for:
 Follows project conventions for modularity, type hints, and docstrings.
 """
 
+import asyncio
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 from app.config.settings import get_settings
@@ -20,7 +21,10 @@ from llama_index.core.node_parser import SemanticSplitterNodeParser
 from llama_index.embeddings.ollama import OllamaEmbedding
 from llama_index.core import Document
 from app.utils.file_parser import FileParser
+from app.core.exceptions import DocumentParseError, DocumentTooLargeError
+from app.services.document_parser import DocumentParser
 from app.services.llm_manager import LLMManager
+from app.services.token_counter import get_token_counter
 from qdrant_client import AsyncQdrantClient, models
 from qdrant_client.http.exceptions import UnexpectedResponse, ResponseHandlingException
 import uuid
@@ -177,8 +181,9 @@ class QdrantUploadService:
         self,
         qdrant_client: Optional[AsyncQdrantClient] = None,
         llm_manager: Optional[LLMManager] = None,
-        chunk_size: int = 1000,
-        chunk_overlap: int = 100,
+        document_parser: Optional[DocumentParser] = None,
+        chunk_size: int = 512,
+        chunk_overlap: int = 64,
     ):
         """
         Initialize the QdrantUploadService.
@@ -186,8 +191,11 @@ class QdrantUploadService:
         Args:
             qdrant_client (Optional[AsyncQdrantClient]): Qdrant client instance.
             llm_manager (Optional[LLMManager]): LLM manager for embeddings.
-            chunk_size (int): Number of characters per chunk.
-            chunk_overlap (int): Number of overlapping characters between chunks.
+            document_parser (Optional[DocumentParser]): Parser for file content. Defaults to
+                parsing in a thread; pass the app's parser to use its process pool.
+            chunk_size (int): Maximum tokens per chunk, counted with the shared TokenCounter.
+            chunk_overlap (int): Tokens shared by consecutive pieces of a semantic chunk
+                that had to be split to fit chunk_size.
         """
         # Use the singleton Qdrant client from QdrantManager if not provided
         if qdrant_client is not None:
@@ -197,6 +205,7 @@ class QdrantUploadService:
             self.qdrant_client = QdrantManager().qclient
         self.llm_manager = llm_manager or LLMManager()
         self.file_parser = FileParser()
+        self.document_parser = document_parser or DocumentParser(max_workers=0)
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
 
@@ -228,6 +237,9 @@ class QdrantUploadService:
         """
         Splits text into semantic chunks using LlamaIndex SemanticSplitterNodeParser with Ollama embeddings.
 
+        Semantic chunks longer than ``chunk_size`` tokens are split into
+        overlapping token windows, so no chunk exceeds the limit.
+
         Args:
             text (str): The text to chunk.
 
@@ -241,7 +253,12 @@ class QdrantUploadService:
             buffer_size=1, breakpoint_percentile_threshold=95, embed_model=embed_model
         )
         nodes = splitter.get_nodes_from_documents([doc])
-        return [node.get_content() for node in nodes]
+        token_counter = get_token_counter()
+        return [
+            window
+            for node in nodes
+            for window in token_counter.split(node.get_content(), self.chunk_size, self.chunk_overlap)
+        ]
 
     async def upload_file(
         self,
@@ -266,7 +283,7 @@ class QdrantUploadService:
         qdrant_upload_logger.info(f"[QdrantUpload] Starting upload_file: filename={filename}, collection={collection}, metadata={metadata}")
         ext = filename.split(".")[-1].lower()
         # Autofill all metadata fields from file or sensible defaults; only username comes from user
-        extracted_meta = self.extract_file_metadata(file_bytes, filename, ext)
+        extracted_meta = await asyncio.to_thread(self.extract_file_metadata, file_bytes, filename, ext)
         user_meta = metadata or {}
         final_meta = {}
         for key in ["title", "author", "topic", "document_type"]:
@@ -279,13 +296,20 @@ class QdrantUploadService:
         try:
             if ext in ["txt", "md"]:
                 log.info(f"[QdrantUpload] Parsing as text/markdown: ext={ext}")
-                content = self.file_parser.parse_file(ext, file_bytes.decode("utf-8"))
+                content = await self.document_parser.parse(ext, file_bytes)
             elif ext in ["pdf", "docx"]:
                 log.info(f"[QdrantUpload] Parsing as binary: ext={ext}")
-                content = self.file_parser.parse_file(ext, file_bytes)
+                content = await self.document_parser.parse(ext, file_bytes)
             else:
                 log.error(f"[QdrantUpload] Unsupported file type: {ext}")
                 return {"error": f"Unsupported file type: {ext}"}
+        except DocumentTooLargeError:
+            # Rejected by size, not a parsing failure - let the caller answer 413
+            raise
+        except DocumentParseError as e:
+            # Parse timeout or worker failure
+            log.error(f"[QdrantUpload] Failed to parse {ext} file: {e.message}")
+            return {"error": e.message}
         except UnicodeDecodeError as e:
             # Text file encoding error
             log.error(f"[QdrantUpload] File encoding error for {ext} file: {e}")
@@ -308,14 +332,15 @@ class QdrantUploadService:
 
         log.info(f"[QdrantUpload] File parsed successfully. Content length: {len(content)}")
         qdrant_upload_logger.info(f"[QdrantUpload] File parsed successfully. Content length: {len(content)}")
-        chunks = self._chunk_text(content)
-        log.info(f"[QdrantUpload] Chunked content into {len(chunks)} chunks (chunk_size={self.chunk_size}, overlap={self.chunk_overlap})")
-        qdrant_upload_logger.info(f"[QdrantUpload] Chunked content into {len(chunks)} chunks (chunk_size={self.chunk_size}, overlap={self.chunk_overlap})")
+        chunks = await asyncio.to_thread(self._chunk_text, content)
+        log.info(f"[QdrantUpload] Chunked content into {len(chunks)} chunks (max {self.chunk_size} tokens, overlap {self.chunk_overlap})")
+        qdrant_upload_logger.info(f"[QdrantUpload] Chunked content into {len(chunks)} chunks (max {self.chunk_size} tokens, overlap {self.chunk_overlap})")
         qdrant_upload_logger.debug(f"First chunk preview: {chunks[0][:500] if chunks else 'NO CHUNKS'}")
         if not chunks:
             log.error("[QdrantUpload] No content to upload after chunking.")
             return {"error": "No content to upload after chunking."}
 
+        chunk_token_counts = get_token_counter().count_batch(chunks)
         points = []
         file_uuid = str(uuid.uuid4())
         for idx, chunk in enumerate(chunks):
@@ -344,6 +369,7 @@ class QdrantUploadService:
                 "filename": filename,
                 "chunk_index": idx,
                 "chunk_count": len(chunks),
+                "token_count": chunk_token_counts[idx],
                 "file_id": file_uuid,
                 **final_meta,
             }
@@ -445,6 +471,7 @@ class QdrantUploadService:
             "chunks_uploaded": len(points),
             "file_id": file_uuid,
             "char_count": total_char_count,
+            "token_count": sum(chunk_token_counts),
         }
 
 # Reason: Now uses explicit UUIDs for each file and chunk, and splits large files into overlapping chunks for better semantic search and retrieval.
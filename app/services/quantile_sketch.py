@@ -0,0 +1,243 @@
+"""
+Mergeable streaming-quantile sketches.
+
+``QuantileSketch`` is a log-bucketed histogram in the style of DDSketch /
+HDR histograms: every value is mapped in O(1) to a bucket whose width is a
+fixed fraction of the value, so any quantile is reported within
+``relative_accuracy`` of the true sample value while memory stays bounded by
+``max_buckets``. Two sketches merge exactly by adding bucket counts, which
+makes snapshots from several workers combinable.
+
+``WindowedSketch`` keeps one sketch per time slice so quantiles can be read
+for any window up to its retention without storing raw samples;
+``RollingQuantiles`` pairs a fine (minute) and a coarse (hour) ring so short
+and day-long windows both stay cheap.
+"""
+
+import math
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from app.core.constants import (
+    QUANTILE_COARSE_RETENTION_SECONDS,
+    QUANTILE_COARSE_SLICE_SECONDS,
+    QUANTILE_FINE_RETENTION_SECONDS,
+    QUANTILE_FINE_SLICE_SECONDS,
+    QUANTILE_MAX_BUCKETS,
+    QUANTILE_RELATIVE_ACCURACY,
+)
+
+# Values at or below this are counted in the zero bucket (timers are in ms)
+MIN_TRACKED_VALUE = 1e-6
+
+
+class QuantileSketch:
+    """Fixed-memory, mergeable quantile sketch with relative-error guarantees."""
+
+    def __init__(
+        self,
+        relative_accuracy: float = QUANTILE_RELATIVE_ACCURACY,
+        max_buckets: int = QUANTILE_MAX_BUCKETS,
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Record one value (negative values are clamped to zero)."""
+        value = max(float(value), 0.0)
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= MIN_TRACKED_VALUE:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        """Fold the lowest buckets together so the highest quantiles stay accurate."""
+        indices = sorted(self.buckets)
+        excess = len(indices) - self.max_buckets
+        target = indices[excess]
+        self.buckets[target] += sum(self.buckets.pop(i) for i in indices[:excess])
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add ``other``'s counts to this sketch (both must use the same accuracy)."""
+        if not math.isclose(self._gamma, other._gamma):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, bucket_count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + bucket_count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at quantile ``q`` (0..1), or None if the sketch is empty."""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i] in relative terms
+                value = 2 * self._gamma ** index / (1 + self._gamma)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable snapshot."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(index): n for index, n in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], max_buckets: int = QUANTILE_MAX_BUCKETS) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"], max_buckets)
+        sketch.buckets = {int(index): n for index, n in data["buckets"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if sketch.count:
+            sketch.min, sketch.max = data["min"], data["max"]
+        return sketch
+
+    @classmethod
+    def merged(cls, sketches: Iterable["QuantileSketch"]) -> "QuantileSketch":
+        """New sketch holding the union of ``sketches``."""
+        result = cls()
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+
+class WindowedSketch:
+    """
+    Quantile sketches over rolling time windows.
+
+    Values go into the sketch for the current ``slice_seconds`` slice; slices
+    older than ``retention_seconds`` are dropped. A window read merges the
+    slices it overlaps, so it covers between ``window`` and
+    ``window + slice_seconds`` seconds.
+    """
+
+    def __init__(
+        self,
+        slice_seconds: int = QUANTILE_FINE_SLICE_SECONDS,
+        retention_seconds: int = QUANTILE_FINE_RETENTION_SECONDS,
+        clock=time.time,
+    ):
+        self.slice_seconds = slice_seconds
+        self.retention_seconds = retention_seconds
+        self._clock = clock
+        self._slices: Dict[int, QuantileSketch] = {}
+
+    def _current_slice(self) -> int:
+        return int(self._clock() // self.slice_seconds)
+
+    def _evict(self, current: int) -> None:
+        oldest = current - self.retention_seconds // self.slice_seconds
+        for index in [i for i in self._slices if i < oldest]:
+            del self._slices[index]
+
+    def add(self, value: float) -> None:
+        current = self._current_slice()
+        sketch = self._slices.get(current)
+        if sketch is None:
+            self._evict(current)
+            sketch = self._slices[current] = QuantileSketch()
+        sketch.add(value)
+
+    def window(self, seconds: Optional[int] = None) -> QuantileSketch:
+        """Merged sketch for the last ``seconds`` (default: the whole retention)."""
+        current = self._current_slice()
+        seconds = min(seconds or self.retention_seconds, self.retention_seconds)
+        oldest = current - math.ceil(seconds / self.slice_seconds)
+        return QuantileSketch.merged(s for i, s in self._slices.items() if i >= oldest)
+
+    def is_empty(self) -> bool:
+        return not self._slices
+
+
+class RollingQuantiles:
+    """Per-operation quantiles over windows from one minute up to a day."""
+
+    def __init__(self, clock=time.time):
+        self.fine = WindowedSketch(QUANTILE_FINE_SLICE_SECONDS, QUANTILE_FINE_RETENTION_SECONDS, clock)
+        self.coarse = WindowedSketch(QUANTILE_COARSE_SLICE_SECONDS, QUANTILE_COARSE_RETENTION_SECONDS, clock)
+
+    def add(self, value: float) -> None:
+        self.fine.add(value)
+        self.coarse.add(value)
+
+    def window(self, seconds: int) -> QuantileSketch:
+        """Merged sketch for the last ``seconds`` (capped at the coarse retention)."""
+        ring = self.fine if seconds <= self.fine.retention_seconds else self.coarse
+        return ring.window(seconds)
+
+
+def summarize(sketch: QuantileSketch, quantiles: Iterable[float]) -> Dict[str, Any]:
+    """Count/avg/min/max plus ``p<NN>`` entries for a sketch."""
+    summary: Dict[str, Any] = {
+        "count": sketch.count,
+        "avg": sketch.mean or 0,
+        "min": sketch.min if sketch.count else 0,
+        "max": sketch.max if sketch.count else 0,
+    }
+    for q in quantiles:
+        summary[quantile_label(q)] = sketch.quantile(q) or 0
+    return summary
+
+
+def quantile_label(q: float) -> str:
+    """``0.95`` -> ``"p95"``, ``0.999`` -> ``"p99.9"``."""
+    return f"p{q * 100:g}"
+
+
+def merge_snapshots(snapshots: List[Dict[str, Dict[str, Dict[str, Any]]]]) -> Dict[str, Dict[str, QuantileSketch]]:
+    """
+    Merge worker snapshots of the form ``{metric: {window: sketch_dict}}``.
+
+    Returns ``{metric: {window: QuantileSketch}}`` with the counts of all workers.
+    """
+    merged: Dict[str, Dict[str, QuantileSketch]] = {}
+    for snapshot in snapshots:
+        for metric, windows in snapshot.items():
+            for window, data in windows.items():
+                target = merged.setdefault(metric, {}).setdefault(window, QuantileSketch())
+                target.merge(QuantileSketch.from_dict(data))
+    return merged
@@ -19,6 +19,7 @@ from app.core.db_models import (
 )
 from app.core.user_models import User
 from app.services.payment_service import PaymentService, PaymentException
+from app.services.audit_log import record_audit_event
 
 if TYPE_CHECKING:
     from app.services.cache_service import RedisCacheService
@@ -159,6 +160,22 @@ class RefundDisputeService:
                     )
 
                 log.info(f"Initiated refund {refund_record.stripe_refund_id} for user {user_id} (amount: {refund_record.amount_cents})")
+                record_audit_event(
+                    "refund.initiated",
+                    actor_type="admin" if admin_user_id else "system",
+                    actor_id=admin_user_id,
+                    subject_type="refund",
+                    subject_id=refund_record.stripe_refund_id,
+                    user_id=user_id,
+                    details={
+                        "payment_intent_id": payment_intent_id,
+                        "amount_cents": refund_record.amount_cents,
+                        "currency": refund_record.currency,
+                        "reason": reason,
+                        "status": refund_record.status,
+                        "admin_notes": admin_notes
+                    }
+                )
                 return refund_record
 
         except PaymentException as e:
@@ -212,6 +229,15 @@ class RefundDisputeService:
                 session.refresh(refund_record)
 
                 log.info(f"Updated refund {refund_id} status from {old_status} to {refund_record.status}")
+                if refund_record.status != old_status:
+                    record_audit_event(
+                        "refund.status_changed",
+                        actor_type="stripe",
+                        subject_type="refund",
+                        subject_id=refund_id,
+                        user_id=refund_record.user_id,
+                        details={"old_status": old_status, "new_status": refund_record.status}
+                    )
                 return refund_record
 
         except PaymentException as e:
@@ -302,6 +328,19 @@ class RefundDisputeService:
                     await self._suspend_user_account(session, user_id, dispute_record.id)
 
                 log.info(f"Created dispute record {dispute_record.id} for user {user_id} (dispute: {stripe_dispute_id})")
+                record_audit_event(
+                    "dispute.opened",
+                    actor_type="stripe",
+                    subject_type="dispute",
+                    subject_id=stripe_dispute_id,
+                    user_id=user_id,
+                    details={
+                        "amount_cents": dispute_record.amount_cents,
+                        "reason": dispute_record.reason,
+                        "status": dispute_record.status,
+                        "account_suspended": suspend_account
+                    }
+                )
                 return dispute_record
 
         except PaymentException as e:
@@ -353,6 +392,15 @@ class RefundDisputeService:
                 session.refresh(dispute_record)
 
                 log.info(f"Submitted evidence for dispute {dispute_record.stripe_dispute_id} by admin {admin_user_id}")
+                record_audit_event(
+                    "dispute.evidence_submitted",
+                    actor_type="admin",
+                    actor_id=admin_user_id,
+                    subject_type="dispute",
+                    subject_id=dispute_record.stripe_dispute_id,
+                    user_id=dispute_record.user_id,
+                    details={"evidence_fields": sorted(evidence), "admin_notes": admin_notes}
+                )
                 return dispute_record
 
         except PaymentException as e:
@@ -402,6 +450,19 @@ class RefundDisputeService:
             session.refresh(dispute_record)
 
             log.info(f"Resolved dispute {dispute_record.stripe_dispute_id} with outcome {resolution}")
+            record_audit_event(
+                "dispute.resolved",
+                actor_type="admin",
+                actor_id=admin_user_id,
+                subject_type="dispute",
+                subject_id=dispute_record.stripe_dispute_id,
+                user_id=dispute_record.user_id,
+                details={
+                    "resolution": resolution,
+                    "suspension_lifted": not dispute_record.account_suspended,
+                    "admin_notes": admin_notes
+                }
+            )
             return dispute_record
 
     async def _adjust_subscription_for_refund(
@@ -428,6 +489,7 @@ class RefundDisputeService:
 
             # Determine adjustment based on refund reason and amount
             adjustment_notes = f"Subscription adjusted due to refund {refund_record.stripe_refund_id}"
+            old_status = subscription.status
             
             if refund_record.reason in [RefundReason.SUBSCRIPTION_CANCELED, RefundReason.CUSTOMER_REQUEST]:
                 # Cancel subscription for full refunds or cancellation requests
@@ -444,11 +506,35 @@ class RefundDisputeService:
             refund_record.subscription_adjustment_notes = adjustment_notes
 
             session.commit()
+            await self._invalidate_subscription_cache(user_id)
             log.info(f"Adjusted subscription for user {user_id} due to refund")
+            if subscription.status != old_status:
+                record_audit_event(
+                    "subscription.status_changed",
+                    actor_type="admin" if admin_user_id else "system",
+                    actor_id=admin_user_id,
+                    subject_type="subscription",
+                    subject_id=subscription.id,
+                    user_id=user_id,
+                    details={
+                        "old_status": old_status,
+                        "new_status": subscription.status,
+                        "refund_id": refund_record.stripe_refund_id
+                    }
+                )
 
         except Exception as e:
             log.error(f"Failed to adjust subscription for refund {refund_record.id}: {e}")
 
+    async def _invalidate_subscription_cache(self, user_id: int):
+        """Drop cached tier/entitlements after a subscription status change."""
+        if not self.subscription_manager:
+            return
+        try:
+            await self.subscription_manager.invalidate_principal(user_id)
+        except Exception as e:
+            log.warning(f"Failed to invalidate cached subscription for user {user_id}: {e}")
+
     async def _suspend_user_account(self, session: Session, user_id: int, dispute_id: int):
         """Suspend user account due to dispute."""
         try:
@@ -460,8 +546,16 @@ class RefundDisputeService:
             if subscription:
                 subscription.status = SubscriptionStatus.UNPAID
                 session.commit()
+                await self._invalidate_subscription_cache(user_id)
 
             log.info(f"Suspended account for user {user_id} due to dispute {dispute_id}")
+            record_audit_event(
+                "account.suspended",
+                subject_type="user",
+                subject_id=user_id,
+                user_id=user_id,
+                details={"dispute_record_id": dispute_id, "subscription_found": subscription is not None}
+            )
 
         except Exception as e:
             log.error(f"Failed to suspend account for user {user_id}: {e}")
@@ -476,6 +570,14 @@ class RefundDisputeService:
             if subscription and subscription.status == SubscriptionStatus.UNPAID:
                 subscription.status = SubscriptionStatus.ACTIVE
                 session.commit()
+                await self._invalidate_subscription_cache(user_id)
+                record_audit_event(
+                    "account.reactivated",
+                    subject_type="user",
+                    subject_id=user_id,
+                    user_id=user_id,
+                    details={"reason": "dispute_resolved"}
+                )
 
             log.info(f"Reactivated subscription for user {user_id} after dispute resolution")
 
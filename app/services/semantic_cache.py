@@ -0,0 +1,246 @@
+"""
+Semantic answer cache for philosophy questions.
+
+Answers are indexed by the query's dense embedding within a scope (collection,
+prompt version and the request options that change the answer). A later query
+whose embedding has cosine similarity of at least ``threshold`` with a cached
+query in the same scope is served the cached answer instead of paying for
+retrieval and generation again.
+
+The vector index is held in process (one small numpy matrix per scope).
+Invalidation is shared through Redis when available: each collection has a
+generation counter, and bumping it (e.g. after a collection is re-ingested)
+drops the matching entries on every worker at their next lookup.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.constants import SEMANTIC_CACHE_GENERATION_KEY
+from app.core.logger import log
+from app.core.metrics import cache_operations_total, update_cache_hit_rate
+
+CACHE_TYPE = "semantic_answer"
+ALL_COLLECTIONS = "*"
+
+
+@dataclass
+class CachedAnswer:
+    """A cached answer and the query it was generated for."""
+
+    text: str
+    raw: Any
+    query: str
+    created_at: float
+    similarity: float = 1.0
+
+
+class _ScopeIndex:
+    """Normalized query embeddings and answers for one cache scope."""
+
+    def __init__(self, generation: str):
+        self.generation = generation
+        self.vectors: Optional[np.ndarray] = None
+        self.answers: List[CachedAnswer] = []
+
+    def search(self, vector: np.ndarray, ttl_seconds: int) -> Optional[CachedAnswer]:
+        if self.vectors is None:
+            return None
+        self.expire(ttl_seconds)
+        if not self.answers:
+            return None
+        similarities = self.vectors @ vector
+        best = int(np.argmax(similarities))
+        answer = self.answers[best]
+        return CachedAnswer(answer.text, answer.raw, answer.query, answer.created_at, float(similarities[best]))
+
+    def add(self, vector: np.ndarray, answer: CachedAnswer, max_entries: int) -> None:
+        row = vector[np.newaxis, :]
+        if self.vectors is None or self.vectors.shape[1] != vector.shape[0]:
+            self.vectors, self.answers = row, [answer]
+        else:
+            self.vectors = np.vstack([self.vectors, row])[-max_entries:]
+            self.answers = (self.answers + [answer])[-max_entries:]
+
+    def expire(self, ttl_seconds: int) -> None:
+        cutoff = time.time() - ttl_seconds
+        keep = [i for i, answer in enumerate(self.answers) if answer.created_at >= cutoff]
+        if len(keep) < len(self.answers):
+            self.answers = [self.answers[i] for i in keep]
+            self.vectors = self.vectors[keep] if keep else None
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+
+class SemanticAnswerCache:
+    """
+    Similarity-keyed answer cache, managed by the application lifespan.
+
+    Access via app.core.dependencies.get_semantic_cache(); None when disabled.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        ttl_seconds: int,
+        max_entries: int,
+        prompt_version: str = "",
+        redis_client: Any = None,
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.prompt_version = prompt_version
+        self._redis = redis_client
+        self._indexes: "OrderedDict[str, _ScopeIndex]" = OrderedDict()
+        self._local_generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._bypassed = 0
+
+    @classmethod
+    async def start(cls, settings=None, cache_service=None, prompt_version: str = "") -> "SemanticAnswerCache":
+        """Async factory method for lifespan-managed initialization."""
+        if settings is None:
+            from app.config.settings import get_settings
+            settings = get_settings()
+        instance = cls(
+            threshold=settings.semantic_cache_threshold,
+            ttl_seconds=settings.semantic_cache_ttl_seconds,
+            max_entries=settings.semantic_cache_max_entries,
+            prompt_version=prompt_version,
+            redis_client=cache_service.redis_client if cache_service is not None else None,
+        )
+        log.info(
+            f"SemanticAnswerCache initialized (threshold={instance.threshold}, "
+            f"shared invalidation={'redis' if instance._redis is not None else 'local'})"
+        )
+        return instance
+
+    async def aclose(self):
+        """Async cleanup for lifespan management."""
+        self.clear()
+        log.info("SemanticAnswerCache cleaned up")
+
+    def scope_key(self, collection: str, **options: Any) -> str:
+        """Scope for ``collection`` and the request options that change the answer."""
+        payload = json.dumps({"prompt_version": self.prompt_version, **options}, sort_keys=True, default=str)
+        return f"{collection}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]}"
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if vector.size and norm > 0 else None
+
+    async def _generation(self, collection: str) -> str:
+        """Current generation of ``collection`` (and of the global invalidation counter)."""
+        local = f"{self._local_generations.get(collection, 0)}.{self._local_generations.get(ALL_COLLECTIONS, 0)}"
+        if self._redis is None:
+            return local
+        try:
+            shared = await self._redis.hmget(SEMANTIC_CACHE_GENERATION_KEY, [collection, ALL_COLLECTIONS])
+        except Exception as e:
+            log.debug(f"Semantic cache generation lookup failed: {e}")
+            return local
+        parts = ["0" if value is None else value.decode() if isinstance(value, bytes) else str(value)
+                 for value in shared]
+        return f"{local}:{'.'.join(parts)}"
+
+    def _record(self, result: str) -> None:
+        cache_operations_total.labels(operation="get", cache_type=CACHE_TYPE, status=result).inc()
+        lookups = self._hits + self._misses
+        if lookups:
+            update_cache_hit_rate(CACHE_TYPE, self._hits / lookups * 100)
+
+    def record_bypass(self) -> None:
+        """Count a request that was not eligible for the cache (history or user documents)."""
+        self._bypassed += 1
+        self._record("bypass")
+
+    async def lookup(self, embedding: Sequence[float], collection: str, scope: str) -> Optional[CachedAnswer]:
+        """Cached answer for a query embedding in ``scope``, or None on a miss."""
+        vector = self._normalize(embedding)
+        generation = await self._generation(collection)
+        answer = None
+        with self._lock:
+            index = self._indexes.get(scope)
+            if index is not None and index.generation != generation:
+                del self._indexes[scope]
+                index = None
+            if index is not None and vector is not None:
+                self._indexes.move_to_end(scope)
+                candidate = index.search(vector, self.ttl_seconds)
+                if candidate is not None and candidate.similarity >= self.threshold:
+                    answer = candidate
+
+        if answer is None:
+            self._misses += 1
+            self._record("miss")
+        else:
+            self._hits += 1
+            self._record("hit")
+            log.info(f"Semantic cache hit for {collection} (similarity={answer.similarity:.3f})")
+        return answer
+
+    async def store(
+        self, embedding: Sequence[float], collection: str, scope: str, query: str, text: str, raw: Any = None
+    ) -> None:
+        """Cache ``text`` as the answer for the query embedding in ``scope``."""
+        vector = self._normalize(embedding)
+        if vector is None or not text:
+            return
+        generation = await self._generation(collection)
+        with self._lock:
+            index = self._indexes.get(scope)
+            if index is None or index.generation != generation:
+                index = self._indexes[scope] = _ScopeIndex(generation)
+            self._indexes.move_to_end(scope)
+            index.add(vector, CachedAnswer(text, raw, query, time.time()), self.max_entries)
+            # Bound total entries across scopes by dropping least recently used scopes
+            while sum(len(i) for i in self._indexes.values()) > self.max_entries and len(self._indexes) > 1:
+                self._indexes.popitem(last=False)
+
+    async def invalidate(self, collection: Optional[str] = None) -> None:
+        """
+        Drop cached answers for ``collection`` (all collections if None) on every worker.
+
+        Call after a collection is re-ingested, restored or deleted.
+        """
+        field = collection or ALL_COLLECTIONS
+        with self._lock:
+            self._local_generations[field] = self._local_generations.get(field, 0) + 1
+            for scope in [s for s in self._indexes if collection is None or s.startswith(f"{collection}:")]:
+                del self._indexes[scope]
+        if self._redis is not None:
+            try:
+                await self._redis.hincrby(SEMANTIC_CACHE_GENERATION_KEY, field, 1)
+            except Exception as e:
+                log.warning(f"Semantic cache invalidation not shared with other workers: {e}")
+        log.info(f"Semantic answer cache invalidated for {collection or 'all collections'}")
+
+    def clear(self) -> None:
+        """Drop all cached answers in this process."""
+        with self._lock:
+            self._indexes.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and index size."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": sum(len(index) for index in self._indexes.values()),
+            "scopes": len(self._indexes),
+            "hits": self._hits,
+            "misses": self._misses,
+            "bypassed": self._bypassed,
+            "hit_rate": round(self._hits / lookups * 100, 2) if lookups else 0.0,
+        }
@@ -0,0 +1,272 @@
+"""
+SPLADE inference backends.
+
+SPLADE maps text to a vocabulary-sized weight vector: ``max_t log(1 + relu(logits))``
+over the masked-LM logits of every token. Two interchangeable encoders are
+provided:
+
+- ``TorchSpladeEncoder``: the transformers/torch model, optionally optimized
+  with ``ModelCompiler``.
+- ``OnnxSpladeEncoder``: an ONNX Runtime session over an exported graph that
+  already includes the pooling step, optionally dynamically quantized to int8.
+
+The exported artifact (graph, ORT-optimized graph, tokenizer and manifest) is
+persisted to ``splade_onnx_dir`` so a restarted process loads it in seconds
+without importing the model through transformers or compiling it again.
+ONNX Runtime is an optional dependency; without it the torch path is used.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import torch
+from transformers import AutoModelForMaskedLM, AutoTokenizer
+
+from app.core.logger import log
+
+SPLADE_MAX_LENGTH = 512
+ONNX_MANIFEST_FILE = "manifest.json"
+ONNX_MANIFEST_VERSION = 1
+ONNX_OPSET_VERSION = 17
+
+
+class TorchSpladeEncoder:
+    """SPLADE encoder backed by a transformers masked-LM model."""
+
+    backend = "torch"
+
+    def __init__(self, model: Any, tokenizer: Any):
+        self.model = model
+        self.tokenizer = tokenizer
+
+    def encode(self, text: str) -> np.ndarray:
+        """Return the vocabulary-sized SPLADE weight vector for ``text``."""
+        inputs = self.tokenizer(
+            text, return_tensors="pt", truncation=True, padding=True, max_length=SPLADE_MAX_LENGTH
+        )
+        device = next(self.model.parameters()).device
+        inputs = {k: v.to(device) for k, v in inputs.items()}
+
+        with torch.inference_mode():
+            logits = self.model(**inputs).logits
+
+        weights = torch.log1p(torch.relu(logits)) * inputs["attention_mask"].unsqueeze(-1)
+        return weights.max(dim=1).values.squeeze(0).float().cpu().numpy()
+
+
+class OnnxSpladeEncoder:
+    """SPLADE encoder backed by an ONNX Runtime session over the exported graph."""
+
+    backend = "onnx"
+
+    def __init__(self, session: Any, tokenizer: Any, quantized: bool = False):
+        self.model = session
+        self.tokenizer = tokenizer
+        self.quantized = quantized
+        self._input_names = {node.name for node in session.get_inputs()}
+
+    def encode(self, text: str) -> np.ndarray:
+        """Return the vocabulary-sized SPLADE weight vector for ``text``."""
+        inputs = self.tokenizer(
+            text, return_tensors="np", truncation=True, padding=True, max_length=SPLADE_MAX_LENGTH
+        )
+        feeds = {name: inputs[name].astype(np.int64) for name in self._input_names}
+        (weights,) = self.model.run(None, feeds)
+        return weights[0]
+
+
+class _SpladePooling(torch.nn.Module):
+    """Wraps a masked-LM model so the exported graph returns pooled SPLADE weights."""
+
+    def __init__(self, model: Any):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids=None):
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if token_type_ids is not None:
+            inputs["token_type_ids"] = token_type_ids
+        logits = self.model(**inputs).logits
+        weights = torch.log1p(torch.relu(logits)) * attention_mask.unsqueeze(-1)
+        return weights.max(dim=1).values
+
+
+def _onnx_paths(output_dir: Path, quantize: bool) -> Dict[str, Path]:
+    stem = "model.int8" if quantize else "model"
+    return {
+        "raw": output_dir / "model.onnx",
+        "model": output_dir / f"{stem}.onnx",
+        "optimized": output_dir / f"{stem}.opt.onnx",
+        "manifest": output_dir / ONNX_MANIFEST_FILE,
+    }
+
+
+def export_splade_onnx(
+    model: Any,
+    tokenizer: Any,
+    output_dir: Path | str,
+    model_name: str,
+    quantize: bool = True,
+) -> Path:
+    """
+    Export a SPLADE model (including pooling) to ONNX and persist it with its tokenizer.
+
+    Args:
+        model: transformers masked-LM model
+        tokenizer: Matching tokenizer, saved next to the graph
+        output_dir: Artifact directory
+        model_name: Source model identifier, recorded in the manifest
+        quantize: Also write a dynamically int8-quantized graph and serve it
+
+    Returns:
+        Path to the graph the runtime should load
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = _onnx_paths(output_dir, quantize)
+
+    model = model.to("cpu").eval()
+    sample = tokenizer("splade export", return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["weights"] = {0: "batch"}
+
+    with torch.inference_mode():
+        torch.onnx.export(
+            _SpladePooling(model).eval(),
+            tuple(sample[name] for name in input_names),
+            str(paths["raw"]),
+            input_names=input_names,
+            output_names=["weights"],
+            dynamic_axes=dynamic_axes,
+            opset_version=ONNX_OPSET_VERSION,
+            dynamo=False,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(str(paths["raw"]), str(paths["model"]), weight_type=QuantType.QInt8)
+
+    paths["optimized"].unlink(missing_ok=True)
+    tokenizer.save_pretrained(str(output_dir))
+    paths["manifest"].write_text(json.dumps({
+        "version": ONNX_MANIFEST_VERSION,
+        "model_name": model_name,
+        "quantized": quantize,
+        "opset": ONNX_OPSET_VERSION,
+        "torch_version": torch.__version__,
+    }, indent=2))
+
+    log.info(f"Exported SPLADE model {model_name} to {paths['model']} (int8={quantize})")
+    return paths["model"]
+
+
+def _manifest_matches(output_dir: Path, model_name: str, quantize: bool) -> bool:
+    manifest_path = output_dir / ONNX_MANIFEST_FILE
+    if not manifest_path.exists():
+        return False
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError) as e:
+        log.warning(f"Unreadable SPLADE ONNX manifest {manifest_path}: {e}")
+        return False
+    return (
+        manifest.get("version") == ONNX_MANIFEST_VERSION
+        and manifest.get("model_name") == model_name
+        and manifest.get("quantized") == quantize
+        and _onnx_paths(output_dir, quantize)["model"].exists()
+    )
+
+
+def load_onnx_encoder(
+    output_dir: Path | str,
+    quantize: bool = True,
+    intra_op_threads: int = 0,
+) -> OnnxSpladeEncoder:
+    """
+    Load an exported SPLADE artifact into an ONNX Runtime session.
+
+    The first load saves ORT's optimized graph next to the export; later loads
+    use it directly and skip graph optimization.
+    """
+    import onnxruntime as ort
+
+    output_dir = Path(output_dir)
+    paths = _onnx_paths(output_dir, quantize)
+
+    options = ort.SessionOptions()
+    options.intra_op_num_threads = intra_op_threads
+    if paths["optimized"].exists():
+        model_path = paths["optimized"]
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_DISABLE_ALL
+    else:
+        model_path = paths["model"]
+        # EXTENDED (not ALL) keeps the saved graph portable across CPUs
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED
+        options.optimized_model_filepath = str(paths["optimized"])
+
+    session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+    tokenizer = AutoTokenizer.from_pretrained(str(output_dir), use_fast=True)
+    return OnnxSpladeEncoder(session, tokenizer, quantized=quantize)
+
+
+def load_torch_encoder(model_name: str, optimize: bool = True) -> TorchSpladeEncoder:
+    """Load the SPLADE model through transformers, applying ModelCompiler optimizations if ``optimize``."""
+    from app.services.model_compiler import ModelCompiler
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+    model = AutoModelForMaskedLM.from_pretrained(model_name)
+    if optimize:
+        model = ModelCompiler.optimize_model(model, "SPLADE")
+    model.eval()
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model = model.to(device)
+    log.info(f"SPLADE model initialized with optimizations on device: {device}")
+    return TorchSpladeEncoder(model, tokenizer)
+
+
+def load_splade_encoder(settings: Optional[Any] = None) -> TorchSpladeEncoder | OnnxSpladeEncoder:
+    """
+    Load the configured SPLADE encoder.
+
+    With ``splade_backend = "onnx"`` a persisted artifact matching the model
+    and quantization settings is loaded directly. A missing or stale artifact
+    is exported from the torch model first. If ONNX Runtime is unavailable or
+    export fails, the torch encoder is returned.
+    """
+    if settings is None:
+        from app.config import get_settings
+        settings = get_settings()
+
+    model_name = settings.splade_model
+    if settings.splade_backend != "onnx":
+        return load_torch_encoder(model_name)
+
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        log.warning("onnxruntime not installed - SPLADE falling back to the torch backend")
+        return load_torch_encoder(model_name)
+
+    output_dir = Path(settings.splade_onnx_dir)
+    quantize = settings.splade_onnx_quantize
+    start = time.perf_counter()
+    try:
+        if not _manifest_matches(output_dir, model_name, quantize):
+            log.info(f"No SPLADE ONNX artifact for {model_name} in {output_dir} - exporting")
+            torch_encoder = load_torch_encoder(model_name, optimize=False)
+            export_splade_onnx(torch_encoder.model, torch_encoder.tokenizer, output_dir, model_name, quantize)
+        encoder = load_onnx_encoder(output_dir, quantize, settings.splade_onnx_threads)
+    except Exception as e:
+        log.warning(f"SPLADE ONNX backend unavailable ({e}) - falling back to the torch backend")
+        return load_torch_encoder(model_name)
+
+    log.info(
+        f"SPLADE ONNX encoder loaded from {output_dir} in {time.perf_counter() - start:.2f}s (int8={quantize})"
+    )
+    return encoder
@@ -9,13 +9,15 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any, List, TYPE_CHECKING
 from dataclasses import dataclass
 
-from sqlmodel import select, func
+from sqlmodel import select, func, or_
 
 from app.config.settings import get_settings
 from app.core.logger import log
 from app.core.db_models import Subscription, SubscriptionTier, SubscriptionStatus, UsageRecord
 from app.core.user_models import User
 from app.core.database import AsyncSessionLocal
+from app.core.principal import PrincipalCache, ResolvedPrincipal, user_cache
+from app.services.audit_log import record_audit_event
 
 if TYPE_CHECKING:
     from app.services.cache_service import RedisCacheService
@@ -73,6 +75,9 @@ class SubscriptionManager:
         
         # Load tier configurations from settings
         self._tier_limits = self._load_tier_limits()
+
+        # Short-TTL in-process cache of resolved principals (user_id -> ResolvedPrincipal)
+        self._principal_cache: PrincipalCache[ResolvedPrincipal] = PrincipalCache()
         
         if cache_service is None:
             log.warning("SubscriptionManager initialized without cache_service - subscription data will not be cached")
@@ -327,6 +332,85 @@ class SubscriptionManager:
             log.debug(f"Retrieved subscription for user {user_id}")
             return subscription_data
 
+    async def get_principal(self, user_id: int) -> ResolvedPrincipal:
+        """
+        Get the resolved principal (tier, status, entitlements) for a user.
+
+        Served from a short-TTL in-process cache; on a miss the subscription is
+        loaded once (Redis cache, then database) and the tier's features are
+        attached as entitlements.
+
+        Args:
+            user_id: User ID to resolve
+
+        Returns:
+            ResolvedPrincipal (FREE tier if no subscription found)
+        """
+        principal = self._principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+
+        subscription = await self.get_user_subscription(user_id) or {}
+        # Subscription is always a dict from cache/database
+        tier = subscription.get("tier") or SubscriptionTier.FREE
+        principal = ResolvedPrincipal(
+            user_id=user_id,
+            tier=tier,
+            status=subscription.get("status"),
+            entitlements=frozenset(self.get_tier_features(tier)),
+            stripe_subscription_id=subscription.get("stripe_subscription_id"),
+        )
+        self._principal_cache.set(user_id, principal)
+        return principal
+
+    async def invalidate_principal(self, user_id: int) -> None:
+        """
+        Drop every cached view of a user's subscription.
+
+        Must be called whenever a subscription changes (webhooks, admin
+        overrides, refunds, disputes) so the next request re-resolves it.
+
+        Args:
+            user_id: User whose cached subscription data should be dropped
+        """
+        self._principal_cache.invalidate(user_id)
+        user_cache.invalidate(user_id)
+        if self.cache_service:
+            cache_key = self._make_cache_key("user", user_id)
+            await self.cache_service.delete(cache_key, cache_type='subscription')
+        log.debug(f"Invalidated cached subscription for user {user_id}")
+
+    async def invalidate_stripe_subscription(
+        self,
+        stripe_subscription_id: Optional[str] = None,
+        stripe_customer_id: Optional[str] = None
+    ) -> List[int]:
+        """
+        Invalidate cached subscription data for the owners of a Stripe object.
+
+        Args:
+            stripe_subscription_id: Stripe subscription ID from a webhook event
+            stripe_customer_id: Stripe customer ID from a webhook event
+
+        Returns:
+            User IDs whose cached data was invalidated
+        """
+        conditions = []
+        if stripe_subscription_id:
+            conditions.append(Subscription.stripe_subscription_id == stripe_subscription_id)
+        if stripe_customer_id:
+            conditions.append(Subscription.stripe_customer_id == stripe_customer_id)
+        if not conditions:
+            return []
+
+        async with AsyncSessionLocal() as session:
+            stmt = select(Subscription.user_id).where(or_(*conditions))
+            user_ids = list(set((await session.execute(stmt)).scalars().all()))
+
+        for user_id in user_ids:
+            await self.invalidate_principal(user_id)
+        return user_ids
+
     async def get_user_tier(self, user_id: int) -> SubscriptionTier:
         """
         Get user's subscription tier.
@@ -337,11 +421,8 @@ class SubscriptionManager:
         Returns:
             SubscriptionTier enum value (defaults to FREE if no subscription found)
         """
-        subscription = await self.get_user_subscription(user_id)
-        if subscription:
-            # Subscription is always a dict from cache/database
-            return subscription.get("tier", SubscriptionTier.FREE)
-        return SubscriptionTier.FREE
+        principal = await self.get_principal(user_id)
+        return principal.tier
 
     async def check_api_access(self, user_id: int, endpoint: str) -> bool:
         """
@@ -438,14 +519,22 @@ class SubscriptionManager:
                 log.warning(f"Cannot update status: No subscription found for user {user_id}")
                 return
 
+            old_status = subscription.status
             subscription.status = status
             session.add(subscription)
             await session.commit()
 
         # Invalidate cache
-        if self.cache_service:
-            cache_key = self._make_cache_key("user", user_id)
-            await self.cache_service.delete(cache_key)
+        await self.invalidate_principal(user_id)
+
+        if status != old_status:
+            record_audit_event(
+                "subscription.status_changed",
+                subject_type="subscription",
+                subject_id=subscription.id,
+                user_id=user_id,
+                details={"old_status": old_status, "new_status": status}
+            )
 
         log.info(f"Updated subscription status for user {user_id} to {status}")
 
@@ -461,13 +550,16 @@ class SubscriptionManager:
         """
         return self._tier_limits.get(tier, self._tier_limits[SubscriptionTier.FREE])
 
-    async def enforce_rate_limits(self, user_id: int, endpoint: str) -> bool:
+    async def enforce_rate_limits(self, user_id: int, endpoint: str, enforce_per_minute: bool = True) -> bool:
         """
         Check and enforce rate limits for a user.
 
         Args:
             user_id: User ID to check limits for
             endpoint: API endpoint being accessed
+            enforce_per_minute: Also apply the tier's per-minute limit. Callers
+                behind the shared request limiter (app.core.rate_limiting) pass
+                False so only the monthly quota is checked here.
 
         Returns:
             True if request is allowed, False if rate limited
@@ -500,7 +592,7 @@ class SubscriptionManager:
         if stats.last_request_time:
             time_diff = (current_time - stats.last_request_time).total_seconds()
             if time_diff < 60:  # Within the same minute
-                if stats.requests_this_minute >= limits.requests_per_minute:
+                if enforce_per_minute and stats.requests_this_minute >= limits.requests_per_minute:
                     log.warning(f"User {user_id} exceeded per-minute rate limit ({limits.requests_per_minute})")
                     return False
             else:
@@ -845,11 +937,25 @@ class SubscriptionManager:
                 await session.refresh(subscription)
 
                 # Clear cache for this user
-                if self.cache_service:
-                    cache_key = self._make_cache_key("subscription", user_id)
-                    await self.cache_service.delete(cache_key, cache_type='subscription')
+                await self.invalidate_principal(user_id)
 
                 log.info(f"Admin override applied for user {user_id} by admin {admin_user_id}")
+                record_audit_event(
+                    "subscription.override",
+                    actor_type="admin",
+                    actor_id=admin_user_id,
+                    subject_type="subscription",
+                    subject_id=subscription.id,
+                    user_id=user_id,
+                    details={
+                        "old_tier": old_tier,
+                        "new_tier": subscription.tier,
+                        "old_status": old_status,
+                        "new_status": subscription.status,
+                        "extend_period_days": extend_period_days if period_extended else None,
+                        "admin_notes": admin_notes
+                    }
+                )
 
                 return {
                     "new_tier": subscription.tier,
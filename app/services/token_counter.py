@@ -0,0 +1,209 @@
+"""
+Tokenizer-accurate token counting.
+
+Counts tokens with the served model's Hugging Face tokenizer, loaded from the
+local cache only (no network at runtime). Counts are memoized per text hash in
+a bounded LRU, and ``count_batch`` tokenizes all cache misses in one call to the
+Rust tokenizer; ``split`` cuts long texts into token windows for chunking.
+If the tokenizer is not available locally, counts fall back to
+the ``CHARS_PER_TOKEN_ESTIMATE`` approximation used before.
+"""
+
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.constants import CHARS_PER_TOKEN_ESTIMATE, TOKEN_COUNT_CACHE_MAX_ENTRIES
+from app.core.logger import log
+
+
+def estimate_tokens(text: str) -> int:
+    """Character-based token estimate (ceiling, at least 1 for non-empty text)."""
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN_ESTIMATE)) if text else 0
+
+
+class TokenCounter:
+    """Counts tokens with a locally cached tokenizer, memoizing counts per text hash."""
+
+    def __init__(
+        self,
+        tokenizer_name: Optional[str] = None,
+        max_entries: int = TOKEN_COUNT_CACHE_MAX_ENTRIES,
+        tokenizer: Any = None,
+    ):
+        self.tokenizer_name = tokenizer_name
+        self._tokenizer = tokenizer
+        self._loaded = tokenizer is not None
+        self._load_lock = threading.Lock()
+        self._cache_lock = threading.Lock()  # count_batch also runs in asyncio.to_thread workers
+        self._cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._max_entries = max_entries
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def backend(self) -> str:
+        """``"tokenizer"`` when counts are exact, ``"estimate"`` when falling back."""
+        return "tokenizer" if self._load() is not None else "estimate"
+
+    def load(self) -> bool:
+        """Load the tokenizer now (e.g. at startup); returns True if it is available."""
+        return self._load() is not None
+
+    def _load(self) -> Any:
+        if self._loaded:
+            return self._tokenizer
+        with self._load_lock:
+            if self._loaded:
+                return self._tokenizer
+            if self.tokenizer_name:
+                try:
+                    from transformers import AutoTokenizer
+
+                    tokenizer = AutoTokenizer.from_pretrained(
+                        self.tokenizer_name, use_fast=True, local_files_only=True
+                    )
+                    # Encode through the Rust tokenizer directly: batch-parallel and
+                    # no max-length warnings for long documents
+                    self._tokenizer = getattr(tokenizer, "backend_tokenizer", None) or tokenizer
+                    log.info(f"Token counter using tokenizer {self.tokenizer_name}")
+                except Exception as e:
+                    log.warning(
+                        f"Tokenizer {self.tokenizer_name} not available locally ({type(e).__name__}) - "
+                        f"token counts will be estimated at {CHARS_PER_TOKEN_ESTIMATE} chars/token"
+                    )
+            self._loaded = True
+        return self._tokenizer
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def _encode(self, tokenizer: Any, texts: List[str]) -> List[int]:
+        if hasattr(tokenizer, "encode_batch"):
+            return [len(encoding.ids) for encoding in tokenizer.encode_batch(texts, add_special_tokens=False)]
+        return [len(ids) for ids in tokenizer(texts, add_special_tokens=False)["input_ids"]]
+
+    def count(self, text: Optional[str]) -> int:
+        """Number of tokens in ``text`` (0 for empty text)."""
+        if not text:
+            return 0
+        return self.count_batch([text])[0]
+
+    def count_batch(self, texts: Iterable[Optional[str]]) -> List[int]:
+        """Token counts for many texts, tokenizing all uncached texts in a single batch."""
+        texts = [text or "" for text in texts]
+        tokenizer = self._load()
+        if tokenizer is None:
+            return [estimate_tokens(text) for text in texts]
+
+        counts: List[Optional[int]] = [None] * len(texts)
+        pending: Dict[bytes, List[int]] = {}
+        pending_texts: List[str] = []
+        keys = [self._key(text) if text else None for text in texts]
+        with self._cache_lock:
+            for i, (text, key) in enumerate(zip(texts, keys)):
+                if key is None:
+                    counts[i] = 0
+                    continue
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    self._hits += 1
+                    counts[i] = cached
+                elif key in pending:
+                    pending[key].append(i)
+                else:
+                    self._misses += 1
+                    pending[key] = [i]
+                    pending_texts.append(text)
+
+        if pending_texts:
+            n_tokens_per_text = self._encode(tokenizer, pending_texts)
+            with self._cache_lock:
+                for (key, positions), n_tokens in zip(pending.items(), n_tokens_per_text):
+                    for i in positions:
+                        counts[i] = n_tokens
+                    self._cache[key] = n_tokens
+                while len(self._cache) > self._max_entries:
+                    self._cache.popitem(last=False)
+
+        return counts
+
+    def _offsets(self, tokenizer: Any, text: str) -> List[Tuple[int, int]]:
+        if hasattr(tokenizer, "encode_batch"):
+            return list(tokenizer.encode(text, add_special_tokens=False).offsets)
+        return list(tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)["offset_mapping"])
+
+    def split(self, text: str, max_tokens: int, overlap_tokens: int = 0) -> List[str]:
+        """
+        Split ``text`` into windows of at most ``max_tokens`` tokens.
+
+        Consecutive windows share ``overlap_tokens`` tokens. Windows are cut at
+        token boundaries; a window that re-tokenizes longer than ``max_tokens``
+        (e.g. when cut inside a word) is shortened until it fits. Without a
+        tokenizer, windows are ``max_tokens`` character-estimated tokens long.
+        """
+        if not text:
+            return []
+        max_tokens = max(1, max_tokens)
+        overlap_tokens = min(max(0, overlap_tokens), max_tokens - 1)
+        tokenizer = self._load()
+        if tokenizer is None:
+            size = max_tokens * CHARS_PER_TOKEN_ESTIMATE
+            step = (max_tokens - overlap_tokens) * CHARS_PER_TOKEN_ESTIMATE
+            last_start = max(1, len(text) - overlap_tokens * CHARS_PER_TOKEN_ESTIMATE)
+            return [text[i:i + size] for i in range(0, last_start, step)]
+
+        offsets = self._offsets(tokenizer, text)
+        if len(offsets) <= max_tokens:
+            return [text]
+
+        windows = []
+        start = 0
+        while start < len(offsets):
+            end = min(start + max_tokens, len(offsets))
+            window = text[offsets[start][0]:offsets[end - 1][1]]
+            while end - start > 1 and self.count(window) > max_tokens:
+                end -= 1
+                window = text[offsets[start][0]:offsets[end - 1][1]]
+            windows.append(window)
+            if end == len(offsets):
+                break
+            start = max(start + 1, end - overlap_tokens)
+        return windows
+
+    def clear_cache(self) -> None:
+        """Drop memoized counts."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Backend and cache statistics."""
+        with self._cache_lock:
+            entries, hits, misses = len(self._cache), self._hits, self._misses
+        lookups = hits + misses
+        return {
+            "backend": self.backend,
+            "tokenizer": self.tokenizer_name,
+            "entries": entries,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups * 100, 2) if lookups else 0.0,
+        }
+
+
+@lru_cache(maxsize=1)
+def get_token_counter() -> TokenCounter:
+    """Process-wide token counter for the configured tokenizer (cached)."""
+    from app.config.settings import get_settings
+
+    return TokenCounter(get_settings().tokenizer_model or None)
+
+
+def count_tokens(text: Optional[str]) -> int:
+    """Count tokens in ``text`` with the process-wide counter."""
+    return get_token_counter().count(text)
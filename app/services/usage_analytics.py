@@ -0,0 +1,268 @@
+"""
+SQL aggregation engine for billing analytics.
+
+Usage totals, per-endpoint counts and per-period series are computed by the
+database with GROUP BY queries instead of loading UsageRecord rows into
+Python. Periods are bucketed with date_trunc on PostgreSQL and strftime on
+SQLite (used by the tests).
+
+Closed days are pre-aggregated into ``usage_daily_rollups`` by
+``roll_up_usage``. Range queries read whole rolled-up days from there and
+only scan raw usage records for the part of the range that is not rolled up
+yet (normally today, plus partial days at the edges of the range).
+
+All functions take an open AsyncSession so callers keep control of session
+lifetime.
+"""
+
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import Date, cast, delete, distinct, func, insert, literal_column, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.db_models import (
+    DisputeRecord,
+    DisputeStatus,
+    PaymentRecord,
+    RefundRecord,
+    RefundStatus,
+    SubscriptionTier,
+    UsageDailyRollup,
+    UsageRecord,
+)
+
+# strftime format (SQLite) and to_char format (PostgreSQL) of each bucket label
+GRANULARITIES = {
+    "day": ("%Y-%m-%d", "YYYY-MM-DD"),
+    "month": ("%Y-%m", "YYYY-MM"),
+}
+
+ACTIVE_DISPUTE_STATUSES = (
+    DisputeStatus.NEEDS_RESPONSE,
+    DisputeStatus.UNDER_REVIEW,
+    DisputeStatus.WARNING_NEEDS_RESPONSE,
+)
+
+
+@dataclass
+class UsageAggregate:
+    """Usage summed over a period or date range."""
+    requests: int = 0
+    tokens: int = 0
+    endpoints: Dict[str, int] = field(default_factory=dict)
+    buckets: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    bucket_endpoints: Dict[str, Set[str]] = field(default_factory=dict)
+    subscription_tier: Optional[SubscriptionTier] = None
+
+    def add(self, endpoint: str, requests: int, tokens: int, bucket: Optional[str] = None) -> None:
+        requests, tokens = int(requests or 0), int(tokens or 0)
+        self.requests += requests
+        self.tokens += tokens
+        self.endpoints[endpoint] = self.endpoints.get(endpoint, 0) + requests
+        if bucket is not None:
+            totals = self.buckets.setdefault(bucket, {"requests": 0, "tokens": 0})
+            totals["requests"] += requests
+            totals["tokens"] += tokens
+            self.bucket_endpoints.setdefault(bucket, set()).add(endpoint)
+
+
+def dialect_name(session: AsyncSession) -> str:
+    return session.get_bind().dialect.name
+
+
+def period_label(column, granularity: str, dialect: str):
+    """SQL expression labelling ``column`` with its day ('YYYY-MM-DD') or month ('YYYY-MM')."""
+    sqlite_format, postgres_format = GRANULARITIES[granularity]
+    # Literals rather than bind parameters, so PostgreSQL sees the same
+    # expression in the select list and in GROUP BY
+    if dialect == "postgresql":
+        return func.to_char(
+            func.date_trunc(literal_column(f"'{granularity}'"), column),
+            literal_column(f"'{postgres_format}'"),
+        )
+    return func.strftime(literal_column(f"'{sqlite_format}'"), column)
+
+
+def day_of(column, dialect: str):
+    """SQL expression truncating a timestamp column to its date."""
+    if dialect == "postgresql":
+        return cast(func.date_trunc(literal_column("'day'"), column), Date)
+    return func.date(column)
+
+
+def _utc(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc) if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+async def usage_for_period(session: AsyncSession, user_id: int, billing_period: str) -> UsageAggregate:
+    """Totals and per-endpoint requests of one billing period (YYYY-MM)."""
+    in_period = (UsageRecord.user_id == user_id, UsageRecord.billing_period == billing_period)
+    result = await session.execute(
+        select(
+            UsageRecord.endpoint,
+            func.count(UsageRecord.id),
+            func.coalesce(func.sum(UsageRecord.tokens_used), 0),
+        ).where(*in_period).group_by(UsageRecord.endpoint)
+    )
+    aggregate = UsageAggregate()
+    for endpoint, requests, tokens in result.all():
+        aggregate.add(endpoint, requests, tokens)
+
+    if aggregate.requests:
+        # Tier the user was on at their latest request in the period
+        tier = await session.execute(
+            select(UsageRecord.subscription_tier).where(*in_period)
+            .order_by(UsageRecord.timestamp.desc()).limit(1)
+        )
+        aggregate.subscription_tier = tier.scalar()
+    return aggregate
+
+
+async def rolled_up_until(session: AsyncSession) -> Optional[date]:
+    """First day not covered by the daily rollups, or None before the first rollup."""
+    last_day = (await session.execute(select(func.max(UsageDailyRollup.day)))).scalar()
+    return last_day + timedelta(days=1) if last_day else None
+
+
+async def usage_for_range(
+    session: AsyncSession,
+    user_id: int,
+    start: datetime,
+    end: datetime,
+    granularity: str = "month",
+) -> UsageAggregate:
+    """
+    Usage in [start, end), bucketed per day or month.
+
+    Whole days already rolled up are read from usage_daily_rollups; the rest
+    of the range is aggregated from usage_records.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+    dialect = dialect_name(session)
+    start, end = _utc(start), _utc(end)
+    aggregate = UsageAggregate()
+
+    raw_ranges: List[Tuple[datetime, datetime]] = [(start, end)]
+    until = await rolled_up_until(session)
+    first_day = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+    last_day = min(end.date(), until) if until else first_day
+    if first_day < last_day:
+        label = period_label(UsageDailyRollup.day, granularity, dialect)
+        result = await session.execute(
+            select(
+                label,
+                UsageDailyRollup.endpoint,
+                func.sum(UsageDailyRollup.requests),
+                func.sum(UsageDailyRollup.tokens),
+            ).where(
+                UsageDailyRollup.user_id == user_id,
+                UsageDailyRollup.day >= first_day,
+                UsageDailyRollup.day < last_day,
+            ).group_by(label, UsageDailyRollup.endpoint)
+        )
+        for bucket, endpoint, requests, tokens in result.all():
+            aggregate.add(endpoint, requests, tokens, bucket)
+        raw_ranges = [(start, _day_start(first_day)), (_day_start(last_day), end)]
+
+    label = period_label(UsageRecord.timestamp, granularity, dialect)
+    for range_start, range_end in raw_ranges:
+        if range_start >= range_end:
+            continue
+        result = await session.execute(
+            select(
+                label,
+                UsageRecord.endpoint,
+                func.count(UsageRecord.id),
+                func.coalesce(func.sum(UsageRecord.tokens_used), 0),
+            ).where(
+                UsageRecord.user_id == user_id,
+                UsageRecord.timestamp >= range_start,
+                UsageRecord.timestamp < range_end,
+            ).group_by(label, UsageRecord.endpoint)
+        )
+        for bucket, endpoint, requests, tokens in result.all():
+            aggregate.add(endpoint, requests, tokens, bucket)
+    return aggregate
+
+
+async def roll_up_usage(session: AsyncSession, through: date) -> int:
+    """
+    Roll up usage of every day before ``through`` not rolled up yet.
+
+    Picks up where the previous run stopped (or at the first usage record)
+    and commits. Days must be closed: usage recorded for a day after it was
+    rolled up is not counted by range queries.
+
+    Returns:
+        Number of days rolled up
+    """
+    dialect = dialect_name(session)
+    start = await rolled_up_until(session)
+    if start is None:
+        first = (await session.execute(select(func.min(UsageRecord.timestamp)))).scalar()
+        if first is None:
+            return 0
+        start = _utc(first).date()
+    if start >= through:
+        return 0
+
+    day = day_of(UsageRecord.timestamp, dialect)
+    per_day = select(
+        UsageRecord.user_id,
+        day,
+        UsageRecord.endpoint,
+        func.count(UsageRecord.id),
+        func.coalesce(func.sum(UsageRecord.tokens_used), 0),
+    ).where(
+        UsageRecord.timestamp >= _day_start(start),
+        UsageRecord.timestamp < _day_start(through),
+    ).group_by(UsageRecord.user_id, day, UsageRecord.endpoint)
+
+    await session.execute(
+        delete(UsageDailyRollup).where(UsageDailyRollup.day >= start, UsageDailyRollup.day < through)
+    )
+    await session.execute(
+        insert(UsageDailyRollup).from_select(["user_id", "day", "endpoint", "requests", "tokens"], per_day)
+    )
+    await session.commit()
+    return (through - start).days
+
+
+async def payment_summary(session: AsyncSession, start: datetime, end: datetime) -> Dict[str, Any]:
+    """Payment, refund and dispute totals for the admin dashboard."""
+    payments = (await session.execute(
+        select(func.count(PaymentRecord.id), func.coalesce(func.sum(PaymentRecord.amount_cents), 0)).where(
+            PaymentRecord.created_at >= start,
+            PaymentRecord.created_at <= end,
+            PaymentRecord.status == "succeeded",
+        )
+    )).one()
+    refunds = (await session.execute(
+        select(func.count(RefundRecord.id), func.coalesce(func.sum(RefundRecord.amount_cents), 0)).where(
+            RefundRecord.created_at >= start,
+            RefundRecord.created_at <= end,
+            RefundRecord.status == RefundStatus.SUCCEEDED,
+        )
+    )).one()
+    disputes = (await session.execute(
+        select(
+            func.count(DisputeRecord.id).filter(DisputeRecord.status.in_(ACTIVE_DISPUTE_STATUSES)),
+            func.count(distinct(DisputeRecord.user_id)).filter(DisputeRecord.account_suspended.is_(True)),
+        )
+    )).one()
+
+    return {
+        "total_payments": payments[0],
+        "total_amount_cents": payments[1],
+        "total_refunds": refunds[0],
+        "total_refund_amount_cents": refunds[1],
+        "active_disputes": disputes[0],
+        "suspended_accounts": disputes[1],
+    }
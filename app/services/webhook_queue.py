@@ -0,0 +1,354 @@
+"""
+Durable, idempotent webhook processing.
+
+Stripe webhooks are stored in the webhook_events table and acknowledged
+straight away; a background worker applies them afterwards. Stripe retries
+deliveries it does not see acknowledged quickly, and a burst of invoice events
+at month rollover no longer ties up request workers while each one syncs
+subscriptions from Stripe.
+
+- Deduplication: event IDs are unique, so a redelivered event is stored once
+  and applied once.
+- Ordering: events of one customer are applied one at a time in the order
+  Stripe created them; a failed event holds back that customer's later
+  events until it succeeds or is dead-lettered. Different customers are
+  processed concurrently.
+- Retries: failed events are retried with exponential backoff. After
+  ``max_attempts`` they are marked dead_letter and stay in the table until an
+  admin replays them.
+
+Since the queue lives in the database, events survive restarts, and several
+API workers can share it: claiming an event is a conditional UPDATE, so each
+attempt runs in exactly one worker.
+"""
+
+import asyncio
+import contextlib
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.core.database import AsyncSessionLocal
+from app.core.db_models import WebhookEvent, WebhookEventStatus
+from app.core.logger import log
+from app.core.metrics import record_webhook_event, webhook_queue_depth
+
+# Statuses that still hold back a customer's later events
+_PENDING_STATUSES = (WebhookEventStatus.QUEUED, WebhookEventStatus.FAILED, WebhookEventStatus.PROCESSING)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """SQLite returns naive datetimes; everything is stored in UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def customer_of(event: Dict[str, Any]) -> Optional[str]:
+    """Stripe customer an event belongs to, which orders it relative to that customer's other events."""
+    obj = event.get("data", {}).get("object", {}) or {}
+    if obj.get("object") == "customer":
+        return obj.get("id")
+    customer = obj.get("customer")
+    # Expanded customers arrive as objects
+    return customer.get("id") if isinstance(customer, dict) else customer
+
+
+class WebhookQueue:
+    """
+    Stores webhook events and applies them in the background, managed by the application lifespan.
+
+    Access via app.core.dependencies.get_webhook_queue(); None when payments are disabled.
+
+    Args:
+        handler: Coroutine function applying one event; returns False or raises on failure
+        max_attempts: Attempts before an event is dead-lettered
+        retry_base_seconds: Delay before the first retry; doubles on each further retry
+        poll_interval_seconds: How often to look for due retries without being woken
+        concurrency: Customers processed concurrently
+        processing_timeout_seconds: An attempt running longer than this is assumed
+            lost (worker crashed) and its event is retried
+        session_factory: Async session factory for the webhook_events table
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Dict[str, Any]], Awaitable[bool]],
+        max_attempts: int = 5,
+        retry_base_seconds: float = 30.0,
+        poll_interval_seconds: float = 5.0,
+        concurrency: int = 4,
+        processing_timeout_seconds: float = 300.0,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.handler = handler
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.concurrency = concurrency
+        self.processing_timeout_seconds = processing_timeout_seconds
+        self._session_factory = session_factory
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    async def start(cls, handler: Callable[[Dict[str, Any]], Awaitable[bool]], settings=None) -> "WebhookQueue":
+        """Async factory method for lifespan-managed initialization; starts the worker."""
+        if settings is None:
+            from app.config.settings import get_settings
+            settings = get_settings()
+        instance = cls(
+            handler,
+            max_attempts=settings.webhook_max_attempts,
+            retry_base_seconds=settings.webhook_retry_base_seconds,
+            poll_interval_seconds=settings.webhook_poll_interval_seconds,
+            concurrency=settings.webhook_concurrency,
+        )
+        instance.run()
+        log.info(
+            f"WebhookQueue started (max {instance.max_attempts} attempts, "
+            f"{instance.concurrency} customers concurrently)"
+        )
+        return instance
+
+    def run(self) -> None:
+        """Start the background worker."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._worker_loop(), name="webhook-queue")
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def aclose(self):
+        """Async cleanup for lifespan management; unfinished events stay queued."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        log.info("WebhookQueue cleaned up")
+
+    async def enqueue(self, event: Dict[str, Any]) -> bool:
+        """
+        Store a verified event for processing.
+
+        Returns:
+            True if the event was queued, False if it had been received before
+        """
+        event_type = event.get("type", "unknown")
+        record = WebhookEvent(
+            event_id=event["id"],
+            event_type=event_type,
+            customer_id=customer_of(event),
+            event_created=event.get("created"),
+            # Plain JSON: the payload is all a (re)play has to go on
+            payload=json.loads(json.dumps(event, default=str)),
+        )
+        async with self._session_factory() as session:
+            session.add(record)
+            try:
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                log.info(f"Webhook event {record.event_id} ({event_type}) already received - ignoring redelivery")
+                record_webhook_event(event_type, "duplicate")
+                return False
+
+        record_webhook_event(event_type, "queued")
+        self._wakeup.set()
+        return True
+
+    async def replay(self, event_id: str) -> bool:
+        """
+        Queue a stored event to be applied again, with fresh attempts.
+
+        Meant for dead-lettered events once their cause is fixed, but any
+        event not currently being processed can be replayed.
+
+        Returns:
+            False if no such event is stored or it is being processed right now
+        """
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(WebhookEvent)
+                .where(WebhookEvent.event_id == event_id, WebhookEvent.status != WebhookEventStatus.PROCESSING)
+                .values(
+                    status=WebhookEventStatus.QUEUED,
+                    attempts=0,
+                    last_error=None,
+                    next_attempt_at=None,
+                    processed_at=None,
+                )
+                .returning(WebhookEvent.event_type)
+            )
+            event_type = result.scalar_one_or_none()
+            await session.commit()
+
+        if event_type is None:
+            return False
+        log.info(
+            f"Webhook event {event_id} ({event_type}) queued for replay",
+            extra={"event_type": "webhook_replayed", "webhook_event_id": event_id, "webhook_event_type": event_type},
+        )
+        record_webhook_event(event_type, "replayed")
+        self._wakeup.set()
+        return True
+
+    async def list_events(
+        self, status: Optional[WebhookEventStatus] = None, limit: int = 50
+    ) -> List[WebhookEvent]:
+        """Most recently received events, optionally only those with ``status``."""
+        query = select(WebhookEvent).order_by(WebhookEvent.received_at.desc(), WebhookEvent.id.desc()).limit(limit)
+        if status is not None:
+            query = query.where(WebhookEvent.status == status)
+        async with self._session_factory() as session:
+            return list((await session.execute(query)).scalars())
+
+    async def _worker_loop(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.process_pending()
+            except Exception as e:
+                log.error(f"Webhook queue pass failed: {e}", exc_info=True)
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+
+    async def process_pending(self) -> int:
+        """
+        Apply every event that is due, in order per customer.
+
+        Returns:
+            Number of events applied successfully
+        """
+        await self._release_stale_claims()
+        async with self._session_factory() as session:
+            rows = (await session.execute(
+                select(WebhookEvent.id, WebhookEvent.event_id, WebhookEvent.customer_id,
+                       WebhookEvent.status, WebhookEvent.next_attempt_at)
+                .where(WebhookEvent.status.in_(_PENDING_STATUSES))
+                .order_by(WebhookEvent.event_created, WebhookEvent.id)
+            )).all()
+
+        lanes: Dict[str, list] = {}
+        for row in rows:
+            # Events without a customer don't need ordering: each is its own lane
+            lanes.setdefault(row.customer_id or row.event_id, []).append(row)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def drain(lane) -> int:
+            async with semaphore:
+                return await self._drain_lane(lane)
+
+        processed = sum(await asyncio.gather(*(drain(lane) for lane in lanes.values())))
+        await self._update_depth_gauge()
+        return processed
+
+    async def _drain_lane(self, rows) -> int:
+        """Apply one customer's events in order, stopping at the first that can't be applied yet."""
+        processed = 0
+        now = _utcnow()
+        for row in rows:
+            if row.status == WebhookEventStatus.PROCESSING:
+                break  # Another worker is on this customer
+            if row.next_attempt_at is not None and _as_utc(row.next_attempt_at) > now:
+                break  # Backing off; later events must wait for it
+            status = await self._attempt(row.id, row.status)
+            if status == WebhookEventStatus.PROCESSED:
+                processed += 1
+            elif status != WebhookEventStatus.DEAD_LETTER:
+                break
+        return processed
+
+    async def _attempt(self, record_id: int, expected_status: WebhookEventStatus) -> Optional[WebhookEventStatus]:
+        """Claim and apply one event; returns its new status, or None if another worker claimed it."""
+        async with self._session_factory() as session:
+            claimed = await session.execute(
+                update(WebhookEvent)
+                .where(WebhookEvent.id == record_id, WebhookEvent.status == expected_status)
+                .values(status=WebhookEventStatus.PROCESSING, locked_at=_utcnow(), attempts=WebhookEvent.attempts + 1)
+            )
+            await session.commit()
+            if claimed.rowcount != 1:
+                return None
+            record = await session.get(WebhookEvent, record_id)
+
+        error = None
+        try:
+            if not await self.handler(record.payload):
+                error = "Handler reported failure"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        now = _utcnow()
+        if error is None:
+            status = WebhookEventStatus.PROCESSED
+            values = {"processed_at": now, "last_error": None, "next_attempt_at": None}
+            record_webhook_event(record.event_type, "processed", (now - _as_utc(record.received_at)).total_seconds())
+        elif record.attempts >= self.max_attempts:
+            status = WebhookEventStatus.DEAD_LETTER
+            values = {"last_error": error, "next_attempt_at": None}
+            log.error(
+                f"Webhook event {record.event_id} ({record.event_type}) dead-lettered after "
+                f"{record.attempts} attempts: {error}",
+                extra={
+                    "event_type": "webhook_dead_lettered",
+                    "webhook_event_id": record.event_id,
+                    "webhook_event_type": record.event_type,
+                    "customer_id": record.customer_id,
+                    "attempts": record.attempts,
+                    "error": error,
+                },
+            )
+            record_webhook_event(record.event_type, "dead_letter")
+        else:
+            status = WebhookEventStatus.FAILED
+            delay = self.retry_base_seconds * 2 ** (record.attempts - 1)
+            values = {"last_error": error, "next_attempt_at": now + timedelta(seconds=delay)}
+            log.warning(
+                f"Webhook event {record.event_id} ({record.event_type}) failed "
+                f"(attempt {record.attempts}/{self.max_attempts}), retrying in {delay:.0f}s: {error}"
+            )
+            record_webhook_event(record.event_type, "retry")
+
+        async with self._session_factory() as session:
+            await session.execute(
+                update(WebhookEvent)
+                .where(WebhookEvent.id == record_id)
+                .values(status=status, locked_at=None, **values)
+            )
+            await session.commit()
+        return status
+
+    async def _release_stale_claims(self) -> None:
+        """Return events whose worker died mid-attempt to the queue."""
+        cutoff = _utcnow() - timedelta(seconds=self.processing_timeout_seconds)
+        async with self._session_factory() as session:
+            result = await session.execute(
+                update(WebhookEvent)
+                .where(WebhookEvent.status == WebhookEventStatus.PROCESSING, WebhookEvent.locked_at < cutoff)
+                .values(status=WebhookEventStatus.FAILED, locked_at=None, last_error="Processing attempt interrupted")
+            )
+            await session.commit()
+        if result.rowcount:
+            log.warning(f"Requeued {result.rowcount} webhook events whose processing was interrupted")
+
+    async def _update_depth_gauge(self) -> None:
+        async with self._session_factory() as session:
+            counts = dict((await session.execute(
+                select(WebhookEvent.status, func.count())
+                .where(WebhookEvent.status.in_((
+                    WebhookEventStatus.QUEUED, WebhookEventStatus.FAILED, WebhookEventStatus.DEAD_LETTER
+                )))
+                .group_by(WebhookEvent.status)
+            )).all())
+        for status in (WebhookEventStatus.QUEUED, WebhookEventStatus.FAILED, WebhookEventStatus.DEAD_LETTER):
+            webhook_queue_depth.labels(status=status.value).set(counts.get(status, 0))
@@ -1,26 +1,48 @@
 """
 Batch processing utilities for chat history operations.
 
-Provides efficient batch operations for vector generation, upload,
-and data processing with progress tracking and error handling.
+Vector backfills run as a pipeline: a reader pages through chat messages in
+ID order (keyset pagination, one short query per batch) and hands batches to
+up to ``max_concurrent`` workers. Each worker embeds its whole batch with one
+request to the embedding model, writes it to Qdrant with one upsert and
+stores the point IDs with one UPDATE.
+
+Progress is checkpointed to a JSON file as a keyset cursor: the highest
+message ID below which every batch is done. A rerun of the same operation
+continues after it instead of starting over; the checkpoint is removed once a
+run has gone through all messages.
+
+Backfills share Qdrant and the embedding model with live chat traffic. An
+AdaptiveThrottle probes their latency between batches and lowers the number
+of batches in flight while it is above the target, raising it again once
+latency has recovered.
 """
 
 import asyncio
+import contextlib
+import json
+import time
 import uuid
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional, Callable, AsyncGenerator
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable, Awaitable
 from dataclasses import dataclass
-from sqlmodel import select, and_
-from sqlalchemy import func
+from sqlmodel import select
+from sqlalchemy import func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db_models import ChatMessage, ChatConversation
+from app.core.constants import CHAT_BATCH_CHECKPOINT_DIR
+from app.core.db_models import ChatMessage
 from app.core.database import AsyncSessionLocal
 from app.core.logger import log
 from app.services.chat_qdrant_service import ChatQdrantService
+from app.utils.file_operations import atomic_write_json
 
 
 DEFAULT_MAX_RESULTS_GUARD = 50_000
+DEFAULT_TARGET_LATENCY_MS = 250.0
+MAX_REPORTED_ERRORS = 1000
 
 
 @dataclass
@@ -32,6 +54,7 @@ class BatchProcessingResult:
     errors: List[str]
     duration_seconds: float
     batch_id: str
+    resumed_from_checkpoint: bool = False
 
 
 @dataclass
@@ -47,41 +70,145 @@ class BatchProcessingProgress:
     current_operation: str = ""
 
 
+class AdaptiveThrottle:
+    """
+    Limit on batches in flight that backs off while live-traffic latency is high.
+
+    After each batch, observe() runs the latency probe (at most once every
+    ``probe_interval_seconds``). Above the target, the limit is halved down
+    to one batch; at one batch, batches are spaced out by a pause that
+    starts at ``initial_pause_seconds`` and doubles up to ``max_pause_seconds``. At or below the target, the pause is
+    dropped and the limit grows back by one batch per probe.
+
+    Args:
+        max_concurrency: Upper bound of the limit, and its starting value
+        target_latency_seconds: Probe latency above which the backfill backs off
+        probe: Async callable returning the current latency in seconds; None disables throttling
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        target_latency_seconds: float,
+        probe: Optional[Callable[[], Awaitable[float]]] = None,
+        probe_interval_seconds: float = 1.0,
+        initial_pause_seconds: float = 1.0,
+        max_pause_seconds: float = 30.0,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.target_latency_seconds = target_latency_seconds
+        self.probe = probe
+        self.probe_interval_seconds = probe_interval_seconds
+        self.initial_pause_seconds = initial_pause_seconds
+        self.max_pause_seconds = max_pause_seconds
+        self.limit = self.max_concurrency
+        self.pause_seconds = 0.0
+        self._active = 0
+        self._last_probe = float("-inf")
+        self._condition = asyncio.Condition()
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """Hold one of the ``limit`` batch slots, pausing first while backed off."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._active < self.limit)
+            self._active += 1
+        try:
+            if self.pause_seconds:
+                await asyncio.sleep(self.pause_seconds)
+            yield
+        finally:
+            async with self._condition:
+                self._active -= 1
+                self._condition.notify_all()
+
+    async def observe(self) -> None:
+        """Probe latency if due and adjust the limit."""
+        now = time.monotonic()
+        if self.probe is None or now - self._last_probe < self.probe_interval_seconds:
+            return
+        self._last_probe = now
+        try:
+            latency = await self.probe()
+        except Exception as e:
+            log.warning(f"Latency probe failed, treating as overloaded: {e}")
+            latency = float("inf")
+
+        previous = (self.limit, self.pause_seconds)
+        async with self._condition:
+            if latency > self.target_latency_seconds:
+                if self.limit > 1:
+                    self.limit = max(1, self.limit // 2)
+                else:
+                    self.pause_seconds = min(
+                        self.max_pause_seconds, max(self.initial_pause_seconds, self.pause_seconds * 2)
+                    )
+            else:
+                self.pause_seconds = 0.0
+                self.limit = min(self.max_concurrency, self.limit + 1)
+            self._condition.notify_all()
+
+        if (self.limit, self.pause_seconds) != previous:
+            log.info(
+                f"Batch throttle: {self.limit} batches in flight, {self.pause_seconds:.1f}s pause "
+                f"(latency {latency * 1000:.0f}ms, target {self.target_latency_seconds * 1000:.0f}ms)",
+                extra={
+                    "event_type": "chat_batch_throttle",
+                    "limit": self.limit,
+                    "pause_seconds": self.pause_seconds,
+                    "latency_seconds": latency,
+                }
+            )
+
+
 class ChatBatchProcessor:
     """
     Batch processor for chat history operations with progress tracking.
-    
-    Handles large-scale operations like vector generation, Qdrant uploads,
-    and data migrations with proper error handling and recovery.
+
+    Handles large-scale vector backfills as a concurrent, resumable pipeline
+    (see the module docstring) with proper error handling and recovery.
     """
-    
+
     def __init__(
         self,
         batch_size: int = 100,
         max_concurrent: int = 5,
         progress_callback: Optional[Callable[[BatchProcessingProgress], None]] = None,
-        max_results_guard: Optional[int] = DEFAULT_MAX_RESULTS_GUARD
+        max_results_guard: Optional[int] = DEFAULT_MAX_RESULTS_GUARD,
+        checkpoint_dir: Optional[str] = CHAT_BATCH_CHECKPOINT_DIR,
+        target_latency_ms: Optional[float] = DEFAULT_TARGET_LATENCY_MS,
+        latency_probe: Optional[Callable[[], Awaitable[float]]] = None
     ):
         """
         Initialize batch processor.
-        
+
         Args:
-            batch_size: Number of items to process per batch
-            max_concurrent: Maximum concurrent operations
+            batch_size: Number of messages embedded and uploaded together
+            max_concurrent: Maximum batches in flight
             progress_callback: Optional callback for progress updates
-            max_results_guard: Maximum number of records to process per run (None disables guard)
+            max_results_guard: Maximum number of records to process per run (None disables guard);
+                a checkpointed run stopped by the guard continues on the next run
+            checkpoint_dir: Directory for resume checkpoints (None disables checkpointing)
+            target_latency_ms: Live-traffic latency above which the backfill slows down
+                (None disables throttling)
+            latency_probe: Async callable returning live-traffic latency in seconds;
+                defaults to timing a request to the Qdrant server
         """
         self.batch_size = batch_size
         self.max_concurrent = max_concurrent
         self.progress_callback = progress_callback
         self._active_batches: Dict[str, BatchProcessingProgress] = {}
         self.max_results_guard = max_results_guard
-    
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+        self.target_latency_ms = target_latency_ms
+        self.latency_probe = latency_probe
+
     async def batch_generate_vectors(
         self,
         session_id: Optional[str] = None,
         missing_vectors_only: bool = True,
-        qdrant_service: Optional[ChatQdrantService] = None
+        qdrant_service: Optional[ChatQdrantService] = None,
+        resume: bool = True
     ) -> BatchProcessingResult:
         """
         Generate vectors for chat messages in batches.
@@ -90,130 +217,184 @@ class ChatBatchProcessor:
             session_id: Optional session to filter by
             missing_vectors_only: Only process messages without Qdrant point IDs
             qdrant_service: ChatQdrantService instance for vector operations
-            
+            resume: Continue from the checkpoint of an earlier run (False starts over)
+
         Returns:
             BatchProcessingResult with operation statistics
         """
+        return await self._run_pipeline(
+            operation="vectors",
+            description="Generating vectors",
+            session_id=session_id,
+            missing_only=missing_vectors_only,
+            qdrant_service=qdrant_service,
+            resume=resume,
+        )
+
+    async def batch_upload_to_qdrant(
+        self,
+        session_id: Optional[str] = None,
+        qdrant_service: Optional[ChatQdrantService] = None,
+        resume: bool = True
+    ) -> BatchProcessingResult:
+        """
+        Upload chat messages without a Qdrant point ID in batches.
+
+        Args:
+            session_id: Optional session to filter by
+            qdrant_service: ChatQdrantService instance for uploads
+            resume: Continue from the checkpoint of an earlier run (False starts over)
+
+        Returns:
+            BatchProcessingResult with operation statistics
+        """
+        return await self._run_pipeline(
+            operation="upload",
+            description="Uploading to Qdrant",
+            session_id=session_id,
+            missing_only=True,
+            qdrant_service=qdrant_service,
+            resume=resume,
+        )
+
+    async def get_batch_progress(self, batch_id: str) -> Optional[BatchProcessingProgress]:
+        """Get progress information for an active batch operation."""
+        return self._active_batches.get(batch_id)
+
+    def get_active_batches(self) -> List[BatchProcessingProgress]:
+        """Get all currently active batch operations."""
+        return list(self._active_batches.values())
+
+    async def _run_pipeline(
+        self,
+        operation: str,
+        description: str,
+        session_id: Optional[str],
+        missing_only: bool,
+        qdrant_service: Optional[ChatQdrantService],
+        resume: bool
+    ) -> BatchProcessingResult:
+        """Read, embed, upload and checkpoint messages with bounded concurrency."""
         batch_id = str(uuid.uuid4())
         start_time = datetime.now(timezone.utc)
+        resumed = False
 
         try:
             qdrant_service = self._require_qdrant_service(qdrant_service)
 
-            async with AsyncSessionLocal() as db_session:
-                total_messages = await self._count_messages_for_vector_processing(
-                    db_session,
-                    session_id,
-                    missing_vectors_only,
-                )
-
-                if not total_messages:
-                    log.info("No messages found for vector processing")
-                    return BatchProcessingResult(
-                        total_processed=0,
-                        successful=0,
-                        failed=0,
-                        errors=[],
-                        duration_seconds=0.0,
-                        batch_id=batch_id,
-                    )
-
-                target_total = self._apply_max_guard(total_messages, "Vector generation")
-
-                if target_total == 0:
-                    log.info("Vector generation skipped due to max results guard")
-                    return BatchProcessingResult(
-                        total_processed=0,
-                        successful=0,
-                        failed=0,
-                        errors=[],
-                        duration_seconds=0.0,
-                        batch_id=batch_id,
-                    )
-
-                progress = BatchProcessingProgress(
-                    batch_id=batch_id,
-                    total_items=target_total,
-                    processed_items=0,
-                    current_batch=0,
-                    total_batches=max(1, (target_total + self.batch_size - 1) // self.batch_size),
-                    start_time=start_time,
-                    current_operation="Generating vectors",
-                )
-                self._active_batches[batch_id] = progress
-
-                successful = 0
-                failed = 0
-                errors: List[str] = []
-                processed_items = 0
-                batch_index = 0
-
-                async for batch in self._get_messages_for_vector_processing(
-                    db_session,
-                    session_id,
-                    missing_vectors_only,
-                    chunk_size=self.batch_size,
-                    max_results=target_total,
-                ):
-                    if not batch:
-                        continue
+            checkpoint_path = self._checkpoint_path(operation, session_id)
+            options = {"operation": operation, "session_id": session_id, "missing_only": missing_only}
+            checkpoint = self._load_checkpoint(checkpoint_path, options) if resume else None
+            after_id = checkpoint["last_id"] if checkpoint else 0
+            resumed = checkpoint is not None
+            if resumed:
+                log.info(f"{description}: resuming after message ID {after_id}")
 
-                    batch_index += 1
-                    progress.current_batch = batch_index
-
-                    semaphore = asyncio.Semaphore(self.max_concurrent)
-                    tasks = [
-                        self._process_message_vector(message, qdrant_service, semaphore)
-                        for message in batch
-                    ]
+            filters = self._build_message_filters(session_id, missing_only)
+            async with AsyncSessionLocal() as db_session:
+                total_messages = await self._count_messages(db_session, filters, after_id)
 
-                    batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+            if not total_messages:
+                log.info(f"{description}: no messages to process")
+                self._clear_checkpoint(checkpoint_path)
+                return self._empty_result(batch_id, resumed)
 
-                    for message_obj, result in zip(batch, batch_results):
-                        if isinstance(result, Exception):
-                            failed += 1
-                            errors.append(f"Message {message_obj.message_id}: {str(result)}")
-                        elif result:
-                            successful += 1
-                        else:
-                            failed += 1
-                            errors.append(f"Message {message_obj.message_id}: Unknown error")
+            target_total = self._apply_max_guard(total_messages, description)
+            if target_total == 0:
+                log.info(f"{description} skipped due to max results guard")
+                return self._empty_result(batch_id, resumed)
 
-                    processed_items += len(batch)
-                    progress.processed_items = min(processed_items, target_total)
+            progress = BatchProcessingProgress(
+                batch_id=batch_id,
+                total_items=target_total,
+                processed_items=0,
+                current_batch=0,
+                total_batches=max(1, (target_total + self.batch_size - 1) // self.batch_size),
+                start_time=start_time,
+                current_operation=description,
+            )
+            self._active_batches[batch_id] = progress
+
+            throttle = self._build_throttle(qdrant_service)
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrent)
+            # Batches in read order, and those done; the checkpoint advances over the done prefix
+            read_batches: deque = deque()
+            done_batches = set()
+            counts = {"successful": 0, "failed": 0}
+            errors: List[str] = []
+
+            async def read_messages():
+                cursor, remaining, index = after_id, target_total, 0
+                while remaining > 0:
+                    async with AsyncSessionLocal() as db_session:
+                        batch = await self._fetch_batch(db_session, filters, cursor, min(self.batch_size, remaining))
+                    if not batch:
+                        break
+                    index += 1
+                    cursor = batch[-1].id
+                    remaining -= len(batch)
+                    read_batches.append((index, cursor))
+                    await queue.put((index, batch))
+                for _ in range(self.max_concurrent):
+                    await queue.put(None)
+
+            async def process_batches():
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        return
+                    index, batch = item
+                    async with throttle.slot():
+                        successful = await self._process_batch(batch, qdrant_service, errors)
+
+                    counts["successful"] += successful
+                    counts["failed"] += len(batch) - successful
+                    progress.current_batch += 1
+                    progress.processed_items += len(batch)
+                    progress.estimated_completion = self._estimate_completion(progress)
+                    self._advance_checkpoint(index, read_batches, done_batches, checkpoint_path, options)
 
                     if self.progress_callback:
                         self.progress_callback(progress)
-
                     log.info(
-                        "Processed batch %d/%d for vector generation",
+                        "Processed batch %d/%d (%s)",
                         progress.current_batch,
                         progress.total_batches,
+                        description.lower(),
                     )
+                    await throttle.observe()
 
-                    if processed_items >= target_total:
-                        break
+            tasks = [asyncio.create_task(read_messages())]
+            tasks += [asyncio.create_task(process_batches()) for _ in range(self.max_concurrent)]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
 
-            duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+            if target_total == total_messages:
+                self._clear_checkpoint(checkpoint_path)
 
             result = BatchProcessingResult(
-                total_processed=processed_items,
-                successful=successful,
-                failed=failed,
+                total_processed=progress.processed_items,
+                successful=counts["successful"],
+                failed=counts["failed"],
                 errors=errors,
-                duration_seconds=duration,
+                duration_seconds=(datetime.now(timezone.utc) - start_time).total_seconds(),
                 batch_id=batch_id,
+                resumed_from_checkpoint=resumed,
             )
-
             log.info(
-                "Batch vector generation completed: %d/%d successful",
-                successful,
-                processed_items,
+                "%s completed: %d/%d successful",
+                description,
+                result.successful,
+                result.total_processed,
             )
             return result
 
         except Exception as e:
-            log.error(f"Batch vector generation failed: {e}")
+            log.error(f"{description} failed: {e}")
             duration = (datetime.now(timezone.utc) - start_time).total_seconds()
             return BatchProcessingResult(
                 total_processed=0,
@@ -221,165 +402,149 @@ class ChatBatchProcessor:
                 failed=1,
                 errors=[str(e)],
                 duration_seconds=duration,
-                batch_id=batch_id
+                batch_id=batch_id,
+                resumed_from_checkpoint=resumed,
             )
         finally:
             # Clean up progress tracking
             self._active_batches.pop(batch_id, None)
-    
-    async def batch_upload_to_qdrant(
+
+    async def _process_batch(
         self,
-        session_id: Optional[str] = None,
-        qdrant_service: Optional[ChatQdrantService] = None
-    ) -> BatchProcessingResult:
-        """
-        Upload chat messages to Qdrant in batches.
-        
-        Args:
-            session_id: Optional session to filter by
-            qdrant_service: ChatQdrantService instance for uploads
-            
-        Returns:
-            BatchProcessingResult with operation statistics
-        """
-        batch_id = str(uuid.uuid4())
-        start_time = datetime.now(timezone.utc)
-        
+        batch: List[ChatMessage],
+        qdrant_service: ChatQdrantService,
+        errors: List[str]
+    ) -> int:
+        """Embed and upload a batch, then store each message's first point ID; returns successes."""
         try:
-            qdrant_service = self._require_qdrant_service(qdrant_service)
+            uploaded = await qdrant_service.batch_upload_messages(batch)
+        except Exception as e:
+            log.error(f"Failed to upload a batch of {len(batch)} messages: {e}")
+            self._record_errors(errors, [f"Message {m.message_id}: {e}" for m in batch])
+            return 0
+
+        stored = [
+            {"id": message.id, "qdrant_point_id": uploaded[message.message_id][0]}
+            for message in batch if uploaded.get(message.message_id)
+        ]
+        self._record_errors(errors, [
+            f"Message {message.message_id}: Upload failed"
+            for message in batch if not uploaded.get(message.message_id)
+        ])
+        if not stored:
+            return 0
 
+        try:
             async with AsyncSessionLocal() as db_session:
-                total_messages = await self._count_messages_for_qdrant_upload(
-                    db_session,
-                    session_id,
-                )
-
-                if not total_messages:
-                    log.info("No messages found for Qdrant upload")
-                    return BatchProcessingResult(
-                        total_processed=0,
-                        successful=0,
-                        failed=0,
-                        errors=[],
-                        duration_seconds=0.0,
-                        batch_id=batch_id,
-                    )
-
-                target_total = self._apply_max_guard(total_messages, "Qdrant upload")
-
-                if target_total == 0:
-                    log.info("Qdrant upload skipped due to max results guard")
-                    return BatchProcessingResult(
-                        total_processed=0,
-                        successful=0,
-                        failed=0,
-                        errors=[],
-                        duration_seconds=0.0,
-                        batch_id=batch_id,
-                    )
-
-                progress = BatchProcessingProgress(
-                    batch_id=batch_id,
-                    total_items=target_total,
-                    processed_items=0,
-                    current_batch=0,
-                    total_batches=max(1, (target_total + self.batch_size - 1) // self.batch_size),
-                    start_time=start_time,
-                    current_operation="Uploading to Qdrant",
-                )
-                self._active_batches[batch_id] = progress
-
-                successful = 0
-                failed = 0
-                errors: List[str] = []
-                processed_items = 0
-                batch_index = 0
-
-                async for batch in self._get_messages_for_qdrant_upload(
-                    db_session,
-                    session_id,
-                    chunk_size=self.batch_size,
-                    max_results=target_total,
-                ):
-                    if not batch:
-                        continue
-
-                    batch_index += 1
-                    progress.current_batch = batch_index
-
-                    semaphore = asyncio.Semaphore(self.max_concurrent)
-                    tasks = [
-                        self._upload_message_to_qdrant(message, qdrant_service, semaphore)
-                        for message in batch
-                    ]
+                await db_session.execute(update(ChatMessage), stored)
+                await db_session.commit()
+        except Exception as db_error:
+            log.error(f"Failed to persist Qdrant points for {len(stored)} messages: {db_error}")
+            self._record_errors(errors, [f"Message ID {row['id']}: {db_error}" for row in stored])
+            return 0
+        return len(stored)
 
-                    batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+    @staticmethod
+    def _record_errors(errors: List[str], new_errors: List[str]) -> None:
+        """Keep the first MAX_REPORTED_ERRORS errors; the failed count stays exact."""
+        errors.extend(new_errors[:max(0, MAX_REPORTED_ERRORS - len(errors))])
 
-                    for message_obj, result in zip(batch, batch_results):
-                        if isinstance(result, Exception):
-                            failed += 1
-                            errors.append(f"Message {message_obj.message_id}: {str(result)}")
-                        elif result:
-                            successful += 1
-                        else:
-                            failed += 1
-                            errors.append(f"Message {message_obj.message_id}: Upload failed")
+    def _advance_checkpoint(
+        self,
+        index: int,
+        read_batches: deque,
+        done_batches: set,
+        checkpoint_path: Optional[Path],
+        options: Dict[str, Any]
+    ) -> None:
+        """Mark a batch done and persist the cursor past every batch done so far in read order."""
+        done_batches.add(index)
+        last_id = None
+        while read_batches and read_batches[0][0] in done_batches:
+            done_index, last_id = read_batches.popleft()
+            done_batches.discard(done_index)
+        if last_id is not None:
+            self._save_checkpoint(checkpoint_path, {
+                "options": options,
+                "last_id": last_id,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            })
 
-                    processed_items += len(batch)
-                    progress.processed_items = min(processed_items, target_total)
+    @staticmethod
+    def _estimate_completion(progress: BatchProcessingProgress) -> Optional[datetime]:
+        if not progress.processed_items:
+            return None
+        now = datetime.now(timezone.utc)
+        per_item = (now - progress.start_time) / progress.processed_items
+        return now + per_item * max(0, progress.total_items - progress.processed_items)
+
+    def _build_throttle(self, qdrant_service: ChatQdrantService) -> AdaptiveThrottle:
+        if self.target_latency_ms is None:
+            return AdaptiveThrottle(self.max_concurrent, float("inf"))
+
+        async def probe_qdrant() -> float:
+            start = time.perf_counter()
+            await qdrant_service.qclient.get_collections()
+            return time.perf_counter() - start
+
+        return AdaptiveThrottle(
+            self.max_concurrent,
+            self.target_latency_ms / 1000,
+            probe=self.latency_probe or probe_qdrant,
+        )
+
+    def _checkpoint_path(self, operation: str, session_id: Optional[str]) -> Optional[Path]:
+        """Checkpoint file of an operation, per session when filtered by one."""
+        if self.checkpoint_dir is None:
+            return None
+        name = f"{operation}-{session_id}" if session_id else operation
+        return self.checkpoint_dir / f"{name}.checkpoint.json"
 
-                    if self.progress_callback:
-                        self.progress_callback(progress)
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: Optional[Path], options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Load a checkpoint if it exists and was written with the same options."""
+        if checkpoint_path is None or not checkpoint_path.exists():
+            return None
 
-                    log.info(
-                        "Processed batch %d/%d for Qdrant upload",
-                        progress.current_batch,
-                        progress.total_batches,
-                    )
+        try:
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable batch checkpoint {checkpoint_path}: {e}")
+            return None
 
-                    if processed_items >= target_total:
-                        break
+        if checkpoint.get("options") != options or not isinstance(checkpoint.get("last_id"), int):
+            log.info(f"Ignoring batch checkpoint {checkpoint_path} written with different options")
+            return None
 
-            duration = (datetime.now(timezone.utc) - start_time).total_seconds()
+        return checkpoint
 
-            result = BatchProcessingResult(
-                total_processed=processed_items,
-                successful=successful,
-                failed=failed,
-                errors=errors,
-                duration_seconds=duration,
-                batch_id=batch_id,
-            )
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: Optional[Path], state: Dict[str, Any]) -> None:
+        """Persist the keyset cursor atomically; a failed write only costs rework on resume."""
+        if checkpoint_path is None:
+            return
+        try:
+            atomic_write_json(state, checkpoint_path)
+        except OSError as e:
+            log.warning(f"Failed to write batch checkpoint {checkpoint_path}: {e}")
 
-            log.info(
-                "Batch Qdrant upload completed: %d/%d successful",
-                successful,
-                processed_items,
-            )
-            return result
+    @staticmethod
+    def _clear_checkpoint(checkpoint_path: Optional[Path]) -> None:
+        if checkpoint_path is not None:
+            checkpoint_path.unlink(missing_ok=True)
 
-        except Exception as e:
-            log.error(f"Batch Qdrant upload failed: {e}")
-            duration = (datetime.now(timezone.utc) - start_time).total_seconds()
-            return BatchProcessingResult(
-                total_processed=0,
-                successful=0,
-                failed=1,
-                errors=[str(e)],
-                duration_seconds=duration,
-                batch_id=batch_id
-            )
-        finally:
-            # Clean up progress tracking
-            self._active_batches.pop(batch_id, None)
-    
-    async def get_batch_progress(self, batch_id: str) -> Optional[BatchProcessingProgress]:
-        """Get progress information for an active batch operation."""
-        return self._active_batches.get(batch_id)
-    
-    def get_active_batches(self) -> List[BatchProcessingProgress]:
-        """Get all currently active batch operations."""
-        return list(self._active_batches.values())
+    @staticmethod
+    def _empty_result(batch_id: str, resumed: bool) -> BatchProcessingResult:
+        return BatchProcessingResult(
+            total_processed=0,
+            successful=0,
+            failed=0,
+            errors=[],
+            duration_seconds=0.0,
+            batch_id=batch_id,
+            resumed_from_checkpoint=resumed,
+        )
 
     @staticmethod
     def _require_qdrant_service(qdrant_service: Optional[ChatQdrantService]) -> ChatQdrantService:
@@ -413,180 +578,29 @@ class ChatBatchProcessor:
             return self.max_results_guard
         return total
 
-    async def _stream_chat_messages(
-        self,
-        db_session: AsyncSession,
-        statement,
-        chunk_size: int,
-        max_results: Optional[int] = None
-    ) -> AsyncGenerator[List[ChatMessage], None]:
-        """Stream chat messages in bounded chunks to avoid large memory usage."""
-        statement = statement.execution_options(stream_results=True)
-        stream = await db_session.stream_scalars(statement)
-        processed = 0
-        chunk: List[ChatMessage] = []
-
-        try:
-            async for message in stream:
-                if max_results is not None and processed >= max_results:
-                    break
-
-                chunk.append(message)
-                processed += 1
-
-                if len(chunk) >= chunk_size:
-                    yield chunk
-                    chunk = []
-
-            if chunk and (max_results is None or processed <= max_results):
-                yield chunk
-        finally:
-            await stream.close()
-
-    async def _count_messages_for_vector_processing(
-        self,
-        db_session: AsyncSession,
-        session_id: Optional[str],
-        missing_vectors_only: bool
-    ) -> int:
-        """Count messages eligible for vector processing."""
-        filters = self._build_message_filters(session_id, missing_vectors_only)
-        count_stmt = select(func.count(ChatMessage.id))
-        if filters:
-            count_stmt = count_stmt.where(*filters)
+    @staticmethod
+    async def _count_messages(db_session: AsyncSession, filters: List[Any], after_id: int) -> int:
+        """Count messages matching the filters after the keyset cursor."""
+        count_stmt = select(func.count(ChatMessage.id)).where(ChatMessage.id > after_id, *filters)
         result = await db_session.execute(count_stmt)
         return int(result.scalar_one() or 0)
 
-    async def _count_messages_for_qdrant_upload(
-        self,
+    @staticmethod
+    async def _fetch_batch(
         db_session: AsyncSession,
-        session_id: Optional[str]
-    ) -> int:
-        """Count messages missing a Qdrant point ID."""
-        filters = self._build_message_filters(session_id, True)
-        count_stmt = select(func.count(ChatMessage.id))
-        if filters:
-            count_stmt = count_stmt.where(*filters)
-        result = await db_session.execute(count_stmt)
-        return int(result.scalar_one() or 0)
-
-    async def _get_messages_for_vector_processing(
-        self,
-        db_session: AsyncSession,
-        session_id: Optional[str],
-        missing_vectors_only: bool,
-        chunk_size: Optional[int] = None,
-        max_results: Optional[int] = None
-    ) -> AsyncGenerator[List[ChatMessage], None]:
-        """Stream messages that need vector processing in bounded chunks."""
-        statement = select(ChatMessage)
-        filters = self._build_message_filters(session_id, missing_vectors_only)
-
-        if filters:
-            statement = statement.where(*filters)
-
-        # Order by creation time for consistent processing
-        statement = statement.order_by(ChatMessage.created_at.asc())
-
-        effective_chunk_size = chunk_size or self.batch_size
-        async for chunk in self._stream_chat_messages(
-            db_session,
-            statement,
-            effective_chunk_size,
-            max_results=max_results,
-        ):
-            yield chunk
-    
-    async def _get_messages_for_qdrant_upload(
-        self,
-        db_session: AsyncSession,
-        session_id: Optional[str],
-        chunk_size: Optional[int] = None,
-        max_results: Optional[int] = None
-    ) -> AsyncGenerator[List[ChatMessage], None]:
-        """Stream messages that need Qdrant upload (no point ID yet)."""
-        statement = select(ChatMessage)
-        filters = self._build_message_filters(session_id, True)
-
-        if filters:
-            statement = statement.where(*filters)
-
-        statement = statement.order_by(ChatMessage.created_at.asc())
-
-        effective_chunk_size = chunk_size or self.batch_size
-        async for chunk in self._stream_chat_messages(
-            db_session,
-            statement,
-            effective_chunk_size,
-            max_results=max_results,
-        ):
-            yield chunk
-    
-    async def _process_message_vector(
-        self,
-        message: ChatMessage,
-        qdrant_service: Optional[ChatQdrantService],
-        semaphore: asyncio.Semaphore
-    ) -> bool:
-        """Process vector generation for a single message."""
-        service = self._require_qdrant_service(qdrant_service)
-
-        try:
-            async with semaphore:
-                point_id = await service.upload_message_to_qdrant(message)
-        except Exception as e:
-            log.error(f"Error processing vector for message {message.message_id}: {e}")
-            return False
-
-        if not point_id:
-            return False
-
-        try:
-            async with AsyncSessionLocal() as db_session:
-                db_message = await db_session.get(ChatMessage, message.id)
-                if db_message:
-                    db_message.qdrant_point_id = point_id
-                    db_session.add(db_message)
-                    await db_session.commit()
-            return True
-        except Exception as db_error:
-            log.error(
-                f"Failed to persist Qdrant point for message {message.message_id}: {db_error}"
-            )
-            return False
-    
-    async def _upload_message_to_qdrant(
-        self,
-        message: ChatMessage,
-        qdrant_service: Optional[ChatQdrantService],
-        semaphore: asyncio.Semaphore
-    ) -> bool:
-        """Upload a single message to Qdrant."""
-        service = self._require_qdrant_service(qdrant_service)
-
-        try:
-            async with semaphore:
-                point_id = await service.upload_message_to_qdrant(message)
-        except Exception as e:
-            log.error(f"Error uploading message {message.message_id} to Qdrant: {e}")
-            return False
-
-        if not point_id:
-            return False
-
-        try:
-            async with AsyncSessionLocal() as db_session:
-                db_message = await db_session.get(ChatMessage, message.id)
-                if db_message:
-                    db_message.qdrant_point_id = point_id
-                    db_session.add(db_message)
-                    await db_session.commit()
-            return True
-        except Exception as db_error:
-            log.error(
-                f"Failed to persist Qdrant point for message {message.message_id}: {db_error}"
-            )
-            return False
+        filters: List[Any],
+        after_id: int,
+        limit: int
+    ) -> List[ChatMessage]:
+        """Next page of messages by ID after the keyset cursor."""
+        statement = (
+            select(ChatMessage)
+            .where(ChatMessage.id > after_id, *filters)
+            .order_by(ChatMessage.id)
+            .limit(limit)
+        )
+        result = await db_session.execute(statement)
+        return list(result.scalars().all())
 
 
 async def batch_process_chat_vectors(
@@ -594,18 +608,22 @@ async def batch_process_chat_vectors(
     batch_size: int = 100,
     max_concurrent: int = 5,
     qdrant_service: Optional[ChatQdrantService] = None,
-    progress_callback: Optional[Callable[[BatchProcessingProgress], None]] = None
+    progress_callback: Optional[Callable[[BatchProcessingProgress], None]] = None,
+    resume: bool = True,
+    **processor_options: Any
 ) -> BatchProcessingResult:
     """
     Convenience function for batch vector processing.
-    
+
     Args:
         session_id: Optional session to filter by
         batch_size: Number of items per batch
-        max_concurrent: Maximum concurrent operations
+        max_concurrent: Maximum batches in flight
         qdrant_service: ChatQdrantService instance required for vector processing
         progress_callback: Optional progress callback
-        
+        resume: Continue from the checkpoint of an earlier run
+        **processor_options: Further ChatBatchProcessor options (checkpoint_dir, target_latency_ms, ...)
+
     Returns:
         BatchProcessingResult with operation statistics
     """
@@ -615,12 +633,14 @@ async def batch_process_chat_vectors(
     processor = ChatBatchProcessor(
         batch_size=batch_size,
         max_concurrent=max_concurrent,
-        progress_callback=progress_callback
+        progress_callback=progress_callback,
+        **processor_options
     )
     return await processor.batch_generate_vectors(
         session_id=session_id,
         missing_vectors_only=True,
-        qdrant_service=qdrant_service
+        qdrant_service=qdrant_service,
+        resume=resume
     )
 
 
@@ -629,18 +649,22 @@ async def batch_upload_to_qdrant(
     batch_size: int = 100,
     max_concurrent: int = 5,
     qdrant_service: Optional[ChatQdrantService] = None,
-    progress_callback: Optional[Callable[[BatchProcessingProgress], None]] = None
+    progress_callback: Optional[Callable[[BatchProcessingProgress], None]] = None,
+    resume: bool = True,
+    **processor_options: Any
 ) -> BatchProcessingResult:
     """
     Convenience function for batch Qdrant upload.
-    
+
     Args:
         session_id: Optional session to filter by
         batch_size: Number of items per batch
-        max_concurrent: Maximum concurrent operations
+        max_concurrent: Maximum batches in flight
         qdrant_service: ChatQdrantService instance required for uploads
         progress_callback: Optional progress callback
-        
+        resume: Continue from the checkpoint of an earlier run
+        **processor_options: Further ChatBatchProcessor options (checkpoint_dir, target_latency_ms, ...)
+
     Returns:
         BatchProcessingResult with operation statistics
     """
@@ -650,9 +674,11 @@ async def batch_upload_to_qdrant(
     processor = ChatBatchProcessor(
         batch_size=batch_size,
         max_concurrent=max_concurrent,
-        progress_callback=progress_callback
+        progress_callback=progress_callback,
+        **processor_options
     )
     return await processor.batch_upload_to_qdrant(
         session_id=session_id,
-        qdrant_service=qdrant_service
+        qdrant_service=qdrant_service,
+        resume=resume
     )
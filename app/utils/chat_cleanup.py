@@ -6,10 +6,12 @@ and maintaining database health with configurable retention policies.
 """
 
 import asyncio
+import time
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, AsyncGenerator
 from dataclasses import dataclass
-from sqlmodel import select, and_, func, delete
+from sqlmodel import select, func, delete
+from sqlalchemy import distinct, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.db_models import ChatMessage, ChatConversation
@@ -28,6 +30,14 @@ class CleanupResult:
     errors: List[str]
     duration_seconds: float
     cleanup_id: str
+    batches_processed: int = 0
+    
+    @property
+    def rows_per_second(self) -> float:
+        """Database rows deleted per second over the whole operation."""
+        if self.duration_seconds <= 0:
+            return 0.0
+        return (self.conversations_deleted + self.messages_deleted) / self.duration_seconds
 
 
 @dataclass
@@ -72,6 +82,9 @@ class ChatCleanupUtility:
         """
         Clean up expired chat sessions based on age or specific session IDs.
         
+        Sessions are processed in batches of ``cleanup_batch_size``; each batch
+        is removed with set-based deletes in its own short transaction.
+        
         Args:
             cutoff_date: Optional cutoff date (defaults to retention policy)
             session_ids: Optional specific session IDs to clean up
@@ -89,34 +102,31 @@ class ChatCleanupUtility:
             conversations_deleted = 0
             messages_deleted = 0
             qdrant_points_deleted = 0
+            batches_processed = 0
             errors = []
             
+            if session_ids:
+                log.info(f"Cleaning up {len(session_ids)} specific sessions")
+            
             async with AsyncSessionLocal() as db_session:
-                # Find sessions to clean up
-                if session_ids:
-                    # Clean up specific sessions
-                    sessions_to_cleanup = session_ids
-                    log.info(f"Cleaning up {len(session_ids)} specific sessions")
-                else:
-                    # Find expired sessions
-                    sessions_to_cleanup = await self._find_expired_sessions(db_session, cutoff_date)
-                    log.info(f"Found {len(sessions_to_cleanup)} expired sessions to clean up")
-                
-                # Process sessions in batches
-                for i in range(0, len(sessions_to_cleanup), self.retention_policy.cleanup_batch_size):
-                    batch = sessions_to_cleanup[i:i + self.retention_policy.cleanup_batch_size]
+                async for batch in self._iter_session_batches(db_session, cutoff_date, session_ids):
+                    batches_processed += 1
+                    batch_start = time.monotonic()
                     
                     try:
-                        batch_result = await self._cleanup_session_batch(db_session, batch)
+                        batch_result = await self._cleanup_session_batch(db_session, batch, errors)
                         conversations_deleted += batch_result[0]
                         messages_deleted += batch_result[1]
                         qdrant_points_deleted += batch_result[2]
                         
-                        log.info(f"Cleaned up batch {i//self.retention_policy.cleanup_batch_size + 1}: "
-                                f"{batch_result[1]} messages, {batch_result[0]} conversations")
+                        self._log_batch_throughput(
+                            "expired sessions", batches_processed, len(batch),
+                            batch_result, time.monotonic() - batch_start
+                        )
                         
                     except Exception as e:
-                        error_msg = f"Error cleaning up batch {i//self.retention_policy.cleanup_batch_size + 1}: {e}"
+                        await db_session.rollback()
+                        error_msg = f"Error cleaning up batch {batches_processed}: {e}"
                         errors.append(error_msg)
                         log.error(error_msg)
             
@@ -129,11 +139,13 @@ class ChatCleanupUtility:
                 qdrant_points_deleted=qdrant_points_deleted,
                 errors=errors,
                 duration_seconds=duration,
-                cleanup_id=cleanup_id
+                cleanup_id=cleanup_id,
+                batches_processed=batches_processed
             )
             
             log.info(f"Expired sessions cleanup completed: {conversations_deleted} conversations, "
-                    f"{messages_deleted} messages deleted in {duration:.2f}s")
+                    f"{messages_deleted} messages deleted in {duration:.2f}s "
+                    f"({result.rows_per_second:.0f} rows/s)")
             
             return result
             
@@ -164,6 +176,7 @@ class ChatCleanupUtility:
             conversations_deleted = 0
             messages_deleted = 0
             qdrant_points_deleted = 0
+            batches_processed = 0
             errors = []
             
             async with AsyncSessionLocal() as db_session:
@@ -177,20 +190,28 @@ class ChatCleanupUtility:
                         # Clean up excess messages (keep most recent)
                         if message_count > self.retention_policy.max_messages_per_session:
                             excess_messages = message_count - self.retention_policy.max_messages_per_session
-                            deleted_messages = await self._cleanup_excess_messages(
-                                db_session, session_id, excess_messages
+                            deleted_messages, deleted_points, batches = await self._cleanup_excess_messages(
+                                db_session, session_id, excess_messages, errors
                             )
                             messages_deleted += deleted_messages
+                            qdrant_points_deleted += deleted_points
+                            batches_processed += batches
                         
                         # Clean up excess conversations (keep most recent)
                         if conversation_count > self.retention_policy.max_conversations_per_session:
                             excess_conversations = conversation_count - self.retention_policy.max_conversations_per_session
-                            deleted_conversations = await self._cleanup_excess_conversations(
-                                db_session, session_id, excess_conversations
+                            deleted_conversations, deleted_messages, deleted_points, batches = (
+                                await self._cleanup_excess_conversations(
+                                    db_session, session_id, excess_conversations, errors
+                                )
                             )
                             conversations_deleted += deleted_conversations
+                            messages_deleted += deleted_messages
+                            qdrant_points_deleted += deleted_points
+                            batches_processed += batches
                         
                     except Exception as e:
+                        await db_session.rollback()
                         error_msg = f"Error cleaning up oversized session {session_id}: {e}"
                         errors.append(error_msg)
                         log.error(error_msg)
@@ -204,11 +225,13 @@ class ChatCleanupUtility:
                 qdrant_points_deleted=qdrant_points_deleted,
                 errors=errors,
                 duration_seconds=duration,
-                cleanup_id=cleanup_id
+                cleanup_id=cleanup_id,
+                batches_processed=batches_processed
             )
             
             log.info(f"Oversized sessions cleanup completed: {conversations_deleted} conversations, "
-                    f"{messages_deleted} messages deleted in {duration:.2f}s")
+                    f"{messages_deleted} messages deleted in {duration:.2f}s "
+                    f"({result.rows_per_second:.0f} rows/s)")
             
             return result
             
@@ -229,65 +252,82 @@ class ChatCleanupUtility:
         """
         Clean up orphaned data (messages without conversations, etc.).
         
+        Orphans are removed with chunked ``DELETE ... WHERE NOT EXISTS``
+        statements; deleted message IDs come back via ``RETURNING`` and are
+        used to remove every Qdrant chunk of those messages.
+        
         Returns:
             CleanupResult with cleanup statistics
         """
         cleanup_id = f"orphaned_data_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
         start_time = datetime.now(timezone.utc)
+        batch_size = self.retention_policy.cleanup_batch_size
         
         try:
             conversations_deleted = 0
             messages_deleted = 0
             qdrant_points_deleted = 0
+            batches_processed = 0
             errors = []
             
             async with AsyncSessionLocal() as db_session:
-                # Find orphaned messages (messages without valid conversations)
-                orphaned_messages = await self._find_orphaned_messages(db_session)
-                
-                if orphaned_messages:
-                    log.info(f"Found {len(orphaned_messages)} orphaned messages")
-                    
-                    # Collect Qdrant point IDs for cleanup
-                    qdrant_point_ids = [
-                        msg.qdrant_point_id for msg in orphaned_messages 
-                        if msg.qdrant_point_id
-                    ]
+                # Delete orphaned messages (messages without valid conversations)
+                while True:
+                    batch_start = time.monotonic()
+                    orphaned_ids = (
+                        select(ChatMessage.id)
+                        .where(self._orphaned_message_condition())
+                        .limit(batch_size)
+                    )
+                    message_ids = await self._delete_returning_message_ids(
+                        db_session, delete(ChatMessage).where(ChatMessage.id.in_(orphaned_ids))
+                    )
+                    if not message_ids:
+                        break
                     
-                    # Delete orphaned messages in bulk
-                    message_ids = [message.id for message in orphaned_messages]
-                    if message_ids:
-                        delete_stmt = delete(ChatMessage).where(ChatMessage.id.in_(message_ids))
-                        result = await db_session.execute(delete_stmt)
-                        deleted_count = result.rowcount
-                        if deleted_count is None or deleted_count < 0:
-                            deleted_count = len(message_ids)
-                        messages_deleted += deleted_count
-                        await db_session.commit()
+                    batches_processed += 1
+                    messages_deleted += len(message_ids)
                     
                     # Clean up corresponding Qdrant points
-                    if self.qdrant_service and qdrant_point_ids:
-                        try:
-                            deleted_points = await self._cleanup_qdrant_points(qdrant_point_ids)
-                            qdrant_points_deleted += deleted_points
-                        except Exception as e:
-                            errors.append(f"Qdrant cleanup error: {e}")
-                
-                # Find empty conversations (conversations without messages)
-                empty_conversations = await self._find_empty_conversations(db_session)
+                    deleted_points = 0
+                    if self.retention_policy.qdrant_cleanup:
+                        deleted_points = await self._cleanup_qdrant_points(errors, message_ids=message_ids)
+                        qdrant_points_deleted += deleted_points
+                    
+                    self._log_batch_throughput(
+                        "orphaned messages", batches_processed, len(message_ids),
+                        (0, len(message_ids), deleted_points), time.monotonic() - batch_start
+                    )
+                    
+                    if len(message_ids) < batch_size:
+                        break
                 
-                if empty_conversations:
-                    log.info(f"Found {len(empty_conversations)} empty conversations")
+                # Delete empty conversations (conversations without messages)
+                while True:
+                    empty_ids = (
+                        select(ChatConversation.id)
+                        .where(self._empty_conversation_condition())
+                        .limit(batch_size)
+                    )
+                    result = await db_session.execute(
+                        delete(ChatConversation)
+                        .where(ChatConversation.id.in_(empty_ids))
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db_session.commit()
                     
-                    conversation_ids = [conversation.id for conversation in empty_conversations]
-                    if conversation_ids:
-                        delete_stmt = delete(ChatConversation).where(ChatConversation.id.in_(conversation_ids))
-                        result = await db_session.execute(delete_stmt)
-                        deleted_count = result.rowcount
-                        if deleted_count is None or deleted_count < 0:
-                            deleted_count = len(conversation_ids)
-                        conversations_deleted += deleted_count
-                        await db_session.commit()
+                    deleted_count = result.rowcount or 0
+                    if deleted_count <= 0:
+                        break
+                    
+                    batches_processed += 1
+                    conversations_deleted += deleted_count
+                    
+                    if deleted_count < batch_size:
+                        break
+            
+            if conversations_deleted:
+                log.info(f"Deleted {conversations_deleted} empty conversations")
             
             duration = (datetime.now(timezone.utc) - start_time).total_seconds()
             
@@ -298,7 +338,8 @@ class ChatCleanupUtility:
                 qdrant_points_deleted=qdrant_points_deleted,
                 errors=errors,
                 duration_seconds=duration,
-                cleanup_id=cleanup_id
+                cleanup_id=cleanup_id,
+                batches_processed=batches_processed
             )
             
             log.info(f"Orphaned data cleanup completed: {conversations_deleted} conversations, "
@@ -331,14 +372,24 @@ class ChatCleanupUtility:
                 cutoff_date = datetime.now(timezone.utc) - timedelta(days=self.retention_policy.max_age_days)
                 
                 # Count expired sessions
-                expired_sessions = await self._find_expired_sessions(db_session, cutoff_date)
+                expired_sessions_stmt = (
+                    select(func.count(distinct(ChatConversation.session_id)))
+                    .where(ChatConversation.updated_at < cutoff_date)
+                )
+                expired_sessions = (await db_session.execute(expired_sessions_stmt)).scalar() or 0
                 
                 # Count oversized sessions
                 oversized_sessions = await self._find_oversized_sessions(db_session)
                 
                 # Count orphaned data
-                orphaned_messages = await self._find_orphaned_messages(db_session)
-                empty_conversations = await self._find_empty_conversations(db_session)
+                orphaned_messages_stmt = (
+                    select(func.count(ChatMessage.id)).where(self._orphaned_message_condition())
+                )
+                empty_conversations_stmt = (
+                    select(func.count(ChatConversation.id)).where(self._empty_conversation_condition())
+                )
+                orphaned_messages = (await db_session.execute(orphaned_messages_stmt)).scalar() or 0
+                empty_conversations = (await db_session.execute(empty_conversations_stmt)).scalar() or 0
                 
                 # Total counts
                 total_conversations_stmt = select(func.count(ChatConversation.id))
@@ -350,18 +401,18 @@ class ChatCleanupUtility:
                 return {
                     "total_conversations": total_conversations,
                     "total_messages": total_messages,
-                    "expired_sessions": len(expired_sessions),
+                    "expired_sessions": expired_sessions,
                     "oversized_sessions": len(oversized_sessions),
-                    "orphaned_messages": len(orphaned_messages),
-                    "empty_conversations": len(empty_conversations),
+                    "orphaned_messages": orphaned_messages,
+                    "empty_conversations": empty_conversations,
                     "retention_policy": {
                         "max_age_days": self.retention_policy.max_age_days,
                         "max_messages_per_session": self.retention_policy.max_messages_per_session,
                         "max_conversations_per_session": self.retention_policy.max_conversations_per_session
                     },
                     "recommendations": self._generate_cleanup_recommendations(
-                        len(expired_sessions), len(oversized_sessions), 
-                        len(orphaned_messages), len(empty_conversations)
+                        expired_sessions, len(oversized_sessions), 
+                        orphaned_messages, empty_conversations
                     )
                 }
                 
@@ -369,19 +420,42 @@ class ChatCleanupUtility:
             log.error(f"Failed to get cleanup statistics: {e}")
             return {"error": str(e)}
     
-    async def _find_expired_sessions(
-        self, 
-        db_session: AsyncSession, 
-        cutoff_date: datetime
-    ) -> List[str]:
-        """Find sessions older than cutoff date."""
-        statement = (
-            select(ChatConversation.session_id)
-            .where(ChatConversation.updated_at < cutoff_date)
-            .distinct()
-        )
-        result = await db_session.execute(statement)
-        return [row[0] for row in result.fetchall()]
+    async def _iter_session_batches(
+        self,
+        db_session: AsyncSession,
+        cutoff_date: datetime,
+        session_ids: Optional[List[str]] = None
+    ) -> AsyncGenerator[List[str], None]:
+        """
+        Yield batches of session IDs to clean up.
+        
+        Expired sessions are paged by session_id (keyset) rather than loaded
+        up front, so a batch that fails is skipped instead of retried forever.
+        """
+        batch_size = self.retention_policy.cleanup_batch_size
+        
+        if session_ids:
+            for i in range(0, len(session_ids), batch_size):
+                yield session_ids[i:i + batch_size]
+            return
+        
+        last_session_id = None
+        while True:
+            statement = select(ChatConversation.session_id).where(ChatConversation.updated_at < cutoff_date)
+            if last_session_id is not None:
+                statement = statement.where(ChatConversation.session_id > last_session_id)
+            statement = statement.distinct().order_by(ChatConversation.session_id).limit(batch_size)
+            
+            result = await db_session.execute(statement)
+            batch = list(result.scalars())
+            if not batch:
+                return
+            
+            yield batch
+            
+            if len(batch) < batch_size:
+                return
+            last_session_id = batch[-1]
     
     async def _find_oversized_sessions(self, db_session: AsyncSession) -> List[Tuple[str, int, int]]:
         """Find sessions that exceed size limits."""
@@ -423,155 +497,202 @@ class ChatCleanupUtility:
         return [(session_id, msg_count, conv_count) 
                 for session_id, (msg_count, conv_count) in oversized_sessions.items()]
     
-    async def _find_orphaned_messages(self, db_session: AsyncSession) -> List[ChatMessage]:
-        """Find messages without valid conversations."""
-        statement = (
-            select(ChatMessage)
-            .outerjoin(ChatConversation, ChatMessage.conversation_id == ChatConversation.conversation_id)
-            .where(ChatConversation.conversation_id.is_(None))
-        )
-        result = await db_session.execute(statement)
-        return result.scalars().all()
+    @staticmethod
+    def _orphaned_message_condition():
+        """WHERE clause matching messages without a valid conversation."""
+        return ~exists().where(ChatConversation.conversation_id == ChatMessage.conversation_id)
     
-    async def _find_empty_conversations(self, db_session: AsyncSession) -> List[ChatConversation]:
-        """Find conversations without any messages."""
-        statement = (
-            select(ChatConversation)
-            .outerjoin(ChatMessage, ChatConversation.conversation_id == ChatMessage.conversation_id)
-            .where(ChatMessage.conversation_id.is_(None))
-        )
-        result = await db_session.execute(statement)
-        return result.scalars().all()
+    @staticmethod
+    def _empty_conversation_condition():
+        """WHERE clause matching conversations without any messages."""
+        return ~exists().where(ChatMessage.conversation_id == ChatConversation.conversation_id)
     
     async def _cleanup_session_batch(
         self, 
         db_session: AsyncSession, 
-        session_ids: List[str]
+        session_ids: List[str],
+        errors: List[str]
     ) -> Tuple[int, int, int]:
-        """Clean up a batch of sessions."""
-        conversations_deleted = 0
-        messages_deleted = 0
-        qdrant_points_deleted = 0
-        
-        for session_id in session_ids:
-            # Get Qdrant point IDs for cleanup
-            qdrant_point_ids = []
-            if self.retention_policy.qdrant_cleanup:
-                messages_stmt = select(ChatMessage.qdrant_point_id).where(
-                    and_(
-                        ChatMessage.session_id == session_id,
-                        ChatMessage.qdrant_point_id.is_not(None)
-                    )
-                )
-                result = await db_session.execute(messages_stmt)
-                qdrant_point_ids = [row[0] for row in result.fetchall()]
-            
-            # Delete messages
-            messages_stmt = delete(ChatMessage).where(ChatMessage.session_id == session_id)
-            messages_result = await db_session.execute(messages_stmt)
-            messages_deleted += messages_result.rowcount
-            
-            # Delete conversations
-            conversations_stmt = delete(ChatConversation).where(ChatConversation.session_id == session_id)
-            conversations_result = await db_session.execute(conversations_stmt)
-            conversations_deleted += conversations_result.rowcount
-            
-            # Clean up Qdrant points
-            if self.qdrant_service and qdrant_point_ids:
-                try:
-                    deleted_points = await self._cleanup_qdrant_points(qdrant_point_ids)
-                    qdrant_points_deleted += deleted_points
-                except Exception as e:
-                    log.warning(f"Failed to cleanup Qdrant points for session {session_id}: {e}")
+        """
+        Clean up a batch of sessions in one short transaction.
         
+        Uses one ``IN`` delete per table instead of per-session statements.
+        Qdrant points are removed by ``session_id`` payload filter, which
+        catches every chunk of every message rather than only the point
+        recorded in ``qdrant_point_id``.
+        """
+        messages_result = await db_session.execute(
+            delete(ChatMessage)
+            .where(ChatMessage.session_id.in_(session_ids))
+            .execution_options(synchronize_session=False)
+        )
+        conversations_result = await db_session.execute(
+            delete(ChatConversation)
+            .where(ChatConversation.session_id.in_(session_ids))
+            .execution_options(synchronize_session=False)
+        )
         await db_session.commit()
-        return conversations_deleted, messages_deleted, qdrant_points_deleted
+        
+        qdrant_points_deleted = 0
+        if self.retention_policy.qdrant_cleanup:
+            qdrant_points_deleted = await self._cleanup_qdrant_points(errors, session_ids=session_ids)
+        
+        return conversations_result.rowcount, messages_result.rowcount, qdrant_points_deleted
     
     async def _cleanup_excess_messages(
         self, 
         db_session: AsyncSession, 
         session_id: str, 
-        excess_count: int
-    ) -> int:
-        """Clean up excess messages, keeping the most recent ones."""
-        # Get oldest messages to delete
-        statement = (
-            select(ChatMessage.id, ChatMessage.qdrant_point_id)
-            .where(ChatMessage.session_id == session_id)
-            .order_by(ChatMessage.created_at.asc())
-            .limit(excess_count)
-        )
-        result = await db_session.execute(statement)
-        messages_to_delete = result.fetchall()
-        
-        if not messages_to_delete:
-            return 0
-        
-        # Collect Qdrant point IDs
-        qdrant_point_ids = [row[1] for row in messages_to_delete if row[1]]
-        message_ids = [row[0] for row in messages_to_delete]
-        
-        # Delete messages
-        delete_stmt = delete(ChatMessage).where(ChatMessage.id.in_(message_ids))
-        result = await db_session.execute(delete_stmt)
+        excess_count: int,
+        errors: List[str]
+    ) -> Tuple[int, int, int]:
+        """
+        Clean up excess messages, keeping the most recent ones.
         
-        # Clean up Qdrant points
-        if self.qdrant_service and qdrant_point_ids:
-            try:
-                await self._cleanup_qdrant_points(qdrant_point_ids)
-            except Exception as e:
-                log.warning(f"Failed to cleanup Qdrant points for excess messages: {e}")
+        Returns:
+            Tuple of (messages deleted, Qdrant points deleted, batches processed)
+        """
+        messages_deleted = 0
+        qdrant_points_deleted = 0
+        batches_processed = 0
+        
+        while messages_deleted < excess_count:
+            oldest_ids = (
+                select(ChatMessage.id)
+                .where(ChatMessage.session_id == session_id)
+                .order_by(ChatMessage.created_at.asc())
+                .limit(min(self.retention_policy.cleanup_batch_size, excess_count - messages_deleted))
+            )
+            message_ids = await self._delete_returning_message_ids(
+                db_session, delete(ChatMessage).where(ChatMessage.id.in_(oldest_ids))
+            )
+            if not message_ids:
+                break
+            
+            batches_processed += 1
+            messages_deleted += len(message_ids)
+            
+            # Clean up Qdrant points
+            if self.retention_policy.qdrant_cleanup:
+                qdrant_points_deleted += await self._cleanup_qdrant_points(errors, message_ids=message_ids)
         
-        return result.rowcount
+        return messages_deleted, qdrant_points_deleted, batches_processed
     
     async def _cleanup_excess_conversations(
         self, 
         db_session: AsyncSession, 
         session_id: str, 
-        excess_count: int
-    ) -> int:
-        """Clean up excess conversations, keeping the most recent ones."""
-        # Get oldest conversations to delete
-        statement = (
-            select(ChatConversation.conversation_id)
-            .where(ChatConversation.session_id == session_id)
-            .order_by(ChatConversation.updated_at.asc())
-            .limit(excess_count)
-        )
-        result = await db_session.execute(statement)
-        conversation_ids = [row[0] for row in result.fetchall()]
-        
-        if not conversation_ids:
-            return 0
+        excess_count: int,
+        errors: List[str]
+    ) -> Tuple[int, int, int, int]:
+        """
+        Clean up excess conversations, keeping the most recent ones.
         
-        # Delete associated messages first
-        messages_delete_stmt = delete(ChatMessage).where(
-            ChatMessage.conversation_id.in_(conversation_ids)
-        )
-        await db_session.execute(messages_delete_stmt)
+        Returns:
+            Tuple of (conversations deleted, messages deleted,
+            Qdrant points deleted, batches processed)
+        """
+        conversations_deleted = 0
+        messages_deleted = 0
+        qdrant_points_deleted = 0
+        batches_processed = 0
+        
+        while conversations_deleted < excess_count:
+            # Get oldest conversations to delete
+            statement = (
+                select(ChatConversation.conversation_id)
+                .where(ChatConversation.session_id == session_id)
+                .order_by(ChatConversation.updated_at.asc())
+                .limit(min(self.retention_policy.cleanup_batch_size, excess_count - conversations_deleted))
+            )
+            result = await db_session.execute(statement)
+            conversation_ids = list(result.scalars())
+            
+            if not conversation_ids:
+                break
+            
+            # Delete associated messages first
+            message_ids = await self._delete_returning_message_ids(
+                db_session,
+                delete(ChatMessage).where(ChatMessage.conversation_id.in_(conversation_ids)),
+                commit=False
+            )
+            
+            # Delete conversations
+            conversations_result = await db_session.execute(
+                delete(ChatConversation)
+                .where(ChatConversation.conversation_id.in_(conversation_ids))
+                .execution_options(synchronize_session=False)
+            )
+            await db_session.commit()
+            
+            batches_processed += 1
+            conversations_deleted += conversations_result.rowcount
+            messages_deleted += len(message_ids)
+            
+            if self.retention_policy.qdrant_cleanup:
+                qdrant_points_deleted += await self._cleanup_qdrant_points(errors, message_ids=message_ids)
         
-        # Delete conversations
-        conversations_delete_stmt = delete(ChatConversation).where(
-            ChatConversation.conversation_id.in_(conversation_ids)
+        return conversations_deleted, messages_deleted, qdrant_points_deleted, batches_processed
+    
+    async def _delete_returning_message_ids(
+        self,
+        db_session: AsyncSession,
+        delete_stmt: Any,
+        commit: bool = True
+    ) -> List[str]:
+        """Execute a ChatMessage delete and return the deleted message IDs via RETURNING."""
+        result = await db_session.execute(
+            delete_stmt
+            .returning(ChatMessage.message_id)
+            .execution_options(synchronize_session=False)
         )
-        result = await db_session.execute(conversations_delete_stmt)
-        
-        return result.rowcount
+        message_ids = list(result.scalars())
+        if commit:
+            await db_session.commit()
+        return message_ids
     
-    async def _cleanup_qdrant_points(self, point_ids: List[str]) -> int:
-        """Clean up Qdrant points by IDs."""
-        if not self.qdrant_service or not point_ids:
+    async def _cleanup_qdrant_points(
+        self,
+        errors: List[str],
+        session_ids: Optional[List[str]] = None,
+        message_ids: Optional[List[str]] = None
+    ) -> int:
+        """
+        Clean up Qdrant points by session or message payload filter.
+        
+        The database rows are already deleted when this runs, so a Qdrant
+        failure does not abort the cleanup: it is appended to ``errors`` (the
+        operation's CleanupResult.errors) and no points are counted.
+        """
+        if not self.qdrant_service or not (session_ids or message_ids):
             return 0
         
         try:
-            # Delete points from Qdrant
-            deleted_count = await self.qdrant_service.delete_points_by_ids(point_ids)
-            log.info(f"Deleted {deleted_count} points from Qdrant")
-            return deleted_count
+            if session_ids:
+                return await self.qdrant_service.delete_points_for_sessions(session_ids)
+            return await self.qdrant_service.delete_points_for_messages(message_ids)
         except Exception as e:
-            log.error(f"Failed to delete Qdrant points: {e}")
+            error_msg = f"Qdrant cleanup error: {e}"
+            errors.append(error_msg)
+            log.error(error_msg)
             return 0
     
+    @staticmethod
+    def _log_batch_throughput(
+        operation: str,
+        batch_number: int,
+        batch_items: int,
+        batch_result: Tuple[int, int, int],
+        elapsed_seconds: float
+    ) -> None:
+        """Log per-batch deletion counts and throughput."""
+        rows = batch_result[0] + batch_result[1]
+        rate = rows / elapsed_seconds if elapsed_seconds > 0 else 0.0
+        log.info(f"Cleaned up {operation} batch {batch_number} ({batch_items} items): "
+                f"{batch_result[1]} messages, {batch_result[0]} conversations, "
+                f"{batch_result[2]} Qdrant points in {elapsed_seconds:.2f}s ({rate:.0f} rows/s)")
+    
     def _generate_cleanup_recommendations(
         self, 
         expired_sessions: int, 
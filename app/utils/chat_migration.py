@@ -6,19 +6,23 @@ backing up data, and performing data transformations safely.
 """
 
 import asyncio
+import gzip
 import json
+import os
 import uuid
 from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional, AsyncGenerator
+from typing import List, Dict, Any, Optional, AsyncGenerator, Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.constants import CHAT_EXPORT_FORMAT_VERSION, CHAT_MIGRATION_BATCH_SIZE
 from app.core.db_models import ChatMessage, ChatConversation, MessageRole
 from app.core.database import AsyncSessionLocal
 from app.core.logger import log
 from app.services.chat_qdrant_service import ChatQdrantService
+from app.utils.file_operations import atomic_write_json
 
 
 @dataclass
@@ -33,6 +37,7 @@ class MigrationResult:
     errors: List[str]
     duration_seconds: float
     migration_id: str
+    resumed_from_checkpoint: bool = False
 
 
 @dataclass
@@ -55,178 +60,236 @@ class ChatMigrationUtility:
     with proper data validation and integrity checks.
     """
     
-    def __init__(self, qdrant_service: Optional[ChatQdrantService] = None):
+    def __init__(
+        self,
+        qdrant_service: Optional[ChatQdrantService] = None,
+        batch_size: int = CHAT_MIGRATION_BATCH_SIZE
+    ):
         """
         Initialize migration utility.
         
         Args:
             qdrant_service: Optional Qdrant service for vector operations
+            batch_size: Rows per read/write batch and checkpoint interval
         """
         self.qdrant_service = qdrant_service
+        self.batch_size = batch_size
     
     async def export_chat_data(
         self,
         output_path: str,
         session_ids: Optional[List[str]] = None,
-        include_vectors: bool = False
+        include_vectors: bool = False,
+        resume: bool = True
     ) -> MigrationResult:
         """
-        Export chat data to JSON format for backup or migration.
+        Export chat data as streaming NDJSON for backup or migration.
+        
+        Rows are read through a server-side cursor in batches of ``batch_size``
+        and appended to the file one batch at a time, so memory use does not
+        grow with the size of the database. Paths ending in ``.gz`` are gzip
+        compressed. A checkpoint is written after every batch; re-running an
+        interrupted export with the same options continues where it stopped.
         
         Args:
-            output_path: Path to output JSON file
+            output_path: Path to output NDJSON file (``.gz`` for compression)
             session_ids: Optional list of session IDs to export
             include_vectors: Whether to include vector data from Qdrant
+            resume: Whether to continue from an existing checkpoint
             
         Returns:
             MigrationResult with export statistics
         """
         migration_id = f"export_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
         start_time = datetime.now(timezone.utc)
+        output_file = Path(output_path)
+        checkpoint_path = self._checkpoint_path(output_file)
+        options = {
+            "operation": "export_chat_data",
+            "session_ids": sorted(session_ids or []),
+            "include_vectors": include_vectors
+        }
+        
+        checkpoint = None
+        if resume and output_file.exists():
+            checkpoint = self._load_checkpoint(checkpoint_path, options)
+        state = checkpoint or {
+            "options": options,
+            "migration_id": migration_id,
+            "phase": "conversations",
+            "last_id": 0,
+            "offset": 0,
+            "conversations": 0,
+            "messages": 0
+        }
+        migration_id = state["migration_id"]
+        errors = []
+        writer = None
         
         try:
-            conversations_exported = 0
-            messages_exported = 0
-            errors = []
+            if checkpoint:
+                log.info(f"Resuming chat export {migration_id} from {state['phase']} after id {state['last_id']}")
+            
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            writer = _NDJSONWriter(output_file, offset=state["offset"])
             
-            # Prepare export data structure
-            export_data = {
-                "metadata": BackupMetadata(
+            if not checkpoint:
+                metadata = BackupMetadata(
                     backup_id=migration_id,
                     created_at=start_time,
                     source_environment="current",
                     total_conversations=0,
                     total_messages=0,
-                    session_ids=session_ids or []
-                ).__dict__,
-                "conversations": [],
-                "messages": []
-            }
+                    session_ids=session_ids or [],
+                    format_version=CHAT_EXPORT_FORMAT_VERSION
+                ).__dict__
+                writer.write({"record_type": "metadata", **metadata, "created_at": start_time.isoformat()})
             
             async with AsyncSessionLocal() as db_session:
                 # Export conversations
-                conversations = await self._get_conversations_for_export(db_session, session_ids)
-                
-                for conversation in conversations:
-                    try:
-                        conv_data = {
-                            "conversation_id": conversation.conversation_id,
-                            "session_id": conversation.session_id,
-                            "title": conversation.title,
-                            "philosopher_collection": conversation.philosopher_collection,
-                            "created_at": conversation.created_at.isoformat(),
-                            "updated_at": conversation.updated_at.isoformat()
-                        }
-                        export_data["conversations"].append(conv_data)
-                        conversations_exported += 1
-                        
-                    except Exception as e:
-                        errors.append(f"Error exporting conversation {conversation.conversation_id}: {e}")
-                
-                # Export messages
-                messages = await self._get_messages_for_export(db_session, session_ids)
-                
-                for message in messages:
-                    try:
-                        msg_data = {
-                            "message_id": message.message_id,
-                            "conversation_id": message.conversation_id,
-                            "session_id": message.session_id,
-                            "role": message.role.value,
-                            "content": message.content,
-                            "philosopher_collection": message.philosopher_collection,
-                            "qdrant_point_id": message.qdrant_point_id,
-                            "created_at": message.created_at.isoformat()
-                        }
-                        
-                        # Include vector data if requested
-                        if include_vectors and message.qdrant_point_id and self.qdrant_service:
+                if state["phase"] == "conversations":
+                    async for conversations in self._stream_export_batches(
+                        db_session, ChatConversation, session_ids, state["last_id"]
+                    ):
+                        for conversation in conversations:
                             try:
-                                vector_data = await self.qdrant_service.get_point_by_id(message.qdrant_point_id)
-                                if vector_data:
-                                    msg_data["vector_data"] = vector_data
+                                writer.write({"record_type": "conversation", **self._conversation_record(conversation)})
+                                state["conversations"] += 1
                             except Exception as e:
-                                errors.append(f"Error getting vector for message {message.message_id}: {e}")
+                                errors.append(f"Error exporting conversation {conversation.conversation_id}: {e}")
                         
-                        export_data["messages"].append(msg_data)
-                        messages_exported += 1
-                        
-                    except Exception as e:
-                        errors.append(f"Error exporting message {message.message_id}: {e}")
-            
-            # Update metadata
-            export_data["metadata"]["total_conversations"] = conversations_exported
-            export_data["metadata"]["total_messages"] = messages_exported
-            
-            # Write to file
-            output_file = Path(output_path)
-            output_file.parent.mkdir(parents=True, exist_ok=True)
+                        state["last_id"] = conversations[-1].id
+                        self._commit_batch(writer, state, checkpoint_path)
+                    
+                    state.update(phase="messages", last_id=0)
+                
+                # Export messages, fetching vectors for the whole batch at once
+                async for messages in self._stream_export_batches(
+                    db_session, ChatMessage, session_ids, state["last_id"]
+                ):
+                    vector_points = {}
+                    if include_vectors and self.qdrant_service:
+                        try:
+                            vector_points = await self.qdrant_service.get_points_for_messages(
+                                [message.message_id for message in messages]
+                            )
+                        except Exception as e:
+                            errors.append(f"Error getting vectors for messages after id {state['last_id']}: {e}")
+                    
+                    for message in messages:
+                        try:
+                            msg_data = self._message_record(message)
+                            if message.message_id in vector_points:
+                                msg_data["vector_data"] = vector_points[message.message_id]
+                            writer.write({"record_type": "message", **msg_data})
+                            state["messages"] += 1
+                        except Exception as e:
+                            errors.append(f"Error exporting message {message.message_id}: {e}")
+                    
+                    state["last_id"] = messages[-1].id
+                    self._commit_batch(writer, state, checkpoint_path)
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            # The trailing summary marks the export as complete
+            writer.write({
+                "record_type": "summary",
+                "total_conversations": state["conversations"],
+                "total_messages": state["messages"],
+                "completed_at": datetime.now(timezone.utc).isoformat()
+            })
+            writer.commit()
+            writer.close()
+            checkpoint_path.unlink(missing_ok=True)
             
             duration = (datetime.now(timezone.utc) - start_time).total_seconds()
             
             result = MigrationResult(
                 operation="export_chat_data",
-                source_conversations=conversations_exported,
-                source_messages=messages_exported,
-                migrated_conversations=conversations_exported,
-                migrated_messages=messages_exported,
+                source_conversations=state["conversations"],
+                source_messages=state["messages"],
+                migrated_conversations=state["conversations"],
+                migrated_messages=state["messages"],
                 skipped_items=0,
                 errors=errors,
                 duration_seconds=duration,
-                migration_id=migration_id
+                migration_id=migration_id,
+                resumed_from_checkpoint=checkpoint is not None
             )
             
-            log.info(f"Chat data export completed: {conversations_exported} conversations, "
-                    f"{messages_exported} messages exported to {output_path}")
+            log.info(f"Chat data export completed: {state['conversations']} conversations, "
+                    f"{state['messages']} messages exported to {output_path}")
             
             return result
             
         except Exception as e:
             log.error(f"Chat data export failed: {e}")
+            if writer:
+                writer.close()
             duration = (datetime.now(timezone.utc) - start_time).total_seconds()
             return MigrationResult(
                 operation="export_chat_data",
-                source_conversations=0,
-                source_messages=0,
-                migrated_conversations=0,
-                migrated_messages=0,
+                source_conversations=state["conversations"],
+                source_messages=state["messages"],
+                migrated_conversations=state["conversations"],
+                migrated_messages=state["messages"],
                 skipped_items=0,
-                errors=[str(e)],
+                errors=errors + [str(e)],
                 duration_seconds=duration,
-                migration_id=migration_id
+                migration_id=migration_id,
+                resumed_from_checkpoint=checkpoint is not None
             )
     
     async def import_chat_data(
         self,
         input_path: str,
         overwrite_existing: bool = False,
-        validate_data: bool = True
+        validate_data: bool = True,
+        resume: bool = True
     ) -> MigrationResult:
         """
-        Import chat data from JSON format.
+        Import chat data from an NDJSON export (or a legacy JSON backup).
+        
+        Records are streamed from the file and written in batches of
+        ``batch_size``: one existence query, one commit and one Qdrant upsert
+        per batch. A checkpoint is written after every batch so an
+        interrupted import can be resumed.
         
         Args:
-            input_path: Path to input JSON file
+            input_path: Path to input file (``.gz`` files are decompressed)
             overwrite_existing: Whether to overwrite existing data
             validate_data: Whether to validate data before import
+            resume: Whether to continue from an existing checkpoint
             
         Returns:
             MigrationResult with import statistics
         """
         migration_id = f"import_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}"
         start_time = datetime.now(timezone.utc)
+        input_file = Path(input_path)
+        checkpoint_path = self._checkpoint_path(input_file)
+        state = {
+            "conversations": 0,
+            "messages": 0,
+            "source_conversations": 0,
+            "source_messages": 0,
+            "skipped": 0
+        }
+        checkpoint = None
+        errors = []
         
         try:
-            # Load import data
-            with open(input_path, 'r', encoding='utf-8') as f:
-                import_data = json.load(f)
+            source_stat = input_file.stat()
+            options = {
+                "operation": "import_chat_data",
+                "source_size": source_stat.st_size,
+                "source_mtime": int(source_stat.st_mtime),
+                "overwrite_existing": overwrite_existing
+            }
+            checkpoint = self._load_checkpoint(checkpoint_path, options) if resume else None
             
-            # Validate format
-            if validate_data:
-                validation_errors = await self._validate_import_data(import_data)
+            # Validate format with a separate streaming pass so nothing is
+            # written when the file is invalid
+            if validate_data and not checkpoint:
+                validation_errors = self._validate_import_stream(input_file)
                 if validation_errors:
                     return MigrationResult(
                         operation="import_chat_data",
@@ -240,114 +303,59 @@ class ChatMigrationUtility:
                         migration_id=migration_id
                     )
             
-            conversations_imported = 0
-            messages_imported = 0
-            skipped_items = 0
-            errors = []
+            state = checkpoint or {
+                "options": options,
+                "migration_id": migration_id,
+                "records_done": 0,
+                **state
+            }
+            migration_id = state["migration_id"]
+            if checkpoint:
+                log.info(f"Resuming chat import {migration_id} after record {state['records_done']}")
             
             async with AsyncSessionLocal() as db_session:
-                # Import conversations
-                for conv_data in import_data.get("conversations", []):
-                    try:
-                        # Check if conversation exists
-                        existing_conv = await self._get_existing_conversation(
-                            db_session, conv_data["conversation_id"]
-                        )
-                        
-                        if existing_conv and not overwrite_existing:
-                            skipped_items += 1
-                            continue
-                        
-                        # Create or update conversation
-                        if existing_conv and overwrite_existing:
-                            conversation = existing_conv
-                            conversation.title = conv_data.get("title")
-                            conversation.philosopher_collection = conv_data.get("philosopher_collection")
-                            conversation.updated_at = datetime.fromisoformat(conv_data["updated_at"])
-                        else:
-                            conversation = ChatConversation(
-                                conversation_id=conv_data["conversation_id"],
-                                session_id=conv_data["session_id"],
-                                title=conv_data.get("title"),
-                                philosopher_collection=conv_data.get("philosopher_collection"),
-                                created_at=datetime.fromisoformat(conv_data["created_at"]),
-                                updated_at=datetime.fromisoformat(conv_data["updated_at"])
-                            )
-                        
-                        db_session.add(conversation)
-                        conversations_imported += 1
-                        
-                    except Exception as e:
-                        errors.append(f"Error importing conversation {conv_data.get('conversation_id')}: {e}")
+                batch: List[Dict[str, Any]] = []
+                batch_type = None
                 
-                # Commit conversations first
-                await db_session.commit()
-                
-                # Import messages
-                for msg_data in import_data.get("messages", []):
-                    try:
-                        # Check if message exists
-                        existing_msg = await self._get_existing_message(
-                            db_session, msg_data["message_id"]
-                        )
-                        
-                        if existing_msg and not overwrite_existing:
-                            skipped_items += 1
-                            continue
-                        
-                        # Create or update message
-                        if existing_msg and overwrite_existing:
-                            message = existing_msg
-                            message.content = msg_data["content"]
-                            message.philosopher_collection = msg_data.get("philosopher_collection")
-                            message.qdrant_point_id = msg_data.get("qdrant_point_id")
-                        else:
-                            message = ChatMessage(
-                                message_id=msg_data["message_id"],
-                                conversation_id=msg_data["conversation_id"],
-                                session_id=msg_data["session_id"],
-                                role=MessageRole(msg_data["role"]),
-                                content=msg_data["content"],
-                                philosopher_collection=msg_data.get("philosopher_collection"),
-                                qdrant_point_id=msg_data.get("qdrant_point_id"),
-                                created_at=datetime.fromisoformat(msg_data["created_at"])
-                            )
-                        
-                        db_session.add(message)
-                        messages_imported += 1
-                        
-                        # Import vector data if available
-                        if "vector_data" in msg_data and self.qdrant_service:
-                            try:
-                                await self.qdrant_service.import_point_data(
-                                    msg_data["qdrant_point_id"],
-                                    msg_data["vector_data"]
-                                )
-                            except Exception as e:
-                                errors.append(f"Error importing vector for message {msg_data['message_id']}: {e}")
-                        
-                    except Exception as e:
-                        errors.append(f"Error importing message {msg_data.get('message_id')}: {e}")
+                for index, record in enumerate(self._iter_records(input_file), start=1):
+                    if index <= state["records_done"]:
+                        continue
+                    
+                    record_type = record.get("record_type")
+                    if record_type not in ("conversation", "message"):
+                        continue
+                    
+                    if batch and (record_type != batch_type or len(batch) >= self.batch_size):
+                        await self._import_batch(db_session, batch_type, batch, overwrite_existing, state, errors)
+                        self._save_checkpoint(checkpoint_path, state)
+                        batch = []
+                    
+                    batch_type = record_type
+                    batch.append(record)
+                    state["records_done"] = index
+                    state[f"source_{record_type}s"] += 1
                 
-                # Commit messages
-                await db_session.commit()
+                if batch:
+                    await self._import_batch(db_session, batch_type, batch, overwrite_existing, state, errors)
             
+            checkpoint_path.unlink(missing_ok=True)
             duration = (datetime.now(timezone.utc) - start_time).total_seconds()
             
             result = MigrationResult(
                 operation="import_chat_data",
-                source_conversations=len(import_data.get("conversations", [])),
-                source_messages=len(import_data.get("messages", [])),
-                migrated_conversations=conversations_imported,
-                migrated_messages=messages_imported,
-                skipped_items=skipped_items,
+                source_conversations=state["source_conversations"],
+                source_messages=state["source_messages"],
+                migrated_conversations=state["conversations"],
+                migrated_messages=state["messages"],
+                skipped_items=state["skipped"],
                 errors=errors,
                 duration_seconds=duration,
-                migration_id=migration_id
+                migration_id=migration_id,
+                resumed_from_checkpoint=checkpoint is not None
             )
             
-            log.info(f"Chat data import completed: {conversations_imported} conversations, "
-                    f"{messages_imported} messages imported from {input_path}")
+            log.info(f"Chat data import completed: {state['conversations']} conversations, "
+                    f"{state['messages']} messages imported from {input_path}")
             
             return result
             
@@ -356,14 +364,15 @@ class ChatMigrationUtility:
             duration = (datetime.now(timezone.utc) - start_time).total_seconds()
             return MigrationResult(
                 operation="import_chat_data",
-                source_conversations=0,
-                source_messages=0,
-                migrated_conversations=0,
-                migrated_messages=0,
-                skipped_items=0,
-                errors=[str(e)],
+                source_conversations=state["source_conversations"],
+                source_messages=state["source_messages"],
+                migrated_conversations=state["conversations"],
+                migrated_messages=state["messages"],
+                skipped_items=state["skipped"],
+                errors=errors + [str(e)],
                 duration_seconds=duration,
-                migration_id=migration_id
+                migration_id=migration_id,
+                resumed_from_checkpoint=checkpoint is not None
             )
     
     async def migrate_session_data(
@@ -466,101 +475,349 @@ class ChatMigrationUtility:
                 migration_id=migration_id
             )
     
-    async def _get_conversations_for_export(
-        self, 
-        db_session: AsyncSession, 
-        session_ids: Optional[List[str]]
-    ) -> List[ChatConversation]:
-        """Get conversations for export."""
-        statement = select(ChatConversation)
+    async def _stream_export_batches(
+        self,
+        db_session: AsyncSession,
+        model: Any,
+        session_ids: Optional[List[str]],
+        after_id: int = 0
+    ) -> AsyncGenerator[List[Any], None]:
+        """
+        Yield rows of ``model`` in primary-key order, one batch at a time.
+        
+        Uses a server-side cursor (``yield_per``) so only one batch is held in
+        memory, and starts after ``after_id`` so checkpoints can resume it.
+        """
+        statement = select(model).where(model.id > after_id)
         
         if session_ids:
-            statement = statement.where(ChatConversation.session_id.in_(session_ids))
+            statement = statement.where(model.session_id.in_(session_ids))
         
-        statement = statement.order_by(ChatConversation.created_at.asc())
+        statement = statement.order_by(model.id.asc()).execution_options(yield_per=self.batch_size)
         
-        result = await db_session.execute(statement)
-        return result.scalars().all()
+        result = await db_session.stream_scalars(statement)
+        try:
+            async for partition in result.partitions():
+                yield partition
+                # Drop exported rows from the identity map to keep memory bounded
+                for row in partition:
+                    db_session.expunge(row)
+        finally:
+            await result.close()
     
-    async def _get_messages_for_export(
-        self, 
-        db_session: AsyncSession, 
-        session_ids: Optional[List[str]]
-    ) -> List[ChatMessage]:
-        """Get messages for export."""
-        statement = select(ChatMessage)
+    async def _import_batch(
+        self,
+        db_session: AsyncSession,
+        record_type: str,
+        records: List[Dict[str, Any]],
+        overwrite_existing: bool,
+        state: Dict[str, Any],
+        errors: List[str]
+    ) -> None:
+        """
+        Write one batch of conversation or message records in a single transaction.
         
-        if session_ids:
-            statement = statement.where(ChatMessage.session_id.in_(session_ids))
+        Existing rows are looked up with one IN query per batch. Vector points
+        attached to messages are upserted to Qdrant after the commit.
+        """
+        if record_type == "conversation":
+            model, key_field, counter = ChatConversation, "conversation_id", "conversations"
+        else:
+            model, key_field, counter = ChatMessage, "message_id", "messages"
+        
+        keys = [record.get(key_field) for record in records]
+        existing_result = await db_session.execute(
+            select(model).where(getattr(model, key_field).in_(keys))
+        )
+        existing = {getattr(row, key_field): row for row in existing_result.scalars()}
+        
+        imported = 0
+        vector_points = []
+        for record in records:
+            try:
+                row = existing.get(record[key_field])
+                
+                if row and not overwrite_existing:
+                    state["skipped"] += 1
+                    continue
+                
+                if record_type == "conversation":
+                    row = self._apply_conversation_record(record, row)
+                else:
+                    row = self._apply_message_record(record, row)
+                    vector_data = record.get("vector_data")
+                    if vector_data:
+                        vector_points.extend(vector_data if isinstance(vector_data, list) else [vector_data])
+                
+                db_session.add(row)
+                imported += 1
+                
+            except Exception as e:
+                errors.append(f"Error importing {record_type} {record.get(key_field)}: {e}")
+        
+        try:
+            await db_session.commit()
+        except Exception:
+            await db_session.rollback()
+            raise
+        finally:
+            db_session.expunge_all()
+        
+        state[counter] += imported
         
-        statement = statement.order_by(ChatMessage.created_at.asc())
+        if vector_points and self.qdrant_service:
+            try:
+                await self.qdrant_service.upsert_point_data(vector_points)
+            except Exception as e:
+                errors.append(f"Error importing vectors for {len(vector_points)} points: {e}")
+    
+    @staticmethod
+    def _conversation_record(conversation: ChatConversation) -> Dict[str, Any]:
+        """Serialise a conversation row for export."""
+        return {
+            "conversation_id": conversation.conversation_id,
+            "session_id": conversation.session_id,
+            "username": conversation.username,
+            "title": conversation.title,
+            "philosopher_collection": conversation.philosopher_collection,
+            "created_at": conversation.created_at.isoformat(),
+            "updated_at": conversation.updated_at.isoformat()
+        }
+    
+    @staticmethod
+    def _message_record(message: ChatMessage) -> Dict[str, Any]:
+        """Serialise a message row for export."""
+        return {
+            "message_id": message.message_id,
+            "conversation_id": message.conversation_id,
+            "session_id": message.session_id,
+            "username": message.username,
+            "role": message.role.value,
+            "content": message.content,
+            "philosopher_collection": message.philosopher_collection,
+            "qdrant_point_id": message.qdrant_point_id,
+            "created_at": message.created_at.isoformat()
+        }
+    
+    @staticmethod
+    def _apply_conversation_record(
+        conv_data: Dict[str, Any],
+        conversation: Optional[ChatConversation]
+    ) -> ChatConversation:
+        """Create a conversation from an import record, or update an existing one."""
+        if conversation:
+            conversation.title = conv_data.get("title")
+            conversation.philosopher_collection = conv_data.get("philosopher_collection")
+            conversation.updated_at = datetime.fromisoformat(conv_data["updated_at"])
+            return conversation
         
-        result = await db_session.execute(statement)
-        return result.scalars().all()
+        return ChatConversation(
+            conversation_id=conv_data["conversation_id"],
+            session_id=conv_data["session_id"],
+            username=conv_data.get("username"),
+            title=conv_data.get("title"),
+            philosopher_collection=conv_data.get("philosopher_collection"),
+            created_at=datetime.fromisoformat(conv_data["created_at"]),
+            updated_at=datetime.fromisoformat(conv_data["updated_at"])
+        )
     
-    async def _get_existing_conversation(
-        self, 
-        db_session: AsyncSession, 
-        conversation_id: str
-    ) -> Optional[ChatConversation]:
-        """Check if conversation exists."""
-        statement = select(ChatConversation).where(
-            ChatConversation.conversation_id == conversation_id
+    @staticmethod
+    def _apply_message_record(
+        msg_data: Dict[str, Any],
+        message: Optional[ChatMessage]
+    ) -> ChatMessage:
+        """Create a message from an import record, or update an existing one."""
+        if message:
+            message.content = msg_data["content"]
+            message.philosopher_collection = msg_data.get("philosopher_collection")
+            message.qdrant_point_id = msg_data.get("qdrant_point_id")
+            return message
+        
+        return ChatMessage(
+            message_id=msg_data["message_id"],
+            conversation_id=msg_data["conversation_id"],
+            session_id=msg_data["session_id"],
+            username=msg_data.get("username"),
+            role=MessageRole(msg_data["role"]),
+            content=msg_data["content"],
+            philosopher_collection=msg_data.get("philosopher_collection"),
+            qdrant_point_id=msg_data.get("qdrant_point_id"),
+            created_at=datetime.fromisoformat(msg_data["created_at"])
         )
-        result = await db_session.execute(statement)
-        return result.scalars().first()
     
-    async def _get_existing_message(
-        self, 
-        db_session: AsyncSession, 
-        message_id: str
-    ) -> Optional[ChatMessage]:
-        """Check if message exists."""
-        statement = select(ChatMessage).where(ChatMessage.message_id == message_id)
-        result = await db_session.execute(statement)
-        return result.scalars().first()
+    def _commit_batch(self, writer: "_NDJSONWriter", state: Dict[str, Any], checkpoint_path: Path) -> None:
+        """Flush the pending export batch to disk and checkpoint its end offset."""
+        state["offset"] = writer.commit()
+        self._save_checkpoint(checkpoint_path, state)
+    
+    @staticmethod
+    def _checkpoint_path(data_path: Path) -> Path:
+        """Checkpoint file stored next to the export/import file."""
+        return data_path.with_name(data_path.name + ".checkpoint.json")
+    
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: Path, options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Load a checkpoint if it exists and was written with the same options."""
+        if not checkpoint_path.exists():
+            return None
+        
+        try:
+            with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable migration checkpoint {checkpoint_path}: {e}")
+            return None
+        
+        if checkpoint.get("options") != options:
+            log.info(f"Ignoring migration checkpoint {checkpoint_path} written with different options")
+            return None
+        
+        return checkpoint
+    
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: Path, state: Dict[str, Any]) -> None:
+        """Persist migration progress atomically."""
+        atomic_write_json(state, checkpoint_path)
+    
+    def _iter_records(self, input_file: Path) -> Iterator[Dict[str, Any]]:
+        """
+        Yield typed records from an NDJSON export or a legacy JSON backup.
+        
+        Legacy (format 1.0) files are a single JSON document and are loaded
+        whole; they are converted to the same record stream as NDJSON exports.
+        """
+        opener = gzip.open if input_file.name.endswith(".gz") else open
+        
+        with opener(input_file, 'rt', encoding='utf-8') as f:
+            first_line = f.readline()
+            try:
+                first_record = json.loads(first_line)
+            except ValueError:
+                first_record = None
+            
+            if not isinstance(first_record, dict) or "record_type" not in first_record:
+                f.seek(0)
+                yield from self._legacy_records(json.load(f))
+                return
+            
+            yield first_record
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    
+    @staticmethod
+    def _legacy_records(import_data: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Convert a legacy JSON backup into the NDJSON record stream."""
+        if "metadata" in import_data:
+            yield {"record_type": "metadata", **import_data["metadata"]}
+        for conv_data in import_data.get("conversations", []):
+            yield {"record_type": "conversation", **conv_data}
+        for msg_data in import_data.get("messages", []):
+            yield {"record_type": "message", **msg_data}
+        if "conversations" in import_data and "messages" in import_data:
+            yield {
+                "record_type": "summary",
+                "total_conversations": len(import_data["conversations"]),
+                "total_messages": len(import_data["messages"])
+            }
     
-    async def _validate_import_data(self, import_data: Dict[str, Any]) -> List[str]:
-        """Validate import data format."""
+    def _validate_import_stream(self, input_file: Path, max_errors: int = 100) -> List[str]:
+        """Validate import data format in a single streaming pass."""
         errors = []
+        has_metadata = has_summary = False
+        conversation_index = message_index = 0
+        
+        try:
+            for record in self._iter_records(input_file):
+                if len(errors) >= max_errors:
+                    errors.append(f"Validation stopped after {max_errors} errors")
+                    break
+                
+                record_type = record.get("record_type")
+                if record_type == "metadata":
+                    has_metadata = True
+                elif record_type == "summary":
+                    has_summary = True
+                elif record_type == "conversation":
+                    required_fields = ["conversation_id", "session_id", "created_at", "updated_at"]
+                    for field in required_fields:
+                        if field not in record:
+                            errors.append(f"Conversation {conversation_index}: Missing required field '{field}'")
+                    conversation_index += 1
+                elif record_type == "message":
+                    required_fields = ["message_id", "conversation_id", "session_id", "role", "content", "created_at"]
+                    for field in required_fields:
+                        if field not in record:
+                            errors.append(f"Message {message_index}: Missing required field '{field}'")
+                    
+                    # Validate role
+                    if record.get("role") not in ["user", "assistant"]:
+                        errors.append(f"Message {message_index}: Invalid role '{record.get('role')}'")
+                    message_index += 1
+                else:
+                    errors.append(f"Unknown record type '{record_type}'")
+        except (OSError, ValueError) as e:
+            errors.append(f"Unreadable import file: {e}")
+            return errors
         
-        # Check required fields
-        if "metadata" not in import_data:
+        if not has_metadata:
             errors.append("Missing metadata section")
         
-        if "conversations" not in import_data:
-            errors.append("Missing conversations section")
-        
-        if "messages" not in import_data:
-            errors.append("Missing messages section")
-        
-        # Validate conversations
-        for i, conv in enumerate(import_data.get("conversations", [])):
-            required_fields = ["conversation_id", "session_id", "created_at", "updated_at"]
-            for field in required_fields:
-                if field not in conv:
-                    errors.append(f"Conversation {i}: Missing required field '{field}'")
-        
-        # Validate messages
-        for i, msg in enumerate(import_data.get("messages", [])):
-            required_fields = ["message_id", "conversation_id", "session_id", "role", "content", "created_at"]
-            for field in required_fields:
-                if field not in msg:
-                    errors.append(f"Message {i}: Missing required field '{field}'")
-            
-            # Validate role
-            if msg.get("role") not in ["user", "assistant"]:
-                errors.append(f"Message {i}: Invalid role '{msg.get('role')}'")
+        if not has_summary:
+            errors.append("Missing summary record (export incomplete or truncated)")
         
         return errors
 
 
+class _NDJSONWriter:
+    """
+    Append-only NDJSON writer that commits records in batches.
+    
+    Each committed batch ends at a byte offset that a checkpoint can record;
+    reopening with that offset truncates anything written afterwards. Gzip
+    output is written as one gzip member per batch, which keeps committed
+    offsets valid boundaries while remaining readable by ``gzip.open``.
+    """
+    
+    def __init__(self, path: Path, offset: int = 0):
+        self.compressed = path.name.endswith(".gz")
+        self._pending: List[str] = []
+        if offset:
+            self._file = open(path, 'r+b')
+            self._file.truncate(offset)
+            self._file.seek(offset)
+        else:
+            self._file = open(path, 'wb')
+    
+    def write(self, record: Dict[str, Any]) -> None:
+        """Queue a record for the current batch."""
+        self._pending.append(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    
+    def commit(self) -> int:
+        """Write the queued batch durably and return the new end offset."""
+        if self._pending:
+            data = "".join(self._pending).encode("utf-8")
+            if self.compressed:
+                data = gzip.compress(data)
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = []
+        return self._file.tell()
+    
+    def close(self) -> None:
+        """Close the underlying file, discarding any uncommitted records."""
+        self._pending = []
+        self._file.close()
+
+
 # Convenience functions for common migration operations
 
 async def export_session_data(
     session_id: str,
     output_path: str,
-    include_vectors: bool = False
+    include_vectors: bool = False,
+    qdrant_service: Optional[ChatQdrantService] = None
 ) -> MigrationResult:
     """
     Export data for a specific session.
@@ -569,11 +826,12 @@ async def export_session_data(
         session_id: Session ID to export
         output_path: Output file path
         include_vectors: Whether to include vector data
+        qdrant_service: Qdrant service used to read vectors
         
     Returns:
         MigrationResult with export statistics
     """
-    migration_utility = ChatMigrationUtility()
+    migration_utility = ChatMigrationUtility(qdrant_service=qdrant_service)
     return await migration_utility.export_chat_data(
         output_path=output_path,
         session_ids=[session_id],
@@ -583,7 +841,8 @@ async def export_session_data(
 
 async def backup_all_chat_data(
     output_path: str,
-    include_vectors: bool = False
+    include_vectors: bool = False,
+    qdrant_service: Optional[ChatQdrantService] = None
 ) -> MigrationResult:
     """
     Backup all chat data to a file.
@@ -591,11 +850,12 @@ async def backup_all_chat_data(
     Args:
         output_path: Output file path
         include_vectors: Whether to include vector data
+        qdrant_service: Qdrant service used to read vectors
         
     Returns:
         MigrationResult with backup statistics
     """
-    migration_utility = ChatMigrationUtility()
+    migration_utility = ChatMigrationUtility(qdrant_service=qdrant_service)
     return await migration_utility.export_chat_data(
         output_path=output_path,
         session_ids=None,
@@ -605,7 +865,8 @@ async def backup_all_chat_data(
 
 async def restore_chat_data(
     input_path: str,
-    overwrite_existing: bool = False
+    overwrite_existing: bool = False,
+    qdrant_service: Optional[ChatQdrantService] = None
 ) -> MigrationResult:
     """
     Restore chat data from a backup file.
@@ -613,13 +874,14 @@ async def restore_chat_data(
     Args:
         input_path: Input file path
         overwrite_existing: Whether to overwrite existing data
+        qdrant_service: Qdrant service used to restore exported vectors
         
     Returns:
         MigrationResult with restore statistics
     """
-    migration_utility = ChatMigrationUtility()
+    migration_utility = ChatMigrationUtility(qdrant_service=qdrant_service)
     return await migration_utility.import_chat_data(
         input_path=input_path,
         overwrite_existing=overwrite_existing,
         validate_data=True
-    )
\ No newline at end of file
+    )
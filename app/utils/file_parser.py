@@ -2,10 +2,56 @@
 Utility module for parsing various file types and extracting their text content.
 """
 
-from typing import Any
+from typing import Any, Optional, Sequence, Tuple
 import pymupdf4llm
 from app.utils.temp_file import secure_temp_file
 
+
+def inspect_pdf(path: str) -> Tuple[int, Any]:
+    """
+    Reads the page count and header levels of a PDF.
+
+    Header levels are derived from font sizes across the whole document, so
+    page ranges parsed separately with ``parse_pdf_pages`` share them.
+
+    Args:
+        path (str): Path to the PDF file.
+
+    Returns:
+        Tuple[int, Any]: The page count and a picklable ``IdentifyHeaders``.
+    """
+    import pymupdf
+    with pymupdf.open(path) as doc:
+        return doc.page_count, pymupdf4llm.IdentifyHeaders(doc)
+
+
+def parse_pdf_pages(path: str, pages: Sequence[int], hdr_info: Optional[Any] = None) -> str:
+    """
+    Converts a range of PDF pages to Markdown.
+
+    Concatenating the results for consecutive ranges gives the same text as
+    converting the whole document. Module-level so it can run in a process pool.
+
+    Args:
+        path (str): Path to the PDF file.
+        pages (Sequence[int]): Zero-based page numbers to convert.
+        hdr_info (Optional[Any]): Header levels from ``inspect_pdf``.
+
+    Returns:
+        str: The Markdown text of the pages.
+    """
+    import pymupdf
+    with pymupdf.open(path) as doc:
+        return pymupdf4llm.to_markdown(
+            doc,
+            pages=list(pages),
+            hdr_info=hdr_info,
+            table_strategy="lines_strict",
+            ignore_images=True,
+            show_progress=False,
+        )
+
+
 class FileParser:
     """
     A utility class for parsing different file types (TXT, MD, PDF, DOCX)
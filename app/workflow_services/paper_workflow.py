@@ -380,18 +380,15 @@ class PaperWorkflow:
         """Render immersive writer prompt for specific philosopher."""
         # Get philosopher info (this would come from your philosopher_info module)
         from app.core.philosopher_info import PHILOSOPHER_INFO
+        from app.core.philosopher_loader import get_prompt_fragment, writer_system_context
 
         if collection in PHILOSOPHER_INFO:
-            philosopher_data = PHILOSOPHER_INFO[collection]
+            prebuilt = get_prompt_fragment("workflows/writer/immersive_system.j2", collection)
+            if prebuilt is not None:
+                return prebuilt
             return self.prompt_renderer.render(
                 "workflows/writer/immersive_system.j2",
-                {
-                    "philosopher_name": collection,
-                    "axioms": philosopher_data.get("axioms", []),
-                    "personality": philosopher_data.get("personality", []),
-                    "rhetorical_tactics": philosopher_data.get("rhetorical_tactics", []),
-                    "cognitive_tone": philosopher_data.get("cognitive_tone", [])
-                }
+                writer_system_context(collection, PHILOSOPHER_INFO[collection])
             )
         else:
             # Fallback to academic style if philosopher not found
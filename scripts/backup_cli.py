@@ -160,10 +160,21 @@ class BackupCLI:
         collection_filter: Optional[str] = None,
         target_prefix: Optional[str] = None,
         overwrite: bool = False,
-        philosophy_only: bool = True
+        philosophy_only: bool = True,
+        upsert_workers: Optional[int] = None,
+        parallel_collections: Optional[int] = None,
+        max_points_per_second: Optional[float] = None
     ):
         """Backup collections from production to local."""
         await self.initialize_service()
+
+        # Pipeline tuning overrides
+        if upsert_workers:
+            self.backup_service.upsert_workers = upsert_workers
+        if parallel_collections:
+            self.backup_service.parallel_collections = parallel_collections
+        if max_points_per_second:
+            self.backup_service.max_points_per_second = max_points_per_second
         
         print("Starting backup operation...")
         
@@ -196,6 +207,8 @@ class BackupCLI:
             print(f"  Failed: {result['failed_backups']}")
             print(f"  Total Points: {result['total_source_points']:,} -> {result['total_target_points']:,}")
             print(f"  Duration: {result.get('duration_seconds', 0):.1f} seconds")
+            if result.get('points_per_second'):
+                print(f"  Throughput: {result['points_per_second']:,.0f} points/sec")
             
             if result['errors']:
                 print(f"\nErrors:")
@@ -255,6 +268,61 @@ class BackupCLI:
             print(f"✗ Validation failed: {e}")
             return None
     
+    async def repair_collection(
+        self,
+        source_collection: str,
+        target_collection: str,
+        repair_mode: str = "incremental_sync",
+        dry_run: bool = False,
+        compare_content: bool = False,
+        resume: bool = True
+    ):
+        """Incrementally repair a target collection, copying/deleting only differences."""
+        await self.initialize_service()
+
+        print(f"Repairing {target_collection} from {source_collection} (mode: {repair_mode}"
+              f"{', dry run' if dry_run else ''})...")
+
+        try:
+            result = await self.backup_service.repair_collection(
+                source_collection=source_collection,
+                target_collection=target_collection,
+                repair_mode=repair_mode,
+                dry_run=dry_run,
+                compare_content=compare_content,
+                resume=resume
+            )
+
+            print(f"\nRepair Result: {'✓ OK' if result['success'] else '✗ FAILED'}")
+
+            diff = result.get("diff")
+            if diff:
+                if diff["resumed_from_checkpoint"]:
+                    print("  Resumed from checkpoint")
+                print(f"  Scanned: {diff['scanned_source_points']:,} source / {diff['scanned_target_points']:,} target points")
+                print(f"  Missing in target: {diff['missing_points']:,}")
+                print(f"  Changed: {diff['changed_points']:,}")
+                print(f"  Extra in target: {diff['extra_points']:,}")
+                print(f"  Copied: {diff['copied_points']:,}")
+                print(f"  Deleted: {diff['deleted_points']:,}")
+                for label, key in (("Missing", "sample_missing_ids"), ("Changed", "sample_changed_ids"),
+                                   ("Extra", "sample_extra_ids")):
+                    if diff[key]:
+                        print(f"  {label} ids (sample): {', '.join(str(i) for i in diff[key][:20])}")
+            else:
+                print(f"  Repaired points: {result['repaired_points']:,}")
+
+            if result['errors']:
+                print(f"\nErrors:")
+                for error in result['errors']:
+                    print(f"  - {error}")
+
+            return result
+
+        except Exception as e:
+            print(f"✗ Repair failed: {e}")
+            return None
+
     async def cleanup(self):
         """Clean up resources."""
         if self.backup_service:
@@ -287,6 +355,9 @@ async def main():
     backup_parser.add_argument("--prefix", help="Target collection name prefix")
     backup_parser.add_argument("--overwrite", action="store_true", help="Overwrite existing collections")
     backup_parser.add_argument("--all", action="store_true", help="Backup all collections (not just philosophy)")
+    backup_parser.add_argument("--workers", type=int, help="Concurrent upsert workers per collection")
+    backup_parser.add_argument("--parallel", type=int, help="Collections to back up concurrently")
+    backup_parser.add_argument("--max-rate", type=float, help="Global cap on copied points per second")
 
     # Snapshot backup command (faster and more reliable)
     snapshot_parser = subparsers.add_parser("snapshot", help="Backup a single collection using snapshots (recommended)")
@@ -300,6 +371,17 @@ async def main():
     validate_parser.add_argument("target_collection", help="Target collection name")
     validate_parser.add_argument("--sample-size", type=int, default=100, help="Sample size for validation")
     
+    # Repair / incremental sync command
+    repair_parser = subparsers.add_parser("repair", help="Incrementally sync a local collection with production")
+    repair_parser.add_argument("source_collection", help="Source collection name")
+    repair_parser.add_argument("target_collection", help="Target collection name")
+    repair_parser.add_argument("--mode", choices=["missing_points", "incremental_sync", "full_sync"],
+                               default="incremental_sync", help="Repair mode")
+    repair_parser.add_argument("--dry-run", action="store_true", help="Only report differences")
+    repair_parser.add_argument("--compare-content", action="store_true",
+                               help="Detect changed points by payload/vector hash")
+    repair_parser.add_argument("--no-resume", action="store_true", help="Ignore any saved checkpoint")
+    
     args = parser.parse_args()
     
     if not args.command:
@@ -324,7 +406,10 @@ async def main():
                 collection_filter=args.filter,
                 target_prefix=args.prefix,
                 overwrite=args.overwrite,
-                philosophy_only=not args.all
+                philosophy_only=not args.all,
+                upsert_workers=args.workers,
+                parallel_collections=args.parallel,
+                max_points_per_second=args.max_rate
             )
 
         elif args.command == "snapshot":
@@ -340,6 +425,16 @@ async def main():
                 args.target_collection,
                 args.sample_size
             )
+
+        elif args.command == "repair":
+            await cli.repair_collection(
+                args.source_collection,
+                args.target_collection,
+                repair_mode=args.mode,
+                dry_run=args.dry_run,
+                compare_content=args.compare_content,
+                resume=not args.no_resume
+            )
         
     except KeyboardInterrupt:
         print("\n✗ Operation cancelled by user")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Philosopher asset bundle build tool.
+Compiles philosopher metadata, priming passages and static prompt fragments
+into the bundle workers load at startup (philosopher_bundle_path), instead of
+each worker rendering the templates. Run it on every deploy that changes
+prompt templates; running workers swap in the new bundle within a minute.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config.settings import get_settings
+from app.core.philosopher_bundle import PhilosopherBundle
+from app.core.philosopher_loader import build_philosopher_bundle
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Build the philosopher asset bundle")
+    parser.add_argument("--output", default=settings.philosopher_bundle_path, help="Bundle path")
+    args = parser.parse_args()
+    if not args.output:
+        parser.error("No output path: pass --output or set philosopher_bundle_path")
+
+    start = time.perf_counter()
+    content_hash = build_philosopher_bundle(args.output)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bundle = PhilosopherBundle.open(args.output)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"Built {args.output} in {build_seconds:.2f}s: {len(bundle.philosophers)} philosophers, "
+          f"{len(bundle)} texts, content hash {content_hash[:16]}; loads in {load_ms:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,7 +19,8 @@ from typing import Optional
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.utils.chat_batch_processor import (
-    ChatBatchProcessor, BatchProcessingProgress, batch_process_chat_vectors, batch_upload_to_qdrant
+    ChatBatchProcessor, BatchProcessingProgress, DEFAULT_TARGET_LATENCY_MS,
+    batch_process_chat_vectors, batch_upload_to_qdrant
 )
 from app.utils.chat_cleanup import (
     ChatCleanupUtility, RetentionPolicy, cleanup_expired_chat_data, 
@@ -28,6 +29,7 @@ from app.utils.chat_cleanup import (
 from app.utils.chat_migration import (
     ChatMigrationUtility, export_session_data, backup_all_chat_data, restore_chat_data
 )
+from app.core.constants import CHAT_BATCH_CHECKPOINT_DIR
 from app.core.logger import log
 from app.services.chat_qdrant_service import ChatQdrantService
 from app.services.llm_manager import LLMManager
@@ -42,6 +44,15 @@ def get_cli_chat_qdrant_service() -> ChatQdrantService:
     return ChatQdrantService(qdrant_client=qdrant_manager.qclient, llm_manager=llm_manager)
 
 
+def batch_processor_options(args) -> dict:
+    """Checkpoint and throttling options shared by the batch commands."""
+    return {
+        "resume": not args.restart,
+        "checkpoint_dir": args.checkpoint_dir,
+        "target_latency_ms": args.target_latency_ms or None,
+    }
+
+
 def progress_callback(progress: BatchProcessingProgress):
     """Progress callback for batch operations."""
     percent = (progress.processed_items / progress.total_items) * 100 if progress.total_items > 0 else 0
@@ -62,7 +73,8 @@ async def cmd_batch_vectors(args):
         batch_size=args.batch_size,
         max_concurrent=args.max_concurrent,
         qdrant_service=qdrant_service,
-        progress_callback=progress_callback if args.verbose else None
+        progress_callback=progress_callback if args.verbose else None,
+        **batch_processor_options(args)
     )
     
     print(f"\nBatch vector processing completed:")
@@ -70,6 +82,7 @@ async def cmd_batch_vectors(args):
     print(f"  Successful: {result.successful}")
     print(f"  Failed: {result.failed}")
     print(f"  Duration: {result.duration_seconds:.2f}s")
+    print(f"  Resumed from checkpoint: {result.resumed_from_checkpoint}")
     
     if result.errors and args.verbose:
         print(f"\nErrors ({len(result.errors)}):")
@@ -92,7 +105,8 @@ async def cmd_batch_upload(args):
         batch_size=args.batch_size,
         max_concurrent=args.max_concurrent,
         qdrant_service=qdrant_service,
-        progress_callback=progress_callback if args.verbose else None
+        progress_callback=progress_callback if args.verbose else None,
+        **batch_processor_options(args)
     )
     
     print(f"\nBatch Qdrant upload completed:")
@@ -100,6 +114,7 @@ async def cmd_batch_upload(args):
     print(f"  Successful: {result.successful}")
     print(f"  Failed: {result.failed}")
     print(f"  Duration: {result.duration_seconds:.2f}s")
+    print(f"  Resumed from checkpoint: {result.resumed_from_checkpoint}")
     
     if result.errors and args.verbose:
         print(f"\nErrors ({len(result.errors)}):")
@@ -220,11 +235,13 @@ async def cmd_export_session(args):
     result = await export_session_data(
         session_id=args.session_id,
         output_path=args.output,
-        include_vectors=args.include_vectors
+        include_vectors=args.include_vectors,
+        qdrant_service=get_cli_chat_qdrant_service() if args.include_vectors else None
     )
     
     print(f"\nSession export completed:")
     print(f"  Operation: {result.operation}")
+    print(f"  Resumed from checkpoint: {result.resumed_from_checkpoint}")
     print(f"  Conversations exported: {result.migrated_conversations}")
     print(f"  Messages exported: {result.migrated_messages}")
     print(f"  Duration: {result.duration_seconds:.2f}s")
@@ -243,11 +260,13 @@ async def cmd_backup_all(args):
     
     result = await backup_all_chat_data(
         output_path=args.output,
-        include_vectors=args.include_vectors
+        include_vectors=args.include_vectors,
+        qdrant_service=get_cli_chat_qdrant_service() if args.include_vectors else None
     )
     
     print(f"\nBackup completed:")
     print(f"  Operation: {result.operation}")
+    print(f"  Resumed from checkpoint: {result.resumed_from_checkpoint}")
     print(f"  Conversations backed up: {result.migrated_conversations}")
     print(f"  Messages backed up: {result.migrated_messages}")
     print(f"  Duration: {result.duration_seconds:.2f}s")
@@ -266,11 +285,13 @@ async def cmd_restore(args):
     
     result = await restore_chat_data(
         input_path=args.input,
-        overwrite_existing=args.overwrite
+        overwrite_existing=args.overwrite,
+        qdrant_service=get_cli_chat_qdrant_service() if args.restore_vectors else None
     )
     
     print(f"\nRestore completed:")
     print(f"  Operation: {result.operation}")
+    print(f"  Resumed from checkpoint: {result.resumed_from_checkpoint}")
     print(f"  Conversations restored: {result.migrated_conversations}")
     print(f"  Messages restored: {result.migrated_messages}")
     print(f"  Skipped items: {result.skipped_items}")
@@ -282,6 +303,21 @@ async def cmd_restore(args):
             print(f"  - {error}")
 
 
+async def cmd_migrate_hybrid(args):
+    """Add sparse vectors to the chat collection for hybrid search."""
+    print(f"Migrating chat collection to hybrid (sparse + dense) vectors...")
+    print(f"Batch size: {args.batch_size}")
+    qdrant_service = get_cli_chat_qdrant_service()
+    print(f"Collection: {qdrant_service.collection_name}")
+    
+    counts = await qdrant_service.migrate_to_hybrid(batch_size=args.batch_size)
+    
+    print(f"\nHybrid migration completed:")
+    print(f"  Points copied to staging: {counts['copied']}")
+    print(f"  Points restored from staging: {counts['restored']}")
+    print(f"  Sparse vectors backfilled: {counts['backfilled']}")
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -289,7 +325,7 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  # Batch process vectors for all sessions
+  # Batch process vectors for all sessions (rerun to resume after an interruption)
   python scripts/chat_maintenance_cli.py batch-vectors --batch-size 50
 
   # Clean up data older than 30 days
@@ -300,6 +336,9 @@ Examples:
 
   # Get cleanup statistics
   python scripts/chat_maintenance_cli.py cleanup-stats
+
+  # Add sparse vectors to an existing chat collection (pause chat writes first)
+  python scripts/chat_maintenance_cli.py migrate-hybrid
         """
     )
     
@@ -318,6 +357,13 @@ Examples:
     batch_upload_parser.add_argument('--batch-size', type=int, default=100, help='Batch size (default: 100)')
     batch_upload_parser.add_argument('--max-concurrent', type=int, default=5, help='Max concurrent operations (default: 5)')
     
+    for batch_parser in (batch_vectors_parser, batch_upload_parser):
+        batch_parser.add_argument('--checkpoint-dir', default=CHAT_BATCH_CHECKPOINT_DIR,
+                                  help=f'Directory for resume checkpoints (default: {CHAT_BATCH_CHECKPOINT_DIR})')
+        batch_parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint and start over')
+        batch_parser.add_argument('--target-latency-ms', type=float, default=DEFAULT_TARGET_LATENCY_MS,
+                                  help=f'Slow down while Qdrant latency exceeds this (default: {DEFAULT_TARGET_LATENCY_MS:.0f}, 0 disables)')
+    
     # Cleanup commands
     cleanup_expired_parser = subparsers.add_parser('cleanup-expired', help='Clean up expired chat data')
     cleanup_expired_parser.add_argument('--max-age-days', type=int, default=90, help='Maximum age in days (default: 90)')
@@ -336,16 +382,20 @@ Examples:
     # Migration commands
     export_session_parser = subparsers.add_parser('export-session', help='Export data for a specific session')
     export_session_parser.add_argument('--session-id', required=True, help='Session ID to export')
-    export_session_parser.add_argument('--output', required=True, help='Output JSON file path')
+    export_session_parser.add_argument('--output', required=True, help='Output NDJSON file path (use a .gz suffix to compress)')
     export_session_parser.add_argument('--include-vectors', action='store_true', help='Include vector data')
     
     backup_all_parser = subparsers.add_parser('backup-all', help='Backup all chat data')
-    backup_all_parser.add_argument('--output', required=True, help='Output JSON file path')
+    backup_all_parser.add_argument('--output', required=True, help='Output NDJSON file path (use a .gz suffix to compress)')
     backup_all_parser.add_argument('--include-vectors', action='store_true', help='Include vector data')
     
     restore_parser = subparsers.add_parser('restore', help='Restore chat data from backup')
-    restore_parser.add_argument('--input', required=True, help='Input JSON file path')
+    restore_parser.add_argument('--input', required=True, help='Input NDJSON (or legacy JSON) file path')
     restore_parser.add_argument('--overwrite', action='store_true', help='Overwrite existing data')
+    restore_parser.add_argument('--restore-vectors', action='store_true', help='Upsert exported vector data to Qdrant')
+    
+    migrate_hybrid_parser = subparsers.add_parser('migrate-hybrid', help='Add sparse vectors to the chat collection')
+    migrate_hybrid_parser.add_argument('--batch-size', type=int, default=64, help='Points per batch (default: 64)')
     
     args = parser.parse_args()
     
@@ -364,6 +414,7 @@ Examples:
         'export-session': cmd_export_session,
         'backup-all': cmd_backup_all,
         'restore': cmd_restore,
+        'migrate-hybrid': cmd_migrate_hybrid,
     }
     
     command_func = command_map.get(args.command)
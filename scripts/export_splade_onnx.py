@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+SPLADE ONNX export CLI tool.
+Exports the configured SPLADE model to ONNX (optionally int8-quantized) so the
+API can start with splade_backend = "onnx" without exporting at startup.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config.settings import get_settings
+from app.services.splade_runtime import export_splade_onnx, load_onnx_encoder, load_torch_encoder
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Export the SPLADE model to ONNX")
+    parser.add_argument("--model", default=settings.splade_model, help="Model name or path")
+    parser.add_argument("--output-dir", default=settings.splade_onnx_dir, help="Artifact directory")
+    parser.add_argument("--no-quantize", action="store_true", help="Serve the fp32 graph instead of int8")
+    args = parser.parse_args()
+
+    quantize = not args.no_quantize
+    torch_encoder = load_torch_encoder(args.model, optimize=False)
+    export_splade_onnx(torch_encoder.model, torch_encoder.tokenizer, args.output_dir, args.model, quantize)
+
+    # Load once so ONNX Runtime persists its optimized graph alongside the export
+    start = time.perf_counter()
+    encoder = load_onnx_encoder(args.output_dir, quantize)
+    encoder.encode("warm up")
+    print(f"Exported {args.model} to {args.output_dir} (int8={quantize}); "
+          f"load + first encode took {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Micro-benchmark for per-request middleware overhead.
+
+Compares the previous ``BaseHTTPMiddleware``-style stack (security headers,
+startup check and subscription pass-through written with ``call_next``)
+against the pure ASGI middlewares now used by the application, on a plain
+JSON endpoint and on an SSE streaming endpoint.
+
+Run directly for a timing table:
+    python -m tests.bench.test_middleware_overhead
+"""
+
+import asyncio
+import statistics as stats
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.asgi_middleware import SecurityHeadersMiddleware, StartupCheckMiddleware
+from app.core.security import SecurityManager
+from app.core.subscription_middleware import SubscriptionMiddleware
+
+STREAM_CHUNKS = 50
+REQUESTS = 300
+
+
+def _add_routes(app: FastAPI) -> FastAPI:
+    @app.get("/json")
+    async def json_endpoint():
+        return {"answer": "The unexamined life is not worth living.", "score": 0.97}
+
+    @app.get("/ask_philosophy/stream")
+    async def stream_endpoint():
+        async def events():
+            for i in range(STREAM_CHUNKS):
+                yield f"data: chunk {i}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def build_base_http_app() -> FastAPI:
+    """Application with the previous BaseHTTPMiddleware-based stack."""
+    app = _add_routes(FastAPI())
+
+    class LegacySubscriptionMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            # Path the old middleware took when no SubscriptionManager is configured
+            return await call_next(request)
+
+    app.add_middleware(LegacySubscriptionMiddleware)
+
+    @app.middleware("http")
+    async def security_headers_middleware(request: Request, call_next):
+        response = await call_next(request)
+        for header_name, header_value in SecurityManager.get_security_headers().items():
+            response.headers[header_name] = header_value
+        return response
+
+    @app.middleware("http")
+    async def startup_check_middleware(request: Request, call_next):
+        if request.url.path.startswith("/health"):
+            return await call_next(request)
+        if not getattr(app.state, "serving_enabled", True) and getattr(app.state, "startup_errors", []):
+            return JSONResponse(status_code=503, content={"error": "Service Unavailable"})
+        return await call_next(request)
+
+    return app
+
+
+def build_pure_asgi_app() -> FastAPI:
+    """Application with the pure ASGI middleware stack."""
+    app = _add_routes(FastAPI())
+    app.add_middleware(SubscriptionMiddleware, enabled=True)
+    app.add_middleware(SecurityHeadersMiddleware)
+    app.add_middleware(StartupCheckMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, path: str, requests: int = REQUESTS) -> dict:
+    """Return mean/p50/p95 latency in microseconds for ``requests`` sequential calls."""
+    transport = httpx.ASGITransport(app=app)
+    timings = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for _ in range(20):  # Warm-up
+            await client.get(path)
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = await client.get(path)
+            response.read()
+            timings.append((time.perf_counter() - start) * 1_000_000)
+    timings.sort()
+    return {
+        "mean_us": stats.mean(timings),
+        "p50_us": timings[len(timings) // 2],
+        "p95_us": timings[int(len(timings) * 0.95)],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("builder", [build_base_http_app, build_pure_asgi_app])
+async def test_stacks_produce_identical_responses(builder):
+    """Both stacks must return the same headers and unbuffered stream content."""
+    transport = httpx.ASGITransport(app=builder())
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        json_response = await client.get("/json")
+        stream_response = await client.get("/ask_philosophy/stream")
+
+    expected_headers = SecurityManager.get_security_headers()
+    for response in (json_response, stream_response):
+        assert response.status_code == 200
+        for header_name, header_value in expected_headers.items():
+            assert response.headers[header_name] == header_value
+    assert json_response.json()["score"] == 0.97
+    assert stream_response.text.count("data: chunk") == STREAM_CHUNKS
+
+
+@pytest.mark.asyncio
+async def test_startup_check_returns_503_when_serving_disabled():
+    app = build_pure_asgi_app()
+    app.state.serving_enabled = False
+    app.state.startup_errors = ["qdrant unavailable"]
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        blocked = await client.get("/json")
+
+    assert blocked.status_code == 503
+    assert blocked.json()["startup_errors"] == ["qdrant unavailable"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_overhead_benchmark():
+    """Report per-request latency for both stacks (informational, no timing assertions)."""
+    results = {}
+    for name, builder in (("BaseHTTPMiddleware", build_base_http_app), ("pure ASGI", build_pure_asgi_app)):
+        app = builder()
+        for path in ("/json", "/ask_philosophy/stream"):
+            results[(name, path)] = await measure(app, path, requests=50)
+
+    for (name, path), timing in results.items():
+        print(f"{name:>20} {path:<24} mean={timing['mean_us']:.0f}us p95={timing['p95_us']:.0f}us")
+        assert timing["mean_us"] > 0
+
+
+async def _main():
+    print(f"{'stack':>20} {'endpoint':<24} {'mean':>10} {'p50':>10} {'p95':>10}")
+    for name, builder in (("BaseHTTPMiddleware", build_base_http_app), ("pure ASGI", build_pure_asgi_app)):
+        app = builder()
+        for path in ("/json", "/ask_philosophy/stream"):
+            timing = await measure(app, path)
+            print(f"{name:>20} {path:<24} {timing['mean_us']:>8.0f}us "
+                  f"{timing['p50_us']:>8.0f}us {timing['p95_us']:>8.0f}us")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
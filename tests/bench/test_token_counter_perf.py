@@ -0,0 +1,80 @@
+"""
+Micro-benchmark for per-request token accounting.
+
+Compares the cost of counting a request's texts (query, retrieved nodes and
+response) cold, i.e. one batched tokenizer call, against warm counts served
+from the per-text-hash cache, with the character estimate as a baseline.
+
+Run directly for a timing table:
+    python -m tests.bench.test_token_counter_perf
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from transformers import BertTokenizerFast
+
+from app.services.token_counter import TokenCounter, estimate_tokens
+
+WORDS = ("virtue justice courage wisdom reason duty will power being time nature "
+         "mind body soul truth beauty good evil law state freedom knowledge").split()
+NODES_PER_REQUEST = 10
+REQUESTS = 200
+
+
+def build_tokenizer(directory: Path) -> BertTokenizerFast:
+    vocab_file = directory / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *WORDS]))
+    return BertTokenizerFast(vocab_file=str(vocab_file))
+
+
+def request_texts(request_id: int) -> list[str]:
+    """Query, retrieved node texts (shared across requests) and a unique response."""
+    nodes = [" ".join(WORDS[(n + i) % len(WORDS)] for i in range(300)) for n in range(NODES_PER_REQUEST)]
+    return [f"what is virtue {request_id}", *nodes, " ".join(WORDS) * 5 + f" {request_id}"]
+
+
+def measure(count, requests: int = REQUESTS) -> float:
+    """Mean microseconds per request to count all of its texts."""
+    batches = [request_texts(i) for i in range(requests)]
+    start = time.perf_counter()
+    for texts in batches:
+        count(texts)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+def run(tokenizer: BertTokenizerFast, requests: int = REQUESTS) -> dict:
+    cold = TokenCounter(tokenizer=tokenizer.backend_tokenizer, max_entries=0)
+    warm = TokenCounter(tokenizer=tokenizer.backend_tokenizer)
+    warm.count_batch(request_texts(-1))
+    return {
+        "estimate": measure(lambda texts: [estimate_tokens(t) for t in texts], requests),
+        "tokenizer (cold)": measure(cold.count_batch, requests),
+        "tokenizer (cached)": measure(warm.count_batch, requests),
+    }
+
+
+def test_cached_counts_match_cold_counts(tmp_path):
+    tokenizer = build_tokenizer(tmp_path)
+    cold = TokenCounter(tokenizer=tokenizer.backend_tokenizer, max_entries=0)
+    warm = TokenCounter(tokenizer=tokenizer.backend_tokenizer)
+    texts = request_texts(0)
+
+    assert warm.count_batch(texts) == warm.count_batch(texts) == cold.count_batch(texts)
+    assert warm.get_stats()["hits"] == len(set(texts))
+
+
+def test_token_counter_benchmark(tmp_path):
+    """Report per-request counting cost (informational, no timing assertions)."""
+    for name, mean_us in run(build_tokenizer(tmp_path), requests=20).items():
+        print(f"{name:>20} mean={mean_us:.0f}us/request")
+        assert mean_us > 0
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(build_tokenizer(Path(directory)))
+    print(f"{'backend':>20} {'per request':>12}   ({NODES_PER_REQUEST + 2} texts/request)")
+    for name, mean_us in results.items():
+        print(f"{name:>20} {mean_us:>10.0f}us")
@@ -19,7 +19,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 import httpx
 from fastapi.testclient import TestClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
 
 from tests.fixtures import get_canned_response
 from tests.helpers import (
@@ -230,7 +232,21 @@ class TestEnvironmentManager:
                 reset_dependency_cache()
             except ImportError:
                 pass
-            
+
+            # Clear cross-request authentication caches
+            try:
+                from app.core.principal import user_cache
+                user_cache.clear()
+            except ImportError:
+                pass
+
+            # Reset in-process rate limit buckets
+            try:
+                from app.core.rate_limiting import limiter
+                limiter.fallback.clear()
+            except ImportError:
+                pass
+
             # Clear test-specific resources
             if test_name and test_name in TestEnvironmentManager._test_resources:
                 resources = TestEnvironmentManager._test_resources.pop(test_name)
@@ -838,6 +854,16 @@ def configure_db_query_results(mock_db_session):
     return _configure
 
 
+@pytest.fixture
+async def session_factory(tmp_path):
+    """Session factory for a real SQLite database (aiosqlite) with every table created."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
 @pytest.fixture(autouse=True)
 def performance_monitor(request):
     """Monitor test performance and resource usage with health tracking (autouse for all tests)."""
@@ -1037,8 +1063,8 @@ def mock_all_services(
         # Patch the underlying dependencies that LLMManager/QdrantManager use
         patch("app.services.llm_manager.Ollama"),
         patch("app.services.llm_manager.OllamaEmbedding"),
-        patch("app.services.llm_manager.AutoTokenizer"),
-        patch("app.services.llm_manager.AutoModelForMaskedLM"),
+        patch("app.services.splade_runtime.AutoTokenizer"),
+        patch("app.services.splade_runtime.AutoModelForMaskedLM"),
         patch("app.services.qdrant_manager.AsyncQdrantClient"),
         # Patch the underlying class constructors to return our mocks
         patch("app.services.llm_manager.LLMManager", return_value=mock_llm_manager),
@@ -1060,12 +1086,15 @@ def mock_all_services(
     
     test_resource_manager.add_cleanup_callback(cleanup_patches)
     
-    return {
+    yield {
         "llm": mock_llm_manager, 
         "qdrant": mock_qdrant_manager,
         "cache": mock_cache_service
     }
 
+    # Stop the patches when the test finishes so they don't leak into later tests
+    cleanup_patches()
+
 
 @pytest.fixture
 async def async_client(mock_environment: None, mock_all_services: Dict[str, MagicMock]):
@@ -1283,12 +1312,12 @@ def test_app_with_mocked_services(mock_environment: None, mock_all_services: Dic
     # Configure app with routers and middleware
     from app.router import router
     from app.core.rate_limiting import limiter
-    from slowapi.middleware import SlowAPIMiddleware
+    from app.core.asgi_middleware import RateLimitHeadersMiddleware
 
     previous_limiter_enabled = limiter.enabled
     app.state.limiter = limiter
     limiter.enabled = False
-    app.add_middleware(SlowAPIMiddleware)
+    app.add_middleware(RateLimitHeadersMiddleware)
     app.include_router(router)
     
     try:
@@ -1670,6 +1699,7 @@ __all__ = [
     "mock_db_session",
     "mock_db_session_factory",
     "configure_db_query_results",
+    "session_factory",
     # Authentication mock fixtures (Task 3.3)
     "mock_auth_token",
     "mock_user_free_tier",
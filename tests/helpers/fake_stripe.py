@@ -0,0 +1,317 @@
+"""
+In-process stand-in for the Stripe API.
+
+FakeStripe exposes the part of the stripe SDK that PaymentService uses
+(``Customer``, ``Subscription``, ``checkout.Session``, ``Refund``,
+``PaymentMethod``, ``Dispute``, ``Charge``) with the same call signatures,
+keeping all objects in memory. Pass it as ``stripe_api`` to PaymentService
+to run the payment flows offline:
+
+    fake = FakeStripe()
+    payments = PaymentService(cache_service, stripe_api=fake)
+    charge = fake.add_charge("cus_...", amount=2000)
+
+Idempotency keys behave as in Stripe: replaying a key returns the object
+created by the first request. Failures and latency can be injected to
+exercise the gateway's retries, timeouts and circuit breaker.
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import stripe
+
+
+class FakeStripeObject(dict):
+    """A dict with attribute access, like stripe.StripeObject."""
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        self[name] = value
+
+
+def _obj(**fields: Any) -> FakeStripeObject:
+    return FakeStripeObject(fields)
+
+
+def _list(items: List[FakeStripeObject]) -> FakeStripeObject:
+    return _obj(object="list", data=list(items), has_more=False)
+
+
+class _Resource:
+    prefix = ""
+
+    def __init__(self, fake: "FakeStripe"):
+        self._fake = fake
+        self._objects: Dict[str, FakeStripeObject] = {}
+
+    def _retrieve(self, object_id: str) -> FakeStripeObject:
+        if object_id not in self._objects:
+            raise stripe.InvalidRequestError(f"No such {type(self).__name__.lower()}: '{object_id}'", "id")
+        return self._objects[object_id]
+
+    def _store(self, **fields: Any) -> FakeStripeObject:
+        obj = _obj(id=self._fake._new_id(self.prefix), created=int(time.time()), livemode=False, **fields)
+        self._objects[obj.id] = obj
+        return obj
+
+
+class Customer(_Resource):
+    prefix = "cus"
+
+    def create(self, email: Optional[str] = None, name: Optional[str] = None,
+               metadata: Optional[Dict[str, str]] = None, **params: Any) -> FakeStripeObject:
+        return self._fake._request(params, lambda: self._store(email=email, name=name, metadata=metadata or {}))
+
+    def retrieve(self, customer_id: str, **params: Any) -> FakeStripeObject:
+        return self._fake._request(params, lambda: self._retrieve(customer_id))
+
+
+class Subscription(_Resource):
+    prefix = "sub"
+    PERIOD_SECONDS = 30 * 24 * 3600
+
+    def create(self, customer: str, items: List[Dict[str, Any]], **params: Any) -> FakeStripeObject:
+        def create():
+            self._fake.Customer._retrieve(customer)
+            now = int(time.time())
+            return self._store(
+                customer=customer,
+                status="active",
+                current_period_start=now,
+                current_period_end=now + self.PERIOD_SECONDS,
+                cancel_at_period_end=False,
+                items=_list([
+                    _obj(price=_obj(id=item["price"]), quantity=item.get("quantity", 1)) for item in items
+                ]),
+            )
+        return self._fake._request(params, create, ignore=("payment_behavior", "payment_settings", "expand"))
+
+    def retrieve(self, subscription_id: str, **params: Any) -> FakeStripeObject:
+        return self._fake._request(params, lambda: self._retrieve(subscription_id))
+
+    def modify(self, subscription_id: str, **params: Any) -> FakeStripeObject:
+        def modify():
+            subscription = self._retrieve(subscription_id)
+            subscription.update(changes)
+            return subscription
+        changes = {k: v for k, v in params.items() if k != "idempotency_key"}
+        return self._fake._request(params, modify, ignore=tuple(changes))
+
+
+class CheckoutSession(_Resource):
+    prefix = "cs"
+
+    def create(self, **params: Any) -> FakeStripeObject:
+        def create():
+            if params.get("customer"):
+                self._fake.Customer._retrieve(params["customer"])
+            session = self._store(payment_status="unpaid", mode=params.get("mode"), customer=params.get("customer"))
+            session.url = f"https://checkout.stripe.test/pay/{session.id}"
+            return session
+        return self._fake._request(params, create, ignore=tuple(k for k in params if k != "idempotency_key"))
+
+
+class Charge(_Resource):
+    prefix = "ch"
+
+    def list(self, customer: Optional[str] = None, limit: int = 10, **params: Any) -> FakeStripeObject:
+        return self._fake._request(params, lambda: _list([
+            charge for charge in self._objects.values() if customer is None or charge.customer == customer
+        ][:limit]))
+
+
+class Refund(_Resource):
+    prefix = "re"
+
+    def create(self, payment_intent: str, amount: Optional[int] = None,
+               metadata: Optional[Dict[str, str]] = None, reason: Optional[str] = None,
+               **params: Any) -> FakeStripeObject:
+        def create():
+            charge = self._fake._charge_for(payment_intent)
+            remaining = charge.amount - charge.amount_refunded
+            refund_amount = remaining if amount is None else amount
+            if refund_amount <= 0 or refund_amount > remaining:
+                raise stripe.InvalidRequestError(
+                    f"Refund amount ({refund_amount}) is greater than unrefunded amount on charge ({remaining})",
+                    "amount",
+                )
+            charge.amount_refunded += refund_amount
+            return self._store(
+                amount=refund_amount,
+                currency=charge.currency,
+                status="succeeded",
+                payment_intent=payment_intent,
+                charge=charge.id,
+                reason=reason,
+                receipt_number=None,
+                metadata=metadata or {},
+            )
+        return self._fake._request(params, create)
+
+    def retrieve(self, refund_id: str, **params: Any) -> FakeStripeObject:
+        return self._fake._request(params, lambda: self._retrieve(refund_id))
+
+    def list(self, payment_intent: Optional[str] = None, **params: Any) -> FakeStripeObject:
+        return self._fake._request(params, lambda: _list([
+            refund for refund in self._objects.values()
+            if payment_intent is None or refund.payment_intent == payment_intent
+        ]))
+
+    def cancel(self, refund_id: str, **params: Any) -> FakeStripeObject:
+        def cancel():
+            refund = self._retrieve(refund_id)
+            if refund.status not in ("pending", "requires_action"):
+                raise stripe.InvalidRequestError(f"Refund {refund_id} with status {refund.status} cannot be canceled", "id")
+            refund.status = "canceled"
+            self._fake._charge_for(refund.payment_intent).amount_refunded -= refund.amount
+            return refund
+        return self._fake._request(params, cancel)
+
+
+class Dispute(_Resource):
+    prefix = "dp"
+
+    def retrieve(self, dispute_id: str, **params: Any) -> FakeStripeObject:
+        return self._fake._request(params, lambda: self._retrieve(dispute_id))
+
+    def modify(self, dispute_id: str, evidence: Optional[Dict[str, Any]] = None,
+               metadata: Optional[Dict[str, str]] = None, **params: Any) -> FakeStripeObject:
+        def modify():
+            dispute = self._retrieve(dispute_id)
+            if evidence:
+                dispute.evidence.update(evidence)
+                dispute.evidence_details.has_evidence = True
+                dispute.evidence_details.submission_count += 1
+                dispute.status = "under_review"
+            dispute.metadata.update(metadata or {})
+            return dispute
+        return self._fake._request(params, modify)
+
+    def close(self, dispute_id: str, **params: Any) -> FakeStripeObject:
+        def close():
+            dispute = self._retrieve(dispute_id)
+            dispute.status = "lost"
+            return dispute
+        return self._fake._request(params, close)
+
+
+class PaymentMethod(_Resource):
+    prefix = "pm"
+
+    def list(self, customer: str, type: str = "card", **params: Any) -> FakeStripeObject:
+        return self._fake._request(params, lambda: _list([
+            method for method in self._objects.values() if method.customer == customer and method.type == type
+        ]))
+
+
+class FakeStripe:
+    """
+    In-memory Stripe with the SDK's call surface.
+
+    Args:
+        latency_seconds: Blocking delay added to every call, like a slow network
+    """
+
+    def __init__(self, latency_seconds: float = 0.0):
+        self.latency_seconds = latency_seconds
+        self.calls = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._idempotent_results: Dict[str, Any] = {}
+        self._failures: List[tuple] = []
+        self.Customer = Customer(self)
+        self.Subscription = Subscription(self)
+        self.Charge = Charge(self)
+        self.Refund = Refund(self)
+        self.Dispute = Dispute(self)
+        self.PaymentMethod = PaymentMethod(self)
+        self.checkout = _obj(Session=CheckoutSession(self))
+
+    def _new_id(self, prefix: str) -> str:
+        return f"{prefix}_fake{next(self._ids):010d}"
+
+    def fail_next(self, error: Exception, times: int = 1, after_commit: bool = False) -> None:
+        """
+        Make the next ``times`` calls raise ``error``.
+
+        With ``after_commit`` the call takes effect before the error is
+        raised, like a request whose response was lost on the way back.
+        """
+        self._failures.extend([(error, after_commit)] * times)
+
+    def _request(self, params: Dict[str, Any], handler, ignore: tuple = ()) -> Any:
+        unexpected = set(params) - {"idempotency_key", *ignore}
+        if unexpected:
+            raise TypeError(f"Unexpected parameters: {sorted(unexpected)}")
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        with self._lock:
+            self.calls += 1
+            error, after_commit = self._failures.pop(0) if self._failures else (None, False)
+            if error is not None and not after_commit:
+                raise error
+            key = params.get("idempotency_key")
+            if key is not None and key in self._idempotent_results:
+                result = self._idempotent_results[key]
+            else:
+                result = handler()
+                if key is not None:
+                    self._idempotent_results[key] = result
+            if error is not None:
+                raise error
+            return result
+
+    # ---- Test data: objects that only Stripe itself would create ----
+
+    def add_charge(self, customer: str, amount: int, currency: str = "usd") -> FakeStripeObject:
+        """A succeeded charge (and its payment intent) for ``customer``."""
+        with self._lock:
+            return self.Charge._store(
+                customer=customer,
+                amount=amount,
+                amount_refunded=0,
+                currency=currency,
+                payment_intent=self._new_id("pi"),
+                dispute=None,
+            )
+
+    def add_card(self, customer: str, brand: str = "visa", last4: str = "4242") -> FakeStripeObject:
+        with self._lock:
+            return self.PaymentMethod._store(
+                customer=customer, type="card",
+                card=_obj(brand=brand, last4=last4, exp_month=12, exp_year=2030),
+            )
+
+    def open_dispute(self, charge_id: str, reason: str = "fraudulent") -> FakeStripeObject:
+        """A dispute needing a response on ``charge_id``."""
+        with self._lock:
+            charge = self.Charge._retrieve(charge_id)
+            dispute = self.Dispute._store(
+                amount=charge.amount,
+                currency=charge.currency,
+                status="needs_response",
+                reason=reason,
+                charge=charge.id,
+                payment_intent=charge.payment_intent,
+                is_charge_refundable=False,
+                metadata={},
+                network_reason_code="10.4",
+                evidence={},
+                evidence_details=_obj(due_by=int(time.time()) + 7 * 24 * 3600, has_evidence=False, submission_count=0),
+            )
+            charge.dispute = dispute
+            return dispute
+
+    def _charge_for(self, payment_intent: str) -> FakeStripeObject:
+        for charge in self.Charge._objects.values():
+            if charge.payment_intent == payment_intent:
+                return charge
+        raise stripe.InvalidRequestError(f"No such payment_intent: '{payment_intent}'", "payment_intent")
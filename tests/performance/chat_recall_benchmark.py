@@ -0,0 +1,179 @@
+"""
+Offline recall benchmark for chat history search.
+
+Stores a synthetic conversation history in an in-memory Qdrant through
+``ChatQdrantService`` and measures how often the message a question refers
+to is found, with hybrid (sparse + dense) search and with dense-only search.
+
+Every question names the rare term of one message (a person's name) while
+several other messages discuss the same topic. The dense stand-in embeds
+topic words only, the way embedding models blur rare names, so dense-only
+search has to pick between same-topic messages; the sparse stand-in matches
+exact terms like SPLADE does.
+
+Run directly:
+    python -m tests.performance.chat_recall_benchmark
+    python -m tests.performance.chat_recall_benchmark --topics 20 --messages-per-topic 8 --k 3
+"""
+
+import argparse
+import asyncio
+import random
+import re
+import sys
+import uuid
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from tests.performance.harness import CORPUS_WORDS
+
+MODES = ("hybrid", "dense")
+SESSION_ID = "recall-bench"
+SPARSE_DIMENSIONS = 30522  # SPLADE (BERT) vocabulary size
+SYLLABLES = ("ka", "zo", "mir", "vel", "tan", "rho", "quin", "dex", "lor", "ba", "sith", "nu")
+TOPIC_WORDS = frozenset(CORPUS_WORDS)
+# Function words, which SPLADE weights close to zero
+STOP_WORDS = frozenset("a about and argued belong did say that the together what".split())
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z]+", text.lower())
+
+
+class OfflineEncoders:
+    """Deterministic stand-ins for the dense embedding model and SPLADE."""
+
+    def __init__(self, dimensions: int = 4096):
+        self.dimensions = dimensions
+
+    def _word_vector(self, word: str) -> np.ndarray:
+        return np.random.default_rng(zlib.crc32(word.encode())).standard_normal(self.dimensions)
+
+    async def generate_dense_vector(self, text: str) -> List[float]:
+        """Sum of topic word vectors; other words (names) only add a little noise."""
+        vector = 0.1 * np.random.default_rng(zlib.crc32(text.encode())).standard_normal(self.dimensions)
+        for word in _words(text):
+            if word in TOPIC_WORDS:
+                vector += self._word_vector(word)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    async def generate_dense_vectors(self, texts: List[str]) -> List[List[float]]:
+        return [await self.generate_dense_vector(text) for text in texts]
+
+    async def generate_splade_vector(self, text: str) -> Dict[str, List]:
+        """Log-scaled term counts over hashed content words."""
+        weights: Counter = Counter()
+        for word, count in Counter(w for w in _words(text) if w not in STOP_WORDS).items():
+            weights[zlib.crc32(word.encode()) % SPARSE_DIMENSIONS] += 1.0 + float(np.log(count))
+        indices = sorted(weights)
+        return {"indices": indices, "values": [weights[i] for i in indices]}
+
+
+def synthetic_history(topics: int, messages_per_topic: int, seed: int) -> List[Tuple[str, str, str]]:
+    """
+    (name, content, question) per message.
+
+    Messages of a topic share its words and differ by the person they mention.
+    """
+    rng = random.Random(seed)
+    vocabulary = sorted(TOPIC_WORDS)
+    names = set()
+    history = []
+    for _ in range(topics):
+        topic = rng.sample(vocabulary, 6)
+        for _ in range(messages_per_topic):
+            name = "".join(rng.choice(SYLLABLES) for _ in range(3)).capitalize()
+            while name in names:
+                name = "".join(rng.choice(SYLLABLES) for _ in range(3)).capitalize()
+            names.add(name)
+            said = rng.sample(topic, 5)
+            content = f"{name} argued that {' '.join(said)} belong together."
+            question = f"What did {name} say about {' and '.join(rng.sample(said, 2))}?"
+            history.append((name, content, question))
+    return history
+
+
+@dataclass
+class RecallResult:
+    """Search quality for one mode."""
+
+    questions: int
+    recall_at_k: float
+    mrr: float
+
+
+async def run(topics: int = 12, messages_per_topic: int = 8, k: int = 3, seed: int = 7,
+              modes: Sequence[str] = MODES) -> Dict[str, RecallResult]:
+    """Store the synthetic history once and ask every question in each mode."""
+    from qdrant_client import AsyncQdrantClient
+
+    from app.core.db_models import ChatMessage, MessageRole
+    from app.services.chat_qdrant_service import ChatQdrantService
+
+    client = AsyncQdrantClient(location=":memory:")
+    service = ChatQdrantService(client, OfflineEncoders())
+    service.use_fusion = False
+    try:
+        questions = []
+        for name, content, question in synthetic_history(topics, messages_per_topic, seed):
+            message = ChatMessage(
+                message_id=str(uuid.uuid4()),
+                conversation_id=f"conv-{SESSION_ID}",
+                session_id=SESSION_ID,
+                username="bench",
+                role=MessageRole.USER,
+                content=content,
+                created_at=datetime.utcnow(),
+            )
+            await service.upload_message_to_qdrant(message)
+            questions.append((question, message.message_id))
+
+        results = {}
+        for mode in modes:
+            service.hybrid_search = mode == "hybrid"
+            hits, reciprocal_ranks = 0, 0.0
+            for question, message_id in questions:
+                found = await service.search_messages(SESSION_ID, question, limit=k)
+                ranked = [result["message_id"] for result in found]
+                if message_id in ranked:
+                    hits += 1
+                    reciprocal_ranks += 1 / (ranked.index(message_id) + 1)
+            results[mode] = RecallResult(
+                questions=len(questions),
+                recall_at_k=round(hits / len(questions), 3),
+                mrr=round(reciprocal_ranks / len(questions), 3),
+            )
+        return results
+    finally:
+        await client.close()
+
+
+def format_results(results: Dict[str, RecallResult], k: int) -> str:
+    lines = [f"{'mode':<8}{'questions':>10}{f'recall@{k}':>11}{'mrr':>8}"]
+    for mode, r in results.items():
+        lines.append(f"{mode:<8}{r.questions:>10}{r.recall_at_k:>11.3f}{r.mrr:>8.3f}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--topics", type=int, default=12, help="Topics in the history")
+    parser.add_argument("--messages-per-topic", type=int, default=8, help="Messages sharing each topic")
+    parser.add_argument("--k", type=int, default=3, help="Results per search")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.topics, args.messages_per_topic, args.k, args.seed))
+
+    print(f"topics={args.topics} messages_per_topic={args.messages_per_topic} k={args.k}")
+    print(format_results(results, args.k))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Deterministic stand-in for the Ollama HTTP API.
+
+Serves the endpoints the application's Ollama clients use (``/api/chat``,
+``/api/generate``, ``/api/embed``, ``/api/embeddings``, ``/api/show`` and
+``/api/tags``) from a local uvicorn server. Completions are a fixed sequence
+of words emitted with a configurable per-token latency, streamed as NDJSON
+when requested; embeddings are unit vectors seeded from a hash of the input
+text, so the same text always maps to the same vector.
+"""
+
+import asyncio
+import hashlib
+import json
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+import numpy as np
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+ANSWER_WORDS = (
+    "Virtue is a settled disposition to choose the mean between excess and deficiency, "
+    "as determined by reason and by the judgement of the practically wise person. "
+).split()
+
+DEFAULT_EMBED_DIM = 4096  # sfr-embedding-mistral, the size chat history collections expect
+
+
+def embed_text(text: str, dim: int = DEFAULT_EMBED_DIM) -> List[float]:
+    """Unit vector of size ``dim`` derived deterministically from ``text``."""
+    seed = int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+    vector = np.random.default_rng(seed).standard_normal(dim)
+    return (vector / np.linalg.norm(vector)).astype(float).tolist()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakeOllama:
+    """
+    Local Ollama-compatible server with configurable generation latency.
+
+    Args:
+        token_latency_ms: Delay before each generated token
+        response_tokens: Number of tokens (words) in every completion
+        embed_dim: Size of returned embeddings
+        embed_latency_ms: Delay per embedding request
+    """
+
+    def __init__(
+        self,
+        token_latency_ms: float = 0.0,
+        response_tokens: int = 64,
+        embed_dim: int = DEFAULT_EMBED_DIM,
+        embed_latency_ms: float = 0.0,
+    ):
+        self.token_latency_ms = token_latency_ms
+        self.response_tokens = response_tokens
+        self.embed_dim = embed_dim
+        self.embed_latency_ms = embed_latency_ms
+        self.port: Optional[int] = None
+        self.requests = {"chat": 0, "generate": 0, "embed": 0}
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def _tokens(self) -> List[str]:
+        return [ANSWER_WORDS[i % len(ANSWER_WORDS)] for i in range(self.response_tokens)]
+
+    async def _pace(self) -> None:
+        if self.token_latency_ms:
+            await asyncio.sleep(self.token_latency_ms / 1000)
+
+    def _final(self, body: dict, prompt_chars: int, **content) -> dict:
+        eval_ns = int(self.response_tokens * self.token_latency_ms * 1e6)
+        return {
+            "model": body.get("model", "fake"),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **content,
+            "done": True,
+            "done_reason": "stop",
+            "prompt_eval_count": max(1, prompt_chars // 4),
+            "eval_count": self.response_tokens,
+            "total_duration": eval_ns,
+            "load_duration": 0,
+            "prompt_eval_duration": 0,
+            "eval_duration": eval_ns,
+        }
+
+    async def _complete(self, request: Request, kind: str):
+        body = await request.json()
+        self.requests[kind] += 1
+        if kind == "chat":
+            prompt_chars = sum(len(m.get("content") or "") for m in body.get("messages", []))
+            wrap = lambda text: {"message": {"role": "assistant", "content": text}}  # noqa: E731
+        else:
+            prompt_chars = len(body.get("prompt", ""))
+            wrap = lambda text: {"response": text}  # noqa: E731
+        tokens = self._tokens()
+
+        if not body.get("stream", True):
+            for _ in tokens:
+                await self._pace()
+            return JSONResponse(self._final(body, prompt_chars, **wrap(" ".join(tokens))))
+
+        async def chunks():
+            for i, token in enumerate(tokens):
+                await self._pace()
+                chunk = {"model": body.get("model", "fake"), "created_at": datetime.now(timezone.utc).isoformat(),
+                         **wrap(token if i == 0 else f" {token}"), "done": False}
+                yield json.dumps(chunk) + "\n"
+            yield json.dumps(self._final(body, prompt_chars, **wrap(""))) + "\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    async def chat(self, request: Request):
+        return await self._complete(request, "chat")
+
+    async def generate(self, request: Request):
+        return await self._complete(request, "generate")
+
+    async def embed(self, request: Request):
+        body = await request.json()
+        self.requests["embed"] += 1
+        if self.embed_latency_ms:
+            await asyncio.sleep(self.embed_latency_ms / 1000)
+        inputs = body.get("input", "")
+        inputs = [inputs] if isinstance(inputs, str) else inputs
+        return JSONResponse({"model": body.get("model", "fake"),
+                             "embeddings": [embed_text(text, self.embed_dim) for text in inputs]})
+
+    async def embeddings(self, request: Request):
+        body = await request.json()
+        self.requests["embed"] += 1
+        return JSONResponse({"embedding": embed_text(body.get("prompt", ""), self.embed_dim)})
+
+    async def show(self, request: Request):
+        return JSONResponse({
+            "modelfile": "",
+            "parameters": "",
+            "template": "{{ .Prompt }}",
+            "details": {"format": "gguf", "family": "fake", "parameter_size": "0B"},
+            "model_info": {"general.architecture": "fake", "fake.context_length": 32768},
+        })
+
+    async def tags(self, request: Request):
+        return JSONResponse({"models": []})
+
+    def _app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/api/chat", self.chat, methods=["POST"]),
+            Route("/api/generate", self.generate, methods=["POST"]),
+            Route("/api/embed", self.embed, methods=["POST"]),
+            Route("/api/embeddings", self.embeddings, methods=["POST"]),
+            Route("/api/show", self.show, methods=["POST"]),
+            Route("/api/tags", self.tags, methods=["GET"]),
+        ])
+
+    def start(self) -> "FakeOllama":
+        """Serve on a free local port from a background thread."""
+        self.port = _free_port()
+        config = uvicorn.Config(self._app(), host="127.0.0.1", port=self.port, log_level="warning", lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, name="fake-ollama", daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("Fake Ollama server did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=5)
+            self._server = None
+
+    def __enter__(self) -> "FakeOllama":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
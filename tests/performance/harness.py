@@ -0,0 +1,233 @@
+"""
+Offline application harness for load benchmarks.
+
+Starts the real application (lifespan, routers, middleware, services) with
+its external dependencies replaced by deterministic local stand-ins:
+
+- Ollama: ``FakeOllama`` HTTP server with configurable token latency
+- SPLADE: hashing encoder over a small word-level tokenizer
+- Qdrant: in-memory ``AsyncQdrantClient`` seeded with synthetic passages
+- Redis: ``fakeredis.FakeAsyncRedis``
+
+Requests are sent in-process through ``httpx.ASGITransport``, so no ports
+other than the fake Ollama server's are opened.
+"""
+
+import contextlib
+import functools
+import os
+import random
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from unittest.mock import patch
+
+import httpx
+import numpy as np
+
+from tests.performance.fake_ollama import ANSWER_WORDS, DEFAULT_EMBED_DIM, FakeOllama, embed_text
+
+PHILOSOPHERS = ("Aristotle", "Immanuel Kant")
+META_COLLECTION = "Meta Collection"
+BENCH_USERNAME = "bench"
+SPARSE_VECTORS = ("sparse_original", "sparse_summary", "sparse_conjecture")
+DENSE_VECTORS = ("dense_original", "dense_summary", "dense_conjecture")
+
+CORPUS_WORDS = sorted({
+    *(word.strip(".,").lower() for word in ANSWER_WORDS),
+    *"""virtue justice courage wisdom temperance reason duty will happiness good evil law state
+    freedom knowledge nature soul mind body truth beauty being time cause end form matter habit
+    pleasure pain friendship city citizen imperative maxim autonomy moral categorical practical
+    pure experience understanding judgement sensibility concept intuition action character""".split(),
+})
+
+
+def configure_environment(directory: Path) -> None:
+    """
+    Default environment for a standalone benchmark run.
+
+    Must run before the application is imported: the database URL is read at
+    import time. Values already set in the environment win.
+    """
+    os.environ.setdefault("ENV", "test")
+    os.environ.setdefault("APP_ENV", "test")
+    os.environ.setdefault("ONTOLOGIC_DB_URL", f"sqlite:///{directory / 'benchmark.db'}")
+    # Debug file logs (e.g. qdrant_upload_debug.log) stay out of the working tree
+    os.environ.setdefault("APP_LOG_DIR", str(directory / "logs"))
+    os.environ.setdefault("OTEL_ENABLED", "false")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+class HashingSpladeEncoder:
+    """Deterministic SPLADE stand-in: log-scaled term counts over a word-level vocabulary."""
+
+    backend = "hashing"
+
+    def __init__(self, tokenizer):
+        self.model = self
+        self.tokenizer = tokenizer
+
+    def encode(self, text: str) -> np.ndarray:
+        weights = np.zeros(len(self.tokenizer), dtype=np.float32)
+        ids = self.tokenizer(text, add_special_tokens=False)["input_ids"]
+        np.add.at(weights, ids, 1.0)
+        return np.log1p(weights)
+
+
+def build_splade_encoder(directory: Path) -> HashingSpladeEncoder:
+    from transformers import BertTokenizerFast
+
+    vocab_file = directory / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *CORPUS_WORDS]))
+    return HashingSpladeEncoder(BertTokenizerFast(vocab_file=str(vocab_file)))
+
+
+@dataclass
+class HarnessConfig:
+    """Stand-in behaviour and corpus size for an offline run."""
+
+    token_latency_ms: float = 5.0
+    response_tokens: int = 64
+    embed_latency_ms: float = 0.0
+    embed_dim: int = DEFAULT_EMBED_DIM
+    passages_per_collection: int = 200
+    seed: int = 7
+    philosophers: Tuple[str, ...] = PHILOSOPHERS
+
+
+def synthetic_passages(collection: str, count: int, seed: int) -> List[Dict[str, str]]:
+    """Deterministic text/summary/conjecture payloads built from the corpus vocabulary."""
+    rng = random.Random(f"{seed}:{collection}")
+
+    def sentence(n_words: int) -> str:
+        return " ".join(rng.choice(CORPUS_WORDS) for _ in range(n_words)).capitalize() + "."
+
+    return [
+        {
+            "text": " ".join(sentence(rng.randint(12, 24)) for _ in range(6)),
+            "summary": sentence(20),
+            "conjecture": sentence(16),
+        }
+        for _ in range(count)
+    ]
+
+
+async def seed_collections(qclient, encoder: HashingSpladeEncoder, config: HarnessConfig) -> None:
+    """Create the philosopher collections and the Meta Collection with all six named vectors."""
+    from qdrant_client import models
+
+    def sparse(text: str) -> "models.SparseVector":
+        weights = encoder.encode(text)
+        indices = np.nonzero(weights)[0]
+        return models.SparseVector(indices=indices.tolist(), values=weights[indices].tolist())
+
+    for collection in (*config.philosophers, META_COLLECTION):
+        await qclient.create_collection(
+            collection_name=collection,
+            vectors_config={
+                name: models.VectorParams(size=config.embed_dim, distance=models.Distance.COSINE)
+                for name in DENSE_VECTORS
+            },
+            sparse_vectors_config={name: models.SparseVectorParams() for name in SPARSE_VECTORS},
+        )
+        points = []
+        for i, passage in enumerate(synthetic_passages(collection, config.passages_per_collection, config.seed)):
+            philosopher = config.philosophers[i % len(config.philosophers)]
+            payload = {**passage, "author": philosopher, "philosopher": philosopher, "collection_name": collection}
+            vector = {}
+            for field_name, dense_name, sparse_name in zip(("text", "summary", "conjecture"), DENSE_VECTORS, SPARSE_VECTORS):
+                vector[dense_name] = embed_text(passage[field_name], config.embed_dim)
+                vector[sparse_name] = sparse(passage[field_name])
+            points.append(models.PointStruct(id=i, vector=vector, payload=payload))
+        await qclient.upsert(collection_name=collection, points=points)
+
+
+@dataclass
+class OfflineApp:
+    """Running application and its stand-ins."""
+
+    client: httpx.AsyncClient
+    ollama: FakeOllama
+    qclient: object
+    config: HarnessConfig
+    auth_headers: Dict[str, str] = field(default_factory=dict)
+
+
+async def _login(client: httpx.AsyncClient) -> Dict[str, str]:
+    """Register and log in a benchmark user; returns bearer auth headers."""
+    credentials = {"email": f"{BENCH_USERNAME}@example.com", "password": "Bench-password-123!"}
+    await client.post("/auth/register", json={**credentials, "username": BENCH_USERNAME})
+    response = await client.post(
+        "/auth/jwt/login", data={"username": credentials["email"], "password": credentials["password"]}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@contextlib.asynccontextmanager
+async def offline_app(config: Optional[HarnessConfig] = None) -> AsyncIterator[OfflineApp]:
+    """
+    Run the application against local stand-ins for the duration of the context.
+
+    Settings are the test environment's with payments (and so subscription
+    checks) disabled, and rate limiting is off so the configured concurrency
+    reaches the endpoints. App state and the limiter are restored on exit.
+    """
+    import fakeredis
+    from llama_index.embeddings.ollama import OllamaEmbedding
+    from llama_index.llms.ollama import Ollama
+    from qdrant_client import AsyncQdrantClient, models
+
+    from app.config.settings import Settings
+
+    config = config or HarnessConfig()
+    with tempfile.TemporaryDirectory() as directory, FakeOllama(
+        token_latency_ms=config.token_latency_ms,
+        response_tokens=config.response_tokens,
+        embed_dim=config.embed_dim,
+        embed_latency_ms=config.embed_latency_ms,
+    ) as ollama:
+        encoder = build_splade_encoder(Path(directory))
+        qclient = AsyncQdrantClient(location=":memory:")
+        await seed_collections(qclient, encoder, config)
+        redis_client = fakeredis.FakeAsyncRedis()
+        embedding = functools.partial(OllamaEmbedding, base_url=ollama.url)
+
+        with contextlib.ExitStack() as stack:
+            for target, replacement in {
+                "app.services.llm_manager.Ollama": functools.partial(Ollama, base_url=ollama.url),
+                "app.services.llm_manager.OllamaEmbedding": embedding,
+                "app.services.qdrant_upload.OllamaEmbedding": embedding,
+                "app.services.llm_manager.load_splade_encoder": lambda settings=None: encoder,
+                "app.services.qdrant_manager.AsyncQdrantClient": lambda *args, **kwargs: qclient,
+                "app.services.cache_service.redis.Redis": lambda *args, **kwargs: redis_client,
+                "app.config.settings._settings": Settings(env="test", payments_enabled=False),
+            }.items():
+                stack.enter_context(patch(target, replacement))
+
+            from app.core.rate_limiting import limiter
+            from app.main import app
+
+            saved_state = dict(app.state._state)
+            saved_limiter = (limiter.enabled, limiter._redis)
+            limiter.enabled = False
+            try:
+                async with app.router.lifespan_context(app):
+                    transport = httpx.ASGITransport(app=app)
+                    async with httpx.AsyncClient(
+                        transport=transport, base_url="http://localhost", timeout=120
+                    ) as client:
+                        harness = OfflineApp(client=client, ollama=ollama, qclient=qclient, config=config)
+                        harness.auth_headers = await _login(client)
+                        # Steady state: the user's document collection exists after a first upload
+                        await qclient.create_collection(
+                            collection_name=BENCH_USERNAME,
+                            vectors_config=models.VectorParams(size=config.embed_dim, distance=models.Distance.COSINE),
+                        )
+                        yield harness
+            finally:
+                app.state._state.clear()
+                app.state._state.update(saved_state)
+                limiter.enabled, limiter._redis = saved_limiter
+                await redis_client.aclose()
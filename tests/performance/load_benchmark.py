@@ -0,0 +1,292 @@
+"""
+Offline end-to-end load benchmark.
+
+Drives the application's hot paths (``/ask``, ``/ask_philosophy``, both
+streaming endpoints, document upload and chat history) through the offline
+harness at a fixed concurrency and reports throughput, p50 and p99 latency
+per scenario. A report can be saved as a baseline and later runs compared
+against it, failing when a scenario regresses beyond the tolerance.
+
+Run directly:
+    python -m tests.performance.load_benchmark
+    python -m tests.performance.load_benchmark --concurrency 16 --requests 200
+    python -m tests.performance.load_benchmark --baseline tests/performance/baseline.json
+    python -m tests.performance.load_benchmark --write-baseline tests/performance/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+import httpx
+import numpy as np
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+QUESTIONS = (
+    "What is virtue?",
+    "How does courage relate to the mean?",
+    "Is happiness the highest good?",
+    "What is the categorical imperative?",
+    "Can reason alone motivate action?",
+    "What makes a friendship complete?",
+)
+
+UPLOAD_DOCUMENT = (
+    "Virtue is a settled disposition to choose the mean. Courage is the mean between fear and confidence. "
+    "Temperance concerns pleasure and pain. Justice is the virtue of the citizen in relation to the city. "
+) * 8
+
+
+def question(i: int) -> str:
+    """Distinct question per request, so answers are generated rather than served from cache."""
+    return f"{QUESTIONS[i % len(QUESTIONS)]} ({i})"
+
+
+def _check(response: httpx.Response) -> None:
+    response.raise_for_status()
+
+
+async def _stream(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> None:
+    async with client.stream(method, url, **kwargs) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.startswith('data: {"error"'):
+                raise RuntimeError(line[:200])
+
+
+async def ask(harness, i: int) -> None:
+    _check(await harness.client.get("/ask", params={"query_str": question(i)}))
+
+
+async def ask_stream(harness, i: int) -> None:
+    await _stream(harness.client, "GET", "/ask/stream", params={"query_str": question(i)})
+
+
+async def ask_philosophy(harness, i: int) -> None:
+    body = {"query_str": question(i), "collection": harness.config.philosophers[i % len(harness.config.philosophers)]}
+    _check(await harness.client.post("/ask_philosophy", json=body))
+
+
+async def ask_philosophy_stream(harness, i: int) -> None:
+    body = {"query_str": question(i), "collection": harness.config.philosophers[i % len(harness.config.philosophers)]}
+    await _stream(harness.client, "POST", "/ask_philosophy/stream", json=body)
+
+
+async def document_upload(harness, i: int) -> None:
+    files = {"file": (f"notes-{i}.txt", f"{UPLOAD_DOCUMENT}Note {i}.".encode(), "text/plain")}
+    _check(await harness.client.post("/documents/upload", files=files, headers=harness.auth_headers))
+
+
+async def chat_message(harness, i: int) -> None:
+    body = {"session_id": f"bench-session-{i % 8}", "role": "user", "content": question(i)}
+    _check(await harness.client.post("/chat/message", json=body))
+
+
+async def chat_history(harness, i: int) -> None:
+    _check(await harness.client.get(f"/chat/history/bench-session-{i % 8}", params={"limit": 20}))
+
+
+SCENARIOS: Dict[str, Callable[..., Awaitable[None]]] = {
+    "ask": ask,
+    "ask_stream": ask_stream,
+    "ask_philosophy": ask_philosophy,
+    "ask_philosophy_stream": ask_philosophy_stream,
+    "document_upload": document_upload,
+    "chat_message": chat_message,
+    "chat_history": chat_history,
+}
+
+
+@dataclass
+class ScenarioResult:
+    """Latency and throughput of one scenario."""
+
+    requests: int
+    errors: int
+    throughput_rps: float
+    p50_ms: float
+    p99_ms: float
+    mean_ms: float
+
+
+@dataclass
+class LoadReport:
+    """Results of a benchmark run and the settings it ran with."""
+
+    config: Dict[str, object]
+    scenarios: Dict[str, ScenarioResult] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {"config": self.config, "scenarios": {name: asdict(r) for name, r in self.scenarios.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "LoadReport":
+        return cls(config=data["config"],
+                   scenarios={name: ScenarioResult(**r) for name, r in data["scenarios"].items()})
+
+
+async def run_scenario(harness, scenario: Callable[..., Awaitable[None]], requests: int,
+                       concurrency: int, warmup: int = 2) -> ScenarioResult:
+    """Run ``requests`` calls of ``scenario`` with at most ``concurrency`` in flight."""
+    for i in range(warmup):
+        await scenario(harness, -1 - i)
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    next_request = iter(range(requests))
+
+    async def worker():
+        for i in next_request:
+            start = time.perf_counter()
+            try:
+                await scenario(harness, i)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    elapsed = time.perf_counter() - start
+
+    if errors:
+        print(f"  {len(errors)} errors, first: {errors[0][:200]}", file=sys.stderr)
+    return ScenarioResult(
+        requests=requests,
+        errors=len(errors),
+        throughput_rps=round(requests / elapsed, 2),
+        p50_ms=round(float(np.percentile(latencies, 50)), 2),
+        p99_ms=round(float(np.percentile(latencies, 99)), 2),
+        mean_ms=round(float(np.mean(latencies)), 2),
+    )
+
+
+async def run(config=None, scenarios: Sequence[str] = tuple(SCENARIOS), requests: int = 50,
+              concurrency: int = 8, warmup: int = 2) -> LoadReport:
+    """Start the offline application and run each scenario in turn."""
+    from tests.performance.harness import HarnessConfig, offline_app
+
+    config = config or HarnessConfig()
+    report = LoadReport(config={
+        **asdict(config),
+        "requests": requests,
+        "concurrency": concurrency,
+        "python": platform.python_version(),
+    })
+    async with offline_app(config) as harness:
+        for name in scenarios:
+            report.scenarios[name] = await run_scenario(harness, SCENARIOS[name], requests, concurrency, warmup)
+    return report
+
+
+def compare(report: LoadReport, baseline: LoadReport, tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Regressions of ``report`` against ``baseline``.
+
+    A scenario regresses when its p50 or p99 latency grows, or its throughput
+    drops, by more than ``tolerance`` (relative), or when it has more errors.
+    """
+    regressions = []
+    for name, result in report.scenarios.items():
+        base = baseline.scenarios.get(name)
+        if base is None:
+            continue
+        if result.errors > base.errors:
+            regressions.append(f"{name}: {result.errors} errors (baseline {base.errors})")
+        for metric in ("p50_ms", "p99_ms"):
+            current, previous = getattr(result, metric), getattr(base, metric)
+            if current > previous * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {current:.1f} vs baseline {previous:.1f}")
+        if result.throughput_rps < base.throughput_rps * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput {result.throughput_rps:.1f}/s vs baseline {base.throughput_rps:.1f}/s"
+            )
+    return regressions
+
+
+def format_report(report: LoadReport, baseline: Optional[LoadReport] = None) -> str:
+    """Table of scenario results, with relative change against ``baseline`` when given."""
+
+    def delta(current: float, previous: Optional[float]) -> str:
+        if not previous:
+            return ""
+        return f" ({(current - previous) / previous * 100:+.0f}%)"
+
+    lines = [
+        f"concurrency={report.config['concurrency']} requests={report.config['requests']} "
+        f"token_latency_ms={report.config['token_latency_ms']} response_tokens={report.config['response_tokens']}",
+        f"{'scenario':<24}{'req/s':>18}{'p50 ms':>18}{'p99 ms':>18}{'errors':>8}",
+    ]
+    for name, result in report.scenarios.items():
+        base = baseline.scenarios.get(name) if baseline else None
+        lines.append(
+            f"{name:<24}"
+            f"{f'{result.throughput_rps:.1f}' + delta(result.throughput_rps, base and base.throughput_rps):>18}"
+            f"{f'{result.p50_ms:.1f}' + delta(result.p50_ms, base and base.p50_ms):>18}"
+            f"{f'{result.p99_ms:.1f}' + delta(result.p99_ms, base and base.p99_ms):>18}"
+            f"{result.errors:>8}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from tests.performance.harness import HarnessConfig, configure_environment
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenario names")
+    parser.add_argument("--requests", type=int, default=50, help="Measured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests per scenario")
+    parser.add_argument("--token-latency-ms", type=float, default=HarnessConfig.token_latency_ms)
+    parser.add_argument("--response-tokens", type=int, default=HarnessConfig.response_tokens)
+    parser.add_argument("--embed-latency-ms", type=float, default=HarnessConfig.embed_latency_ms)
+    parser.add_argument("--baseline", type=Path, help="Compare against this report and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed relative slowdown")
+    parser.add_argument("--write-baseline", type=Path, help="Save the report as a new baseline")
+    parser.add_argument("--output", type=Path, help="Save the report as JSON")
+    args = parser.parse_args(argv)
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = sorted(set(scenarios) - set(SCENARIOS))
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)} (available: {', '.join(SCENARIOS)})")
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure_environment(Path(directory))
+        config = HarnessConfig(
+            token_latency_ms=args.token_latency_ms,
+            response_tokens=args.response_tokens,
+            embed_latency_ms=args.embed_latency_ms,
+        )
+        report = asyncio.run(run(config, scenarios, args.requests, args.concurrency, args.warmup))
+
+    baseline = LoadReport.from_dict(json.loads(args.baseline.read_text())) if args.baseline else None
+    print(format_report(report, baseline))
+
+    for path in (args.output, args.write_baseline):
+        if path:
+            path.write_text(json.dumps(report.to_dict(), indent=2) + "\n")
+            print(f"Report written to {path}")
+
+    if baseline is None:
+        return 0
+    mismatched = [key for key in ("concurrency", "requests", "token_latency_ms", "response_tokens")
+                  if baseline.config.get(key) != report.config.get(key)]
+    if mismatched:
+        print(f"Warning: baseline was recorded with different settings ({', '.join(mismatched)})")
+    regressions = compare(report, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
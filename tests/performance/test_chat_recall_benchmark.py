@@ -0,0 +1,23 @@
+"""Tests for the offline chat history recall benchmark."""
+
+import pytest
+
+from tests.performance.chat_recall_benchmark import format_results, run, synthetic_history
+
+
+def test_history_questions_name_one_message():
+    history = synthetic_history(topics=3, messages_per_topic=4, seed=1)
+
+    assert len(history) == 12
+    assert len({name for name, _, _ in history}) == 12
+    assert all(name in content and name in question for name, content, question in history)
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_recalls_more_than_dense_only():
+    results = await run(topics=4, messages_per_topic=6, k=3)
+
+    assert results["hybrid"].questions == results["dense"].questions == 24
+    assert results["hybrid"].recall_at_k > results["dense"].recall_at_k
+    assert results["hybrid"].mrr > results["dense"].mrr
+    assert "recall@3" in format_results(results, k=3)
@@ -0,0 +1,79 @@
+"""Tests for the offline load benchmark harness and its baseline comparison."""
+
+import json
+
+import pytest
+
+from tests.performance.harness import HarnessConfig
+from tests.performance.load_benchmark import (
+    BASELINE_PATH,
+    SCENARIOS,
+    LoadReport,
+    ScenarioResult,
+    compare,
+    format_report,
+    run,
+)
+
+pytest.importorskip("fakeredis")
+
+
+def make_report(**scenarios: ScenarioResult) -> LoadReport:
+    return LoadReport(
+        config={"concurrency": 8, "requests": 50, "token_latency_ms": 5.0, "response_tokens": 64},
+        scenarios=scenarios,
+    )
+
+
+def result(p50: float = 100.0, p99: float = 200.0, rps: float = 10.0, errors: int = 0) -> ScenarioResult:
+    return ScenarioResult(requests=50, errors=errors, throughput_rps=rps, p50_ms=p50, p99_ms=p99, mean_ms=p50)
+
+
+class TestCompare:
+    """Regressions are reported per scenario beyond the tolerance."""
+
+    def test_within_tolerance_passes(self):
+        baseline = make_report(ask=result())
+        current = make_report(ask=result(p50=120.0, p99=240.0, rps=8.0))
+
+        assert compare(current, baseline, tolerance=0.25) == []
+
+    def test_latency_throughput_and_errors_regress(self):
+        baseline = make_report(ask=result(), chat_history=result())
+        current = make_report(ask=result(p50=130.0, rps=7.0), chat_history=result(p99=300.0, errors=1))
+
+        regressions = compare(current, baseline, tolerance=0.25)
+
+        assert [r.split(":")[0] for r in regressions] == ["ask", "ask", "chat_history", "chat_history"]
+        assert any("p50_ms" in r for r in regressions)
+        assert any("throughput" in r for r in regressions)
+        assert any("errors" in r for r in regressions)
+
+    def test_new_scenarios_are_not_compared(self):
+        assert compare(make_report(upload=result(p50=1e6)), make_report(ask=result())) == []
+
+    def test_report_shows_change_against_baseline(self):
+        table = format_report(make_report(ask=result(p50=150.0)), make_report(ask=result()))
+
+        assert "+50%" in table
+
+
+def test_committed_baseline_covers_all_scenarios():
+    baseline = LoadReport.from_dict(json.loads(BASELINE_PATH.read_text()))
+
+    assert set(baseline.scenarios) == set(SCENARIOS)
+    assert all(r.errors == 0 for r in baseline.scenarios.values())
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_offline_run_serves_every_scenario():
+    """Every scenario succeeds end to end against the stand-ins."""
+    config = HarnessConfig(token_latency_ms=0, response_tokens=8, passages_per_collection=20)
+
+    report = await run(config, requests=3, concurrency=2, warmup=0)
+
+    assert set(report.scenarios) == set(SCENARIOS)
+    for name, scenario in report.scenarios.items():
+        assert scenario.errors == 0, name
+        assert scenario.p99_ms >= scenario.p50_ms > 0
@@ -0,0 +1,23 @@
+"""Tests for the upload event-loop lag benchmark."""
+
+import pytest
+
+from tests.performance.harness import HarnessConfig
+from tests.performance.upload_lag_benchmark import format_results, run
+
+pytest.importorskip("fakeredis")
+pytest.importorskip("fitz")
+
+
+@pytest.mark.slow
+@pytest.mark.asyncio
+async def test_pool_phase_uploads_while_serving_ask():
+    """Uploads parsed in the pool succeed while /ask is measured alongside them."""
+    config = HarnessConfig(token_latency_ms=0, response_tokens=8, passages_per_collection=20)
+
+    results = await run(config, modes=("pool",), pages=6, uploads=1, requests=4, concurrency=2)
+
+    uploading = results["pool"]["uploading"]
+    assert uploading.uploads == 1 and uploading.upload_errors == 0
+    assert uploading.ask_max_ms >= uploading.ask_p50_ms > 0
+    assert "pool" in format_results(results)
@@ -0,0 +1,210 @@
+"""
+Event-loop lag benchmark for document uploads.
+
+Measures ``/ask`` latency and event-loop lag on their own, then again while
+PDF uploads run concurrently. With parsing in the process pool the loaded
+numbers should stay close to the idle ones; the ``inline`` mode parses on the
+event loop instead (the behaviour before the parser pool) for comparison.
+
+Loop lag is sampled by a task that sleeps for a short interval and records
+how late it wakes up.
+
+Run directly:
+    python -m tests.performance.upload_lag_benchmark
+    python -m tests.performance.upload_lag_benchmark --modes pool,inline --pages 120 --uploads 4
+"""
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from tests.performance.load_benchmark import ask
+
+MODES = ("pool", "inline")
+LAG_INTERVAL_SECONDS = 0.01
+
+PAGE_TEXT = (
+    "Virtue is a settled disposition to choose the mean relative to us, determined by reason. "
+    "Courage is the mean between fear and confidence; temperance concerns pleasures and pains. "
+) * 6
+
+
+def make_pdf(pages: int) -> bytes:
+    """Text-heavy PDF of ``pages`` pages, each with a heading and wrapped paragraphs."""
+    import fitz
+
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Book {i // 10 + 1}, Chapter {i + 1}", fontsize=18)
+        page.insert_textbox(fitz.Rect(72, 100, 540, 770), PAGE_TEXT * 2, fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class InlineParser:
+    """Parses on the event loop, as uploads did before the parser pool."""
+
+    def __init__(self):
+        from app.utils.file_parser import FileParser
+
+        self.file_parser = FileParser()
+
+    async def parse(self, file_extension: str, file_bytes: bytes) -> str:
+        if file_extension in ("txt", "md"):
+            return self.file_parser.parse_file(file_extension, file_bytes.decode("utf-8"))
+        return self.file_parser.parse_file(file_extension, file_bytes)
+
+
+@dataclass
+class PhaseResult:
+    """``/ask`` latency and loop lag during one phase."""
+
+    ask_p50_ms: float
+    ask_p99_ms: float
+    ask_max_ms: float
+    lag_p99_ms: float
+    lag_max_ms: float
+    uploads: int = 0
+    upload_errors: int = 0
+
+
+async def _sample_lag(lags: List[float]) -> None:
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL_SECONDS)
+        lags.append((time.perf_counter() - start - LAG_INTERVAL_SECONDS) * 1000)
+
+
+async def _ask_latencies(harness, requests: int, concurrency: int, first: int,
+                         until: Optional[asyncio.Future] = None) -> List[float]:
+    """Latencies of at least ``requests`` calls to ``/ask``, continuing until ``until`` is done."""
+    latencies: List[float] = []
+    next_request = itertools.count(first)
+
+    async def worker():
+        for i in next_request:
+            if i >= first + requests and (until is None or until.done()):
+                return
+            start = time.perf_counter()
+            await ask(harness, i)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def run_phase(harness, requests: int, concurrency: int, uploads: int = 0,
+                    pdf: Optional[bytes] = None, first: int = 0) -> PhaseResult:
+    """
+    Time calls to ``/ask`` while ``uploads`` concurrent uploads of ``pdf`` run.
+
+    At least ``requests`` calls are made, and calls continue until every upload
+    has finished, so stalls caused by an upload show up in the latencies.
+    Questions are numbered from ``first``; give each phase its own range so no
+    answer is served from a cache filled by an earlier phase.
+    """
+    lags: List[float] = []
+    uploaded: List[bool] = []
+
+    async def upload(n: int):
+        files = {"file": (f"lag-{first}-{n}.pdf", pdf, "application/pdf")}
+        response = await harness.client.post("/documents/upload", files=files, headers=harness.auth_headers)
+        uploaded.append(response.status_code == 200)
+
+    lag_task = asyncio.create_task(_sample_lag(lags))
+    uploads_done = asyncio.gather(*(upload(n) for n in range(uploads)))
+    try:
+        latencies = await _ask_latencies(harness, requests, concurrency, first, until=uploads_done)
+        await uploads_done
+    finally:
+        lag_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await lag_task
+
+    return PhaseResult(
+        ask_p50_ms=round(float(np.percentile(latencies, 50)), 2),
+        ask_p99_ms=round(float(np.percentile(latencies, 99)), 2),
+        ask_max_ms=round(max(latencies), 2),
+        lag_p99_ms=round(float(np.percentile(lags, 99)), 2) if lags else 0.0,
+        lag_max_ms=round(max(lags), 2) if lags else 0.0,
+        uploads=len(uploaded),
+        upload_errors=uploaded.count(False),
+    )
+
+
+async def run(config=None, modes: Sequence[str] = MODES, pages: int = 60, uploads: int = 2,
+              requests: int = 40, concurrency: int = 4) -> Dict[str, Dict[str, PhaseResult]]:
+    """Idle and under-upload phases for each parsing mode, in one application run."""
+    from app.main import app
+    from tests.performance.harness import HarnessConfig, offline_app
+
+    pdf = make_pdf(pages)
+    results: Dict[str, Dict[str, PhaseResult]] = {}
+    async with offline_app(config or HarnessConfig()) as harness:
+        pool_parser = app.state.document_parser
+        await run_phase(harness, 2, 1, uploads=1, pdf=pdf, first=-100)  # Warm up the workers and models
+        for m, mode in enumerate(modes):
+            app.state.document_parser = pool_parser if mode == "pool" else InlineParser()
+            first = 100_000 * (m + 1)
+            results[mode] = {
+                "idle": await run_phase(harness, requests, concurrency, first=first),
+                "uploading": await run_phase(harness, requests, concurrency, uploads=uploads, pdf=pdf,
+                                             first=first + 50_000),
+            }
+        app.state.document_parser = pool_parser
+    return results
+
+
+def format_results(results: Dict[str, Dict[str, PhaseResult]]) -> str:
+    lines = [f"{'mode':<8}{'phase':<11}{'ask p50':>10}{'ask p99':>10}{'ask max':>10}"
+             f"{'lag p99':>10}{'lag max':>10}{'uploads':>9}"]
+    for mode, phases in results.items():
+        for phase, r in phases.items():
+            lines.append(
+                f"{mode:<8}{phase:<11}{r.ask_p50_ms:>10.1f}{r.ask_p99_ms:>10.1f}{r.ask_max_ms:>10.1f}"
+                f"{r.lag_p99_ms:>10.1f}{r.lag_max_ms:>10.1f}{f'{r.uploads - r.upload_errors}/{r.uploads}':>9}"
+            )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from tests.performance.harness import HarnessConfig, configure_environment
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--modes", default=",".join(MODES), help="Comma-separated: pool, inline")
+    parser.add_argument("--pages", type=int, default=60, help="Pages in the uploaded PDF")
+    parser.add_argument("--uploads", type=int, default=2, help="Concurrent uploads")
+    parser.add_argument("--requests", type=int, default=40, help="/ask requests per phase")
+    parser.add_argument("--concurrency", type=int, default=4, help="/ask requests in flight")
+    parser.add_argument("--token-latency-ms", type=float, default=HarnessConfig.token_latency_ms)
+    parser.add_argument("--response-tokens", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = sorted(set(modes) - set(MODES))
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)} (available: {', '.join(MODES)})")
+
+    with tempfile.TemporaryDirectory() as directory:
+        configure_environment(Path(directory))
+        config = HarnessConfig(token_latency_ms=args.token_latency_ms, response_tokens=args.response_tokens)
+        results = asyncio.run(run(config, modes, args.pages, args.uploads, args.requests, args.concurrency))
+
+    print(f"pages={args.pages} uploads={args.uploads} requests={args.requests} concurrency={args.concurrency}")
+    print(format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""Tests for the audit log: non-blocking batched writes, append-only storage, filters and cursor pagination."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from sqlmodel import select
+
+from app.core.db_models import AuditEvent, Subscription, SubscriptionStatus, SubscriptionTier
+from app.services.audit_log import AuditLog, record_audit_event
+
+
+
+async def stored(session_factory):
+    async with session_factory() as session:
+        return list((await session.execute(select(AuditEvent).order_by(AuditEvent.id))).scalars().all())
+
+
+class BrokenSessions:
+    """Session factory whose sessions fail to write, like an unreachable database."""
+
+    def __init__(self):
+        self.attempts = 0
+
+    def __call__(self):
+        self.attempts += 1
+        raise ConnectionError("database unavailable")
+
+
+@pytest.mark.asyncio
+async def test_record_buffers_and_flush_writes_in_batches(session_factory):
+    audit_log = AuditLog(batch_size=2, session_factory=session_factory)
+    for refund in range(5):
+        audit_log.record(
+            "refund.initiated", actor_type="admin", actor_id=7, subject_type="refund",
+            subject_id=f"re_{refund}", user_id=3, details={"amount_cents": 100, "tier": SubscriptionTier.PREMIUM},
+        )
+    assert audit_log.pending == 5
+    assert await stored(session_factory) == []
+
+    assert await audit_log.flush() == 5
+
+    events = await stored(session_factory)
+    assert [e.subject_id for e in events] == [f"re_{i}" for i in range(5)]
+    assert (events[0].actor_id, events[0].user_id) == ("7", 3)
+    assert events[0].details == {"amount_cents": 100, "tier": "premium"}
+    assert audit_log.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_database_outage_does_not_block_or_lose_events(session_factory):
+    sessions = BrokenSessions()
+    audit_log = AuditLog(batch_size=10, max_pending=3, session_factory=sessions)
+    for i in range(4):
+        audit_log.record("subscription.override", subject_id=i)  # Returns without touching the database
+
+    assert sessions.attempts == 0
+    assert audit_log.pending == 3  # The fourth was dropped
+    assert await audit_log.flush() == 0
+    assert audit_log.pending == 3
+
+    audit_log._session_factory = session_factory
+    assert await audit_log.flush() == 3
+    assert [e.subject_id for e in await stored(session_factory)] == ["0", "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_events_are_append_only(session_factory):
+    audit_log = AuditLog(session_factory=session_factory)
+    audit_log.record("account.suspended", user_id=1)
+    await audit_log.flush()
+
+    async with session_factory() as session:
+        event = (await session.execute(select(AuditEvent))).scalar_one()
+        event.action = "account.reactivated"
+        with pytest.raises(PermissionError):
+            await session.commit()
+        await session.rollback()
+        with pytest.raises(PermissionError):
+            await session.delete(event)
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_query_filters_and_paginates_newest_first(session_factory):
+    audit_log = AuditLog(session_factory=session_factory)
+    for i in range(5):
+        audit_log.record("refund.initiated", actor_type="admin", actor_id=1, subject_type="refund", subject_id=i, user_id=10)
+    audit_log.record("refund.status_changed", actor_type="stripe", subject_type="refund", subject_id=0, user_id=10)
+    audit_log.record("subscription.override", actor_type="admin", actor_id=2, subject_type="subscription", user_id=20)
+    await audit_log.flush()
+
+    pages, cursor = [], None
+    while True:
+        page, cursor = await audit_log.query(actor_id=1, limit=2, cursor=cursor)
+        pages.append([e.subject_id for e in page])
+        if cursor is None:
+            break
+    assert pages == [["4", "3"], ["2", "1"], ["0"]]
+
+    by_subject, _ = await audit_log.query(subject_type="refund", subject_id=0)
+    assert [e.action for e in by_subject] == ["refund.status_changed", "refund.initiated"]
+    by_prefix, _ = await audit_log.query(action="refund", user_id=10)
+    assert len(by_prefix) == 6
+    assert [e.actor_id for e in (await audit_log.query(action="subscription.override"))[0]] == ["2"]
+    assert (await audit_log.query(action="refund.init"))[0] == []
+
+    now = datetime.now(timezone.utc)
+    assert len((await audit_log.query(since=now - timedelta(minutes=1)))[0]) == 7
+    assert (await audit_log.query(until=now - timedelta(minutes=1)))[0] == []
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_in_background_and_on_close(session_factory):
+    audit_log = AuditLog(flush_interval_seconds=0.05, session_factory=session_factory)
+    audit_log.run()
+    try:
+        record_audit_event("backup.started", actor_type="admin", subject_type="backup", subject_id="b1")
+        for _ in range(100):
+            if await stored(session_factory):
+                break
+            await asyncio.sleep(0.02)
+        assert [e.action for e in await stored(session_factory)] == ["backup.started"]
+
+        audit_log.flush_interval_seconds = 60.0
+        await asyncio.sleep(0.1)  # Let the writer pick up the longer interval
+        record_audit_event("backup.completed", subject_type="backup", subject_id="b1")
+    finally:
+        await audit_log.aclose()
+
+    assert [e.action for e in await stored(session_factory)] == ["backup.started", "backup.completed"]
+    assert not audit_log.running
+    record_audit_event("backup.failed")  # No audit log running: ignored
+    assert audit_log.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_subscription_override_is_audited(session_factory):
+    from app.services.subscription_manager import SubscriptionManager
+
+    async with session_factory() as session:
+        session.add(Subscription(user_id=5, stripe_customer_id="cus_5", tier=SubscriptionTier.FREE))
+        await session.commit()
+    audit_log = AuditLog(session_factory=session_factory)
+    audit_log.run()
+    try:
+        with patch("app.services.subscription_manager.AsyncSessionLocal", session_factory):
+            await SubscriptionManager().apply_admin_override(
+                user_id=5, new_tier=SubscriptionTier.PREMIUM, admin_user_id=1, admin_notes="Goodwill"
+            )
+            await SubscriptionManager().update_subscription_status(5, SubscriptionStatus.PAST_DUE)
+    finally:
+        await audit_log.aclose()
+
+    override, status_change = await stored(session_factory)
+    assert (override.action, override.actor_type, override.actor_id, override.user_id) == (
+        "subscription.override", "admin", "1", 5
+    )
+    assert override.details["old_tier"] == "free"
+    assert override.details["new_tier"] == "premium"
+    assert override.details["admin_notes"] == "Goodwill"
+    assert status_change.action == "subscription.status_changed"
+    assert status_change.details == {"old_status": "active", "new_status": "past_due"}
+
+
+def test_admin_audit_trail_endpoint(test_client, session_factory):
+    from app.main import app
+    from app.router.admin_payments import get_audit_log, verify_admin_user
+
+    audit_log = AuditLog(session_factory=session_factory)
+    for i in range(3):
+        audit_log.record("dispute.resolved", actor_type="admin", actor_id=9, subject_type="dispute", subject_id=i)
+    asyncio.run(audit_log.flush())
+    app.dependency_overrides[verify_admin_user] = lambda: SimpleNamespace(id=9, is_admin=True)
+    app.dependency_overrides[get_audit_log] = lambda: audit_log
+    try:
+        first = test_client.get("/admin/payments/audit/trail", params={"actor_id": "9", "limit": 2})
+        cursor = first.json()["next_cursor"]
+        second = test_client.get("/admin/payments/audit/trail", params={"actor_id": "9", "limit": 2, "cursor": cursor})
+    finally:
+        app.dependency_overrides.pop(verify_admin_user, None)
+        app.dependency_overrides.pop(get_audit_log, None)
+
+    assert first.status_code == 200
+    assert [e["subject_id"] for e in first.json()["events"]] == ["2", "1"]
+    assert [e["subject_id"] for e in second.json()["events"]] == ["0"]
+    assert second.json()["next_cursor"] is None
+
+
+def test_subscription_cancel_endpoint_is_audited(test_client):
+    from unittest.mock import AsyncMock
+
+    from app.core.auth_config import current_active_user
+    from app.main import app
+    from app.router.payments import get_payment_service, get_subscription_manager
+
+    subscription = SimpleNamespace(id=12, stripe_subscription_id="sub_12", current_period_end=None)
+    subscription_manager = SimpleNamespace(get_user_subscription=AsyncMock(return_value=subscription))
+    payment_service = SimpleNamespace(cancel_subscription=AsyncMock(return_value=True))
+    app.dependency_overrides[current_active_user] = lambda: SimpleNamespace(id=5)
+    app.dependency_overrides[get_payment_service] = lambda: payment_service
+    app.dependency_overrides[get_subscription_manager] = lambda: subscription_manager
+    try:
+        with patch("app.router.payments.record_audit_event") as record:
+            response = test_client.post("/payments/subscription/cancel")
+    finally:
+        for dependency in (current_active_user, get_payment_service, get_subscription_manager):
+            app.dependency_overrides.pop(dependency, None)
+
+    assert response.status_code == 200
+    payment_service.cancel_subscription.assert_awaited_once_with("sub_12")
+    record.assert_called_once()
+    assert record.call_args.args == ("subscription.cancelled",)
+    assert {key: record.call_args.kwargs[key] for key in ("actor_type", "actor_id", "subject_type", "subject_id")} == {
+        "actor_type": "user", "actor_id": 5, "subject_type": "subscription", "subject_id": 12,
+    }
@@ -0,0 +1,256 @@
+"""Tests for QdrantBackupService using in-memory Qdrant instances."""
+
+import asyncio
+import os
+import time
+
+import pytest
+from qdrant_client import AsyncQdrantClient, models
+
+from app.services.qdrant_backup_service import (
+    AdaptiveBatchSizer,
+    BackupStatus,
+    PointRateLimiter,
+    QdrantBackupService,
+)
+
+
+async def _create_source_collection(client: AsyncQdrantClient, name: str, num_points: int):
+    """Create a collection with one dense and one sparse vector per point."""
+    await client.create_collection(
+        collection_name=name,
+        vectors_config={"dense_original": models.VectorParams(size=4, distance=models.Distance.COSINE)},
+        sparse_vectors_config={"sparse_original": models.SparseVectorParams()},
+    )
+    points = [
+        models.PointStruct(
+            id=i,
+            vector={
+                "dense_original": [float(i % 7) + 1.0, 1.0, 0.5, 0.25],
+                "sparse_original": models.SparseVector(indices=[i % 50, 100 + i % 3], values=[1.0, 0.5]),
+            },
+            payload={"text": f"passage {i}", "author": name},
+        )
+        for i in range(num_points)
+    ]
+    await client.upsert(collection_name=name, points=points)
+
+
+@pytest.fixture
+async def backup_service():
+    """Backup service wired to two independent in-memory Qdrant instances."""
+    service = QdrantBackupService(
+        {"url": "http://production.invalid", "backup_batch_size": 40, "backup_upsert_workers": 3},
+        {"url": "http://local.invalid"},
+    )
+    await service.close()
+    service.production_client = AsyncQdrantClient(location=":memory:")
+    service.local_client = AsyncQdrantClient(location=":memory:")
+    yield service
+    await service.close()
+
+
+class TestPipelinedBackup:
+    """Pipelined scroll/upsert backup engine."""
+
+    @pytest.mark.asyncio
+    async def test_backup_collection_copies_all_points(self, backup_service):
+        await _create_source_collection(backup_service.production_client, "Aristotle", 250)
+        progress_updates = []
+
+        result = await backup_service.backup_collection(
+            "Aristotle",
+            progress_callback=lambda current, total: progress_updates.append((current, total)),
+        )
+
+        assert result["success"], result.get("error")
+        assert result["processed_points"] == 250
+        assert result["target_points"] == 250
+        assert result["batches_processed"] >= 250 // backup_service.max_batch_size
+        assert progress_updates[-1] == (250, 250)
+
+        copied = await backup_service.local_client.retrieve(
+            "Aristotle", ids=[17], with_payload=True, with_vectors=True
+        )
+        assert copied[0].payload == {"text": "passage 17", "author": "Aristotle"}
+        assert copied[0].vector["sparse_original"].indices == [17, 102]
+
+    @pytest.mark.asyncio
+    async def test_backup_collections_runs_in_parallel_and_reports_throughput(self, backup_service):
+        for name in ("Kant", "Hume", "Locke"):
+            await _create_source_collection(backup_service.production_client, name, 90)
+        backup_service.parallel_collections = 3
+
+        progress = backup_service.create_backup_progress(["Kant", "Hume", "Locke"])
+        summary = await backup_service.backup_collections(
+            collections=["Kant", "Hume", "Locke"],
+            target_prefix="backup_",
+            backup_id=progress.backup_id,
+        )
+
+        assert summary["backup_id"] == progress.backup_id
+        assert summary["successful_backups"] == 3
+        assert summary["total_target_points"] == 270
+        assert [r["target_collection"] for r in summary["collections"]] == [
+            "backup_Kant", "backup_Hume", "backup_Locke"
+        ]
+        assert progress.status == BackupStatus.COMPLETED
+        assert progress.processed_points == 270
+        assert progress.points_per_second > 0
+        assert progress.eta_seconds is None  # Only reported while in progress
+
+    @pytest.mark.asyncio
+    async def test_upsert_failure_fails_collection(self, backup_service):
+        await _create_source_collection(backup_service.production_client, "Nietzsche", 100)
+        backup_service.retry_attempts = 1
+
+        async def failing_upsert(**kwargs):
+            raise RuntimeError("disk full")
+
+        backup_service.local_client.upsert = failing_upsert
+
+        result = await backup_service.backup_collection("Nietzsche")
+
+        assert result["success"] is False
+        assert "disk full" in result["error"]
+
+
+class TestPipelineControls:
+    """Rate budget and adaptive batch sizing helpers."""
+
+    def test_batch_size_shrinks_on_slow_and_grows_on_fast_operations(self):
+        sizer = AdaptiveBatchSizer(initial=100, minimum=10, maximum=200, target_seconds=1.0)
+
+        assert sizer.observe(2.0) == 50
+        assert sizer.observe(0.9) == 50  # Within target band: unchanged
+        assert sizer.observe(0.1) == 62
+
+        for _ in range(20):
+            sizer.observe(0.01)
+        assert sizer.size == 200
+
+        for _ in range(20):
+            sizer.observe(5.0)
+        assert sizer.size == 10
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_enforces_budget(self):
+        limiter = PointRateLimiter(points_per_second=1000)
+
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire(250) for _ in range(8)))
+        elapsed = time.monotonic() - start
+
+        # 2000 points at 1000/s with one second of burst allowance
+        assert elapsed >= 0.9
+
+    @pytest.mark.asyncio
+    async def test_rate_limiter_disabled_without_budget(self):
+        limiter = PointRateLimiter(None)
+
+        start = time.monotonic()
+        await limiter.acquire(10_000_000)
+
+        assert time.monotonic() - start < 0.05
+
+
+class TestIncrementalSync:
+    """Incremental repair copies and deletes only the differing points."""
+
+    @pytest.fixture
+    async def diverged_collections(self, backup_service, tmp_path):
+        """Source with 120 points; target missing 5, one changed and two extra."""
+        backup_service.checkpoint_dir = str(tmp_path)
+        backup_service.sync_page_size = 25
+        await _create_source_collection(backup_service.production_client, "Kant", 120)
+        result = await backup_service.backup_collection("Kant")
+        assert result["success"]
+
+        local = backup_service.local_client
+        await local.delete("Kant", points_selector=models.PointIdsList(points=[3, 30, 31, 77, 119]))
+        await local.set_payload("Kant", payload={"text": "tampered"}, points=[50])
+        await local.upsert("Kant", points=[
+            models.PointStruct(id=i, vector={"dense_original": [1.0, 1.0, 1.0, 1.0]}, payload={})
+            for i in (500, 501)
+        ])
+        return backup_service
+
+    @pytest.mark.asyncio
+    async def test_dry_run_reports_diff_without_changes(self, diverged_collections):
+        service = diverged_collections
+
+        result = await service.repair_collection(
+            "Kant", "Kant", repair_mode="incremental_sync", dry_run=True, compare_content=True
+        )
+
+        assert result["success"], result["errors"]
+        diff = result["diff"]
+        assert diff["missing_points"] == 5
+        assert sorted(diff["sample_missing_ids"]) == [3, 30, 31, 77, 119]
+        assert diff["sample_changed_ids"] == [50]
+        assert sorted(diff["sample_extra_ids"]) == [500, 501]
+        assert diff["copied_points"] == diff["deleted_points"] == 0
+        assert (await service.local_client.count("Kant")).count == 117
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync_applies_only_differences(self, diverged_collections):
+        service = diverged_collections
+        upserted = []
+        original_upsert = service.local_client.upsert
+
+        async def recording_upsert(**kwargs):
+            upserted.extend(point.id for point in kwargs["points"])
+            return await original_upsert(**kwargs)
+
+        service.local_client.upsert = recording_upsert
+
+        result = await service.repair_collection(
+            "Kant", "Kant", repair_mode="incremental_sync", compare_content=True
+        )
+
+        assert result["success"], result["errors"]
+        assert sorted(upserted) == [3, 30, 31, 50, 77, 119]
+        assert result["repaired_points"] == 8
+        assert (await service.local_client.count("Kant")).count == 120
+        repaired = await service.local_client.retrieve("Kant", ids=[50], with_payload=True)
+        assert repaired[0].payload["text"] == "passage 50"
+
+    @pytest.mark.asyncio
+    async def test_missing_points_mode_keeps_extra_points(self, diverged_collections):
+        service = diverged_collections
+
+        result = await service.repair_collection("Kant", "Kant", repair_mode="missing_points")
+
+        assert result["success"], result["errors"]
+        assert result["diff"]["copied_points"] == 5
+        assert result["diff"]["deleted_points"] == 0
+        assert (await service.local_client.count("Kant")).count == 122
+
+    @pytest.mark.asyncio
+    async def test_interrupted_sync_resumes_from_checkpoint(self, diverged_collections):
+        service = diverged_collections
+        service.retry_attempts = 1
+        original_upsert = service.local_client.upsert
+        calls = {"count": 0}
+
+        async def flaky_upsert(**kwargs):
+            calls["count"] += 1
+            if calls["count"] == 2:
+                raise RuntimeError("connection reset")
+            return await original_upsert(**kwargs)
+
+        service.local_client.upsert = flaky_upsert
+
+        first = await service.repair_collection("Kant", "Kant", repair_mode="incremental_sync")
+        assert not first["success"]
+        assert first["diff"]["copied_points"] == 1
+
+        service.local_client.upsert = original_upsert
+        second = await service.repair_collection("Kant", "Kant", repair_mode="incremental_sync")
+
+        assert second["success"], second["errors"]
+        assert second["diff"]["resumed_from_checkpoint"]
+        # Pages before the checkpoint are not rescanned
+        assert second["diff"]["scanned_source_points"] == 120
+        assert (await service.local_client.count("Kant")).count == 120
+        assert os.listdir(service.checkpoint_dir) == []  # Checkpoint removed on completion
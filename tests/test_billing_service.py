@@ -9,6 +9,7 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timedelta
 from decimal import Decimal
+from dateutil.relativedelta import relativedelta
 from dataclasses import dataclass
 
 from app.services.billing_service import (
@@ -20,6 +21,7 @@ from app.services.billing_service import (
     Invoice
 )
 from app.core.db_models import UsageRecord, PaymentRecord, SubscriptionTier
+from app.services.usage_analytics import UsageAggregate
 
 
 @pytest.fixture
@@ -208,8 +210,10 @@ class TestUsageStatistics:
         with patch('app.services.billing_service.AsyncSessionLocal') as mock_session_maker:
             mock_session = AsyncMock()
             mock_session_maker.return_value.__aenter__.return_value = mock_session
+            # The database returns per-endpoint aggregates (endpoint, requests, tokens)
             mock_result = MagicMock()
-            mock_result.scalars.return_value.all.return_value = mock_usage_records
+            mock_result.all.return_value = [("/api/ask", 2, 250), ("/api/query", 1, 200)]
+            mock_result.scalar.return_value = SubscriptionTier.BASIC
             mock_session.execute = AsyncMock(return_value=mock_result)
             
             stats = await billing_service.get_usage_stats(1, "2024-01")
@@ -220,6 +224,7 @@ class TestUsageStatistics:
             assert stats.total_tokens == 450  # 150 + 200 + 100
             assert stats.endpoints_used["/api/ask"] == 2
             assert stats.endpoints_used["/api/query"] == 1
+            assert stats.subscription_tier == SubscriptionTier.BASIC
 
     async def test_get_usage_stats_cached(self, billing_service):
         """Test usage statistics retrieval from cache."""
@@ -580,46 +585,35 @@ class TestAnalyticsAndReporting:
 
     async def test_get_usage_analytics_monthly(self, billing_service, mock_usage_records):
         """Test monthly usage analytics."""
-        # Mock the get_usage_stats method to return consistent data
-        mock_stats = UsageStats(
-            user_id=1,
-            period="2024-01",
-            total_requests=3,
-            total_tokens=450,
-            endpoints_used={"/api/ask": 2, "/api/query": 1},
-            subscription_tier=SubscriptionTier.FREE
-        )
-        
-        with patch.object(billing_service, 'get_usage_stats', return_value=mock_stats):
+        # One aggregate over the three months; only the current month has usage
+        current_period = datetime.utcnow().strftime("%Y-%m")
+        usage = UsageAggregate()
+        usage.add("/api/ask", 2, 250, bucket=current_period)
+        usage.add("/api/query", 1, 200, bucket=current_period)
+
+        with patch.object(billing_service, '_usage_by_month', AsyncMock(return_value=usage)) as usage_by_month:
             analytics = await billing_service.get_usage_analytics(1, "monthly", months=3)
             
             assert analytics["user_id"] == 1
             assert analytics["period_type"] == "monthly"
             assert analytics["periods_analyzed"] == 3
             assert len(analytics["monthly_usage"]) == 3
+            assert analytics["summary"]["total_requests"] == 3
+            assert analytics["endpoint_breakdown"] == {"/api/ask": 2, "/api/query": 1}
+            assert analytics["monthly_usage"][0] == {"period": current_period, "requests": 3, "tokens": 450}
+            assert analytics["monthly_usage"][1]["requests"] == 0
+            usage_by_month.assert_awaited_once()
 
     async def test_get_usage_trends(self, billing_service):
         """Test usage trend analysis."""
-        # Mock get_usage_stats to return different values for different periods
-        async def mock_get_usage_stats(user_id, period):
-            # The service gets current month first (index 0), then previous months
-            if "10" in period:  # Most recent month (October)
-                return UsageStats(
-                    user_id=user_id, period=period, total_requests=8000, total_tokens=160000,
-                    endpoints_used={"/api/ask": 5000, "/api/query": 3000}, subscription_tier=SubscriptionTier.FREE
-                )
-            elif "09" in period:  # Previous month (September)
-                return UsageStats(
-                    user_id=user_id, period=period, total_requests=6000, total_tokens=120000,
-                    endpoints_used={"/api/ask": 4000, "/api/query": 2000}, subscription_tier=SubscriptionTier.FREE
-                )
-            else:  # Older months
-                return UsageStats(
-                    user_id=user_id, period=period, total_requests=4000, total_tokens=80000,
-                    endpoints_used={"/api/ask": 3000, "/api/query": 1000}, subscription_tier=SubscriptionTier.FREE
-                )
-        
-        with patch.object(billing_service, 'get_usage_stats', side_effect=mock_get_usage_stats):
+        # Monthly buckets as returned by the aggregate query
+        current = datetime.utcnow()
+        usage = UsageAggregate()
+        for months_ago, requests in [(0, 8000), (1, 6000), (2, 4000)]:
+            period = (current - relativedelta(months=months_ago)).strftime("%Y-%m")
+            usage.add("/api/ask", requests, requests * 20, bucket=period)
+
+        with patch.object(billing_service, '_usage_by_month', AsyncMock(return_value=usage)):
             trends = await billing_service.get_usage_trends(1, months=3)
             
             assert trends["request_growth_rate"] > 0  # Should show growth from 6000 to 8000
@@ -732,23 +726,13 @@ class TestConcurrencyAndPerformance:
 
     async def test_large_usage_dataset_handling(self, billing_service):
         """Test handling of large usage datasets."""
-        # Create large mock dataset
-        large_usage_records = [
-            MagicMock(
-                user_id=1,
-                endpoint="/api/ask",
-                tokens_used=100,
-                timestamp=datetime.utcnow() - timedelta(days=i),
-                billing_period="2024-01"
-            )
-            for i in range(10000)  # 10k records
-        ]
-        
+        # 10k records are summed by the database; only the aggregate row comes back
         with patch('app.services.billing_service.AsyncSessionLocal') as mock_session_maker:
             mock_session = AsyncMock()
             mock_session_maker.return_value.__aenter__.return_value = mock_session
             mock_result = MagicMock()
-            mock_result.scalars.return_value.all.return_value = large_usage_records
+            mock_result.all.return_value = [("/api/ask", 10000, 1000000)]
+            mock_result.scalar.return_value = SubscriptionTier.FREE
             mock_session.execute = AsyncMock(return_value=mock_result)
             
             stats = await billing_service.get_usage_stats(1, "2024-01")
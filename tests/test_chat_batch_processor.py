@@ -0,0 +1,196 @@
+"""Tests for the chat batch processor: bulk embedding, keyset checkpoints and adaptive throttling."""
+
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from qdrant_client import AsyncQdrantClient
+from sqlmodel import select
+
+from app.core.db_models import ChatMessage, MessageRole
+from app.services.chat_qdrant_service import ChatQdrantService
+from app.utils.chat_batch_processor import AdaptiveThrottle, ChatBatchProcessor
+from tests.performance.chat_recall_benchmark import OfflineEncoders
+
+
+class CountingEncoders(OfflineEncoders):
+    """Offline encoders recording each bulk embedding request."""
+
+    def __init__(self):
+        super().__init__()
+        self.bulk_requests = []
+
+    async def generate_dense_vector(self, text):
+        raise AssertionError("Backfills must embed in bulk")
+
+    async def generate_dense_vectors(self, texts):
+        self.bulk_requests.append(len(texts))
+        return [await super(CountingEncoders, self).generate_dense_vector(text) for text in texts]
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    with patch("app.utils.chat_batch_processor.AsyncSessionLocal", session_factory):
+        yield session_factory
+
+
+@pytest.fixture
+async def service():
+    client = AsyncQdrantClient(location=":memory:")
+    with patch.dict("os.environ", {"APP_ENV": "test"}):
+        chat_service = ChatQdrantService(client, CountingEncoders())
+    yield chat_service
+    await client.close()
+
+
+async def add_messages(session_factory, count, session_id="s1"):
+    async with session_factory() as session:
+        for i in range(count):
+            session.add(ChatMessage(
+                message_id=str(uuid.uuid4()),
+                conversation_id=f"conv-{session_id}",
+                session_id=session_id,
+                role=MessageRole.USER,
+                content=f"Message {i} about justice and the soul.",
+                created_at=datetime.utcnow(),
+            ))
+        await session.commit()
+
+
+async def stored_messages(session_factory):
+    async with session_factory() as session:
+        return list((await session.execute(select(ChatMessage).order_by(ChatMessage.id))).scalars().all())
+
+
+def processor(tmp_path, **options):
+    return ChatBatchProcessor(checkpoint_dir=str(tmp_path / "checkpoints"), target_latency_ms=None, **options)
+
+
+@pytest.mark.asyncio
+async def test_upload_embeds_in_bulk_and_stores_point_ids(tmp_path, session_factory, service):
+    await add_messages(session_factory, 7)
+    await add_messages(session_factory, 2, session_id="other")
+
+    result = await processor(tmp_path, batch_size=3, max_concurrent=2).batch_upload_to_qdrant(
+        session_id="s1", qdrant_service=service
+    )
+
+    assert (result.total_processed, result.successful, result.failed) == (7, 7, 0)
+    assert sorted(service.llm_manager.bulk_requests) == [1, 3, 3]
+    messages = await stored_messages(session_factory)
+    points, _ = await service.qclient.scroll(service.collection_name, limit=100)
+    assert {p.id for p in points} == {m.qdrant_point_id for m in messages if m.session_id == "s1"}
+    assert all(m.qdrant_point_id is None for m in messages if m.session_id == "other")
+    assert not (tmp_path / "checkpoints" / "upload-s1.checkpoint.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_interrupted_run_resumes_after_checkpoint(tmp_path, session_factory, service):
+    await add_messages(session_factory, 10)
+    checkpoint = tmp_path / "checkpoints" / "vectors.checkpoint.json"
+    original = ChatBatchProcessor._process_batch
+    calls = []
+
+    async def crash_on_third_batch(self, batch, *args):
+        calls.append(batch[0].id)
+        if len(calls) == 3:
+            raise ConnectionError("process killed")
+        return await original(self, batch, *args)
+
+    with patch.object(ChatBatchProcessor, "_process_batch", crash_on_third_batch):
+        crashed = await processor(tmp_path, batch_size=3, max_concurrent=1).batch_generate_vectors(
+            missing_vectors_only=False, qdrant_service=service
+        )
+    assert crashed.errors == ["process killed"]
+    assert json.loads(checkpoint.read_text())["last_id"] == 6
+
+    # Re-embedding everything: only the cursor keeps the rerun from starting over
+    resumed = await processor(tmp_path, batch_size=3, max_concurrent=1).batch_generate_vectors(
+        missing_vectors_only=False, qdrant_service=service
+    )
+
+    assert resumed.resumed_from_checkpoint
+    assert (resumed.total_processed, resumed.successful) == (4, 4)
+    assert all(m.qdrant_point_id for m in await stored_messages(session_factory))
+    assert not checkpoint.exists()
+
+    restarted = await processor(tmp_path, batch_size=5).batch_generate_vectors(
+        missing_vectors_only=False, qdrant_service=service, resume=False
+    )
+    assert (restarted.total_processed, restarted.resumed_from_checkpoint) == (10, False)
+
+
+@pytest.mark.asyncio
+async def test_guarded_run_continues_on_next_run(tmp_path, session_factory, service):
+    await add_messages(session_factory, 5)
+    runs = [
+        await processor(tmp_path, batch_size=2, max_results_guard=3).batch_generate_vectors(
+            missing_vectors_only=False, qdrant_service=service
+        )
+        for _ in range(2)
+    ]
+
+    assert [r.total_processed for r in runs] == [3, 2]
+    assert [r.resumed_from_checkpoint for r in runs] == [False, True]
+    assert not (tmp_path / "checkpoints" / "vectors.checkpoint.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_reported_and_skipped(tmp_path, session_factory, service):
+    await add_messages(session_factory, 4)
+    async with session_factory() as session:
+        message = (await session.execute(select(ChatMessage).where(ChatMessage.id == 2))).scalar_one()
+        message.content = "   "
+        await session.commit()
+
+    result = await processor(tmp_path, batch_size=2).batch_upload_to_qdrant(qdrant_service=service)
+
+    assert (result.successful, result.failed) == (3, 1)
+    assert result.errors == [f"Message {message.message_id}: Upload failed"]
+
+
+@pytest.mark.asyncio
+async def test_throttle_backs_off_while_latency_is_high():
+    latencies = [0.5, 0.5, 0.5, 0.5, 0.01, 0.01]
+
+    async def probe():
+        return latencies.pop(0)
+
+    throttle = AdaptiveThrottle(4, target_latency_seconds=0.1, probe=probe, probe_interval_seconds=0,
+                                initial_pause_seconds=0.1, max_pause_seconds=0.15)
+    observed = []
+    for _ in range(6):
+        await throttle.observe()
+        observed.append((throttle.limit, throttle.pause_seconds))
+
+    assert observed == [(2, 0.0), (1, 0.0), (1, 0.1), (1, 0.15), (2, 0.0), (3, 0.0)]
+
+    async def failing_probe():
+        raise TimeoutError("qdrant unreachable")
+
+    throttle = AdaptiveThrottle(1, target_latency_seconds=0.1, probe=failing_probe, probe_interval_seconds=0,
+                                initial_pause_seconds=0.01, max_pause_seconds=0.05)
+    for _ in range(4):
+        await throttle.observe()
+    assert throttle.pause_seconds == 0.05
+
+
+@pytest.mark.asyncio
+async def test_throttle_limits_batches_in_flight():
+    throttle = AdaptiveThrottle(3, target_latency_seconds=1.0)
+    throttle.limit = 2
+    in_flight, peak = 0, 0
+
+    async def batch():
+        nonlocal in_flight, peak
+        async with throttle.slot():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(batch() for _ in range(6)))
+    assert peak == 2
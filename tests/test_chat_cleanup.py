@@ -0,0 +1,173 @@
+"""Tests for set-based cleanup in ChatCleanupUtility."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from qdrant_client import AsyncQdrantClient, models
+from sqlmodel import select
+
+from app.core.db_models import ChatConversation, ChatMessage, MessageRole
+from app.services.chat_qdrant_service import ChatQdrantService
+from app.utils.chat_cleanup import ChatCleanupUtility, RetentionPolicy
+
+NOW = datetime.now(timezone.utc)
+OLD = NOW - timedelta(days=200)
+
+
+@pytest.fixture
+def chat_db(session_factory):
+    with patch("app.utils.chat_cleanup.AsyncSessionLocal", session_factory):
+        yield session_factory
+
+
+@pytest.fixture
+async def chat_qdrant():
+    """ChatQdrantService backed by an in-memory Qdrant collection."""
+    service = ChatQdrantService(AsyncQdrantClient(location=":memory:"), MagicMock())
+    service.collection_name = "Chat_History_Test"
+    await service.qclient.create_collection(
+        service.collection_name,
+        vectors_config=models.VectorParams(size=2, distance=models.Distance.COSINE),
+    )
+    yield service
+    await service.qclient.close()
+
+
+async def _add_session(session_factory, qdrant, session_id, updated_at, messages=3, conversation=True):
+    """Add a session with one conversation and two Qdrant chunks per message."""
+    conversation_id = f"conv-{session_id}"
+    points = []
+    async with session_factory() as db_session:
+        if conversation:
+            db_session.add(ChatConversation(
+                conversation_id=conversation_id,
+                session_id=session_id,
+                created_at=updated_at,
+                updated_at=updated_at,
+            ))
+        for m in range(messages):
+            message_id = f"{session_id}-msg-{m}"
+            db_session.add(ChatMessage(
+                message_id=message_id,
+                conversation_id=conversation_id,
+                session_id=session_id,
+                role=MessageRole.USER,
+                content=f"message {m}",
+                created_at=updated_at + timedelta(minutes=m),
+            ))
+            for chunk in range(2):
+                points.append(models.PointStruct(
+                    id=str(uuid.uuid4()),
+                    vector=[1.0, float(chunk)],
+                    payload={"session_id": session_id, "message_id": message_id, "chunk_index": chunk},
+                ))
+        await db_session.commit()
+    if qdrant:
+        await qdrant.qclient.upsert(qdrant.collection_name, points=points)
+
+
+async def _message_ids(session_factory):
+    async with session_factory() as db_session:
+        return set((await db_session.execute(select(ChatMessage.message_id))).scalars())
+
+
+async def _points_for(qdrant, key, value):
+    result = await qdrant.qclient.count(
+        qdrant.collection_name,
+        count_filter=models.Filter(must=[models.FieldCondition(key=key, match=models.MatchValue(value=value))]),
+    )
+    return result.count
+
+
+class TestExpiredSessionCleanup:
+    """Expired sessions are removed batch-wise with set-based deletes."""
+
+    @pytest.mark.asyncio
+    async def test_deletes_expired_sessions_in_batches(self, chat_db, chat_qdrant):
+        for i in range(5):
+            await _add_session(chat_db, chat_qdrant, f"old-{i}", OLD)
+        await _add_session(chat_db, chat_qdrant, "recent", NOW)
+        utility = ChatCleanupUtility(RetentionPolicy(max_age_days=90, cleanup_batch_size=2), chat_qdrant)
+
+        with patch.object(utility, "_cleanup_session_batch", wraps=utility._cleanup_session_batch) as batch:
+            result = await utility.cleanup_expired_sessions()
+
+        assert result.errors == []
+        assert result.conversations_deleted == 5
+        assert result.messages_deleted == 15
+        # Every chunk is removed, not only the point referenced by qdrant_point_id
+        assert result.qdrant_points_deleted == 30
+        assert result.batches_processed == batch.call_count == 3
+        assert [len(call.args[1]) for call in batch.call_args_list] == [2, 2, 1]
+        assert await _message_ids(chat_db) == {"recent-msg-0", "recent-msg-1", "recent-msg-2"}
+        assert await _points_for(chat_qdrant, "session_id", "recent") == 6
+        assert (await chat_qdrant.qclient.count(chat_qdrant.collection_name)).count == 6
+
+    @pytest.mark.asyncio
+    async def test_explicit_session_ids(self, chat_db, chat_qdrant):
+        await _add_session(chat_db, chat_qdrant, "keep", NOW)
+        await _add_session(chat_db, chat_qdrant, "drop", NOW)
+        utility = ChatCleanupUtility(qdrant_service=chat_qdrant)
+
+        result = await utility.cleanup_expired_sessions(session_ids=["drop"])
+
+        assert result.messages_deleted == 3
+        assert await _points_for(chat_qdrant, "session_id", "drop") == 0
+        assert await _points_for(chat_qdrant, "session_id", "keep") == 6
+
+    @pytest.mark.asyncio
+    async def test_qdrant_failure_is_reported(self, chat_db, chat_qdrant):
+        for i in range(3):
+            await _add_session(chat_db, chat_qdrant, f"old-{i}", OLD)
+        utility = ChatCleanupUtility(RetentionPolicy(max_age_days=90, cleanup_batch_size=2), chat_qdrant)
+
+        with patch.object(chat_qdrant, "delete_points_for_sessions", side_effect=ConnectionError("qdrant down")):
+            result = await utility.cleanup_expired_sessions()
+
+        # Database rows are gone and counted; the Qdrant failure surfaces per batch
+        assert result.messages_deleted == 9
+        assert result.qdrant_points_deleted == 0
+        assert result.errors == ["Qdrant cleanup error: qdrant down"] * 2
+        assert (await chat_qdrant.qclient.count(chat_qdrant.collection_name)).count == 18
+
+
+class TestOrphanedAndOversizedCleanup:
+    """Orphans and excess rows are deleted with RETURNING-driven Qdrant cleanup."""
+
+    @pytest.mark.asyncio
+    async def test_cleanup_orphaned_data(self, chat_db, chat_qdrant):
+        await _add_session(chat_db, chat_qdrant, "healthy", NOW)
+        await _add_session(chat_db, chat_qdrant, "orphaned", NOW, messages=5, conversation=False)
+        await _add_session(chat_db, None, "empty", NOW, messages=0)
+        utility = ChatCleanupUtility(RetentionPolicy(cleanup_batch_size=2), chat_qdrant)
+
+        stats = await utility.get_cleanup_statistics()
+        assert stats["orphaned_messages"] == 5
+        assert stats["empty_conversations"] == 1
+
+        result = await utility.cleanup_orphaned_data()
+
+        assert result.errors == []
+        assert result.messages_deleted == 5
+        assert result.conversations_deleted == 1
+        assert result.qdrant_points_deleted == 10
+        assert await _points_for(chat_qdrant, "session_id", "orphaned") == 0
+        assert await _message_ids(chat_db) == {"healthy-msg-0", "healthy-msg-1", "healthy-msg-2"}
+
+    @pytest.mark.asyncio
+    async def test_cleanup_oversized_keeps_most_recent_messages(self, chat_db, chat_qdrant):
+        await _add_session(chat_db, chat_qdrant, "chatty", NOW, messages=7)
+        utility = ChatCleanupUtility(
+            RetentionPolicy(max_messages_per_session=3, cleanup_batch_size=3), chat_qdrant
+        )
+
+        result = await utility.cleanup_oversized_sessions()
+
+        assert result.errors == []
+        assert result.messages_deleted == 4
+        assert result.qdrant_points_deleted == 8
+        assert result.batches_processed == 2
+        assert await _message_ids(chat_db) == {"chatty-msg-4", "chatty-msg-5", "chatty-msg-6"}
+        assert await _points_for(chat_qdrant, "message_id", "chatty-msg-0") == 0
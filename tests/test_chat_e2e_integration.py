@@ -382,7 +382,7 @@ class TestChatE2EIntegration:
             await chat_qdrant_service.generate_message_vector("Test content")
         
         # Test 4: Search service unavailable
-        mock_qdrant_client.search.side_effect = LLMUnavailableError("Search service unavailable")
+        mock_qdrant_client.query_points_groups.side_effect = LLMUnavailableError("Search service unavailable")
         
         # Should handle search failure gracefully (fallback decorator may return empty results)
         try:
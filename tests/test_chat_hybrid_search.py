@@ -0,0 +1,202 @@
+"""
+Hybrid (sparse + dense) chat search against a real in-memory Qdrant.
+
+Chunks are stored with a SPLADE sparse vector next to the dense one, searches
+fuse both, and dense-only collections keep working until migrate_to_hybrid
+rebuilds them.
+"""
+
+import uuid
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from qdrant_client import AsyncQdrantClient, models
+
+from app.core.db_models import ChatMessage, MessageRole
+from app.services.chat_qdrant_service import SPARSE_VECTOR_NAME, ChatQdrantService
+from tests.performance.chat_recall_benchmark import OfflineEncoders
+
+SESSION = "s1"
+
+
+class FlakySplade(OfflineEncoders):
+    """SPLADE that can be switched off, like an encoder that failed to load."""
+
+    available = True
+
+    async def generate_splade_vector(self, text):
+        if not self.available:
+            raise RuntimeError("Splade model not initialized")
+        return await super().generate_splade_vector(text)
+
+
+def message(content: str, session_id: str = SESSION) -> ChatMessage:
+    return ChatMessage(
+        message_id=str(uuid.uuid4()),
+        conversation_id=f"conv-{session_id}",
+        session_id=session_id,
+        username="alice",
+        role=MessageRole.USER,
+        content=content,
+        created_at=datetime.utcnow(),
+    )
+
+
+@pytest.fixture
+async def client():
+    client = AsyncQdrantClient(location=":memory:")
+    yield client
+    await client.close()
+
+
+@pytest.fixture
+def service(client):
+    with patch.dict("os.environ", {"APP_ENV": "test"}):
+        chat_service = ChatQdrantService(client, FlakySplade())
+    chat_service.use_fusion = False
+    return chat_service
+
+
+async def stored_points(service):
+    points, _ = await service.qclient.scroll(service.collection_name, limit=100, with_payload=True, with_vectors=True)
+    return points
+
+
+async def create_dense_only_collection(service, messages):
+    """A chat collection as created before sparse vectors were added."""
+    await service.qclient.create_collection(
+        service.collection_name,
+        vectors_config=models.VectorParams(size=4096, distance=models.Distance.COSINE),
+    )
+    encoders = OfflineEncoders()
+    await service.qclient.upsert(service.collection_name, [
+        models.PointStruct(
+            id=str(uuid.uuid4()),
+            vector=await encoders.generate_dense_vector(msg.content),
+            payload={"message_id": msg.message_id, "session_id": msg.session_id, "content": msg.content,
+                     "chunk_index": 0, "total_chunks": 1},
+        )
+        for msg in messages
+    ])
+
+
+@pytest.mark.asyncio
+async def test_exact_names_are_found_by_hybrid_search(service):
+    same_topic = [message(f"{name} argued that virtue and courage belong together.")
+                  for name in ("Zorvath", "Mirelka", "Dexanor", "Quintaro", "Lorbanu", "Velsith")]
+    for msg in same_topic:
+        await service.upload_message_to_qdrant(msg)
+    await service.upload_message_to_qdrant(message("Mirelka argued that virtue belongs elsewhere.", "s2"))
+
+    points = await stored_points(service)
+    assert all(point.vector[SPARSE_VECTOR_NAME].indices for point in points)
+
+    # Only the sparse vector matches the name; every message is equally close to the dense query
+    results = await service.search_messages(SESSION, "What did Mirelka say?", limit=3)
+
+    assert results[0]["message_id"] == same_topic[1].message_id
+    assert all(r["session_id"] == SESSION for r in results)
+    context = await service.search_conversation_context(SESSION, "Mirelka", limit=2)
+    assert context[0]["message_id"] == same_topic[1].message_id
+
+
+@pytest.mark.asyncio
+async def test_long_message_takes_one_hybrid_result_slot(service):
+    service.max_chunk_size = 60
+    long_message = message(" ".join(f"Mirelka weighed virtue against courage, point {i}." for i in range(30)))
+    await service.upload_message_to_qdrant(long_message)
+    # Off-topic messages rank below every chunk of the long message in both vectors
+    others = [message(f"Ordinary remark {i} on breakfast.") for i in range(6)]
+    for msg in others:
+        await service.upload_message_to_qdrant(msg)
+    assert len(await stored_points(service)) == 36
+
+    results = await service.search_messages(SESSION, "What did Mirelka say about virtue?", limit=5)
+
+    assert len(results) == 5
+    assert len({r["message_id"] for r in results}) == 5
+
+
+@pytest.mark.asyncio
+async def test_splade_outage_stores_and_searches_dense_only(service):
+    service.llm_manager.available = False
+    msg = message("Kant on the categorical imperative.")
+
+    await service.upload_message_to_qdrant(msg)
+    results = await service.search_messages(SESSION, "categorical imperative", limit=1)
+
+    (point,) = await stored_points(service)
+    assert isinstance(point.vector, list)  # Dense vector only
+    assert results[0]["message_id"] == msg.message_id
+
+    service.llm_manager.available = True
+    counts = await service.migrate_to_hybrid()
+    (point,) = await stored_points(service)
+    assert counts == {"copied": 0, "restored": 0, "backfilled": 1}
+    assert point.vector[SPARSE_VECTOR_NAME].indices
+
+
+@pytest.mark.asyncio
+async def test_dense_only_collection_is_searched_until_migrated(service):
+    messages = [message(f"Note {i} on justice and the city.") for i in range(5)]
+    await create_dense_only_collection(service, messages)
+
+    assert not await service._hybrid_enabled()
+    results = await service.search_messages(SESSION, "justice", limit=5)
+    assert {r["message_id"] for r in results} == {m.message_id for m in messages}
+
+    counts = await service.migrate_to_hybrid(batch_size=2)
+
+    info = await service.qclient.get_collection(service.collection_name)
+    assert SPARSE_VECTOR_NAME in info.config.params.sparse_vectors
+    assert counts == {"copied": 5, "restored": 5, "backfilled": 0}
+    points = await stored_points(service)
+    assert {p.payload["message_id"] for p in points} == {m.message_id for m in messages}
+    assert all(p.vector[""] and p.vector[SPARSE_VECTOR_NAME].indices for p in points)
+    assert [c.name for c in (await service.qclient.get_collections()).collections] == [service.collection_name]
+    assert await service._hybrid_enabled()
+
+
+@pytest.mark.asyncio
+async def test_interrupted_migration_resumes(service):
+    messages = [message(f"Remark {i} about pleasure and pain.") for i in range(4)]
+    await create_dense_only_collection(service, messages)
+
+    original_delete = service.qclient.delete_collection
+
+    async def interrupted_delete(name, **kwargs):
+        await original_delete(name, **kwargs)
+        raise ConnectionError("lost connection")
+
+    with patch.object(service.qclient, "delete_collection", side_effect=interrupted_delete), \
+            patch.object(service, "retry_attempts", 1):
+        with pytest.raises(Exception):
+            await service.migrate_to_hybrid()
+
+    # The dense-only collection is gone; its points wait in staging
+    names = {c.name for c in (await service.qclient.get_collections()).collections}
+    assert names == {f"{service.collection_name}_hybrid_migration"}
+
+    counts = await service.migrate_to_hybrid()
+
+    assert counts == {"copied": 0, "restored": 4, "backfilled": 0}
+    points = await stored_points(service)
+    assert {p.payload["message_id"] for p in points} == {m.message_id for m in messages}
+    assert all(p.vector[SPARSE_VECTOR_NAME].indices for p in points)
+
+
+@pytest.mark.asyncio
+async def test_hybrid_points_import_into_dense_only_collection(service, client):
+    msg = message("Friendship requires equality.")
+    await service.upload_message_to_qdrant(msg)
+    exported = (await service.get_points_for_messages([msg.message_id]))[msg.message_id]
+    assert set(exported[0]["vector"]) == {"", SPARSE_VECTOR_NAME}
+
+    with patch.dict("os.environ", {"APP_ENV": "prod"}):
+        target = ChatQdrantService(client, FlakySplade())
+    await create_dense_only_collection(target, [])
+
+    assert await target.upsert_point_data(exported) == 1
+    (point,) = await stored_points(target)
+    assert isinstance(point.vector, list)
@@ -199,7 +199,7 @@ class TestChatIntegrationSimple:
             service = ChatQdrantService(mock_qdrant_client, mock_llm_manager)
         
         # Mock search results with session filtering
-        def mock_search(collection_name, query_vector, query_filter=None, **kwargs):
+        def mock_query_points_groups(collection_name, query, query_filter=None, **kwargs):
             # Simulate results from different sessions
             all_results = [
                 MagicMock(
@@ -231,11 +231,13 @@ class TestChatIntegrationSimple:
                             hasattr(condition, 'match') and
                             result.payload["session_id"] == condition.match.value):
                             filtered_results.append(result)
-                return filtered_results
+                all_results = filtered_results
             
-            return all_results
+            return MagicMock(groups=[
+                MagicMock(id=result.payload["message_id"], hits=[result]) for result in all_results
+            ])
         
-        mock_qdrant_client.search = AsyncMock(side_effect=mock_search)
+        mock_qdrant_client.query_points_groups = AsyncMock(side_effect=mock_query_points_groups)
         
         # Test search with session filtering
         results = await service.search_messages(
@@ -0,0 +1,281 @@
+"""Tests for streaming chat export/import in ChatMigrationUtility."""
+
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from qdrant_client import AsyncQdrantClient, models
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel, func, select
+
+from app.core.db_models import ChatConversation, ChatMessage, MessageRole
+from app.services.chat_qdrant_service import ChatQdrantService
+from app.utils.chat_migration import ChatMigrationUtility
+
+
+async def _make_session_factory(db_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    return engine, sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _seed_chat_data(session_factory, sessions=3, messages_per_session=10):
+    base_time = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    async with session_factory() as db_session:
+        for s in range(sessions):
+            conversation_id = f"conv-{s}"
+            db_session.add(ChatConversation(
+                conversation_id=conversation_id,
+                session_id=f"session-{s}",
+                username=f"user-{s}",
+                title=f"Conversation {s}",
+                created_at=base_time,
+                updated_at=base_time,
+            ))
+            for m in range(messages_per_session):
+                db_session.add(ChatMessage(
+                    message_id=f"msg-{s}-{m}",
+                    conversation_id=conversation_id,
+                    session_id=f"session-{s}",
+                    username=f"user-{s}",
+                    role=MessageRole.USER if m % 2 == 0 else MessageRole.ASSISTANT,
+                    content=f"Message {m} of session {s}",
+                    created_at=base_time + timedelta(minutes=m),
+                ))
+        await db_session.commit()
+
+
+async def _count(session_factory, model):
+    async with session_factory() as db_session:
+        return (await db_session.execute(select(func.count()).select_from(model))).scalar_one()
+
+
+def _read_records(path):
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.fixture
+async def source_db(tmp_path):
+    engine, session_factory = await _make_session_factory(tmp_path / "source.db")
+    await _seed_chat_data(session_factory)
+    yield session_factory
+    await engine.dispose()
+
+
+@pytest.fixture
+async def target_db(tmp_path):
+    engine, session_factory = await _make_session_factory(tmp_path / "target.db")
+    yield session_factory
+    await engine.dispose()
+
+
+@pytest.fixture
+async def chat_qdrant():
+    """ChatQdrantService backed by an in-memory Qdrant collection."""
+    service = ChatQdrantService(AsyncQdrantClient(location=":memory:"), MagicMock())
+    service.collection_name = "Chat_History_Test"
+    await service.qclient.create_collection(
+        service.collection_name,
+        vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE),
+    )
+    yield service
+    await service.qclient.close()
+
+
+class TestStreamingExport:
+    """NDJSON export streams batches and checkpoints progress."""
+
+    @pytest.mark.asyncio
+    async def test_export_writes_ndjson_records(self, source_db, tmp_path):
+        output = tmp_path / "backup.ndjson"
+        utility = ChatMigrationUtility(batch_size=7)
+
+        with patch("app.utils.chat_migration.AsyncSessionLocal", source_db):
+            result = await utility.export_chat_data(str(output))
+
+        assert result.errors == []
+        assert result.migrated_conversations == 3
+        assert result.migrated_messages == 30
+        records = _read_records(output)
+        assert records[0]["record_type"] == "metadata"
+        assert records[0]["format_version"] == "2.0"
+        assert [r["record_type"] for r in records[1:4]] == ["conversation"] * 3
+        assert records[-1] == {**records[-1], "record_type": "summary", "total_messages": 30}
+        assert not (tmp_path / "backup.ndjson.checkpoint.json").exists()
+
+    @pytest.mark.asyncio
+    async def test_export_filters_sessions_and_compresses(self, source_db, tmp_path):
+        output = tmp_path / "session.ndjson.gz"
+        utility = ChatMigrationUtility(batch_size=4)
+
+        with patch("app.utils.chat_migration.AsyncSessionLocal", source_db):
+            result = await utility.export_chat_data(str(output), session_ids=["session-1"])
+
+        assert result.migrated_messages == 10
+        messages = [r for r in _read_records(output) if r["record_type"] == "message"]
+        assert {m["session_id"] for m in messages} == {"session-1"}
+        assert messages[0]["username"] == "user-1"
+
+    @pytest.mark.asyncio
+    async def test_interrupted_export_resumes_from_checkpoint(self, source_db, tmp_path):
+        output = tmp_path / "backup.ndjson.gz"
+        utility = ChatMigrationUtility(batch_size=8)
+        original_record = ChatMigrationUtility._message_record
+        calls = {"count": 0}
+
+        def failing_record(message):
+            calls["count"] += 1
+            if calls["count"] == 20:
+                raise KeyboardInterrupt
+            return original_record(message)
+
+        with patch("app.utils.chat_migration.AsyncSessionLocal", source_db):
+            with patch.object(ChatMigrationUtility, "_message_record", staticmethod(failing_record)):
+                with pytest.raises(KeyboardInterrupt):
+                    await utility.export_chat_data(str(output))
+
+            checkpoint = json.loads((tmp_path / "backup.ndjson.gz.checkpoint.json").read_text())
+            assert checkpoint["phase"] == "messages"
+            assert checkpoint["messages"] == 16
+
+            result = await utility.export_chat_data(str(output))
+
+        assert result.resumed_from_checkpoint
+        assert result.migrated_messages == 30
+        message_ids = [r["message_id"] for r in _read_records(output) if r["record_type"] == "message"]
+        assert len(message_ids) == len(set(message_ids)) == 30
+
+
+class TestStreamingImport:
+    """Batched NDJSON import, legacy JSON support and validation."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_with_vectors(self, source_db, target_db, chat_qdrant, tmp_path):
+        await chat_qdrant.qclient.upsert(chat_qdrant.collection_name, points=[
+            models.PointStruct(
+                id=i,
+                vector=[1.0, float(i), 0.5, 0.25],
+                payload={"message_id": f"msg-0-{i}", "session_id": "session-0", "chunk_index": 0},
+            )
+            for i in range(10)
+        ])
+        output = tmp_path / "backup.ndjson.gz"
+
+        with patch("app.utils.chat_migration.AsyncSessionLocal", source_db):
+            export = await ChatMigrationUtility(chat_qdrant, batch_size=6).export_chat_data(
+                str(output), include_vectors=True
+            )
+        assert export.errors == []
+
+        await chat_qdrant.qclient.delete(
+            chat_qdrant.collection_name, points_selector=models.PointIdsList(points=list(range(10)))
+        )
+        with patch("app.utils.chat_migration.AsyncSessionLocal", target_db):
+            result = await ChatMigrationUtility(chat_qdrant, batch_size=6).import_chat_data(str(output))
+
+        assert result.errors == []
+        assert result.migrated_conversations == 3
+        assert result.migrated_messages == 30
+        assert await _count(target_db, ChatMessage) == 30
+        assert (await chat_qdrant.qclient.count(chat_qdrant.collection_name)).count == 10
+
+    @pytest.mark.asyncio
+    async def test_import_uses_one_existence_query_per_batch(self, source_db, target_db, tmp_path):
+        output = tmp_path / "backup.ndjson"
+        with patch("app.utils.chat_migration.AsyncSessionLocal", source_db):
+            await ChatMigrationUtility().export_chat_data(str(output))
+
+        utility = ChatMigrationUtility(batch_size=10)
+        with patch("app.utils.chat_migration.AsyncSessionLocal", target_db):
+            first = await utility.import_chat_data(str(output))
+            with patch.object(utility, "_import_batch", wraps=utility._import_batch) as import_batch:
+                second = await utility.import_chat_data(str(output))
+
+        assert first.migrated_messages == 30
+        assert second.migrated_messages == 0
+        assert second.skipped_items == 33
+        # One conversation batch plus three message batches of ten
+        assert import_batch.call_count == 4
+
+    @pytest.mark.asyncio
+    async def test_imports_legacy_json_backup(self, target_db, tmp_path):
+        legacy = tmp_path / "legacy.json"
+        legacy.write_text(json.dumps({
+            "metadata": {"backup_id": "export_1", "format_version": "1.0"},
+            "conversations": [{
+                "conversation_id": "conv-legacy",
+                "session_id": "session-legacy",
+                "title": None,
+                "philosopher_collection": None,
+                "created_at": "2024-05-01T10:00:00+00:00",
+                "updated_at": "2024-05-01T10:00:00+00:00",
+            }],
+            "messages": [{
+                "message_id": "msg-legacy",
+                "conversation_id": "conv-legacy",
+                "session_id": "session-legacy",
+                "role": "user",
+                "content": "What is virtue?",
+                "philosopher_collection": None,
+                "qdrant_point_id": None,
+                "created_at": "2024-05-01T10:00:00+00:00",
+            }],
+        }, indent=2))
+
+        with patch("app.utils.chat_migration.AsyncSessionLocal", target_db):
+            result = await ChatMigrationUtility().import_chat_data(str(legacy))
+
+        assert result.errors == []
+        assert result.migrated_conversations == 1
+        assert result.migrated_messages == 1
+
+    @pytest.mark.asyncio
+    async def test_truncated_export_fails_validation(self, source_db, target_db, tmp_path):
+        output = tmp_path / "backup.ndjson"
+        with patch("app.utils.chat_migration.AsyncSessionLocal", source_db):
+            await ChatMigrationUtility().export_chat_data(str(output))
+        lines = output.read_text().splitlines(keepends=True)
+        output.write_text("".join(lines[:-1]))
+
+        with patch("app.utils.chat_migration.AsyncSessionLocal", target_db):
+            result = await ChatMigrationUtility().import_chat_data(str(output))
+
+        assert any("summary" in error for error in result.errors)
+        assert await _count(target_db, ChatMessage) == 0
+
+    @pytest.mark.asyncio
+    async def test_interrupted_import_resumes_from_checkpoint(self, source_db, target_db, tmp_path):
+        output = tmp_path / "backup.ndjson"
+        with patch("app.utils.chat_migration.AsyncSessionLocal", source_db):
+            await ChatMigrationUtility().export_chat_data(str(output))
+
+        utility = ChatMigrationUtility(batch_size=10)
+        original_import_batch = utility._import_batch
+        calls = {"count": 0}
+
+        async def flaky_import_batch(*args, **kwargs):
+            calls["count"] += 1
+            if calls["count"] == 3:
+                raise ConnectionError("database went away")
+            return await original_import_batch(*args, **kwargs)
+
+        with patch("app.utils.chat_migration.AsyncSessionLocal", target_db):
+            with patch.object(utility, "_import_batch", side_effect=flaky_import_batch):
+                first = await utility.import_chat_data(str(output))
+            assert "database went away" in first.errors[-1]
+            assert first.migrated_messages == 10
+
+            second = await utility.import_chat_data(str(output))
+
+        assert second.resumed_from_checkpoint
+        assert second.errors == []
+        assert second.skipped_items == 0
+        assert second.migrated_messages == 30
+        assert await _count(target_db, ChatMessage) == 30
+        assert not (tmp_path / "backup.ndjson.checkpoint.json").exists()
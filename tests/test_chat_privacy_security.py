@@ -237,9 +237,9 @@ class TestChatPrivacySecurity:
                     "payload": point.payload
                 })
         
-        async def mock_search(collection_name, query_vector, query_filter=None, limit=10, **kwargs):
+        async def mock_query_points_groups(collection_name, query, query_filter=None, limit=10, **kwargs):
             if collection_name not in vector_storage:
-                return []
+                return MagicMock(groups=[])
             
             results = []
             for point in vector_storage[collection_name]:
@@ -263,7 +263,10 @@ class TestChatPrivacySecurity:
                 mock_result.payload = point["payload"]
                 results.append(mock_result)
             
-            return results[:limit]
+            # One group per message, best hit first
+            return MagicMock(groups=[
+                MagicMock(id=result.payload["message_id"], hits=[result]) for result in results[:limit]
+            ])
         
         async def mock_delete(collection_name, points_selector, **kwargs):
             if collection_name in vector_storage:
@@ -278,7 +281,7 @@ class TestChatPrivacySecurity:
                             ]
         
         mock_qdrant_client.upsert = mock_upsert
-        mock_qdrant_client.search = mock_search
+        mock_qdrant_client.query_points_groups = mock_query_points_groups
         mock_qdrant_client.delete = mock_delete
         
         # Mock collection existence
@@ -724,7 +727,7 @@ class TestChatPrivacySecurity:
             chat_qdrant_service = ChatQdrantService(mock_qdrant_client, mock_llm_manager)
         
         # Mock search that returns cross-session results (privacy violation)
-        async def mock_search_with_violation(collection_name, query_vector, query_filter=None, **kwargs):
+        async def mock_search_with_violation(collection_name, query, query_filter=None, **kwargs):
             # Simulate a privacy violation - return result from different session
             mock_result = MagicMock()
             mock_result.id = "violation_point_123"
@@ -738,9 +741,9 @@ class TestChatPrivacySecurity:
                 "chunk_index": 0,
                 "total_chunks": 1
             }
-            return [mock_result]
+            return MagicMock(groups=[MagicMock(id=mock_result.payload["message_id"], hits=[mock_result])])
         
-        mock_qdrant_client.search = mock_search_with_violation
+        mock_qdrant_client.query_points_groups = mock_search_with_violation
         
         # Test privacy violation detection
         alice_session = test_sessions["alice"]
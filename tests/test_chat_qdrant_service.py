@@ -24,6 +24,11 @@ from app.core.chat_exceptions import (
 )
 
 
+def grouped(*hits):
+    """Mimic a query_points_groups response with one group per hit."""
+    return MagicMock(groups=[MagicMock(id=hit.payload["message_id"], hits=[hit]) for hit in hits])
+
+
 class TestChatQdrantService:
     """Test cases for ChatQdrantService functionality."""
 
@@ -58,6 +63,7 @@ class TestChatQdrantService:
         
         # Mock search operations
         client.search.return_value = []
+        client.query_points_groups.return_value = grouped()
         client.scroll.return_value = ([], None)
         
         # Mock delete operations
@@ -70,6 +76,7 @@ class TestChatQdrantService:
         """Create a mocked LLMManager."""
         manager = AsyncMock()
         manager.generate_dense_vector.return_value = [0.1] * 4096  # Mock 4096-dim vector
+        manager.generate_dense_vectors.side_effect = lambda texts: [[0.1] * 4096 for _ in texts]
         return manager
 
     @pytest.fixture
@@ -327,7 +334,7 @@ class TestChatQdrantService:
             "chunk_index": 0,
             "total_chunks": 1
         }
-        mock_qdrant_client.search.return_value = [mock_result]
+        mock_qdrant_client.query_points_groups.return_value = grouped(mock_result)
         
         results = await chat_qdrant_service.search_messages(session_id, query, limit=10)
         
@@ -394,7 +401,7 @@ class TestChatQdrantService:
         }
         
         # Mock the Qdrant search to return our privacy-violating result
-        mock_qdrant_client.search.return_value = [mock_result]
+        mock_qdrant_client.query_points_groups.return_value = grouped(mock_result)
         
         # Ensure vector generation works
         mock_llm_manager.generate_dense_vector.return_value = [0.1] * 4096
@@ -417,14 +424,14 @@ class TestChatQdrantService:
         query = "virtue ethics"
         philosopher_filter = "Aristotle"
         
-        mock_qdrant_client.search.return_value = []
+        mock_qdrant_client.query_points_groups.return_value = grouped()
         
         await chat_qdrant_service.search_messages(
             session_id, query, limit=10, philosopher_filter=philosopher_filter
         )
         
         # Verify philosopher filter is applied
-        call_args = mock_qdrant_client.search.call_args
+        call_args = mock_qdrant_client.query_points_groups.call_args
         search_filter = call_args[1]["query_filter"]
         
         # Should have both session_id and philosopher_collection filters
@@ -642,9 +649,9 @@ class TestChatQdrantService:
     async def test_retry_mechanism_success_after_failure(self, chat_qdrant_service, mock_qdrant_client):
         """Test retry mechanism succeeds after initial failure."""
         # Mock first call fails, second succeeds
-        mock_qdrant_client.search.side_effect = [
+        mock_qdrant_client.query_points_groups.side_effect = [
             ConnectionError("Connection failed"),
-            []  # Success on retry
+            grouped()  # Success on retry
         ]
         
         # Should succeed after retry (may return empty list or None due to fallback)
@@ -657,7 +664,7 @@ class TestChatQdrantService:
         assert isinstance(results, list)
         
         # Verify it was called twice (original + retry)
-        assert mock_qdrant_client.search.call_count == 2
+        assert mock_qdrant_client.query_points_groups.call_count == 2
 
     @pytest.mark.asyncio
     async def test_retry_mechanism_exhausted(self, mock_qdrant_client, mock_llm_manager):
@@ -748,7 +755,7 @@ class TestChatQdrantServiceIntegration:
             "chunk_index": 0,
             "total_chunks": 1
         }
-        mock_qdrant_client.search.return_value = [mock_result]
+        mock_qdrant_client.query_points_groups.return_value = grouped(mock_result)
         
         search_results = await integration_service.search_messages(
             sample_message.session_id, "virtue ethics"
@@ -830,7 +837,7 @@ class TestChatQdrantServiceIntegration:
         }
         
         # Mock the Qdrant search to return our privacy-violating result
-        mock_qdrant_client.search.return_value = [mock_result_session2]
+        mock_qdrant_client.query_points_groups.return_value = grouped(mock_result_session2)
         
         # Test the _search_standard method directly to avoid fallback decorator
         with pytest.raises(ChatPrivacyError):
@@ -863,9 +870,9 @@ class TestChatQdrantServiceIntegration:
         mock_llm_manager.generate_dense_vector.return_value = [0.1] * 1024
         
         # Test search with retry behavior - this should succeed after retry
-        mock_qdrant_client.search.side_effect = [
+        mock_qdrant_client.query_points_groups.side_effect = [
             ConnectionError("Connection failed"),
-            []  # Success on retry
+            grouped()  # Success on retry
         ]
         
         results = await integration_service.search_messages("session_123", "query")
@@ -0,0 +1,95 @@
+"""
+Chat search against a real in-memory Qdrant.
+
+Filters are applied inside Qdrant and results are grouped per message, so
+selective filters still fill the requested limit and a long message takes a
+single slot with its chunks reassembled.
+"""
+
+import uuid
+import zlib
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+from qdrant_client import AsyncQdrantClient
+
+from app.core.db_models import ChatMessage, MessageRole
+from app.services.chat_qdrant_service import ChatQdrantService
+
+DIMENSIONS = 4096
+QUERY = "virtue"
+LONG_CONTENT = " ".join(["Virtue is a mean between extremes."] * 100)
+
+
+def embed(text: str) -> list:
+    """Texts about virtue sit close to the query vector; anything else is random."""
+    rng = np.random.default_rng(zlib.crc32(text.encode()))
+    noise = rng.standard_normal(DIMENSIONS)
+    if QUERY in text.lower():
+        base = np.random.default_rng(0).standard_normal(DIMENSIONS)
+        return (base + 0.3 * noise).tolist()
+    return noise.tolist()
+
+
+def message(session_id: str, content: str, philosopher: str, username: str) -> ChatMessage:
+    return ChatMessage(
+        message_id=str(uuid.uuid4()),
+        conversation_id=f"conv-{session_id}",
+        session_id=session_id,
+        username=username,
+        role=MessageRole.USER,
+        content=content,
+        philosopher_collection=philosopher,
+        created_at=datetime.utcnow(),
+    )
+
+
+@pytest.fixture
+async def service():
+    client = AsyncQdrantClient(location=":memory:")
+    llm_manager = AsyncMock()
+    llm_manager.generate_dense_vector.side_effect = embed
+    with patch.dict("os.environ", {"APP_ENV": "test"}):
+        chat_service = ChatQdrantService(client, llm_manager)
+    chat_service.use_fusion = False
+    yield chat_service
+    await client.close()
+
+
+async def upload(service: ChatQdrantService, messages) -> None:
+    for msg in messages:
+        await service.upload_message_to_qdrant(msg)
+
+
+@pytest.mark.asyncio
+async def test_selective_filters_fill_the_limit(service):
+    # Many close matches that the filters exclude, a few weaker ones they keep
+    await upload(service, [message("s1", f"On virtue, part {i}", "Kant", "alice") for i in range(30)])
+    await upload(service, [message("s2", f"On virtue, part {i}", "Aristotle", "bob") for i in range(10)])
+    kept = [message("s1", f"Friendship note {i}", "Aristotle", "bob") for i in range(6)]
+    await upload(service, kept)
+
+    results = await service.search_messages("s1", QUERY, limit=5, philosopher_filter="Aristotle", username="bob")
+
+    assert len(results) == 5
+    assert len({r["message_id"] for r in results}) == 5
+    assert {r["message_id"] for r in results} <= {m.message_id for m in kept}
+    assert all(r["session_id"] == "s1" and r["username"] == "bob" for r in results)
+
+
+@pytest.mark.asyncio
+async def test_long_message_takes_one_slot_with_full_content(service):
+    long_message = message("s1", LONG_CONTENT, "Aristotle", "bob")
+    await upload(service, [long_message])
+    await upload(service, [message("s1", f"Virtue aside {i}", "Aristotle", "bob") for i in range(2)])
+    await upload(service, [message("s1", f"Friendship note {i}", "Aristotle", "bob") for i in range(3)])
+
+    results = await service.search_messages("s1", QUERY, limit=3)
+
+    assert len(results) == 3
+    assert len({r["message_id"] for r in results}) == 3
+    hit = next(r for r in results if r["message_id"] == long_message.message_id)
+    assert hit["total_chunks"] > 1
+    assert hit["content"].count("Virtue is a mean between extremes") == 100
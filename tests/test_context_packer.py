@@ -0,0 +1,135 @@
+"""Tests for token-budgeted context packing."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.router.ontologic import calculate_required_context_window, pack_context_nodes
+from app.services.context_packer import (
+    ContextPacker,
+    context_window_tiers,
+    select_context_window,
+    split_sentences,
+)
+from app.services.token_counter import TokenCounter
+from tests.conftest import create_mock_llm_response, create_mock_node
+
+PASSAGE = (
+    "Virtue is a state of character concerned with choice. It lies in a mean relative to us. "
+    "This mean is determined by a rational principle. It is the principle by which the man of "
+    "practical wisdom would determine it."
+)
+
+
+def make_node(node_id, text, score):
+    return SimpleNamespace(id=node_id, score=score, payload={"text": text})
+
+
+@pytest.fixture
+def packer():
+    # Character estimate (4 chars/token) keeps token counts predictable
+    return ContextPacker(token_counter=TokenCounter(None), min_truncated_tokens=8)
+
+
+class TestPacking:
+    """Nodes fill the budget by score without duplicates."""
+
+    def test_fills_budget_by_score(self, packer):
+        nodes = [make_node(1, "a" * 400, 0.2), make_node(2, "b" * 400, 0.9), make_node(3, "c" * 400, 0.5)]
+
+        packed = packer.pack(nodes, budget_tokens=250)
+
+        assert [node.id for node in packed.nodes] == [2, 3]
+        assert packed.token_count == 200
+        assert packed.over_budget_dropped == 1
+
+    def test_drops_exact_and_near_duplicates(self, packer):
+        overlapping = PASSAGE.split(". ", 1)[1]  # same chunk minus its first sentence
+        nodes = [
+            make_node(1, PASSAGE, 0.9),
+            make_node(1, PASSAGE, 0.8),  # same point returned through another vector
+            make_node(2, overlapping, 0.7),
+            make_node(3, "Duty is the necessity of an action done out of respect for the law.", 0.6),
+        ]
+
+        packed = packer.pack(nodes, budget_tokens=1000)
+
+        assert [node.id for node in packed.nodes] == [1, 3]
+        assert packed.duplicates_dropped == 1
+
+    def test_truncates_at_sentence_boundary(self, packer):
+        nodes = [make_node(1, "x" * 200, 0.9), make_node(2, PASSAGE, 0.8)]
+
+        packed = packer.pack(nodes, budget_tokens=50 + 25)
+
+        truncated = packed.nodes[1]
+        assert packed.truncated_ids == [2]
+        assert truncated.payload["text"] == " ".join(split_sentences(PASSAGE)[:2])
+        assert truncated.payload["truncated"] is True
+        assert nodes[1].payload["text"] == PASSAGE
+        assert packed.token_count <= packed.budget_tokens
+
+    def test_skips_nodes_without_text(self, packer):
+        nodes = [SimpleNamespace(id=1, score=0.9, payload={"filename": "a.pdf"}), make_node(2, "text", 0.1)]
+
+        assert [node.id for node in packer.pack(nodes, 100).nodes] == [2]
+
+
+class TestContextWindow:
+    """Context windows come from a fixed set of sizes."""
+
+    def test_tiers(self):
+        assert context_window_tiers(8192, 32000) == [8192, 16384, 32000]
+        assert context_window_tiers(8192, 8192) == [8192]
+        assert select_context_window(9000, 8192, 32000) == 16384
+        assert select_context_window(40000, 8192, 32000) == 32000
+
+    def test_scaled_window_uses_fixed_size(self):
+        nodes = [make_node(1, "x" * 4 * 9000, 0.9)]
+
+        with patch("app.router.ontologic.get_token_counter", return_value=TokenCounter(None)):
+            window, _ = calculate_required_context_window(nodes, query_str="")
+
+        assert window == 16384
+
+    def test_packed_nodes_fit_default_window(self):
+        nodes = [make_node(i, f"{i} " + "y" * 4 * 3000, 1.0 - i / 10) for i in range(5)]
+        history = [SimpleNamespace(text="z" * 400)]
+        settings = SimpleNamespace(context_packing_enabled=True, default_context_window=8192,
+                                   max_context_window=32000)
+
+        with patch("app.router.ontologic.get_settings", return_value=settings), \
+                patch("app.router.ontologic.get_token_counter", return_value=TokenCounter(None)), \
+                patch("app.services.context_packer.get_token_counter", return_value=TokenCounter(None)):
+            packed = pack_context_nodes(nodes, history, "What is virtue?")
+            window, _ = calculate_required_context_window(packed, history, query_str="What is virtue?")
+
+        assert [node.id for node in packed] == [0, 1]
+        assert window == 8192
+
+    def test_packing_can_be_disabled(self):
+        nodes = [make_node(1, "text", 0.5)]
+        settings = SimpleNamespace(context_packing_enabled=False)
+
+        with patch("app.router.ontologic.get_settings", return_value=settings):
+            assert pack_context_nodes(nodes, None, "q") is nodes
+
+
+class TestAskPhilosophy:
+    """The endpoint hands the LLM packed context."""
+
+    def test_sends_packed_nodes_to_llm(self, test_client, mock_all_services):
+        mock_llm, mock_qdrant = mock_all_services["llm"], mock_all_services["qdrant"]
+        mock_llm.achat.return_value = create_mock_llm_response("A mean.")
+        mock_qdrant.gather_points_and_sort.return_value = [
+            create_mock_node("n1", PASSAGE, score=0.9),
+            create_mock_node("n2", PASSAGE, score=0.8),  # Duplicate: dropped by the packer
+            create_mock_node("n3", "Justice is the virtue of the soul.", score=0.7),
+        ]
+
+        response = test_client.post("/ask_philosophy", json={"query_str": "What is virtue?", "collection": "Aristotle"})
+
+        assert response.status_code == 200
+        context = mock_llm.achat.await_args.args[1]
+        assert [node.id for node in context] == ["n1", "n3"]
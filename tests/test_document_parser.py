@@ -0,0 +1,150 @@
+"""Tests for off-loop, page-parallel document parsing."""
+
+import asyncio
+import io
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.core.exceptions import DocumentParseTimeoutError, DocumentTooLargeError
+from app.services.document_parser import DocumentParser
+from app.utils.file_parser import FileParser
+
+fitz = pytest.importorskip("fitz")
+
+
+def make_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Chapter {i + 1}", fontsize=20)
+        page.insert_text((72, 120), f"Virtue is the mean on page {i + 1}.", fontsize=11)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_docx(*paragraphs: str) -> bytes:
+    from docx import Document
+
+    document = Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def slow_pages(path, pages, hdr_info=None):
+    """Stand-in for a page range that never finishes; module-level so workers can import it."""
+    time.sleep(30)
+
+
+def paced_pages(path, pages, hdr_info=None):
+    """Page range taking a quarter of a 1s/page budget; module-level so workers can import it."""
+    from app.utils.file_parser import parse_pdf_pages
+
+    time.sleep(0.5)
+    return parse_pdf_pages(path, pages, hdr_info)
+
+
+@pytest.fixture
+async def pool_parser():
+    parser = DocumentParser(max_workers=2, pages_per_task=3, page_timeout_seconds=30)
+    yield parser
+    await parser.aclose()
+
+
+class TestPageParallelPdf:
+    """Page ranges parsed in workers join back into the whole document."""
+
+    @pytest.mark.asyncio
+    async def test_matches_whole_document_in_page_order(self, pool_parser):
+        pdf = make_pdf(10)
+
+        text = await pool_parser.parse("pdf", pdf)
+
+        assert text == FileParser().parse_pdf(pdf)
+        positions = [text.index(f"page {i}.") for i in range(1, 11)]
+        assert positions == sorted(positions)
+        assert "# Chapter 1" in text and "# Chapter 10" in text
+
+    @pytest.mark.asyncio
+    async def test_page_cap_rejects_before_parsing(self):
+        parser = DocumentParser(max_workers=0, max_pages=4)
+
+        with patch("app.services.document_parser.parse_pdf_pages") as parse_pages:
+            with pytest.raises(DocumentTooLargeError) as exc_info:
+                await parser.parse("pdf", make_pdf(5))
+
+        assert exc_info.value.details == {"page_count": 5, "max_pages": 4}
+        parse_pages.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalid_pdf_raises_value_error(self):
+        with pytest.raises(ValueError):
+            await DocumentParser(max_workers=0).parse("pdf", b"%PDF-1.4 not really")
+
+
+class TestTimeouts:
+    """A range over its time budget fails the parse and frees the worker."""
+
+    @pytest.mark.asyncio
+    async def test_stuck_range_times_out_and_pool_recovers(self):
+        parser = DocumentParser(max_workers=1, pages_per_task=2, page_timeout_seconds=0.5)
+        try:
+            with patch("app.services.document_parser.parse_pdf_pages", slow_pages):
+                start = time.monotonic()
+                with pytest.raises(DocumentParseTimeoutError) as exc_info:
+                    await parser.parse("pdf", make_pdf(4))
+
+            assert time.monotonic() - start < 10
+            assert exc_info.value.details["timeout_seconds"] == 1.0
+            assert parser._executor is None
+            assert "page 1." in await parser.parse("pdf", make_pdf(1))
+        finally:
+            await parser.aclose()
+
+
+    @pytest.mark.asyncio
+    async def test_queued_ranges_do_not_use_their_budget(self):
+        # 5 ranges over 2 uploads, 1 worker: over 2.5s of work against 2s per range
+        parser = DocumentParser(max_workers=1, pages_per_task=2, page_timeout_seconds=1.0)
+        try:
+            await parser._get_executor()
+            executor = parser._executor
+            with patch("app.services.document_parser.parse_pdf_pages", paced_pages):
+                first, second = await asyncio.gather(
+                    parser.parse("pdf", make_pdf(6)), parser.parse("pdf", make_pdf(4))
+                )
+
+            assert "page 6." in first and "page 4." in second
+            assert parser._executor is executor  # No timeout, so the pool was never recycled
+        finally:
+            await parser.aclose()
+
+
+class TestOtherFormats:
+
+    @pytest.mark.asyncio
+    async def test_docx_is_parsed_in_worker(self, pool_parser):
+        text = await pool_parser.parse("docx", make_docx("Virtue is a mean.", "Courage too."))
+
+        assert text == "Virtue is a mean.\nCourage too."
+
+    @pytest.mark.asyncio
+    async def test_text_is_decoded_inline(self):
+        parser = DocumentParser(max_workers=2)
+
+        assert await parser.parse("md", "# Ethics".encode()) == "# Ethics"
+        assert parser._executor is None
+        with pytest.raises(UnicodeDecodeError):
+            await parser.parse("txt", b"\xff\xfe\xfa")
+
+    @pytest.mark.asyncio
+    async def test_thread_fallback_without_workers(self):
+        parser = DocumentParser(max_workers=0, pages_per_task=2)
+
+        assert await parser.parse("pdf", make_pdf(3)) == FileParser().parse_pdf(make_pdf(3))
+        assert parser._executor is None
@@ -22,8 +22,8 @@ def mock_all_services():
     with patch('app.services.qdrant_manager.AsyncQdrantClient'), \
          patch('app.services.llm_manager.Ollama'), \
          patch('app.services.llm_manager.OllamaEmbedding'), \
-         patch('app.services.llm_manager.AutoTokenizer'), \
-         patch('app.services.llm_manager.AutoModelForMaskedLM'), \
+         patch('app.services.splade_runtime.AutoTokenizer'), \
+         patch('app.services.splade_runtime.AutoModelForMaskedLM'), \
          patch('app.core.database.init_db'):
 
         # Mock QdrantManager
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from app.services.expansion_service import ExpansionService, ExpansionResult
@@ -112,21 +113,21 @@ class TestExpansionService:
         """Test query expansion with Pseudo Relevance Feedback."""
         service = mock_expansion_service
 
-        # Mock initial retrieval for PRF
+        # Mock initial retrieval for PRF (stored sparse vector returned with the point)
         service.qdrant_manager.query_hybrid.return_value = {
             "sparse_original": [
-                MagicMock(id="1", payload={"text": "Virtue ethics content"}, score=0.9)
+                MagicMock(
+                    id="1",
+                    payload={"text": "Virtue ethics content"},
+                    score=0.9,
+                    vector={"sparse_original": {"indices": [1, 2, 3], "values": [0.9, 0.8, 0.7]}}
+                )
             ]
         }
-
-        # Mock SPLADE vector generation
-        service.llm_manager.generate_splade_vector.return_value = {
-            "indices": [1, 2, 3],
-            "values": [0.9, 0.8, 0.7]
-        }
-
-        # Mock tokenizer
-        service.llm_manager.splade_tokenizer.decode.side_effect = lambda x: f"term_{x[0]}"
+        service.llm_manager.generate_splade_vector = AsyncMock()
+        service.llm_manager.splade_vocab = np.array(
+            ["[PAD]", "eudaimonia", "character", "habit"], dtype=object
+        )
 
         result = await service.expand_query(
             query="What is virtue ethics?",
@@ -136,7 +137,27 @@ class TestExpansionService:
         )
 
         assert "prf" in result.expanded_queries
-        assert len(result.expanded_queries["prf"]) >= 1
+        assert result.expanded_queries["prf"] == ["What is virtue ethics? eudaimonia character habit"]
+        # PRF reuses the stored vectors - no SPLADE inference
+        service.llm_manager.generate_splade_vector.assert_not_called()
+        first_call = service.qdrant_manager.query_hybrid.call_args_list[0]
+        assert first_call.kwargs["with_vectors"] == ["sparse_original"]
+
+    def test_top_prf_terms_merges_weights_across_documents(self, mock_expansion_service):
+        """Terms shared by several feedback documents outrank single heavy terms."""
+        service = mock_expansion_service
+        service.llm_manager.splade_vocab = np.array(
+            ["[CLS]", "virtue", "##ing", "ethics", "justice", "courage"], dtype=object
+        )
+
+        terms = service._top_prf_terms(
+            [([3, 4, 2], [0.5, 0.6, 2.0]), ([4, 5, 0], [0.6, 0.9, 3.0]), ([1], [5.0])],
+            original_query="virtue?",
+        )
+
+        # justice (1.2) > courage (0.9) > ethics (0.5); specials, word pieces and
+        # query terms are dropped
+        assert terms == ["justice", "courage", "ethics"]
 
     @pytest.mark.asyncio
     async def test_expand_query_error_handling(self, mock_expansion_service):
@@ -0,0 +1,190 @@
+"""Tests for the background health monitor and the snapshot-serving health endpoints."""
+
+import asyncio
+import logging
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.services.health_monitor import HealthMonitor, HealthProbe
+
+
+def status_gauge(dependency: str, status: str):
+    return REGISTRY.get_sample_value("dependency_health_status", {"dependency": dependency, "status": status})
+
+
+class TestHealthMonitor:
+
+    @pytest.mark.asyncio
+    async def test_snapshot_reports_age_and_latency(self):
+        monitor = HealthMonitor([HealthProbe("snap_db", AsyncMock(return_value={"status": "healthy"}), 10.0)])
+
+        assert monitor.snapshot()["snap_db"]["status"] == "pending"
+
+        await monitor.refresh()
+        entry = monitor.snapshot()["snap_db"]
+
+        assert entry["status"] == "healthy"
+        assert entry["stale"] is False
+        assert 0 <= entry["age_seconds"] < 5
+        assert entry["latency_ms"]["samples"] == 1
+        assert entry["latency_ms"]["p50"] == entry["latency_ms"]["last"]
+
+    @pytest.mark.asyncio
+    async def test_slow_probe_backs_off_to_budget(self):
+        async def slow_check():
+            await asyncio.sleep(0.05)
+            return {"status": "healthy"}
+
+        monitor = HealthMonitor([HealthProbe("snap_llm", slow_check, 0.01)], probe_budget=0.1)
+        await monitor.refresh("snap_llm")
+
+        assert monitor._states["snap_llm"].next_interval_seconds >= 0.5
+
+    @pytest.mark.asyncio
+    async def test_budget_backoff_is_capped(self):
+        async def slow_check():
+            await asyncio.sleep(0.05)
+            return {"status": "healthy"}
+
+        monitor = HealthMonitor([HealthProbe("snap_cap", slow_check, 0.01)], probe_budget=0.001,
+                                max_interval_seconds=2.0)
+        await monitor.refresh("snap_cap")
+
+        assert monitor._states["snap_cap"].next_interval_seconds == 2.0
+
+    @pytest.mark.asyncio
+    async def test_timed_out_probe_retries_at_base_interval_and_recovers(self):
+        hangs = [True]
+
+        async def check():
+            if hangs and hangs.pop():
+                await asyncio.sleep(10)
+            return {"status": "healthy"}
+
+        # A 1% budget would wait 100x the timeout if the timed-out probe's duration counted
+        monitor = HealthMonitor([HealthProbe("snap_flaky", check, 0.01, critical=True, timeout_seconds=0.2)],
+                                probe_budget=0.01)
+        await monitor.refresh("snap_flaky")
+        state = monitor._states["snap_flaky"]
+
+        assert monitor.snapshot()["snap_flaky"]["status"] == "unhealthy"
+        assert state.next_interval_seconds == 0.01
+
+        monitor.run()
+        await asyncio.sleep(0.1)
+        await monitor.aclose()
+
+        entry = monitor.snapshot()["snap_flaky"]
+        assert entry["status"] == "healthy"
+        assert entry["consecutive_failures"] == 0
+        assert entry["stale"] is False
+
+    @pytest.mark.asyncio
+    async def test_failures_are_reported_not_raised(self):
+        async def hangs():
+            await asyncio.sleep(10)
+
+        monitor = HealthMonitor([
+            HealthProbe("snap_boom", AsyncMock(side_effect=RuntimeError("boom")), 10.0),
+            HealthProbe("snap_hang", hangs, 10.0, timeout_seconds=0.05),
+        ])
+        await monitor.refresh()
+        snapshot = monitor.snapshot()
+
+        assert snapshot["snap_boom"]["status"] == "error"
+        assert snapshot["snap_boom"]["message"] == "boom"
+        assert snapshot["snap_hang"]["status"] == "unhealthy"
+        assert snapshot["snap_boom"]["consecutive_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_status_change_sets_gauge_and_logs_event(self, caplog):
+        check = AsyncMock(return_value={"status": "healthy"})
+        monitor = HealthMonitor([HealthProbe("snap_qdrant", check, 10.0, critical=True)])
+        await monitor.refresh()
+        assert status_gauge("snap_qdrant", "healthy") == 1
+
+        check.return_value = {"status": "unhealthy", "message": "connection refused"}
+        caplog.clear()
+        with caplog.at_level(logging.INFO):
+            await monitor.refresh()
+            await monitor.refresh()  # Unchanged: no second event
+
+        assert status_gauge("snap_qdrant", "healthy") == 0
+        assert status_gauge("snap_qdrant", "unhealthy") == 1
+        events = [r for r in caplog.records if getattr(r, "event_type", None) == "dependency_health_change"]
+        assert len(events) == 1
+        assert (events[0].previous_status, events[0].status, events[0].critical) == ("healthy", "unhealthy", True)
+        assert REGISTRY.get_sample_value(
+            "dependency_health_transitions_total",
+            {"dependency": "snap_qdrant", "from_status": "healthy", "to_status": "unhealthy"},
+        ) == 1
+
+    @pytest.mark.asyncio
+    async def test_background_tasks_refresh_until_closed(self):
+        check = AsyncMock(return_value={"status": "healthy"})
+        monitor = HealthMonitor([HealthProbe("snap_redis", check, 0.01)], probe_budget=1.0)
+
+        monitor.run()
+        await asyncio.sleep(0.1)
+        assert monitor.running
+        await monitor.aclose()
+        calls = check.await_count
+        await asyncio.sleep(0.05)
+
+        assert calls >= 3
+        assert check.await_count == calls
+        assert not monitor.running
+
+
+class StubMonitor:
+    """A running monitor with a fixed snapshot."""
+
+    running = True
+
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+
+    def snapshot(self):
+        return self._snapshot
+
+
+def healthy(**extra):
+    return {"status": "healthy", "stale": False, "age_seconds": 1.0, **extra}
+
+
+@pytest.fixture
+def serve_snapshot(test_client):
+    from app.main import app
+
+    def install(snapshot):
+        app.state.health_monitor = StubMonitor(snapshot)
+
+    yield install
+    app.state.health_monitor = None
+
+
+def test_health_serves_snapshot_without_probing(test_client, serve_snapshot):
+    serve_snapshot({name: healthy() for name in ("database", "qdrant", "redis", "llm", "chat_history")})
+    llm_probe = AsyncMock(return_value={"status": "healthy"})
+
+    with patch("app.router.health.check_llm_health", llm_probe):
+        response = test_client.get("/health")
+        ready = test_client.get("/health/ready")
+
+    assert response.status_code == 200
+    assert response.json()["source"] == "snapshot"
+    assert response.json()["services"]["llm"]["age_seconds"] == 1.0
+    assert ready.status_code == 200
+    llm_probe.assert_not_called()
+
+
+def test_stale_critical_service_is_not_ready(test_client, serve_snapshot):
+    serve_snapshot({"database": healthy(), "qdrant": healthy(stale=True), "llm": healthy()})
+
+    response = test_client.get("/health")
+    ready = test_client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert ready.status_code == 503
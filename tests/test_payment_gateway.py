@@ -0,0 +1,165 @@
+"""
+Payment flows against the in-process FakeStripe, through the StripeGateway.
+
+No request leaves the process: PaymentService is given a FakeStripe as its
+Stripe API, so the full customer -> subscription -> refund -> dispute flow
+runs offline, and failures can be injected to exercise retries, idempotency
+and the circuit breaker.
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+import stripe
+
+from tests.helpers.fake_stripe import FakeStripe
+from app.services.payment_gateway import StripeGateway, StripeUnavailableError
+from app.services.payment_service import PaymentException, PaymentService
+
+
+def fast_gateway(**overrides) -> StripeGateway:
+    options = dict(timeout_seconds=1.0, max_retries=2, backoff_seconds=0.01, failure_threshold=3, reset_seconds=60.0)
+    options.update(overrides)
+    return StripeGateway(**options)
+
+
+@pytest.fixture
+def fake():
+    return FakeStripe()
+
+
+@pytest.fixture
+def payments(fake):
+    return PaymentService(gateway=fast_gateway(), stripe_api=fake)
+
+
+def user(user_id: int = 1):
+    return SimpleNamespace(id=user_id, email=f"user{user_id}@example.com", username=f"user{user_id}", stripe_customer_id=None)
+
+
+@pytest.mark.asyncio
+async def test_full_payment_flow_offline(fake, payments):
+    assert payments.is_payments_enabled()
+
+    customer_id = await payments.create_stripe_customer(user())
+    subscription = await payments.create_subscription(customer_id, "price_premium")
+    session = await payments.create_checkout_session(customer_id, "price_premium", "https://ok", "https://cancel")
+    fake.add_card(customer_id)
+
+    assert subscription["status"] == "active"
+    assert session["url"].endswith(session["id"])
+    assert [m["card"]["last4"] for m in await payments.get_customer_payment_methods(customer_id)] == ["4242"]
+
+    synced = await payments.sync_subscription_from_stripe(subscription["id"])
+    assert synced["items"] == [{"price_id": "price_premium", "quantity": 1}]
+
+    charge = fake.add_charge(customer_id, amount=2000)
+    refund = await payments.process_refund(charge.payment_intent, amount=500, reason="duplicate")
+    assert (await payments.get_refund_status(refund["id"]))["status"] == "succeeded"
+    assert [r["amount"] for r in await payments.list_refunds_for_payment(charge.payment_intent)] == [500]
+    with pytest.raises(PaymentException, match="greater than unrefunded amount"):
+        await payments.process_refund(charge.payment_intent, amount=1600)
+
+    dispute = fake.open_dispute(charge.id)
+    evidence = await payments.submit_dispute_evidence(dispute.id, {"uncategorized_text": "Delivered"}, admin_user_id=7)
+    assert evidence["status"] == "under_review"
+    assert evidence["evidence_submission_count"] == 1
+    assert [d["id"] for d in await payments.list_disputes_for_customer(customer_id)] == [dispute.id]
+    assert (await payments.close_dispute(dispute.id))["status"] == "lost"
+
+    assert await payments.cancel_subscription(subscription["id"]) is True
+    assert (await payments.sync_subscription_from_stripe(subscription["id"]))["cancel_at_period_end"] is True
+
+
+@pytest.mark.asyncio
+async def test_unknown_subscription_syncs_to_none(payments):
+    assert await payments.sync_subscription_from_stripe("sub_missing") is None
+
+
+@pytest.mark.asyncio
+async def test_retry_after_lost_response_does_not_duplicate(fake, payments):
+    customer_id = await payments.create_stripe_customer(user())
+    charge = fake.add_charge(customer_id, amount=1000)
+    # Stripe creates the refund but the response never arrives
+    fake.fail_next(stripe.APIConnectionError("connection reset"), after_commit=True)
+
+    refund = await payments.process_refund(charge.payment_intent, amount=400)
+
+    assert fake.calls == 3
+    assert [r["id"] for r in await payments.list_refunds_for_payment(charge.payment_intent)] == [refund["id"]]
+    assert fake.Charge._objects[charge.id].amount_refunded == 400
+
+
+@pytest.mark.asyncio
+async def test_declines_are_not_retried(fake):
+    gateway = fast_gateway()
+    fake.fail_next(stripe.CardError("Your card was declined.", None, "card_declined"))
+
+    with pytest.raises(stripe.CardError):
+        await gateway.call(fake.Customer.create, email="a@example.com", mutating=True)
+
+    assert fake.calls == 1
+    assert not gateway.circuit_open
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_fails_fast(fake):
+    gateway = fast_gateway(max_retries=0, failure_threshold=2)
+    fake.fail_next(stripe.APIError("Stripe is down"), times=2)
+
+    for _ in range(2):
+        with pytest.raises(StripeUnavailableError):
+            await gateway.call(fake.Customer.create, mutating=True)
+    with pytest.raises(StripeUnavailableError, match="circuit open") as rejected:
+        await gateway.call(fake.Customer.create, mutating=True)
+
+    assert gateway.circuit_open
+    assert fake.calls == 2
+    assert 0 < rejected.value.retry_after <= 60
+
+
+@pytest.mark.asyncio
+async def test_circuit_closes_after_successful_trial(fake):
+    gateway = fast_gateway(max_retries=0, failure_threshold=1, reset_seconds=0.05)
+    fake.fail_next(stripe.APIConnectionError("unreachable"))
+    with pytest.raises(StripeUnavailableError):
+        await gateway.call(fake.Customer.create, mutating=True)
+    assert gateway.circuit_open
+
+    await asyncio.sleep(0.06)
+    await gateway.call(fake.Customer.create, mutating=True)
+
+    assert not gateway.circuit_open
+
+
+@pytest.mark.asyncio
+async def test_slow_stripe_does_not_block_event_loop():
+    fake = FakeStripe(latency_seconds=0.2)
+    gateway = fast_gateway()
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(gateway.call(fake.Customer.create, mutating=True) for _ in range(4)))
+    elapsed = time.perf_counter() - started
+    task.cancel()
+
+    assert ticks >= 10
+    assert elapsed < 0.6  # Four calls ran concurrently in worker threads
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_retried_then_reported(fake):
+    fake.latency_seconds = 0.2
+    gateway = fast_gateway(timeout_seconds=0.05, max_retries=1)
+
+    with pytest.raises(StripeUnavailableError, match="timed out"):
+        await gateway.call(fake.Customer.retrieve, "cus_missing")
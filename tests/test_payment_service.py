@@ -7,13 +7,14 @@ and payment processing with comprehensive error handling and edge case testing.
 
 import os
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
 from datetime import datetime, timedelta
 from decimal import Decimal
 
 import stripe
 from stripe import StripeError, CardError, InvalidRequestError
 
+from app.services.payment_gateway import StripeGateway
 from app.services.payment_service import (
     PaymentService,
     PaymentException,
@@ -39,8 +40,11 @@ async def payment_service(mock_cache_service):
             mock_settings.stripe_secret_key.get_secret_value.return_value = "sk_test_12345"
             mock_get_settings.return_value = mock_settings
 
-            # Create service with mocked Stripe and settings
-            service = PaymentService(cache_service=mock_cache_service)
+            # Create service with mocked Stripe and settings; failures surface on the first attempt
+            service = PaymentService(
+                cache_service=mock_cache_service,
+                gateway=StripeGateway(max_retries=0, backoff_seconds=0),
+            )
 
             # Verify it initialized correctly
             assert service._payments_enabled is True
@@ -160,7 +164,8 @@ class TestSubscriptionManagement:
                 items=[{"price": "price_test123"}],
                 payment_behavior="default_incomplete",
                 payment_settings={"save_default_payment_method": "on_subscription"},
-                expand=["latest_invoice.payment_intent"]
+                expand=["latest_invoice.payment_intent"],
+                idempotency_key=ANY,
             )
 
     async def test_create_subscription_no_customer(self, payment_service, mock_user):
@@ -191,7 +196,8 @@ class TestSubscriptionManagement:
             assert result is True
             mock_modify.assert_called_once_with(
                 "sub_test123",
-                cancel_at_period_end=True
+                cancel_at_period_end=True,
+                idempotency_key=ANY,
             )
 
     async def test_cancel_subscription_not_found(self, payment_service):
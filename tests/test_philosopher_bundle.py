@@ -0,0 +1,97 @@
+"""Tests for the pre-built philosopher asset bundle: build, memory-mapped loading and hot swap."""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.core import philosopher_loader
+from app.core.philosopher_bundle import BundleFormatError, PhilosopherBundle, write_bundle
+from app.core.philosopher_info import PHILOSOPHER_INFO
+from app.core.philosopher_loader import (
+    PhilosopherLoader,
+    build_philosopher_bundle,
+    get_prompt_fragment,
+    immersive_system_context,
+    refresh_philosopher_bundle,
+)
+
+
+@pytest.fixture
+def bundle_path(tmp_path):
+    path = tmp_path / "philosopher_bundle.bin"
+    with patch.object(philosopher_loader, "_bundle_path", return_value=path):
+        yield path
+    philosopher_loader._bundle = None
+    philosopher_loader._publish_philosopher_info()
+
+
+def test_bundle_holds_rendered_templates(tmp_path):
+    loader = PhilosopherLoader()
+    content_hash = build_philosopher_bundle(tmp_path / "a.bin", loader)
+    bundle = PhilosopherBundle.open(tmp_path / "a.bin")
+
+    assert bundle.content_hash == content_hash
+    assert bundle.template_version == loader.prompt_renderer.version
+    assert bundle.philosophers == loader.get_all_philosophers()
+    assert bundle.passage("Aristotle", "ethics") == loader.prompt_renderer.render("philosophers/aristotle/ethics.j2")
+    kant = bundle.philosophers["Immanuel Kant"]
+    assert bundle.fragment("chat/immersive_system.j2", "Immanuel Kant") == loader.prompt_renderer.render(
+        "chat/immersive_system.j2", immersive_system_context("Immanuel Kant", kant)
+    )
+    assert bundle.fragment("chat/neutral_system.j2") == loader.prompt_renderer.render("chat/neutral_system.j2")
+    assert bundle.fragment("chat/immersive_system.j2", "Plato") is None
+
+    # Same templates, same hash: safe to use in cache keys
+    assert build_philosopher_bundle(tmp_path / "b.bin", loader) == content_hash
+
+
+def test_unreadable_or_stale_bundles_are_rejected(tmp_path, bundle_path):
+    (tmp_path / "junk.bin").write_bytes(b"not a bundle at all")
+    with pytest.raises(BundleFormatError):
+        PhilosopherBundle.open(tmp_path / "junk.bin")
+
+    write_bundle(bundle_path, {"Aristotle": {"axioms": ["Old"]}}, {}, template_version="0ld")
+    assert not refresh_philosopher_bundle()
+    assert philosopher_loader.get_active_bundle() is None
+    assert PHILOSOPHER_INFO["Aristotle"]["axioms"] != ["Old"]
+
+
+def test_deployed_bundle_is_swapped_in(bundle_path):
+    assert not refresh_philosopher_bundle()  # Nothing deployed: templates
+
+    build_philosopher_bundle(bundle_path)
+    assert refresh_philosopher_bundle()
+    first = philosopher_loader.get_active_bundle()
+    assert PHILOSOPHER_INFO == first.philosophers
+    assert get_prompt_fragment("chat/neutral_system.j2") == first.fragment("chat/neutral_system.j2")
+    assert not refresh_philosopher_bundle()  # Unchanged file
+
+    # A new version with an edited axiom, renamed into place like a deploy
+    philosophers = dict(first.philosophers)
+    philosophers["David Hume"] = {**philosophers["David Hume"], "axioms": ["Reason is the slave of the passions."]}
+    texts = {key: first.text(key) for key in first._texts}
+    staged = bundle_path.with_name("staged.bin")
+    write_bundle(staged, philosophers, texts, first.template_version)
+    os.replace(staged, bundle_path)
+
+    assert refresh_philosopher_bundle()
+    assert philosopher_loader.get_active_bundle().content_hash != first.content_hash
+    # Modules that imported PHILOSOPHER_INFO see the new data
+    assert PHILOSOPHER_INFO["David Hume"]["axioms"] == ["Reason is the slave of the passions."]
+    assert first.passage("Aristotle", "ethics")  # The replaced bundle stays readable
+
+
+def test_system_prompt_uses_prebuilt_fragment(bundle_path):
+    from app.services.llm_manager import LLMManager
+
+    build_philosopher_bundle(bundle_path)
+    refresh_philosopher_bundle()
+    manager = LLMManager.__new__(LLMManager)
+    manager._prompts = MagicMock()
+
+    system_prompt, speaker = manager._render_system_prompt("Aristotle", None)
+
+    assert system_prompt == get_prompt_fragment("chat/immersive_system.j2", "Aristotle")
+    assert speaker == "Aristotle"
+    manager._prompts.render.assert_not_called()
@@ -0,0 +1,177 @@
+"""Tests for request-scoped and cross-request principal caching."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+from app.core import principal as principal_module
+from app.core.auth_config import current_active_user, get_jwt_strategy
+from app.core.db_models import Subscription, SubscriptionStatus, SubscriptionTier
+from app.core.principal import PrincipalCache, ResolvedPrincipal, resolve_principal, user_cache
+from app.core.user_models import User
+from app.services.subscription_manager import SubscriptionManager
+
+
+@pytest.fixture
+async def auth_db(tmp_path):
+    """Temp database with one premium subscriber, counting executed statements."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'auth.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as session:
+        user = User(email="plato@academy.gr", hashed_password="x", is_active=True)
+        session.add(user)
+        await session.commit()
+        session.add(Subscription(
+            user_id=user.id,
+            stripe_customer_id="cus_plato",
+            stripe_subscription_id="sub_plato",
+            tier=SubscriptionTier.PREMIUM,
+            status=SubscriptionStatus.ACTIVE,
+        ))
+        await session.commit()
+
+    statements = []
+    event.listen(engine.sync_engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+
+    with patch("app.core.database.AsyncSessionLocal", session_factory), \
+            patch("app.services.subscription_manager.AsyncSessionLocal", session_factory):
+        yield SimpleNamespace(session_factory=session_factory, user=user, statements=statements)
+
+    user_cache.clear()
+    await engine.dispose()
+
+
+class TestPrincipalCache:
+    """TTL and size bounds of the in-process cache."""
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr(principal_module.time, "monotonic", lambda: now[0])
+        cache = PrincipalCache(ttl_seconds=30)
+        cache.set(1, "premium")
+
+        now[0] += 29
+        assert cache.get(1) == "premium"
+        now[0] += 2
+        assert cache.get(1) is None
+        assert cache.get_stats()["hits"] == 1
+
+    def test_oldest_entries_are_evicted(self):
+        cache = PrincipalCache(ttl_seconds=30, max_entries=2)
+        for user_id in range(3):
+            cache.set(user_id, user_id)
+
+        assert len(cache) == 2
+        assert cache.get(0) is None
+        assert cache.get(2) == 2
+
+
+class TestResolvePrincipal:
+    """Principals are resolved once per request and reused across requests."""
+
+    @pytest.mark.asyncio
+    async def test_resolution_is_memoised_on_request_state(self):
+        manager = AsyncMock()
+        manager.get_principal.return_value = ResolvedPrincipal(user_id=7, tier=SubscriptionTier.BASIC)
+        request = SimpleNamespace(state=SimpleNamespace())
+
+        first = await resolve_principal(request, 7, manager)
+        second = await resolve_principal(request, 7, manager)
+
+        assert first is second
+        assert request.state.subscription_tier == SubscriptionTier.BASIC
+        manager.get_principal.assert_awaited_once_with(7)
+
+    @pytest.mark.asyncio
+    async def test_principal_includes_entitlements_and_is_cached(self, auth_db):
+        manager = SubscriptionManager()
+
+        principal = await manager.get_principal(auth_db.user.id)
+        queries = len(auth_db.statements)
+        assert await manager.get_user_tier(auth_db.user.id) == SubscriptionTier.PREMIUM
+        assert await manager.check_api_access(auth_db.user.id, "/analytics")
+
+        assert principal.has_entitlement("analytics")
+        assert principal.stripe_subscription_id == "sub_plato"
+        assert len(auth_db.statements) == queries
+
+    @pytest.mark.asyncio
+    async def test_admin_override_invalidates_principal(self, auth_db):
+        manager = SubscriptionManager()
+        assert await manager.get_user_tier(auth_db.user.id) == SubscriptionTier.PREMIUM
+
+        await manager.apply_admin_override(auth_db.user.id, new_tier=SubscriptionTier.BASIC, admin_user_id=1)
+
+        assert await manager.get_user_tier(auth_db.user.id) == SubscriptionTier.BASIC
+
+    @pytest.mark.asyncio
+    async def test_webhook_invalidation_by_stripe_ids(self, auth_db):
+        manager = SubscriptionManager()
+        await manager.get_principal(auth_db.user.id)
+        async with auth_db.session_factory() as session:
+            subscription = await session.get(Subscription, 1)
+            subscription.tier = SubscriptionTier.FREE
+            await session.commit()
+        assert await manager.get_user_tier(auth_db.user.id) == SubscriptionTier.PREMIUM
+
+        user_ids = await manager.invalidate_stripe_subscription(stripe_subscription_id="sub_plato")
+
+        assert user_ids == [auth_db.user.id]
+        assert await manager.get_user_tier(auth_db.user.id) == SubscriptionTier.FREE
+        assert await manager.invalidate_stripe_subscription(stripe_customer_id="cus_unknown") == []
+
+
+class TestWarmAuthenticatedRequest:
+    """A warm authenticated request makes no database round-trips."""
+
+    @pytest.mark.asyncio
+    async def test_warm_request_issues_no_queries(self, auth_db):
+        manager = SubscriptionManager()
+        app = FastAPI()
+
+        @app.get("/ask")
+        async def ask(request: Request, user: User = Depends(current_active_user)):
+            principal = await resolve_principal(request, user.id, manager)
+            allowed = await manager.check_api_access(user.id, "/ask")
+            return {"email": user.email, "tier": principal.tier.value, "allowed": allowed}
+
+        token = await get_jwt_strategy().write_token(auth_db.user)
+        headers = {"Authorization": f"Bearer {token}"}
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            cold = await client.get("/ask", headers=headers)
+            cold_queries = len(auth_db.statements)
+            warm = await client.get("/ask", headers=headers)
+
+        assert cold.json() == warm.json() == {
+            "email": "plato@academy.gr", "tier": "premium", "allowed": True
+        }
+        assert cold_queries > 0
+        assert len(auth_db.statements) == cold_queries
+
+    @pytest.mark.asyncio
+    async def test_cached_user_is_detached_copy(self, auth_db):
+        user_cache.set(auth_db.user)
+
+        first = user_cache.get(auth_db.user.id)
+        second = user_cache.get(auth_db.user.id)
+
+        assert first is not second
+        assert first.email == "plato@academy.gr"
+        async with auth_db.session_factory() as session:
+            session.add(first)
+            first.username = "plato"
+            await session.commit()
+        async with auth_db.session_factory() as session:
+            assert (await session.get(User, auth_db.user.id)).username == "plato"
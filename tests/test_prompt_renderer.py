@@ -0,0 +1,86 @@
+"""Tests for PromptRenderer caching and the static-first prompt layout."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.llm_manager import LLMManager
+from app.services.prompt_renderer import PromptPrefixTracker, PromptRenderer, prompt_prefix_tracker
+
+
+@pytest.fixture
+def renderer():
+    return PromptRenderer()
+
+
+class TestRenderCache:
+    """Templates compile once; static renders are memoized."""
+
+    def test_templates_are_compiled_once(self, renderer):
+        with patch.object(renderer.env, "get_template", wraps=renderer.env.get_template) as get_template:
+            for query in ("What is virtue?", "What is justice?"):
+                renderer.render("chat/user.j2", {"name": "Sophia", "node_content": "...", "query_str": query})
+
+        get_template.assert_called_once_with("chat/user.j2")
+        assert renderer.get_cache_stats()["cached_renders"] == 0
+
+    def test_static_renders_are_memoized(self, renderer):
+        context = {"name": "Aristotle", "axioms": ["Virtue is a mean"], "personality": [],
+                   "rhetorical_tactics": [], "response_protocol": [], "cognitive_tone": []}
+
+        first = renderer.render("chat/immersive_system.j2", context, cache=True)
+        second = renderer.render("chat/immersive_system.j2", dict(context), cache=True)
+        neutral = renderer.render("chat/neutral_system.j2")
+        renderer.render("chat/neutral_system.j2")
+
+        assert first is second
+        assert "Virtue is a mean" in first and neutral
+        stats = renderer.get_cache_stats()
+        assert (stats["cached_renders"], stats["hits"], stats["misses"]) == (2, 2, 2)
+        assert stats["hit_rate"] == 50.0
+
+    def test_render_cache_is_bounded(self):
+        renderer = PromptRenderer(max_cached_renders=2)
+        for mode in ("debate", "tutorial", "socratic"):
+            renderer.render("chat/adaptive_system.j2", {"conversation_mode": mode, "personality": []}, cache=True)
+
+        assert renderer.get_cache_stats()["cached_renders"] == 2
+        renderer.clear_cache()
+        assert renderer.get_cache_stats()["compiled_templates"] == 0
+
+
+class TestStablePrefix:
+    """Static prompt parts come first and are byte-identical between requests."""
+
+    def test_user_prompt_starts_with_static_instructions(self, renderer):
+        first = renderer.render("chat/user.j2", {"name": "Sophia", "node_content": "A", "query_str": "Why?"})
+        second = renderer.render("chat/user.j2", {"name": "Kant", "node_content": "B", "query_str": "How?"})
+
+        static = first.split("Hello")[0]
+        assert static.strip().startswith("You will receive several context nodes")
+        assert second.startswith(static)
+
+    def test_prefix_tracker_hit_rate(self):
+        tracker = PromptPrefixTracker(max_entries=1)
+
+        assert not tracker.observe("system A", "neutral")
+        assert tracker.observe("system A", "neutral")
+        assert not tracker.observe("system B", "immersive")
+        assert not tracker.observe("system A", "neutral")  # evicted by B
+        assert tracker.hit_rate == 25.0
+
+    @pytest.mark.asyncio
+    async def test_chat_observes_system_prompt_prefix(self, renderer):
+        with patch.object(LLMManager, "_initialize_models"):
+            manager = LLMManager(prompt_renderer=renderer)
+        manager._llm = AsyncMock()
+        manager._llm.achat.return_value = "answer"
+        prompt_prefix_tracker.reset()
+        node = type("Node", (), {"id": 1, "payload": {"text": "Virtue is a mean."}})()
+
+        for query in ("What is virtue?", "What is courage?"):
+            await manager.achat(query, [node])
+
+        system_messages = [call.args[0][0].content for call in manager._llm.achat.await_args_list]
+        assert system_messages[0] == system_messages[1]
+        assert (prompt_prefix_tracker.hits, prompt_prefix_tracker.misses) == (1, 1)
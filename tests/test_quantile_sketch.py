@@ -0,0 +1,157 @@
+"""Tests for streaming-quantile sketches and their use in chat monitoring."""
+
+import random
+
+import numpy as np
+import pytest
+from prometheus_client import CollectorRegistry, generate_latest
+
+from app.core.constants import QUANTILE_RELATIVE_ACCURACY
+from app.services.chat_monitoring import ChatMonitoringService, ChatQuantileCollector
+from app.services.quantile_sketch import QuantileSketch, RollingQuantiles, WindowedSketch, merge_snapshots
+
+fakeredis = pytest.importorskip("fakeredis")
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def latencies(n, seed):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(4, 1) for _ in range(n)]
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestQuantileSketch:
+    """Quantiles are within the relative accuracy and sketches merge exactly."""
+
+    def test_quantiles_within_relative_accuracy(self):
+        values = latencies(20000, seed=1)
+        sketch = QuantileSketch()
+        for value in values:
+            sketch.add(value)
+
+        for q in QUANTILES:
+            expected = np.quantile(values, q, method="lower")
+            assert sketch.quantile(q) == pytest.approx(expected, rel=2 * QUANTILE_RELATIVE_ACCURACY)
+        assert sketch.count == len(values)
+        assert sketch.mean == pytest.approx(np.mean(values))
+        assert (sketch.min, sketch.max) == (min(values), max(values))
+
+    def test_merge_equals_single_sketch(self):
+        first, second, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for i, value in enumerate(latencies(5000, seed=2)):
+            (first if i % 2 else second).add(value)
+            combined.add(value)
+
+        merged = QuantileSketch.from_dict(first.to_dict()).merge(QuantileSketch.from_dict(second.to_dict()))
+
+        assert merged.buckets == combined.buckets
+        assert [merged.quantile(q) for q in QUANTILES] == [combined.quantile(q) for q in QUANTILES]
+
+    def test_memory_is_bounded(self):
+        values = [step * 10.0 ** exponent for exponent in range(-3, 9) for step in range(1, 100)]
+        sketch = QuantileSketch(max_buckets=64)
+        for value in values:
+            sketch.add(value)
+
+        # Collapsing folds the lowest buckets, so high quantiles keep their accuracy
+        assert len(sketch.buckets) <= 64
+        expected = np.quantile(values, 0.99, method="lower")
+        assert sketch.quantile(0.99) == pytest.approx(expected, rel=2 * QUANTILE_RELATIVE_ACCURACY)
+
+    def test_zero_and_empty(self):
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) is None
+        sketch.add(0)
+        sketch.add(-5)
+        assert sketch.quantile(0.5) == 0.0
+
+    def test_mismatched_accuracy_cannot_merge(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.05))
+
+
+class TestWindows:
+    """Old slices age out of rolling windows."""
+
+    def test_window_drops_old_slices(self):
+        clock = FakeClock()
+        windowed = WindowedSketch(slice_seconds=60, retention_seconds=600, clock=clock)
+        windowed.add(1000)
+        clock.now += 300
+        windowed.add(10)
+
+        assert windowed.window(60).count == 1
+        assert windowed.window(600).count == 2
+        clock.now += 700
+        windowed.add(5)
+        assert windowed.window(600).count == 1
+        assert len(windowed._slices) == 1
+
+    def test_rolling_quantiles_use_coarse_ring_for_long_windows(self):
+        clock = FakeClock()
+        rolling = RollingQuantiles(clock=clock)
+        rolling.add(100)
+        clock.now += 2 * 3600
+        rolling.add(200)
+
+        assert rolling.window(600).count == 1
+        assert rolling.window(24 * 3600).count == 2
+
+
+class TestChatMonitoring:
+    """Timers are summarized by sketches, exported and merged across workers."""
+
+    def test_performance_summary_reports_quantiles(self):
+        service = ChatMonitoringService()
+        for value in range(1, 101):
+            service.record_timer_ms("search_duration", value)
+        service.record_counter("search_total")
+
+        metrics = service.get_performance_summary(hours=1)["metrics"]
+
+        assert metrics["search_duration"]["count"] == 100
+        assert metrics["search_duration"]["p95"] == pytest.approx(95, rel=0.02)
+        assert metrics["search_total"]["total"] == 1
+        assert "search_duration" not in service.metrics
+
+    def test_prometheus_summary_export(self):
+        service = ChatMonitoringService()
+        for value in range(1, 101):
+            service.record_timer_ms("search_duration", value)
+        registry = CollectorRegistry()
+        registry.register(ChatQuantileCollector(service))
+
+        output = generate_latest(registry).decode()
+
+        assert "# TYPE chat_monitoring_summary summary" in output
+        assert 'chat_monitoring_summary_count{metric="search_duration",window="10m"} 100.0' in output
+        assert 'chat_monitoring_summary{metric="search_duration",quantile="0.5",window="1h"}' in output
+
+    @pytest.mark.asyncio
+    async def test_workers_merge_snapshots_through_redis(self):
+        redis_client = fakeredis.FakeAsyncRedis()
+        workers = [ChatMonitoringService(), ChatMonitoringService()]
+        workers[0].worker_id, workers[1].worker_id = "host:1", "host:2"
+        values = latencies(4000, seed=3)
+        single = QuantileSketch()
+        for i, value in enumerate(values):
+            workers[i % 2].record_timer_ms("chat_duration", value)
+            single.add(value)
+
+        for worker in workers:
+            await worker.sync_quantiles(redis_client)
+        await workers[0].sync_quantiles(redis_client)
+        await redis_client.aclose()
+
+        merged = workers[0].exported_quantiles()["chat_duration"]["1h"]
+        assert merged.count == len(values)
+        assert merged.quantile(0.99) == single.quantile(0.99)
+        assert merge_snapshots([workers[1].quantile_snapshot()])["chat_duration"]["1h"].count == 2000
@@ -0,0 +1,223 @@
+"""Tests for the GCRA rate limiter, its Redis script and in-process fallback."""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from app.core import rate_limiting
+from app.core.asgi_middleware import RateLimitHeadersMiddleware
+from app.core.db_models import SubscriptionTier
+from app.core.rate_limiting import (
+    InMemoryRateLimitBackend,
+    RateLimitPolicy,
+    RedisRateLimitBackend,
+    TierRateLimiter,
+    load_tier_policies,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+NOW_MS = 1_700_000_000_000
+
+
+@pytest.fixture
+async def redis_client():
+    client = fakeredis.FakeAsyncRedis()
+    yield client
+    await client.aclose()
+
+
+@pytest.fixture
+def frozen_clock(monkeypatch):
+    """Controllable wall clock (milliseconds) for the limiter."""
+    clock = SimpleNamespace(ms=NOW_MS)
+    monkeypatch.setattr(rate_limiting.time, "time", lambda: clock.ms / 1000)
+    return clock
+
+
+def _policies(**counts):
+    return {tier: {"default": RateLimitPolicy(counts.get(tier.value, 3), 60)} for tier in SubscriptionTier}
+
+
+class TestPolicies:
+    """Policies are parsed from limit strings and loaded from configuration."""
+
+    @pytest.mark.parametrize("spec,expected", [
+        ("10/minute", RateLimitPolicy(10, 60)),
+        ("100 per hour", RateLimitPolicy(100, 3600)),
+        ("5/30 seconds", RateLimitPolicy(5, 30)),
+    ])
+    def test_parse(self, spec, expected):
+        assert RateLimitPolicy.parse(spec) == expected
+
+    def test_parse_rejects_garbage(self):
+        with pytest.raises(ValueError):
+            RateLimitPolicy.parse("lots")
+
+    def test_load_from_settings(self):
+        settings = SimpleNamespace(
+            rate_limit_window_seconds=30,
+            free_requests_per_minute=12,
+            rate_limit_policies={"free": {"heavy": 1}, "premium": {"default": 500}},
+        )
+
+        policies = load_tier_policies(settings)
+
+        assert policies[SubscriptionTier.FREE]["default"] == RateLimitPolicy(12, 30)
+        assert policies[SubscriptionTier.FREE]["heavy"] == RateLimitPolicy(1, 30)
+        assert policies[SubscriptionTier.FREE]["streaming"] == RateLimitPolicy(5, 30)
+        assert policies[SubscriptionTier.PREMIUM]["default"] == RateLimitPolicy(500, 30)
+
+
+class TestRedisBackend:
+    """The Lua GCRA script admits bursts up to the limit, then paces requests."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_throttle_then_recover(self, redis_client):
+        backend = RedisRateLimitBackend(redis_client)
+        policy = RateLimitPolicy(3, 60)
+
+        results = [await backend.hit("bucket", policy, NOW_MS) for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+        assert results[3].retry_after_ms == 20_000
+        assert results[3].headers["Retry-After"] == "20"
+        assert results[2].headers["RateLimit-Reset"] == "60"
+        # One emission interval later exactly one more request fits
+        assert (await backend.hit("bucket", policy, NOW_MS + 20_000)).allowed
+        assert not (await backend.hit("bucket", policy, NOW_MS + 20_000)).allowed
+        assert 0 < await redis_client.pttl("bucket") <= 60_000
+
+    @pytest.mark.asyncio
+    async def test_matches_in_memory_fallback(self, redis_client):
+        redis_backend = RedisRateLimitBackend(redis_client)
+        memory_backend = InMemoryRateLimitBackend()
+        policy = RateLimitPolicy(7, 60)
+        offsets = [0, 0, 0, 1_000, 5_000, 5_000, 5_000, 5_000, 5_000, 30_000, 30_001, 95_000]
+
+        for offset in offsets:
+            expected = memory_backend.hit("k", policy, NOW_MS + offset)
+            actual = await redis_backend.hit("k", policy, NOW_MS + offset)
+            assert actual == expected
+
+    @pytest.mark.asyncio
+    async def test_concurrent_hits_are_atomic(self, redis_client, frozen_clock):
+        limiter = TierRateLimiter(policies=_policies(), redis_client=redis_client)
+        policy = RateLimitPolicy(5, 60)
+
+        results = await asyncio.gather(*(limiter.hit("user:1", policy) for _ in range(20)))
+
+        assert sum(r.allowed for r in results) == 5
+        assert limiter.backend_name == "redis"
+
+
+class TestFallback:
+    """Limits keep working in-process when Redis fails."""
+
+    @pytest.mark.asyncio
+    async def test_falls_back_and_backs_off(self, frozen_clock):
+        class BrokenRedis:
+            calls = 0
+
+            def register_script(self, script):
+                async def run(keys, args):
+                    BrokenRedis.calls += 1
+                    raise ConnectionError("redis down")
+                return run
+
+        limiter = TierRateLimiter(policies=_policies(), redis_client=BrokenRedis())
+        policy = RateLimitPolicy(2, 60)
+
+        results = [await limiter.hit("ip:1.2.3.4", policy) for _ in range(3)]
+
+        assert [r.allowed for r in results] == [True, True, False]
+        assert BrokenRedis.calls == 1
+        assert limiter.backend_name == "memory"
+
+    def test_fallback_prunes_replenished_buckets(self):
+        backend = InMemoryRateLimitBackend(max_keys=2)
+        policy = RateLimitPolicy(10, 60)
+        backend.hit("a", policy, NOW_MS)
+        backend.hit("b", policy, NOW_MS)
+
+        backend.hit("c", policy, NOW_MS + 60_000)
+
+        assert set(backend._buckets) == {"c"}
+
+
+class TestEndpointIntegration:
+    """Decorated endpoints enforce tier policies and expose RateLimit-* headers."""
+
+    @staticmethod
+    def _build_app(limiter: TierRateLimiter, tier: SubscriptionTier = SubscriptionTier.FREE) -> FastAPI:
+        app = FastAPI()
+        app.add_middleware(RateLimitHeadersMiddleware)
+
+        def set_tier(request: Request):
+            request.state.subscription_tier = tier
+
+        @app.get("/ask_philosophy", dependencies=[Depends(set_tier)])
+        @limiter.limit(rate_limiting.get_heavy_limit)
+        async def ask(request: Request):
+            return {"answer": "Know thyself."}
+
+        @app.get("/ask/stream")
+        @limiter.limit("streaming")
+        async def stream(request: Request):
+            async def events():
+                yield "data: 1\n\n"
+            return StreamingResponse(events(), media_type="text/event-stream")
+
+        @app.post("/auth/session")
+        @limiter.limit("2/minute")
+        async def session(request: Request):
+            return {"ok": True}
+
+        return app
+
+    @pytest.mark.asyncio
+    async def test_tier_policy_headers_and_429(self, redis_client, frozen_clock):
+        limiter = TierRateLimiter(redis_client=redis_client, policies=load_tier_policies(SimpleNamespace()))
+        transport = httpx.ASGITransport(app=self._build_app(limiter))
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            responses = [await client.get("/ask_philosophy") for _ in range(3)]
+            stream = await client.get("/ask/stream")
+
+        assert [r.status_code for r in responses] == [200, 200, 429]
+        assert responses[0].headers["RateLimit-Limit"] == "2"
+        assert responses[0].headers["RateLimit-Remaining"] == "1"
+        assert responses[0].headers["RateLimit-Policy"] == "2;w=60"
+        assert responses[2].headers["Retry-After"] == "30"
+        assert responses[2].json()["detail"]["error"] == "rate_limit_exceeded"
+        # Streaming is a separate endpoint class with its own bucket
+        assert stream.status_code == 200
+        assert stream.headers["RateLimit-Limit"] == "5"
+
+    @pytest.mark.asyncio
+    async def test_higher_tier_gets_higher_limit(self, frozen_clock):
+        limiter = TierRateLimiter(policies=load_tier_policies(SimpleNamespace()))
+        transport = httpx.ASGITransport(app=self._build_app(limiter, SubscriptionTier.PREMIUM))
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            responses = [await client.get("/ask_philosophy") for _ in range(10)]
+
+        assert all(r.status_code == 200 for r in responses)
+        assert responses[-1].headers["RateLimit-Limit"] == "50"
+
+    @pytest.mark.asyncio
+    async def test_fixed_limit_and_disabled_limiter(self, frozen_clock):
+        limiter = TierRateLimiter(policies=_policies())
+        transport = httpx.ASGITransport(app=self._build_app(limiter))
+        async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+            limited = [(await client.post("/auth/session")).status_code for _ in range(3)]
+            limiter.enabled = False
+            unlimited = await client.post("/auth/session")
+
+        assert limited == [200, 200, 429]
+        assert unlimited.status_code == 200
+        assert "RateLimit-Limit" not in unlimited.headers
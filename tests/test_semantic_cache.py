@@ -0,0 +1,152 @@
+"""Tests for the semantic answer cache and its use in /ask_philosophy."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import dependencies as deps
+from app.services.semantic_cache import SemanticAnswerCache
+from tests.conftest import create_mock_llm_response, create_mock_node
+
+fakeredis = pytest.importorskip("fakeredis")
+
+VIRTUE = [1.0, 0.0, 0.0]
+VIRTUE_REPHRASED = [0.99, 0.1, 0.0]  # cosine ~0.995
+JUSTICE = [0.6, 0.8, 0.0]  # cosine 0.6
+
+
+def make_cache(redis_client=None, **overrides):
+    options = {"threshold": 0.95, "ttl_seconds": 3600, "max_entries": 100, "prompt_version": "v1"}
+    return SemanticAnswerCache(redis_client=redis_client, **{**options, **overrides})
+
+
+class TestLookup:
+    """Similar queries in the same scope hit; everything else misses."""
+
+    @pytest.mark.asyncio
+    async def test_similar_query_hits_and_dissimilar_misses(self):
+        cache = make_cache()
+        scope = cache.scope_key("Aristotle", immersive=False)
+        await cache.store(VIRTUE, "Aristotle", scope, query="What is virtue?", text="A mean.")
+
+        hit = await cache.lookup(VIRTUE_REPHRASED, "Aristotle", scope)
+        miss = await cache.lookup(JUSTICE, "Aristotle", scope)
+
+        assert hit.text == "A mean." and hit.similarity > 0.99
+        assert miss is None
+        assert cache.get_stats()["hit_rate"] == 50.0
+
+    @pytest.mark.asyncio
+    async def test_scopes_are_isolated(self):
+        cache = make_cache()
+        scope = cache.scope_key("Aristotle", immersive=False)
+        await cache.store(VIRTUE, "Aristotle", scope, query="q", text="answer")
+
+        assert await cache.lookup(VIRTUE, "Aristotle", cache.scope_key("Aristotle", immersive=True)) is None
+        assert await cache.lookup(VIRTUE, "Kant", cache.scope_key("Kant", immersive=False)) is None
+        new_prompts = make_cache(prompt_version="v2")
+        assert new_prompts.scope_key("Aristotle", immersive=False) != scope
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_miss(self):
+        cache = make_cache(ttl_seconds=60)
+        scope = cache.scope_key("Aristotle")
+        with patch("app.services.semantic_cache.time.time", return_value=1000.0):
+            await cache.store(VIRTUE, "Aristotle", scope, query="q", text="answer")
+        with patch("app.services.semantic_cache.time.time", return_value=1100.0):
+            assert await cache.lookup(VIRTUE, "Aristotle", scope) is None
+
+    @pytest.mark.asyncio
+    async def test_entries_are_bounded(self):
+        cache = make_cache(max_entries=3)
+        for i in range(5):
+            await cache.store([1.0, float(i), 0.0], f"C{i}", cache.scope_key(f"C{i}"), query="q", text="a")
+
+        assert cache.get_stats()["entries"] == 3
+
+
+class TestInvalidation:
+    """Re-ingesting a collection drops its answers on every worker."""
+
+    @pytest.mark.asyncio
+    async def test_invalidation_is_shared_through_redis(self):
+        redis_client = fakeredis.FakeAsyncRedis()
+        workers = [make_cache(redis_client), make_cache(redis_client)]
+        aristotle, kant = workers[0].scope_key("Aristotle"), workers[0].scope_key("Kant")
+        for worker in workers:
+            await worker.store(VIRTUE, "Aristotle", aristotle, query="q", text="A mean.")
+            await worker.store(VIRTUE, "Kant", kant, query="q", text="Duty.")
+
+        await workers[0].invalidate("Aristotle")
+
+        assert await workers[1].lookup(VIRTUE, "Aristotle", aristotle) is None
+        assert (await workers[1].lookup(VIRTUE, "Kant", kant)).text == "Duty."
+        await workers[1].invalidate()
+        assert await workers[0].lookup(VIRTUE, "Kant", kant) is None
+        await redis_client.aclose()
+
+
+class TestAskPhilosophy:
+    """The endpoint serves repeated questions from the cache."""
+
+    @pytest.fixture
+    def semantic_cache(self, test_client):
+        from app.core.rate_limiting import limiter
+        from app.main import app
+
+        cache = make_cache()
+        app.dependency_overrides[deps.get_semantic_cache] = lambda: cache
+        limiter_enabled, limiter.enabled = limiter.enabled, False
+        yield cache
+        limiter.enabled = limiter_enabled
+        app.dependency_overrides.pop(deps.get_semantic_cache, None)
+
+    def _ask(self, client: TestClient, query: str, **params):
+        return client.post("/ask_philosophy", params=params, json={"query_str": query, "collection": "Aristotle"})
+
+    def test_repeated_question_served_from_cache(self, test_client, mock_all_services, semantic_cache):
+        mock_llm, mock_qdrant = mock_all_services["llm"], mock_all_services["qdrant"]
+        mock_llm.generate_dense_vector = AsyncMock(side_effect=[VIRTUE, VIRTUE_REPHRASED, JUSTICE])
+        mock_llm.achat.return_value = create_mock_llm_response("Virtue is a mean.")
+        mock_qdrant.gather_points_and_sort.return_value = [create_mock_node("n1", "Virtue", collection="Aristotle")]
+
+        first = self._ask(test_client, "What is virtue?")
+        second = self._ask(test_client, "What's virtue?")
+        third = self._ask(test_client, "What is justice?")
+
+        assert first.status_code == second.status_code == third.status_code == 200
+        assert second.json()["text"] == first.json()["text"]
+        assert mock_llm.achat.await_count == 2
+        assert mock_qdrant.gather_points_and_sort.await_count == 2
+        assert semantic_cache.get_stats()["hits"] == 1
+
+    def test_temperature_is_part_of_scope(self, test_client, mock_all_services, semantic_cache):
+        mock_llm, mock_qdrant = mock_all_services["llm"], mock_all_services["qdrant"]
+        mock_llm.generate_dense_vector = AsyncMock(return_value=VIRTUE)
+        mock_llm.achat.return_value = create_mock_llm_response("Virtue is a mean.")
+        mock_qdrant.gather_points_and_sort.return_value = [create_mock_node("n1", "Virtue", collection="Aristotle")]
+
+        cool = self._ask(test_client, "What is virtue?", temperature=0.2)
+        warm = self._ask(test_client, "What is virtue?", temperature=0.8)
+
+        assert cool.status_code == warm.status_code == 200
+        assert mock_llm.achat.await_count == 2
+        assert (semantic_cache.get_stats()["hits"], semantic_cache.get_stats()["misses"]) == (0, 2)
+
+    def test_conversation_history_bypasses_cache(self, test_client, mock_all_services, semantic_cache):
+        mock_llm, mock_qdrant = mock_all_services["llm"], mock_all_services["qdrant"]
+        mock_llm.generate_dense_vector = AsyncMock(return_value=VIRTUE)
+        mock_llm.achat.return_value = create_mock_llm_response("Virtue is a mean.")
+        mock_qdrant.gather_points_and_sort.return_value = [create_mock_node("n1", "Virtue", collection="Aristotle")]
+        history = [{"id": "m1", "role": "user", "text": "Hello"}]
+
+        for _ in range(2):
+            response = test_client.post("/ask_philosophy", json={
+                "query_str": "What is virtue?", "collection": "Aristotle", "conversation_history": history,
+            })
+            assert response.status_code == 200
+
+        assert mock_llm.achat.await_count == 2
+        mock_llm.generate_dense_vector.assert_not_awaited()
+        assert semantic_cache.get_stats()["bypassed"] == 2
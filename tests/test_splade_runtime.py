@@ -0,0 +1,106 @@
+"""Parity and persistence tests for the SPLADE torch and ONNX Runtime backends."""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import torch
+
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from transformers import BertConfig, BertForMaskedLM, BertTokenizerFast
+
+from app.services import splade_runtime
+from app.services.splade_runtime import (
+    OnnxSpladeEncoder,
+    TorchSpladeEncoder,
+    export_splade_onnx,
+    load_onnx_encoder,
+    load_splade_encoder,
+)
+
+WORDS = ("virtue justice courage wisdom reason duty will power being time nature "
+         "mind body soul truth beauty good evil law state freedom knowledge").split()
+TEXTS = [
+    "virtue is the mean between courage and wisdom",
+    "the good will is good without qualification",
+    "knowledge of nature comes from reason and time",
+]
+TOP_K = 20
+
+
+@pytest.fixture(scope="module")
+def torch_encoder(tmp_path_factory):
+    """Small randomly initialised BERT masked-LM with a word-level vocabulary."""
+    vocab_file = tmp_path_factory.mktemp("vocab") / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *WORDS]))
+    tokenizer = BertTokenizerFast(vocab_file=str(vocab_file))
+
+    torch.manual_seed(0)
+    config = BertConfig(vocab_size=len(tokenizer), hidden_size=32, num_hidden_layers=2,
+                        num_attention_heads=2, intermediate_size=64, max_position_embeddings=64)
+    return TorchSpladeEncoder(BertForMaskedLM(config).eval(), tokenizer)
+
+
+def _top_k(vector: np.ndarray) -> dict:
+    indices = np.argsort(-vector)[:TOP_K]
+    return {int(i): float(vector[i]) for i in indices if vector[i] > 0}
+
+
+class TestParity:
+    """ONNX encoders reproduce the torch sparse terms and weights."""
+
+    def test_fp32_export_matches_torch(self, torch_encoder, tmp_path):
+        export_splade_onnx(torch_encoder.model, torch_encoder.tokenizer, tmp_path, "tiny", quantize=False)
+        onnx_encoder = load_onnx_encoder(tmp_path, quantize=False)
+
+        for text in TEXTS:
+            expected, actual = torch_encoder.encode(text), onnx_encoder.encode(text)
+            assert expected.shape == actual.shape
+            assert _top_k(actual).keys() == _top_k(expected).keys()
+            np.testing.assert_allclose(actual, expected, atol=1e-5)
+        assert not torch_encoder.model.training
+
+    def test_int8_export_preserves_top_terms(self, torch_encoder, tmp_path):
+        export_splade_onnx(torch_encoder.model, torch_encoder.tokenizer, tmp_path, "tiny", quantize=True)
+        onnx_encoder = load_onnx_encoder(tmp_path, quantize=True)
+
+        for text in TEXTS:
+            expected, actual = _top_k(torch_encoder.encode(text)), _top_k(onnx_encoder.encode(text))
+            shared = expected.keys() & actual.keys()
+            assert len(shared) >= 0.8 * len(expected)
+            np.testing.assert_allclose([actual[i] for i in shared], [expected[i] for i in shared], atol=0.1)
+
+
+class TestPersistedArtifact:
+    """A persisted export is reused without loading the torch model."""
+
+    def test_restart_loads_artifact_without_torch(self, torch_encoder, tmp_path):
+        settings = SimpleNamespace(splade_model="tiny", splade_backend="onnx", splade_onnx_dir=str(tmp_path),
+                                   splade_onnx_quantize=True, splade_onnx_threads=1)
+
+        with patch.object(splade_runtime, "load_torch_encoder", return_value=torch_encoder) as load_torch:
+            first = load_splade_encoder(settings)
+            first.encode(TEXTS[0])
+            assert load_torch.call_count == 1
+            assert (tmp_path / "model.int8.opt.onnx").exists()
+
+            second = load_splade_encoder(settings)
+
+        assert load_torch.call_count == 1
+        assert isinstance(second, OnnxSpladeEncoder)
+        np.testing.assert_allclose(second.encode(TEXTS[0]), first.encode(TEXTS[0]), atol=1e-5)
+
+    def test_stale_artifact_is_re_exported(self, torch_encoder, tmp_path):
+        export_splade_onnx(torch_encoder.model, torch_encoder.tokenizer, tmp_path, "other-model", quantize=True)
+        settings = SimpleNamespace(splade_model="tiny", splade_backend="onnx", splade_onnx_dir=str(tmp_path),
+                                   splade_onnx_quantize=True, splade_onnx_threads=0)
+
+        with patch.object(splade_runtime, "load_torch_encoder", return_value=torch_encoder) as load_torch:
+            encoder = load_splade_encoder(settings)
+
+        load_torch.assert_called_once_with("tiny", optimize=False)
+        assert isinstance(encoder, OnnxSpladeEncoder)
+        assert '"model_name": "tiny"' in (tmp_path / "manifest.json").read_text()
@@ -0,0 +1,150 @@
+"""Tests for tokenizer-accurate token counting."""
+
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from transformers import BertTokenizerFast
+
+from app.core.constants import CONTEXT_BUFFER_TOKENS
+from app.router.ontologic import calculate_required_context_window
+from app.services.token_counter import TokenCounter, estimate_tokens
+
+WORDS = "what is virtue justice courage the good will a mean between".split()
+
+
+@pytest.fixture(scope="module")
+def tokenizer(tmp_path_factory):
+    """Word-level BERT tokenizer; unknown words split into ``##`` pieces are [UNK]."""
+    vocab_file = tmp_path_factory.mktemp("vocab") / "vocab.txt"
+    vocab_file.write_text("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "?", *WORDS]))
+    return BertTokenizerFast(vocab_file=str(vocab_file))
+
+
+@pytest.fixture
+def counter(tokenizer):
+    return TokenCounter(tokenizer=tokenizer.backend_tokenizer)
+
+
+class TestCounts:
+    """Counts match the tokenizer and are memoized per text."""
+
+    def test_counts_match_tokenizer(self, counter, tokenizer):
+        texts = ["What is virtue?", "the good will", "courage is a mean between"]
+
+        expected = [len(tokenizer(text, add_special_tokens=False)["input_ids"]) for text in texts]
+        assert counter.count_batch(texts) == expected
+        assert counter.count("What is virtue?") == 4
+        assert counter.count("") == 0
+        assert counter.backend == "tokenizer"
+
+    def test_batch_dedupes_and_caches(self, counter):
+        with patch.object(counter, "_encode", wraps=counter._encode) as encode:
+            assert counter.count_batch(["the good", "the good", "", "a mean"]) == [2, 2, 0, 2]
+            assert counter.count_batch(["a mean", "the good"]) == [2, 2]
+
+        encode.assert_called_once()
+        assert encode.call_args.args[1] == ["the good", "a mean"]
+        stats = counter.get_stats()
+        assert (stats["entries"], stats["hits"], stats["misses"]) == (2, 2, 2)
+
+    def test_cache_is_bounded(self, tokenizer):
+        counter = TokenCounter(tokenizer=tokenizer.backend_tokenizer, max_entries=2)
+        counter.count_batch(["what", "is", "virtue"])
+
+        assert counter.get_stats()["entries"] == 2
+        counter.clear_cache()
+        assert counter.get_stats()["entries"] == 0
+
+    def test_concurrent_batches_share_bounded_cache(self, tokenizer):
+        counter = TokenCounter(tokenizer=tokenizer.backend_tokenizer, max_entries=4)
+        batches = [[" ".join(WORDS[(i + j) % len(WORDS)] for j in range(3)) for i in range(n, n + 8)]
+                   for n in range(40)]
+        expected = [[3] * 8] * len(batches)
+
+        # Batches also run in asyncio.to_thread workers; evictions must not race with lookups
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert list(pool.map(counter.count_batch, batches * 5)) == expected * 5
+
+        stats = counter.get_stats()
+        assert stats["entries"] == 4
+        assert stats["hits"] + stats["misses"] == 40 * 8 * 5
+
+    def test_tokenizer_call_fallback(self, tokenizer):
+        counter = TokenCounter(tokenizer=tokenizer)
+
+        assert counter.count_batch(["What is virtue?", "the good will"]) == [4, 3]
+
+
+class TestEstimateFallback:
+    """Without a locally cached tokenizer, counts use the chars/token estimate."""
+
+    def test_missing_tokenizer_falls_back_to_estimate(self):
+        counter = TokenCounter("not-a-real/tokenizer-model")
+
+        assert not counter.load()
+        assert counter.backend == "estimate"
+        assert counter.count_batch(["Hello", "Hi", ""]) == [2, 1, 0]
+        assert estimate_tokens("x" * 1000) == 250
+
+    def test_no_tokenizer_configured(self):
+        assert TokenCounter(None).count("What is virtue?") == estimate_tokens("What is virtue?")
+
+
+class TestContextWindow:
+    """Context window sizing uses the token counter."""
+
+    def test_context_window_uses_exact_counts(self, counter):
+        nodes = [SimpleNamespace(payload={"text": "virtue " * 5000})]
+        history = [SimpleNamespace(text="what is the good")]
+
+        with patch("app.router.ontologic.get_token_counter", return_value=counter):
+            window, reasoning = calculate_required_context_window(
+                nodes, history, query_str="What is virtue?"
+            )
+
+        # 5000 + 4 + 4 content tokens (vs. ~8770 from the character estimate) plus the buffer
+        assert f"{5008 + CONTEXT_BUFFER_TOKENS} estimated tokens" in reasoning
+        assert window >= 5008 + CONTEXT_BUFFER_TOKENS
+
+
+class TestSplit:
+    """Long texts are cut into token windows for chunking."""
+
+    def test_windows_fit_limit_and_overlap(self, counter):
+        text = " ".join(WORDS * 10)  # 110 tokens
+
+        windows = counter.split(text, max_tokens=32, overlap_tokens=8)
+
+        assert all(counter.count(window) <= 32 for window in windows)
+        assert len(windows) == 5
+        assert windows[0].split()[-8:] == windows[1].split()[:8]
+        assert windows[-1].endswith(WORDS[-1])
+        assert counter.split("the good will", max_tokens=32) == ["the good will"]
+
+    def test_estimate_windows_fit_limit(self):
+        counter = TokenCounter(None)
+
+        windows = counter.split("x" * 1000, max_tokens=100, overlap_tokens=10)
+
+        assert all(counter.count(window) <= 100 for window in windows)
+        assert "".join(window[40:] if i else window for i, window in enumerate(windows)) == "x" * 1000
+
+    def test_upload_chunks_fit_token_limit(self, counter):
+        from app.services.qdrant_upload import QdrantUploadService
+
+        service = QdrantUploadService.__new__(QdrantUploadService)
+        service.chunk_size, service.chunk_overlap = 16, 4
+        service._get_embed_model_name = lambda: "nomic-embed-text"
+        semantic_chunks = [SimpleNamespace(get_content=lambda: " ".join(WORDS * 6)),
+                           SimpleNamespace(get_content=lambda: "What is virtue?")]
+        splitter = SimpleNamespace(get_nodes_from_documents=lambda docs: semantic_chunks)
+
+        with patch("app.services.qdrant_upload.SemanticSplitterNodeParser", return_value=splitter), \
+                patch("app.services.qdrant_upload.OllamaEmbedding"), \
+                patch("app.services.qdrant_upload.get_token_counter", return_value=counter):
+            chunks = service._chunk_text("ignored")
+
+        assert max(counter.count_batch(chunks)) <= 16
+        assert len(chunks) == 7 and chunks[-1] == "What is virtue?"
@@ -0,0 +1,188 @@
+"""Tests for the SQL billing analytics engine: aggregates, daily rollups and the payment summary."""
+
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlmodel import select
+
+from app.core.db_models import (
+    DisputeReason,
+    DisputeRecord,
+    DisputeStatus,
+    PaymentRecord,
+    RefundReason,
+    RefundRecord,
+    RefundStatus,
+    SubscriptionTier,
+    UsageDailyRollup,
+    UsageRecord,
+)
+from app.services.usage_analytics import (
+    payment_summary,
+    roll_up_usage,
+    rolled_up_until,
+    usage_for_period,
+    usage_for_range,
+)
+
+
+
+def at(day: str, hour: int = 12) -> datetime:
+    return datetime.fromisoformat(day).replace(hour=hour, tzinfo=timezone.utc)
+
+
+async def add_usage(session_factory, *usages):
+    """Store (user_id, endpoint, tokens, timestamp[, tier]) usage records."""
+    async with session_factory() as session:
+        for user_id, endpoint, tokens, timestamp, *tier in usages:
+            session.add(UsageRecord(
+                user_id=user_id,
+                endpoint=endpoint,
+                tokens_used=tokens,
+                billing_period=timestamp.strftime("%Y-%m"),
+                subscription_tier=tier[0] if tier else SubscriptionTier.FREE,
+                timestamp=timestamp,
+            ))
+        await session.commit()
+
+
+@pytest.fixture
+async def usage(session_factory):
+    await add_usage(
+        session_factory,
+        (1, "/ask", 100, at("2024-01-30")),
+        (1, "/query", 50, at("2024-01-31", hour=23)),
+        (1, "/ask", 200, at("2024-02-01", hour=0), SubscriptionTier.BASIC),
+        (1, "/ask", 10, at("2024-02-02")),
+        (2, "/ask", 999, at("2024-02-01")),
+    )
+
+
+@pytest.mark.asyncio
+async def test_period_totals_are_aggregated_in_sql(session_factory, usage):
+    async with session_factory() as session:
+        january = await usage_for_period(session, 1, "2024-01")
+        february = await usage_for_period(session, 1, "2024-02")
+        empty = await usage_for_period(session, 1, "2024-03")
+
+    assert (january.requests, january.tokens, january.endpoints) == (2, 150, {"/ask": 1, "/query": 1})
+    assert (february.requests, february.tokens) == (2, 210)
+    assert february.subscription_tier == SubscriptionTier.FREE  # Latest request in the period
+    assert (empty.requests, empty.subscription_tier) == (0, None)
+
+
+@pytest.mark.asyncio
+async def test_range_is_bucketed_per_month_and_day(session_factory, usage):
+    async with session_factory() as session:
+        monthly = await usage_for_range(session, 1, at("2024-01-01", 0), at("2024-03-01", 0))
+        daily = await usage_for_range(session, 1, at("2024-01-31", 0), at("2024-02-02", 0), granularity="day")
+
+    assert monthly.buckets == {"2024-01": {"requests": 2, "tokens": 150}, "2024-02": {"requests": 2, "tokens": 210}}
+    assert monthly.endpoints == {"/ask": 3, "/query": 1}
+    assert daily.buckets == {"2024-01-31": {"requests": 1, "tokens": 50}, "2024-02-01": {"requests": 1, "tokens": 200}}
+
+
+@pytest.mark.asyncio
+async def test_rollup_is_incremental(session_factory, usage):
+    async with session_factory() as session:
+        assert await rolled_up_until(session) is None
+        assert await roll_up_usage(session, through=date(2024, 2, 1)) == 2
+        assert await roll_up_usage(session, through=date(2024, 2, 1)) == 0
+        assert await rolled_up_until(session) == date(2024, 2, 1)
+        assert await roll_up_usage(session, through=date(2024, 2, 3)) == 2
+
+        rows = (await session.execute(
+            select(UsageDailyRollup.user_id, UsageDailyRollup.day, UsageDailyRollup.endpoint,
+                   UsageDailyRollup.requests, UsageDailyRollup.tokens)
+            .order_by(UsageDailyRollup.day, UsageDailyRollup.user_id)
+        )).all()
+
+    assert [tuple(row) for row in rows] == [
+        (1, date(2024, 1, 30), "/ask", 1, 100),
+        (1, date(2024, 1, 31), "/query", 1, 50),
+        (1, date(2024, 2, 1), "/ask", 1, 200),
+        (2, date(2024, 2, 1), "/ask", 1, 999),
+        (1, date(2024, 2, 2), "/ask", 1, 10),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_range_combines_rollups_with_raw_records(session_factory, usage):
+    async with session_factory() as session:
+        expected = await usage_for_range(session, 1, at("2024-01-30", 6), at("2024-02-03", 0), granularity="day")
+        await roll_up_usage(session, through=date(2024, 2, 2))
+    # Recorded after the rollup: still counted from the raw records
+    await add_usage(session_factory, (1, "/ask", 5, at("2024-02-02", 18)))
+
+    async with session_factory() as session:
+        combined = await usage_for_range(session, 1, at("2024-01-30", 6), at("2024-02-03", 0), granularity="day")
+
+    expected.add("/ask", 1, 5, bucket="2024-02-02")
+    assert combined.buckets == expected.buckets
+    assert combined.endpoints == expected.endpoints
+    assert (combined.requests, combined.tokens) == (5, 365)
+
+
+@pytest.mark.asyncio
+async def test_rolled_up_days_are_not_rescanned(session_factory, usage):
+    async with session_factory() as session:
+        await roll_up_usage(session, through=date(2024, 2, 3))
+        # Raw records of rolled-up days are no longer read
+        await session.execute(UsageRecord.__table__.delete())
+        await session.commit()
+
+        usage_range = await usage_for_range(session, 1, at("2024-01-01", 0), at("2024-03-01", 0))
+
+    assert usage_range.buckets == {"2024-01": {"requests": 2, "tokens": 150}, "2024-02": {"requests": 2, "tokens": 210}}
+
+
+@pytest.mark.asyncio
+async def test_billing_analytics_use_one_aggregate_query(session_factory):
+    from app.services.billing_service import BillingService
+
+    now = datetime.now(timezone.utc)
+    await add_usage(session_factory, (1, "/ask", 100, now), (1, "/query", 20, now))
+    service = BillingService(cache_service=None)
+
+    with patch("app.services.billing_service.AsyncSessionLocal", session_factory), \
+            patch.object(service, "get_usage_stats", AsyncMock()) as get_usage_stats:
+        analytics = await service.get_usage_analytics(1, "monthly", months=12)
+        assert await service.roll_up_closed_days() == 0  # Nothing before today
+        trends = await service.get_usage_trends(1, months=2)
+
+    get_usage_stats.assert_not_called()
+    assert analytics["periods_analyzed"] == 12
+    assert analytics["summary"]["total_requests"] == 2
+    assert analytics["monthly_usage"][0] == {"period": now.strftime("%Y-%m"), "requests": 2, "tokens": 120}
+    assert trends["trend_data"][0]["endpoints"] == 2
+
+
+@pytest.mark.asyncio
+async def test_payment_summary(session_factory):
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        session.add_all([
+            PaymentRecord(user_id=1, stripe_payment_intent_id="pi_1", amount_cents=1000, status="succeeded", created_at=now),
+            PaymentRecord(user_id=1, stripe_payment_intent_id="pi_2", amount_cents=500, status="failed", created_at=now),
+            PaymentRecord(user_id=2, stripe_payment_intent_id="pi_3", amount_cents=700, status="succeeded",
+                          created_at=now - timedelta(days=60)),
+            RefundRecord(user_id=1, stripe_refund_id="re_1", stripe_payment_intent_id="pi_1", amount_cents=300,
+                         status=RefundStatus.SUCCEEDED, reason=RefundReason.CUSTOMER_REQUEST, created_at=now),
+            DisputeRecord(user_id=1, stripe_dispute_id="dp_1", stripe_charge_id="ch_1", amount_cents=1000,
+                          status=DisputeStatus.NEEDS_RESPONSE, reason=DisputeReason.FRAUDULENT, account_suspended=True),
+            DisputeRecord(user_id=1, stripe_dispute_id="dp_2", stripe_charge_id="ch_2", amount_cents=1000,
+                          status=DisputeStatus.LOST, reason=DisputeReason.FRAUDULENT, account_suspended=True),
+        ])
+        await session.commit()
+
+        summary = await payment_summary(session, now - timedelta(days=30), now + timedelta(minutes=1))
+
+    assert summary == {
+        "total_payments": 1,
+        "total_amount_cents": 1000,
+        "total_refunds": 1,
+        "total_refund_amount_cents": 300,
+        "active_disputes": 1,
+        "suspended_accounts": 1,
+    }
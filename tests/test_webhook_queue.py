@@ -0,0 +1,207 @@
+"""Tests for the durable webhook queue: deduplication, per-customer ordering, retries and replay."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlmodel import select
+
+from app.core.db_models import WebhookEvent, WebhookEventStatus
+from app.services.webhook_queue import WebhookQueue, customer_of
+
+
+
+def event(event_id: str, customer: str = "cus_1", created: int = 1, event_type: str = "invoice.payment_succeeded"):
+    return {
+        "id": event_id,
+        "type": event_type,
+        "created": created,
+        "data": {"object": {"id": f"in_{event_id}", "object": "invoice", "customer": customer}},
+    }
+
+
+class Recorder:
+    """Handler recording applied event IDs; fails events listed in ``failing``."""
+
+    def __init__(self, delay: float = 0.0):
+        self.applied = []
+        self.failing = set()
+        self.delay = delay
+
+    async def __call__(self, payload):
+        await asyncio.sleep(self.delay)
+        if payload["id"] in self.failing:
+            raise RuntimeError(f"cannot apply {payload['id']}")
+        self.applied.append(payload["id"])
+        return True
+
+
+def make_queue(session_factory, handler, **overrides) -> WebhookQueue:
+    options = dict(max_attempts=2, retry_base_seconds=0.0, poll_interval_seconds=0.05, session_factory=session_factory)
+    options.update(overrides)
+    return WebhookQueue(handler, **options)
+
+
+async def stored(session_factory, event_id: str) -> WebhookEvent:
+    async with session_factory() as session:
+        return (await session.execute(select(WebhookEvent).where(WebhookEvent.event_id == event_id))).scalar_one()
+
+
+def test_customer_of_reads_the_event_object():
+    assert customer_of(event("evt_1", customer="cus_9")) == "cus_9"
+    assert customer_of({"data": {"object": {"object": "customer", "id": "cus_7"}}}) == "cus_7"
+    assert customer_of({"data": {"object": {"customer": {"id": "cus_5", "object": "customer"}}}}) == "cus_5"
+    assert customer_of({"data": {"object": {"object": "product"}}}) is None
+
+
+@pytest.mark.asyncio
+async def test_redelivered_event_is_applied_once(session_factory):
+    handler = Recorder()
+    queue = make_queue(session_factory, handler)
+
+    assert await queue.enqueue(event("evt_1")) is True
+    assert await queue.enqueue(event("evt_1")) is False
+    await queue.process_pending()
+    assert await queue.enqueue(event("evt_1")) is False
+    await queue.process_pending()
+
+    assert handler.applied == ["evt_1"]
+    record = await stored(session_factory, "evt_1")
+    assert record.status == WebhookEventStatus.PROCESSED
+    assert record.processed_at is not None
+
+
+@pytest.mark.asyncio
+async def test_events_apply_in_creation_order_per_customer(session_factory):
+    handler = Recorder(delay=0.01)
+    queue = make_queue(session_factory, handler)
+    # Delivered out of order
+    for event_id, customer, created in [("b2", "cus_b", 2), ("a2", "cus_a", 2), ("a1", "cus_a", 1), ("b1", "cus_b", 1)]:
+        await queue.enqueue(event(event_id, customer, created))
+
+    assert await queue.process_pending() == 4
+
+    assert handler.applied.index("a1") < handler.applied.index("a2")
+    assert handler.applied.index("b1") < handler.applied.index("b2")
+
+
+@pytest.mark.asyncio
+async def test_failure_holds_back_the_customer_then_dead_letters(session_factory, caplog):
+    handler = Recorder()
+    handler.failing = {"a1"}
+    queue = make_queue(session_factory, handler, retry_base_seconds=60.0)
+    await queue.enqueue(event("a1", "cus_a", 1))
+    await queue.enqueue(event("a2", "cus_a", 2))
+    await queue.enqueue(event("b1", "cus_b", 1))
+
+    await queue.process_pending()
+    # a2 waits behind a1's retry; other customers are unaffected
+    assert handler.applied == ["b1"]
+    failed = await stored(session_factory, "a1")
+    assert failed.status == WebhookEventStatus.FAILED
+    assert failed.attempts == 1
+    assert "cannot apply a1" in failed.last_error
+
+    await queue.process_pending()  # Not due yet
+    assert (await stored(session_factory, "a1")).attempts == 1
+
+    queue.retry_base_seconds = 0.0
+    async with session_factory() as session:
+        record = await session.get(WebhookEvent, failed.id)
+        record.next_attempt_at = None
+        session.add(record)
+        await session.commit()
+    caplog.clear()
+    await queue.process_pending()
+
+    dead = await stored(session_factory, "a1")
+    assert dead.status == WebhookEventStatus.DEAD_LETTER
+    assert dead.attempts == 2
+    # A dead letter no longer blocks the customer
+    assert handler.applied == ["b1", "a2"]
+    assert any(getattr(r, "event_type", None) == "webhook_dead_lettered" for r in caplog.records)
+    assert [e.event_id for e in await queue.list_events(WebhookEventStatus.DEAD_LETTER)] == ["a1"]
+
+
+@pytest.mark.asyncio
+async def test_replay_reapplies_a_dead_letter(session_factory):
+    handler = Recorder()
+    handler.failing = {"evt_1"}
+    queue = make_queue(session_factory, handler, max_attempts=1)
+    await queue.enqueue(event("evt_1"))
+    await queue.process_pending()
+    assert (await stored(session_factory, "evt_1")).status == WebhookEventStatus.DEAD_LETTER
+
+    handler.failing.clear()
+    assert await queue.replay("evt_1") is True
+    assert await queue.replay("evt_missing") is False
+    await queue.process_pending()
+
+    record = await stored(session_factory, "evt_1")
+    assert handler.applied == ["evt_1"]
+    assert (record.status, record.attempts, record.last_error) == (WebhookEventStatus.PROCESSED, 1, None)
+
+
+@pytest.mark.asyncio
+async def test_interrupted_attempt_is_retried(session_factory):
+    handler = Recorder()
+    queue = make_queue(session_factory, handler, processing_timeout_seconds=0.0)
+    await queue.enqueue(event("evt_1"))
+    # A worker claimed the event and died
+    async with session_factory() as session:
+        record = (await session.execute(WebhookEvent.__table__.select())).first()
+        claimed = await session.get(WebhookEvent, record.id)
+        claimed.status = WebhookEventStatus.PROCESSING
+        claimed.locked_at = claimed.received_at
+        session.add(claimed)
+        await session.commit()
+
+    await queue.process_pending()
+
+    assert handler.applied == ["evt_1"]
+
+
+@pytest.mark.asyncio
+async def test_worker_applies_queued_events_in_background(session_factory):
+    handler = Recorder()
+    queue = make_queue(session_factory, handler, poll_interval_seconds=10.0)
+    queue.run()
+    try:
+        await queue.enqueue(event("evt_1"))
+        for _ in range(100):
+            if handler.applied:
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await queue.aclose()
+
+    assert handler.applied == ["evt_1"]
+    assert not queue.running
+
+
+@pytest.mark.asyncio
+async def test_webhook_endpoint_acknowledges_by_queueing(test_client):
+    from app.main import app
+    from app.router.payments import get_payment_service
+
+    queue = MagicMock()
+    queue.enqueue = AsyncMock(side_effect=[True, False])
+    payment_service = AsyncMock()
+    app.state.webhook_queue = queue
+    app.dependency_overrides[get_payment_service] = lambda: payment_service
+    stripe_event = event("evt_http")
+    try:
+        with patch("app.router.payments.stripe.Webhook.construct_event", return_value=stripe_event), \
+                patch("app.router.payments.get_settings") as get_settings:
+            get_settings.return_value.stripe_webhook_secret.get_secret_value.return_value = "whsec_test"
+            first = test_client.post("/payments/webhooks/stripe", content=b"{}", headers={"stripe-signature": "sig"})
+            second = test_client.post("/payments/webhooks/stripe", content=b"{}", headers={"stripe-signature": "sig"})
+    finally:
+        app.state.webhook_queue = None
+        app.dependency_overrides.pop(get_payment_service, None)
+
+    assert first.status_code == 200
+    assert first.json()["queued"] is True
+    assert second.json()["duplicate"] is True
+    queue.enqueue.assert_awaited_with(stripe_event)
+    payment_service.sync_subscription_from_stripe.assert_not_called()